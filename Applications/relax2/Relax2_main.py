@@ -44,6 +44,10 @@ from parameter_handler import params
 from sequence_handler import seq
 from process_handler import proc
 from data_logger import logger
+from rawdata_handler import rawdata
+from scheduler_handler import scheduler
+from acquisition_handler import acquisition, job
+from preview_handler import preview
 
 plt.rc('axes', prop_cycle=params.cycler)
 plt.rcParams['lines.linewidth'] = 2
@@ -77,9 +81,13 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
         self.dialog_prot = None
         self.dialog_sarmonitor = None
         self.dialog_motortools = None
+        self.preview_canvas = None
 
         self.ui = loadUi('ui/mainwindow.ui')
         self.setWindowTitle('Relax 2.0')
+        scheduler.progress.connect(self.measurement_progress)
+        acquisition.busy.connect(self.acquisition_busy)
+        preview.updated.connect(self.live_preview)
         params.load_GUItheme()
         self.setStyleSheet(params.stylesheet)
         self.setGeometry(10, 40, 400, 410)
@@ -240,6 +248,41 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
             self.motor.clearError()
             self.motor.blockSignals(False)
 
+    def acquisition_busy(self, busy):
+        # While acquisitions run the parameters and the hardware belong to them, plots and progress stay live
+        for widget in (self.Acquire_pushButton, self.Data_Process_pushButton, self.Sequence_comboBox, self.Datapath_lineEdit, \
+                       self.Mode_Spectroscopy_pushButton, self.Mode_Imaging_pushButton, self.Mode_T1_Measurement_pushButton, \
+                       self.Mode_T2_Measurement_pushButton, self.Mode_Projections_pushButton, self.Mode_Image_Stitching_pushButton, \
+                       self.Parameters_pushButton, self.Config_pushButton, self.Tools_pushButton, self.Protocol_pushButton, \
+                       self.Motor_Tools_pushButton, self.dialog_params, self.dialog_config, self.dialog_tools, \
+                       self.dialog_prot, self.dialog_motortools):
+            if widget != None: widget.setEnabled(not busy)
+        self.repaint()
+
+    def measurement_progress(self, text):
+        # Progress of the running measurement (TR scheduler), empty when finished
+        if text: self.setWindowTitle('Relax 2.0 - ' + text.replace('\n', ' - '))
+        else: self.setWindowTitle('Relax 2.0')
+
+    def live_preview(self, image, text):
+        # Frame of the live preview during image acquisitions, drawn into one canvas per image size
+        if self.preview_canvas == None or self.preview_plot.get_array().shape != image.shape:
+            if self.preview_canvas != None: self.preview_canvas.hide()
+            self.preview_fig = Figure()
+            self.preview_fig.set_facecolor('None')
+            self.preview_canvas = FigureCanvas(self.preview_fig)
+            self.preview_ax = self.preview_fig.add_subplot(111)
+            self.preview_plot = self.preview_ax.imshow(image, cmap=params.imagecolormap)
+            self.preview_ax.axis('off')
+            self.preview_canvas.setGeometry(420, 40, 800, 750)
+        else:
+            self.preview_plot.set_data(image)
+        self.preview_plot.set_clim(0, max(float(np.max(image)), 1e-12))
+        self.preview_canvas.setWindowTitle(text)
+        self.preview_canvas.draw()
+        self.preview_canvas.show()
+        preview.shown()
+
     def establish_conn(self):
         self.dialog_con = ConnectionDialog(self)
         self.dialog_con.show()
@@ -304,7 +347,9 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
             self.Sequence_comboBox.clear()
             self.Sequence_comboBox.addItems(['Gradient Echo (On Axis)', 'Spin Echo (On Axis)', 'Gradient Echo (On Angle)' \
                                             , 'Spin Echo (On Angle)', 'Gradient Echo (Slice, On Axis)', 'Spin Echo (Slice, On Axis)' \
-                                            , 'Gradient Echo (Slice, On Angle)', 'Spin Echo (Slice, On Angle)'])
+                                            , 'Gradient Echo (Slice, On Angle)', 'Spin Echo (Slice, On Angle)' \
+                                            , 'Gradient Echo (Projection Reconstruction)', 'Spin Echo (Projection Reconstruction)' \
+                                            , 'Gradient Echo (Slice, Projection Reconstruction)', 'Spin Echo (Slice, Projection Reconstruction)'])
             self.Sequence_comboBox.setCurrentIndex(0)
             self.Datapath_lineEdit.setText('rawdata/Projection_rawdata')
             params.datapath = self.Datapath_lineEdit.text()
@@ -329,6 +374,11 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
         if params.autodataprocess == 1: self.Data_Process_pushButton.setEnabled(False)
         self.repaint()
 
+        # Scan on the acquisition thread, with auto data processing reconstructed on the processing thread
+        if params.autodataprocess == 1: acquisition.submit(job('Acquisition', self.acquire_run, self.dataprocess_run, self.acquire_finished, self.dataprocess_finished))
+        else: acquisition.submit(job('Acquisition', self.acquire_run, acquired=self.acquire_finished))
+
+    def acquire_run(self):
         if params.GUImode == 2:
             if params.sequence == 0:
                 proc.T1measurement_IR_FID()
@@ -415,6 +465,9 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                     proc.image_stitching_2D_SE_slice()
                 if params.sequence == 10:
                     proc.image_stitching_3D_slab()
+
+        elif params.GUImode == 4 and (params.sequence == 8 or params.sequence == 9 or params.sequence == 10 or params.sequence == 11):
+            proc.projection_reconstruction()
             
         elif params.GUImode == 1:
             if params.autorecenter == 1:
@@ -424,6 +477,7 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                 if params.sequence == 0 or params.sequence == 2 or params.sequence == 4 \
                         or params.sequence == 7 or params.sequence == 9 or params.sequence == 12 \
                         or params.sequence == 15:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -437,22 +491,13 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if self.dialog_config != None:
-                        self.dialog_config.load_params()
-                        self.dialog_config.repaint()
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
                 elif params.sequence == 17 or params.sequence == 19 or params.sequence == 21 \
                         or params.sequence == 24 or params.sequence == 26 or params.sequence == 29 \
                         or params.sequence == 32 or params.sequence == 34:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -466,23 +511,14 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if self.dialog_config != None:
-                        self.dialog_config.load_params()
-                        self.dialog_config.repaint()
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
                 elif params.sequence == 1 or params.sequence == 3 or params.sequence == 5 \
                         or params.sequence == 6 or params.sequence == 8 or params.sequence == 10 \
                         or params.sequence == 11 or params.sequence == 13 or params.sequence == 14 \
                         or params.sequence == 16:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -496,23 +532,14 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if self.dialog_config != None:
-                        self.dialog_config.load_params()
-                        self.dialog_config.repaint()
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
                 elif params.sequence == 18 or params.sequence == 20 or params.sequence == 22 \
                         or params.sequence == 23 or params.sequence == 25 or params.sequence == 27 \
                         or params.sequence == 28 or params.sequence == 30 or params.sequence == 31 \
                         or params.sequence == 33 or params.sequence == 35 or params.sequence == 36:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -526,18 +553,8 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if self.dialog_config != None:
-                        self.dialog_config.load_params()
-                        self.dialog_config.repaint()
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
             else:
                 seq.sequence_upload()
@@ -564,8 +581,8 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                 params.save_header_file_txt()
             else:
                 params.save_header_file_json()
-            
 
+    def acquire_finished(self, job):
         if self.dialog_params != None:
             self.SIR_TEtemp = 0
             self.SIR_TEtemp = params.SIR_TE
@@ -583,12 +600,6 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
             self.dialog_motortools.load_params()
             self.dialog_motortools.repaint()
 
-        if params.autodataprocess == 1: self.dataprocess()
-
-        self.Acquire_pushButton.setEnabled(True)
-        self.Data_Process_pushButton.setEnabled(True)
-        self.repaint()
-
     def load_params(self):
         self.Sequence_comboBox.clear()
         self.switch_GUImode(params.GUImode)
@@ -624,8 +635,13 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
     def dataprocess(self):
         self.Data_Process_pushButton.setEnabled(False)
         self.repaint()
-        
+
+        acquisition.submit(job('Data processing', process=self.dataprocess_run, processed=self.dataprocess_finished))
+
+    def dataprocess_run(self):
+        # Processing thread: True if there is a result to plot, None without header file
         self.dataprocess_header_flag = 0
+        plot = False
         
         self.GUImode_temp = 0
         self.GUImode_temp = params.GUImode
@@ -660,6 +676,8 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
         self.sliceoffset_temp = 0
         self.sliceoffset_temp = params.sliceoffset
         
+        rawdata.flush()
+
         if params.headerfileformat == 0:
             if os.path.isdir(params.datapath) == True:
                 if os.path.isfile(params.datapath + '/Image_Stitching_Header.txt') == True:
@@ -747,188 +765,68 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                 params.sliceoffset = jsonparams['Slice offset [mm]']
         
         if self.dataprocess_header_flag == 1:
-            if self.dialog_plot != None:
-                if self.dialog_plot.dialog_3D_layers != None:
-                    self.dialog_plot.dialog_3D_layers.hide()
             
             if params.GUImode == 0:
-                if os.path.isfile(params.datapath + '.txt') == True:
+                if rawdata.exists(params.datapath) == True:
                     proc.spectrum_process()
                     proc.spectrum_analytics()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.fig_canvas != None: self.dialog_plot.fig_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No spectrum rawdata file!!')
                     
             elif params.GUImode == 1 and (params.sequence == 34 or params.sequence == 35 or params.sequence == 36):
-                if os.path.isfile(params.datapath + '.txt') == True:
+                if rawdata.exists(params.datapath) == True:
                     proc.image_3D_process()
                     proc.image_3D_analytics()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No 3D rawdata file!!')
                 
             elif params.GUImode == 1 and (params.sequence == 14 or params.sequence == 31):
-                if os.path.isfile(params.datapath + '.txt') == True:
+                if rawdata.exists(params.datapath) == True:
                     proc.image_diff_process()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.IComb_canvas != None: self.dialog_plot.IComb_canvas.hide()
-                            if self.dialog_plot.IDiff_canvas != None: self.dialog_plot.IDiff_canvas.hide()
-                            if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
-                            if self.dialog_plot.IPha_canvas != None: self.dialog_plot.IPha_canvas.hide()
-                            if self.dialog_plot.kMag_canvas != None: self.dialog_plot.kMag_canvas.hide()
-                            if self.dialog_plot.kPha_canvas != None: self.dialog_plot.kPha_canvas.hide()
-                            if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
-                            if self.dialog_plot.hist_canvas != None: self.dialog_plot.hist_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No 2D diffusion rawdata file!!')
             elif params.GUImode == 1 and (params.sequence == 0 or params.sequence == 1 or params.sequence == 2 \
                                           or params.sequence == 3 or params.sequence == 17 or params.sequence == 18 \
                                           or params.sequence == 19 or params.sequence == 20):
-                if os.path.isfile(params.datapath + '.txt') == True:
+                if rawdata.exists(params.datapath) == True:
                     proc.radial_process()
                     proc.image_analytics()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
-                            if self.dialog_plot.IPha_canvas != None: self.dialog_plot.IPha_canvas.hide()
-                            if self.dialog_plot.kMag_canvas != None: self.dialog_plot.kMag_canvas.hide()
-                            if self.dialog_plot.kPha_canvas != None: self.dialog_plot.kPha_canvas.hide()
-                            if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
-                            if self.dialog_plot.hist_canvas != None: self.dialog_plot.hist_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No 2D radial rawdata file!!')
             elif params.GUImode == 1 and (params.sequence != 34 or params.sequence != 35 or params.sequence != 36 \
                                           or params.sequence != 14 or params.sequence != 31 or params.sequence != 0 \
                                           or params.sequence != 1 or params.sequence != 2 or params.sequence != 3 \
                                           or params.sequence != 17 or params.sequence != 18 or params.sequence != 19 \
                                           or params.sequence != 20):
-                if os.path.isfile(params.datapath + '.txt') == True:
+                if rawdata.exists(params.datapath) == True:
                     proc.image_process()
                     proc.image_analytics()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
-                            if self.dialog_plot.IPha_canvas != None: self.dialog_plot.IPha_canvas.hide()
-                            if self.dialog_plot.kMag_canvas != None: self.dialog_plot.kMag_canvas.hide()
-                            if self.dialog_plot.kPha_canvas != None: self.dialog_plot.kPha_canvas.hide()
-                            if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
-                            if self.dialog_plot.hist_canvas != None: self.dialog_plot.hist_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No 2D rawdata file!!')
 
             elif params.GUImode == 2 and (params.sequence == 0 or params.sequence == 1 or params.sequence == 2 or params.sequence == 3):
-                if os.path.isfile(params.datapath + '.txt') == True:
-                    proc.T1process()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.fig_canvas1 != None: self.dialog_plot.fig_canvas1.hide()
-                            if self.dialog_plot.fig_canvas2 != None: self.dialog_plot.fig_canvas2.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                if rawdata.exists(params.datapath) == True:
+                    proc.T1process(method=['loglinear', 'IR'][params.T1fitmethod])
+                    plot = True
                 else: print('No T1 file!!')
             elif params.GUImode == 2 and (params.sequence == 4 or params.sequence == 5 or params.sequence == 6 or params.sequence == 7):
-                if os.path.isfile(params.datapath + '_Image_TI_steps.txt') == True:
-                    if os.path.isfile(params.datapath + '_Image_Magnitude.txt') == True:
-                        proc.T1imageprocess()
-                        if params.single_plot == 1:
-                            if self.dialog_plot != None:
-                                self.dialog_plot.hide()
-                                if self.dialog_plot.IComb_canvas != None: self.dialog_plot.IComb_canvas.hide()
-                                self.dialog_plot = PlotWindow(self)
-                                self.dialog_plot.show()
-                            else:
-                                self.dialog_plot = PlotWindow(self)
-                                self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
+                if rawdata.exists(params.datapath + '_Image_TI_steps') == True:
+                    if rawdata.exists(params.datapath + '_Image_Magnitude') == True:
+                        proc.T1imageprocess(method=['loglinear', 'IR'][params.T1fitmethod])
+                        plot = True
                     else: print('No T1 rawdata file!!')
                 else: print('No TI steps file!!')
 
             elif params.GUImode == 3 and (params.sequence == 0 or params.sequence == 1 or params.sequence == 2 or params.sequence == 3):
-                if os.path.isfile(params.datapath + '.txt') == True:
-                    proc.T2process()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.fig_canvas != None: self.dialog_plot.fig_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                if rawdata.exists(params.datapath) == True:
+                    proc.T2process(method=['loglinear', 'mono', 'bi'][params.T2fitmethod])
+                    plot = True
                 else: print('No T2 file!!')
             elif params.GUImode == 3 and (params.sequence == 4 or params.sequence == 5 or params.sequence == 6 or params.sequence == 7):
-                if os.path.isfile(params.datapath + '_Image_TE_steps.txt') == True:
-                    if os.path.isfile(params.datapath + '_Image_Magnitude.txt') == True:
-                        proc.T2imageprocess()
-                        if params.single_plot == 1:
-                            if self.dialog_plot != None:
-                                self.dialog_plot.hide()
-                                if self.dialog_plot.IComb_canvas != None: self.dialog_plot.IComb_canvas.hide()
-                                self.dialog_plot = PlotWindow(self)
-                                self.dialog_plot.show()
-                            else:
-                                self.dialog_plot = PlotWindow(self)
-                                self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
+                if rawdata.exists(params.datapath + '_Image_TE_steps') == True:
+                    if rawdata.exists(params.datapath + '_Image_Magnitude') == True:
+                        proc.T2imageprocess(method=['loglinear', 'mono', 'bi'][params.T2fitmethod])
+                        plot = True
                     else: print('No T2 rawdata file!!')
                 else: print('No TE steps file!!')
 
@@ -939,7 +837,7 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                 params.projz = np.matrix(np.zeros((1, 4)))
                 for m in range(params.projaxis.shape[0]):
                     params.datapath = self.datapathtemp + '_' + str(m)
-                    if os.path.isfile(params.datapath + '.txt') == True:
+                    if rawdata.exists(params.datapath) == True:
                         proc.spectrum_process()
                         if m == 0:
                             params.projx = np.matrix(np.zeros((params.timeaxis.shape[0], 4)))
@@ -961,79 +859,59 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
                             params.projz[:, 3] = params.spectrumfft
                     else: print('No projection spectrum rawdata file!!')
                 params.datapath = self.datapathtemp
-                if params.single_plot == 1:
-                    if self.dialog_plot != None:
-                        self.dialog_plot.hide()
-                        if self.dialog_plot.fig_canvas != None: self.dialog_plot.fig_canvas.hide()
-                        if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
-                else:
-                    self.dialog_plot = PlotWindow(self)
-                    self.dialog_plot.show()
+                plot = True
             elif params.GUImode == 4 and (params.sequence == 2 or params.sequence == 3 or params.sequence == 6 or params.sequence == 7):
-                if os.path.isfile(params.datapath + '.txt') == True:
+                if rawdata.exists(params.datapath) == True:
                     proc.spectrum_process()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.fig_canvas != None: self.dialog_plot.fig_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No projection spectrum rawdata file!!')
+            elif params.GUImode == 4 and (params.sequence == 8 or params.sequence == 9 or params.sequence == 10 or params.sequence == 11):
+                if rawdata.exists(params.datapath + '_Sinogram') == True:
+                    proc.projection_reconstruction_process()
+                    plot = True
+                else: print('No sinogram rawdata file!!')
 
             elif params.GUImode == 5 and (params.sequence == 0 or params.sequence == 1 or params.sequence == 2 or params.sequence == 3 \
                                           or params.sequence == 4 or params.sequence == 5 or params.sequence == 6 or params.sequence == 7 \
                                           or params.sequence == 8 or params.sequence == 9):
-                if os.path.isfile(params.datapath + '/Image_Stitching_1.txt') == True:
+                if rawdata.exists(params.datapath + '/Image_Stitching_1') == True:
                     proc.image_stitching_2D_process()
                     proc.image_stitching_analytics()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
-                            if self.dialog_plot.IPha_canvas != None: self.dialog_plot.IPha_canvas.hide()
-                            if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
-                            if self.dialog_plot.hist_canvas != None: self.dialog_plot.hist_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No 2D stitching rawdata file!!')
             elif params.GUImode == 5 and params.sequence == 10:
-                if os.path.isfile(params.datapath + '/Image_Stitching_1.txt') == True:
+                if rawdata.exists(params.datapath + '/Image_Stitching_1') == True:
                     proc.image_stitching_3D_process()
                     proc.image_stitching_3D_analytics()
-                    if params.single_plot == 1:
-                        if self.dialog_plot != None:
-                            self.dialog_plot.hide()
-                            if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
-                            if self.dialog_plot.IPha_canvas != None: self.dialog_plot.IPha_canvas.hide()
-                            if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
-                            if self.dialog_plot.hist_canvas != None: self.dialog_plot.hist_canvas.hide()
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                        else:
-                            self.dialog_plot = PlotWindow(self)
-                            self.dialog_plot.show()
-                    else:
-                        self.dialog_plot = PlotWindow(self)
-                        self.dialog_plot.show()
+                    plot = True
                 else: print('No 3D stitching rawdata file!!')
         
+            return plot
+
+    def dataprocess_finished(self, job):
+        # GUI thread: plot, then the parameters replaced by the header are restored
+        if job.result is not None:
+            if job.result:
+                if self.dialog_plot != None:
+                    if self.dialog_plot.dialog_3D_layers != None:
+                        self.dialog_plot.dialog_3D_layers.hide()
+                    if params.single_plot == 1:
+                        self.dialog_plot.hide()
+                        if self.dialog_plot.fig_canvas != None: self.dialog_plot.fig_canvas.hide()
+                        if self.dialog_plot.fig_canvas1 != None: self.dialog_plot.fig_canvas1.hide()
+                        if self.dialog_plot.fig_canvas2 != None: self.dialog_plot.fig_canvas2.hide()
+                        if self.dialog_plot.IComb_canvas != None: self.dialog_plot.IComb_canvas.hide()
+                        if self.dialog_plot.IDiff_canvas != None: self.dialog_plot.IDiff_canvas.hide()
+                        if self.dialog_plot.IMag_canvas != None: self.dialog_plot.IMag_canvas.hide()
+                        if self.dialog_plot.IPha_canvas != None: self.dialog_plot.IPha_canvas.hide()
+                        if self.dialog_plot.kMag_canvas != None: self.dialog_plot.kMag_canvas.hide()
+                        if self.dialog_plot.kPha_canvas != None: self.dialog_plot.kPha_canvas.hide()
+                        if self.dialog_plot.all_canvas != None: self.dialog_plot.all_canvas.hide()
+                        if self.dialog_plot.hist_canvas != None: self.dialog_plot.hist_canvas.hide()
+                if self.preview_canvas != None: self.preview_canvas.hide()
+                self.dialog_plot = PlotWindow(self)
+                self.dialog_plot.show()
+
             params.saveFileData()
             
             params.GUImode = self.GUImode_temp
@@ -1052,9 +930,6 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
             params.radialosfactor = self.radialosfactor_temp
             params.autofreqoffset = self.autofreqoffset_temp
             params.sliceoffset = self.sliceoffset_temp
-        
-        self.Data_Process_pushButton.setEnabled(True)
-        self.repaint()
 
     def tools(self):
         if self.dialog_tools == None:
@@ -1096,6 +971,7 @@ class MainWindow(Main_Window_Base, Main_Window_Form):
             params.GUImode = 0
             params.sequence = 0
             params.saveFileParameter()
+            params.flushParameter()
             params.saveFileData()
             event.accept()
             raise SystemExit
@@ -1888,7 +1764,7 @@ class ConfigWindow(Config_Window_Form, Config_Window_Base):
 
         self.ui = loadUi('ui/config.ui')
         self.setWindowTitle('Config')
-        self.setGeometry(420, 40, 760, 820)
+        self.setGeometry(420, 40, 760, 850)
 
         # self.label_3.setToolTip('<img src='tooltip/test.png'>')
         self.Frequency_doubleSpinBox.setKeyboardTracking(False)
@@ -1993,6 +1869,23 @@ class ConfigWindow(Config_Window_Form, Config_Window_Base):
         elif params.imagecolormap == 'plasma': self.Image_Colormap_comboBox.setCurrentIndex(5)
         self.Image_Colormap_comboBox.currentIndexChanged.connect(self.update_params)
 
+        self.Live_Preview_comboBox.clear()
+        self.Live_Preview_comboBox.addItems(['Off', 'Zero-filled k-Space', 'Centre-out', 'k-Space Magnitude'])
+        self.Live_Preview_comboBox.setCurrentIndex(params.preview_mode)
+        self.Live_Preview_comboBox.currentIndexChanged.connect(self.update_params)
+        self.Live_Preview_Rate_spinBox.setValue(params.preview_rate)
+        self.Live_Preview_Rate_spinBox.setKeyboardTracking(False)
+        self.Live_Preview_Rate_spinBox.valueChanged.connect(self.update_params)
+
+        self.T1_Fit_comboBox.clear()
+        self.T1_Fit_comboBox.addItems(['Log-linear', 'Inversion Recovery'])
+        self.T1_Fit_comboBox.setCurrentIndex(params.T1fitmethod)
+        self.T1_Fit_comboBox.currentIndexChanged.connect(self.update_params)
+        self.T2_Fit_comboBox.clear()
+        self.T2_Fit_comboBox.addItems(['Log-linear', 'Mono-exponential', 'Bi-exponential'])
+        self.T2_Fit_comboBox.setCurrentIndex(params.T2fitmethod)
+        self.T2_Fit_comboBox.currentIndexChanged.connect(self.update_params)
+
     def frequency_center(self):
         params.frequency = params.centerfrequency
         self.Frequency_doubleSpinBox.setValue(params.frequency)
@@ -2068,6 +1961,11 @@ class ConfigWindow(Config_Window_Form, Config_Window_Base):
         elif params.imagecolormap == 'inferno': self.Image_Colormap_comboBox.setCurrentIndex(4)
         elif params.imagecolormap == 'plasma': self.Image_Colormap_comboBox.setCurrentIndex(5)
 
+        self.Live_Preview_comboBox.setCurrentIndex(params.preview_mode)
+        self.Live_Preview_Rate_spinBox.setValue(params.preview_rate)
+        self.T1_Fit_comboBox.setCurrentIndex(params.T1fitmethod)
+        self.T2_Fit_comboBox.setCurrentIndex(params.T2fitmethod)
+
     def update_params(self):
         params.frequency = self.Frequency_doubleSpinBox.value()
         if self.auto_recenter_radioButton.isChecked(): params.autorecenter = 1
@@ -2160,6 +2058,11 @@ class ConfigWindow(Config_Window_Form, Config_Window_Base):
         elif self.Image_Colormap_comboBox.currentIndex() == 3: params.imagecolormap = 'bone'
         elif self.Image_Colormap_comboBox.currentIndex() == 4: params.imagecolormap = 'inferno'
         elif self.Image_Colormap_comboBox.currentIndex() == 5: params.imagecolormap = 'plasma'
+
+        params.preview_mode = self.Live_Preview_comboBox.currentIndex()
+        params.preview_rate = self.Live_Preview_Rate_spinBox.value()
+        params.T1fitmethod = self.T1_Fit_comboBox.currentIndex()
+        params.T2fitmethod = self.T2_Fit_comboBox.currentIndex()
         
         params.saveFileParameter()
 
@@ -3361,6 +3264,8 @@ class ToolsWindow(Tools_Window_Form, Tools_Window_Base):
 
 class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
     connected = pyqtSignal()
+    # Message task: shown on the GUI thread, the protocol waits for Ok
+    message = pyqtSignal(str)
 
     def __init__(self, parent=None, motor=None, motor_reader=None):
         super(ProtocolWindow, self).__init__(parent)
@@ -3405,6 +3310,14 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
         self.Protocol_Insert_Message_pushButton.clicked.connect(lambda: self.protocol_insert_message())
         self.Protocol_Add_MoveTo_pushButton.clicked.connect(lambda: self.protocol_add_moveto())
         self.Protocol_Insert_MoveTo_pushButton.clicked.connect(lambda: self.protocol_insert_moveto())
+        self.message.connect(self.protocol_message, Qt.BlockingQueuedConnection)
+
+    def protocol_message(self, text):
+        msg_box = QMessageBox()
+        msg_box.setIcon(QMessageBox.Warning)
+        msg_box.setText(text)
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec()
 
     def set_protocol_datapath(self):
         self.prot_datapath = self.Protocol_Datapath_lineEdit.text()
@@ -3422,6 +3335,7 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
         if os.path.isdir(self.prot_datapath + '/Parameters') != True: os.mkdir(self.prot_datapath + '/Parameters')
         
         try:
+            params.flushParameter()
             shutil.copyfile('parameters.pkl', self.prot_datapath + '/Parameters/Task_' + str(self.protocol.shape[0] - 1) + '_parameters.pkl')
             time.sleep(0.01)
         except: print('No parameter file.')
@@ -3467,6 +3381,7 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     time.sleep(0.01)
                 except: print('No parameter file.')
                     
+            params.flushParameter()
             shutil.copyfile('parameters.pkl', self.prot_datapath + '/Parameters/Task_' + str(self.Protocol_Number_spinBox.value()) + '_parameters.pkl')
             time.sleep(0.01)
             
@@ -3524,6 +3439,7 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
             if os.path.isdir(self.prot_datapath + '/Parameters') != True: os.mkdir(self.prot_datapath + '/Parameters')
 
             try:
+                params.flushParameter()
                 shutil.copyfile('parameters.pkl', self.prot_datapath + '/Parameters/Task_' + str(self.Protocol_Number_spinBox.value()) + '_parameters.pkl')
                 time.sleep(0.01)
             except: print('No parameter file.')
@@ -3792,11 +3708,15 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
 
         self.Protocol_Execute_Protocol_pushButton.setEnabled(False)
         self.repaint()
-        
+
+        acquisition.submit(job('Protocol', self.protocol_run, processed=self.protocol_finished))
+
+    def protocol_run(self):
         if os.path.isdir(self.prot_datapath) == True:
             if os.path.isdir(self.prot_datapath + '/Parameters') == True:
 
                 try:
+                    params.flushParameter()
                     shutil.copyfile('parameters.pkl', self.prot_datapath + '/Parameters/Parameters_temp.pkl')
                     time.sleep(0.01)
                 except:
@@ -3814,6 +3734,7 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     print('Protocol task: ' + str(n + 1))
                     if self.protocol[n, 0] < 6:
                         try:
+                            params.flushParameter()
                             shutil.copyfile(self.prot_datapath + '/Parameters/Task_' + str(n + 1) + '_parameters.pkl', 'parameters.pkl')
                             time.sleep(0.01)
                             params.loadParam()
@@ -3846,9 +3767,16 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     else: params.datapath = ''
                     
                     self.protocol_acquire()
+
+                    if params.GUImode < 6 and params.autodataprocess == 1:
+                        # Reconstructed on the parameters of this task while the next task is acquired
+                        task = job('Task ' + str(n + 1), process=self.parent().dataprocess_run, processed=self.parent().dataprocess_finished)
+                        task.params = params.draft()
+                        acquisition.process(task)
                     
+                    # TR of this task before the next one
                     if params.GUImode < 6:
-                        time.sleep(params.TR/1000)
+                        scheduler.pause(params.TR/1000)
                     if params.GUImode == 8:
                         time.sleep(1)
                     
@@ -3859,6 +3787,7 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                 params.datapath = self.datapathtemp
 
                 try:
+                    params.flushParameter()
                     shutil.copyfile(self.prot_datapath + '/Parameters/Parameters_temp.pkl', 'parameters.pkl')
                     time.sleep(0.01)
                     
@@ -3872,7 +3801,8 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
             
             else: print('No protocol parameter directory!!')
         else: print('No protocol directory!!')
-            
+
+    def protocol_finished(self, job):
         self.Protocol_Execute_Protocol_pushButton.setEnabled(True)
         self.repaint()
 
@@ -3963,6 +3893,9 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     proc.image_stitching_2D_SE_slice()
                 if params.sequence == 10:
                     proc.image_stitching_3D_slab()
+
+        elif params.GUImode == 4 and (params.sequence == 8 or params.sequence == 9 or params.sequence == 10 or params.sequence == 11):
+            proc.projection_reconstruction()
             
         elif params.GUImode == 1:
             if params.autorecenter == 1:
@@ -3972,6 +3905,7 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                 if params.sequence == 0 or params.sequence == 2 or params.sequence == 4 \
                         or params.sequence == 7 or params.sequence == 9 or params.sequence == 12 \
                         or params.sequence == 15:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -3985,19 +3919,13 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
                 elif params.sequence == 17 or params.sequence == 19 or params.sequence == 21 \
                         or params.sequence == 24 or params.sequence == 26 or params.sequence == 29 \
                         or params.sequence == 32 or params.sequence == 34:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -4011,20 +3939,14 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
                 elif params.sequence == 1 or params.sequence == 3 or params.sequence == 5 \
                         or params.sequence == 6 or params.sequence == 8 or params.sequence == 10 \
                         or params.sequence == 11 or params.sequence == 13 or params.sequence == 14 \
                         or params.sequence == 16:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -4038,20 +3960,14 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
                 elif params.sequence == 18 or params.sequence == 20 or params.sequence == 22 \
                         or params.sequence == 23 or params.sequence == 25 or params.sequence == 27 \
                         or params.sequence == 28 or params.sequence == 30 or params.sequence == 31 \
                         or params.sequence == 33 or params.sequence == 35 or params.sequence == 36:
+                    schedule = scheduler.start(params.TR)
                     seq.RXconfig_upload()
                     seq.Gradients_upload()
                     seq.Frequency_upload()
@@ -4065,32 +3981,16 @@ class ProtocolWindow(Protocol_Window_Form, Protocol_Window_Base):
                     params.saveFileParameter()
                     print('Autorecenter to: ', params.frequency)
                     params.frequencyoffset = self.frequencyoffsettemp
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
                     seq.sequence_upload()
             else:
                 seq.sequence_upload()
         elif params.GUImode == 6:
-            msg_box = QMessageBox()
-            msg_box.setText('Pause: ' + str(params.TR) + 's')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(int(params.TR*1000))
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
+            scheduler.pause(params.TR, 'Pause: ' + str(params.TR) + 's')
         elif params.GUImode == 7:
             self.protocol_messagebox_string = ('Change Sample!', 'Move Sample!', 'Rotate Sample!')
-            msg_box = QMessageBox()
-            msg_box.setIcon(QMessageBox.Warning)
-            msg_box.setText(self.protocol_messagebox_string[int(params.sequence)])
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.exec()
+            self.message.emit(self.protocol_messagebox_string[int(params.sequence)])
         elif params.GUImode == 8:
             proc.motor_move(motor=self.motor)
         else:
@@ -4196,6 +4096,12 @@ class PlotWindow(Plot_Window_Form, Plot_Window_Base):
                 params.frequencyplotrange = 250000
                 self.Frequncyaxisrange_spinBox.setValue(params.frequencyplotrange)
                 self.spectrum_plot_init()
+            else:
+                params.imageminimum = np.min(params.img_mag)
+                self.Image_Minimum_doubleSpinBox.setValue(params.imageminimum)
+                params.imagemaximum = np.max(params.img_mag)
+                self.Image_Maximum_doubleSpinBox.setValue(params.imagemaximum)
+                self.imaging_plot_init()
 
         elif params.GUImode == 5:
             if params.sequence == 0 or params.sequence == 1 or params.sequence == 2 or params.sequence == 3 \
@@ -4349,6 +4255,8 @@ class PlotWindow(Plot_Window_Form, Plot_Window_Base):
         self.sliceoffset_temp = 0
         self.sliceoffset_temp = params.sliceoffset
         
+        rawdata.flush()
+
         if params.headerfileformat == 0:
             if os.path.isdir(params.datapath) == True:
                 if os.path.isfile(params.datapath + '/Image_Stitching_Header.txt') == True:
@@ -4457,8 +4365,17 @@ class PlotWindow(Plot_Window_Form, Plot_Window_Base):
                 if self.hist_canvas != None: self.hist_canvas.hide()
                 self.imaging_plot_init()
         elif params.GUImode == 4:
-            self.fig_canvas.hide()
-            self.projection_plot_init()
+            if params.sequence == 8 or params.sequence == 9 or params.sequence == 10 or params.sequence == 11:
+                if self.IMag_canvas != None: self.IMag_canvas.hide()
+                if self.IPha_canvas != None: self.IPha_canvas.hide()
+                if self.kMag_canvas != None: self.kMag_canvas.hide()
+                if self.kPha_canvas != None: self.kPha_canvas.hide()
+                if self.all_canvas != None: self.all_canvas.hide()
+                if self.hist_canvas != None: self.hist_canvas.hide()
+                self.imaging_plot_init()
+            else:
+                self.fig_canvas.hide()
+                self.projection_plot_init()
         elif params.GUImode == 5:
             if params.sequence == 10:
                 if self.IMag_canvas != None: self.IMag_canvas.hide()
@@ -4684,7 +4601,7 @@ class PlotWindow(Plot_Window_Form, Plot_Window_Base):
         self.fig_canvas.setGeometry(420, 40, 600, 950)
         self.fig_canvas.show()
 
-        if os.path.isfile(params.datapath + '_0.txt') == True and os.path.isfile(params.datapath + '_2.txt') == True:
+        if rawdata.exists(params.datapath + '_0') == True and rawdata.exists(params.datapath + '_2') == True:
 
             self.projzx = np.matrix(np.zeros((params.projz.shape[0], params.projx.shape[0])))
             self.projzx = params.projx[:, 3] * np.transpose(params.projz[:, 3])
@@ -7840,6 +7757,8 @@ class View3DLayersDialog(View3D_Dialog_Form, View3D_Dialog_Base):
         self.setWindowTitle('3D Layers Plot')
         self.setGeometry(420, 40, 1160, 950)
         
+        rawdata.flush()
+
         if params.headerfileformat == 0:
             if os.path.isdir(params.datapath) == True:
                 if os.path.isfile(params.datapath + '/Image_Stitching_Header.txt') == True:
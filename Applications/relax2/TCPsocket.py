@@ -1,8 +1,90 @@
 # create global TCP socket
 
+import atexit
+import os
+import tempfile
+
 from PyQt5.QtNetwork import QAbstractSocket, QTcpSocket
 
-socket = QTcpSocket()
+from capture_handler import capture_writer, capture_replay
+from parameter_handler import params
 
 connected = QAbstractSocket.ConnectedState
 unconnected = QAbstractSocket.UnconnectedState
+
+
+class tcpsocket(QTcpSocket):
+    # QTcpSocket that can record the server connection to a capture file or replay one instead of the server
+
+    def __init__(self):
+        super().__init__()
+        self.recorder = None
+        self.replayer = None
+
+    def record(self, path, header=None):
+        self.stop_capture()
+        # Snapshot of the current parameters, so a replay runs with the same settings
+        parameters = None
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                params.saveFileParameter(os.path.join(tmp, 'parameters.pkl'))
+                params.flushParameter(os.path.join(tmp, 'parameters.pkl'))
+                with open(os.path.join(tmp, 'parameters.pkl'), 'rb') as file: parameters = file.read()
+            except Exception as e: print('Parameters not stored in capture:', e)
+        self.recorder = capture_writer(path, header, parameters)
+        print('Recording server connection to: ', path)
+
+    def replay(self, path, realtime=False):
+        self.stop_capture()
+        self.replayer = capture_replay(path, realtime)
+        print('Replaying server connection from: ', path)
+        return self.replayer.capture.header
+
+    def stop_capture(self):
+        if self.recorder is not None: self.recorder.close()
+        self.recorder = None
+        self.replayer = None
+
+    def write(self, data):
+        if self.replayer is not None: return self.replayer.write(data)
+        if self.recorder is not None: self.recorder.sent(bytes(data))
+        return super().write(data)
+
+    def read(self, maxlen):
+        if self.replayer is not None: return self.replayer.read(maxlen)
+        data = super().read(maxlen)
+        if self.recorder is not None: self.recorder.received(data)
+        return data
+
+    def bytesAvailable(self):
+        if self.replayer is not None: return self.replayer.bytesAvailable()
+        return super().bytesAvailable()
+
+    def waitForReadyRead(self, msecs=30000):
+        if self.replayer is not None: return self.replayer.waitForReadyRead(msecs)
+        return super().waitForReadyRead(msecs)
+
+    def waitForBytesWritten(self, msecs=30000):
+        if self.replayer is not None: return False
+        return super().waitForBytesWritten(msecs)
+
+    def state(self):
+        if self.replayer is not None: return unconnected if self.replayer.finished else connected
+        return super().state()
+
+    def connectToHost(self, *args):
+        if self.replayer is None: super().connectToHost(*args)
+
+    def waitForConnected(self, msecs=30000):
+        if self.replayer is not None: return True
+        return super().waitForConnected(msecs)
+
+    def disconnectFromHost(self):
+        if self.replayer is None: super().disconnectFromHost()
+
+
+socket = tcpsocket()
+
+# Record the server connection of a whole session, e.g. RELAX2_RECORD=scan.rcap python3 Relax2_main.py
+if os.environ.get('RELAX2_RECORD'): socket.record(os.environ['RELAX2_RECORD'])
+atexit.register(socket.stop_capture)
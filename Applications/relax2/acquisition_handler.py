@@ -0,0 +1,174 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Background acquisition
+#   Jobs run in two stages off the GUI thread: the acquisition thread runs the
+#   uploads and readouts one job after the other and hands the finished dataset
+#   to the processing thread, so the reconstruction of one job overlaps the
+#   acquisition of the next. The GUI callbacks of a job are posted back to the
+#   GUI thread with the acquired and done signals. The server socket belongs to
+#   the acquisition thread while jobs are queued, busy tells the GUI when the
+#   parameters and the hardware are in use.
+#
+#   Benchmark: python3 acquisition_handler.py
+#
+################################################################################
+
+import queue
+import threading
+import traceback
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+
+from TCPsocket import socket
+from parameter_handler import params
+
+
+class job:
+    def __init__(self, name, acquire=None, process=None, acquired=None, processed=None):
+        self.name = name
+        self.acquire = acquire # Acquisition thread
+        self.process = process # Processing thread
+        self.acquired = acquired # GUI thread, after the acquisition
+        self.processed = processed # GUI thread, when the job is done (also after an error)
+
+        self.params = None # Parameter copy the processing and processed() run on, None: the global parameters
+        self.data = None
+        self.result = None
+        self.error = None
+
+
+class acquisition_thread(QThread):
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        while True:
+            job = self.worker.jobs.get()
+            self.worker.run_acquisition(job)
+            with self.worker.lock:
+                # Queue empty: the socket goes back to the GUI thread
+                if self.worker.jobs.empty(): socket.moveToThread(self.worker.thread())
+            self.worker.hand_over(job)
+
+
+class acquisition_worker(QObject):
+    acquired = pyqtSignal(object)
+    done = pyqtSignal(object)
+    busy = pyqtSignal(bool)
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.runner = None
+        self.processing = ThreadPoolExecutor(1)
+
+        self.acquired.connect(self.on_acquired)
+        self.done.connect(self.on_done)
+
+    def submit(self, job):
+        # Acquisition and processing (either may be None), in submission order
+        with self.lock:
+            self.start(job)
+            if self.runner is None:
+                self.runner = acquisition_thread(self)
+                self.runner.start()
+            if socket.thread() == QThread.currentThread(): socket.moveToThread(self.runner)
+            self.jobs.put(job)
+        return job
+
+    def process(self, job):
+        # Processing only, next to the acquisitions (e.g. of a protocol task from the acquisition thread)
+        with self.lock: self.start(job)
+        self.processing.submit(self.run_processing, job)
+        return job
+
+    def start(self, job):
+        self.pending += 1
+        if self.pending == 1: self.busy.emit(True)
+
+    def run_acquisition(self, job):
+        if job.acquire is not None:
+            try:
+                job.data = job.acquire()
+            except Exception:
+                traceback.print_exc()
+                job.error = 'Acquisition failed: ' + job.name
+            if job.error is None: self.acquired.emit(job)
+
+    def hand_over(self, job):
+        if job.error is None and job.process is not None: self.processing.submit(self.run_processing, job)
+        else: self.done.emit(job)
+
+    def run_processing(self, job):
+        if job.params is not None: params.bind(job.params)
+        try:
+            job.result = job.process()
+        except Exception:
+            traceback.print_exc()
+            job.error = 'Processing failed: ' + job.name
+        finally:
+            if job.params is not None: params.bind(None)
+        self.done.emit(job)
+
+    def on_acquired(self, job):
+        if job.acquired is not None: job.acquired(job)
+
+    def on_done(self, job):
+        if job.error is not None: print(job.error)
+        if job.processed is not None:
+            if job.params is not None: params.bind(job.params)
+            try:
+                job.processed(job)
+            finally:
+                if job.params is not None: params.bind(None)
+        with self.lock:
+            self.pending -= 1
+            if self.pending == 0: self.busy.emit(False)
+
+    def wait(self):
+        # Blocks (delivering the callbacks) until all jobs are done
+        while self.pending:
+            QCoreApplication.processEvents()
+            QThread.msleep(5)
+
+
+acquisition = acquisition_worker()
+
+
+if __name__ == '__main__':
+    import time
+
+    app = QCoreApplication([])
+    tasks = 6
+    t_acquire = 0.2 # Scan [s]
+    t_process = 0.15 # Reconstruction [s]
+
+    # Former protocol: scan and reconstruction of a task, then the next task
+    t = time.monotonic()
+    for n in range(tasks):
+        time.sleep(t_acquire)
+        time.sleep(t_process)
+    former = time.monotonic() - t
+
+    t = time.monotonic()
+    finished = []
+    def protocol():
+        for n in range(tasks):
+            time.sleep(t_acquire)
+            params.task = n
+            task = job('Task ' + str(n + 1), process=lambda: time.sleep(t_process) or params.task, processed=lambda job: finished.append(job.result))
+            task.params = params.draft()
+            acquisition.process(task)
+    acquisition.submit(job('Protocol', acquire=protocol))
+    acquisition.wait()
+    pipelined = time.monotonic() - t
+
+    print('%d tasks, scan %.0f ms, reconstruction %.0f ms: former %.2f s, pipelined %.2f s (tasks %s)' % \
+          (tasks, t_acquire * 1000, t_process * 1000, former, pipelined, finished))
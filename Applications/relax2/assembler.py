@@ -8,38 +8,42 @@
 #
 #   An assember for the Red Pitaya.
 # 	Generates machine code from code written in the assembly language.
-# 	Outputs two files, out_bin.txt, which contains the commands in binary,
-# 	and out_hex.txt, which contains the commands in hex.
-# 	See sample usage at the bottom (commented out).
+# 	The 64 bit commands are encoded with integer shifts into a numpy array,
+# 	assemble() returns them as bytes (little endian, low word first).
+# 	The machine code file (<sequence>_hex.txt) and assembler.log are
+# 	optional: Assembler(hexfile=True, log=True).
+# 	disassemble() converts machine code back to assembly language.
 # 	Comments must be prefaced by //
 # 	Variables must come first
 # 	Numerical values of variables must be in base 16 (hexadecimal)
 #
+#   Benchmark: python3 assembler.py
+#
 ################################################################################
 
-import pdb # Debugging
 import numpy as np
-import math
 import logging # For errors
-import struct
 
 class Assembler:
-	def __init__(self):
+	cycle = 7e-3 # Clock cycle [µs]
+
+	def __init__(self, hexfile=False, log=False):
 		self.pc = 0
+		# Opcode, format (A: register and address, B: constant), command fields [bit shift]
 		opcode_table = {
-			'NOP' : ['000000'],
-			'DEC' : ['000001', 'A'],
-			'INC' : ['000010', 'A'],
-			'LD64' : ['000100', 'A', 'ADDR'],
-			'TXOFFSET' : ['001000', 'B'],
-			'GRADOFFSET' : ['001001', 'B'],
-			'JNZ' : ['010000', 'A', 'ADDR'],
-			'BTR' : ['010100', 'A'],
-			'RET' : ['010101', 'A'],
-			'J' : ['010111', 'A'],
-			'HALT' : ['011001'],
-			'PI' : ['011100', 'A'],
-			'PR' : ['011101', 'B', 'DELAY']
+			'NOP' : [0b000000],
+			'DEC' : [0b000001, 'A'],
+			'INC' : [0b000010, 'A'],
+			'LD64' : [0b000100, 'A', 'ADDR'],
+			'TXOFFSET' : [0b001000, 'B'],
+			'GRADOFFSET' : [0b001001, 'B'],
+			'JNZ' : [0b010000, 'A', 'ADDR'],
+			'BTR' : [0b010100, 'A'],
+			'RET' : [0b010101, 'A'],
+			'J' : [0b010111, 'A'],
+			'HALT' : [0b011001],
+			'PI' : [0b011100, 'A'],
+			'PR' : [0b011101, 'B', 'DELAY']
 		}
 		bit_table = {
             'TX_PULSE': '0x01',
@@ -52,122 +56,81 @@ class Assembler:
 		self.opcode_table = opcode_table
 		self.bit_table = bit_table
 		self.var_table = {}
+		self.opcodes = {value[0]: key for key, value in opcode_table.items()}
+
+		self.hexfile = hexfile
+		self.log = log
 
 		# Logging
 		self.logger = logging.getLogger()
-		logging.basicConfig(filename = 'assembler.log', filemode = 'w', level = logging.DEBUG)
+		if log: logging.basicConfig(filename = 'assembler.log', filemode = 'w', level = logging.DEBUG)
+
+	def error(self, message):
+		if self.log: logging.error(message, stack_info=True)
+		raise ValueError(message)
 
+	def hex(self, word):
+		try:
+			return int(word, 16) # NOTE: must be in base 16
+		except ValueError:
+			self.error("Invalid hexadecimal number {}".format(word))
 
 	def var_parser(self,line):
-		''' Parses the variables '''
+		''' Parses the variables, returns the 64 bit value '''
 		line = line.replace(' ','') # Remove spaces
 		equals_index = line.find('=') # Get everything to the right of the equals sign
 		cmd = line[equals_index + 1:len(line)]
 		var_name = line[0:equals_index] # name of variable
-		cmds_bit = []
-		cmd_split = cmd.split('|') # Parse bit patterns
+		value = 0
 
-		# Loop over words
-		for word in cmd_split:
-			# Check if the word is hex
+		# Loop over words, a hex number is the value, else the bit patterns are combined
+		for word in cmd.split('|'):
 			if any(str.isdigit(c) for c in word):
-				try:
-					var = format(int(word, 16), 'b') # NOTE: value of var must be in base 16
-					cmd_out = var.zfill(64)
-					# Add entry to var_table
-					self.var_table[var_name] = self.pc # Indexed by address of the variable, for LD64
-					self.pc += 1
-					return cmd_out
-
-				except ValueError:
-					logger.exception("Invalid hexadecimal number {}".format(cmd), stack_info=True)
-
-			else: # Must be a bit pattern
-				cmd_byte = self.bit_table.get(word)
-				# If not in the dictionary, it is an invalid command
-				if not cmd_byte:
-					logging.error("Unknown command {}".format(word), stack_info=True)
-					raise ValueError("Unknown command {}".format(word))
-				cmd_bit = int(cmd_byte, 16) # Convert to bits
-				cmds_bit.append(cmd_bit)
-
-		np_bits = np.array(cmds_bit) # Make numpy array to make bitwise computation easier
-		cmd_out = format(np.bitwise_or.reduce(np_bits), 'b') # String in binary
-		cmd_out = cmd_out.zfill(64) # Zero pad to make it 64 bits
+				value = self.hex(word)
+				break
+			# If not in the dictionary, it is an invalid command
+			if word not in self.bit_table: self.error("Unknown command {}".format(word))
+			value |= int(self.bit_table[word], 16)
+
+		if not 0 <= value < 1 << 64: self.error("Variable {} out of range".format(var_name))
 
 		# Add entry to var_table
 		self.var_table[var_name] = self.pc # Indexed by address of the variable, for LD64
 		self.pc += 1
-		return cmd_out
+		return value
 
 	def make_cmd(self, line):
-		''' Synthesizes the command in binary '''
-		line = line.split(' ') # Remove spaces
+		''' Fields of the command: opcode, register or constant field and its shift, address or delay '''
+		line = line.split(' ')
 		opcode = line[0] # Get the opcode
 
 		# Error checking
 		if opcode not in self.opcode_table.keys():
-			logging.error("Unknown opcode {}".format(opcode), stack_info=True)
-			raise ValueError("Unknown opcode {} on line {}".format(opcode, line))
+			self.error("Unknown opcode {} on line {}".format(opcode, line))
 
-		opcode_bin = self.opcode_table[opcode][0] # Convert to binary from the dict
+		code = self.opcode_table[opcode][0]
 
 		# Cmds without format A or B - NOP and HALT
 		if len(self.opcode_table[opcode]) < 2:
-			remaining_bits = 64 - len(opcode_bin)
-			cmd = opcode_bin + '0'.zfill(remaining_bits)
+			return code, 0, 0, 0
 
-		# Format A
-		elif self.opcode_table[opcode][1] == 'A':
-			reg_addr = format(int(line[1], 10), 'b').zfill(5)
-			#print(reg_addr)
+		# Format A: opcode | register << 32 | address
+		if self.opcode_table[opcode][1] == 'A':
+			self.pc += 1 # Increment pc by 1
 			if opcode == 'LD64' or opcode == 'JNZ': # Reg and addr specified
-				if line[2] in self.var_table.keys():
-					addr = self.var_table[line[2]] # Look up address of variable
-					#print(self.var_table)
-					#print(addr)
-
-				else:
-					try:
-						addr = int(line[2], 16) # Must be in hex
-						#print(addr)
-					except ValueError:
-						logger.exception("Invalid hexadecimal number {}".format(line[2]), stack_info=True)
-
-				dir_addr = format(int(addr), 'b').zfill(32)
-
+				# Look up address of variable, else the address must be in hex
+				addr = self.var_table[line[2]] if line[2] in self.var_table.keys() else self.hex(line[2])
+				return code, int(line[1], 10), 32, addr
 			elif opcode == 'DEC' or opcode == 'INC': # Reg specified
-				dir_addr = '0'.zfill(32)
-
+				return code, int(line[1], 10), 32, 0
 			else: # Addr specified
-				dir_addr = format(int(line[1], 16), 'b').zfill(32)
-				reg_addr = '0'.zfill(5)
+				return code, 0, 32, self.hex(line[1])
 
-			# Make the command
-			remaining_bits = 64 - len(opcode_bin) - len(reg_addr) - len(dir_addr) # Remaining bits
-			remainder = '0'.zfill(remaining_bits)
-			cmd = opcode_bin + remainder + reg_addr + dir_addr
-			self.pc += 1 # Increment pc by 1
-
-		# Format B
-		elif self.opcode_table[opcode][1] == 'B':
-			if opcode == 'PR': # PR
-				conversion_factor = 1/(7e-3) # us to ns, assuming 7ns clock cycle
-				num_cycles = math.floor(int(line[2]) * conversion_factor) # Round down
-				const = format(num_cycles, 'b').zfill(40)
-				reg_addr = format(int(line[1]), 'b')
-				#print(reg_addr)
-				remaining_bits = 64 - len(const) - len(opcode_bin) - len(reg_addr)
-				remainder = '0'.zfill(remaining_bits)
-				cmd = opcode_bin + remainder + reg_addr + const
-				#print(cmd)
-			else: # TXOFFSET and GRADOFFSET
-				# const = format(int(line[1], 16), 'b').zfill(40)
-				const = format(int(line[1], 10), 'b').zfill(40)
-				remaining_bits = 64 - len(const) - len(opcode_bin)
-				remainder = '0'.zfill(remaining_bits)
-				cmd = opcode_bin + remainder + const
-		return cmd
+		# Format B: PR opcode | register << 40 | delay [µs] (clock cycles in encode)
+		if opcode == 'PR':
+			return code, int(line[1]), 40, int(line[2])
+		# TXOFFSET and GRADOFFSET: opcode | constant
+		return code, 0, 0, int(line[1], 10)
 
 	def strip_lines(self, line):
 		''' Takes a sequence of lines and strip comments and commas '''
@@ -177,104 +140,166 @@ class Assembler:
 		if comment_index >= 0:
 			line = line[:comment_index]
 			line = line.strip()
-		#print(line)
 		return line
 
-	def assemble(self, inp_file):
-		''' Converts an input txt file to binary and outputs a text file '''
-		# Open the file
-		f = open(inp_file)
-		self.logger.info("Opening file")
-		lines = f.readlines()
-
-    	# Parse the lines
-		cmds = []
-		hex_cmds = []
-		line_ctr = 1
-		for line in lines:
+	def encode(self, lines):
+		''' Machine code of the lines, numpy uint32 array (low, high word of every command) '''
+		self.pc = 0
+		self.var_table = {}
+		fields = []
+		for n, line in enumerate(lines):
 			line_stripped = self.strip_lines(line)
-			self.logger.info("Line {0} stripped = {1}".format(line_ctr, line_stripped))
+			if self.log: self.logger.info("Line {0} stripped = {1}".format(n + 1, line_stripped))
     		# If line contains '=', call the var parser
 			if '=' in line_stripped:
-				cmd = self.var_parser(line_stripped)
+				value = self.var_parser(line_stripped)
+				fields.append((value >> 58, 0, 0, value & ((1 << 58) - 1)))
 			else:
-				cmd = self.make_cmd(line_stripped)
-
-			# Cut the line in half to convert to byte array, otherwise it is too large
-			half_len = int(len(cmd)/2)
-			cmd1 = cmd[0:half_len]
-			cmd2 = cmd[half_len:len(cmd)]
-
-			# Put hex command in log, for debugging
-			# hex_cmd = hex(int(cmd,2))
-			hex_cmd1 = hex(int(cmd1,2))
-			hex_cmd2 = hex(int(cmd2,2))
-			# self.logger.info("Hex cmd = {}".format(hex_cmd))
-			cmds.append(cmd) # Append the command to an array
-			# hex_cmds.append(hex_cmd)
-			# Reorder them
-			hex_cmds.append(hex_cmd2)
-			hex_cmds.append(hex_cmd1)
-			line_ctr += 1
+				fields.append(self.make_cmd(line_stripped))
 
-			self.logger.info("Hex cmd1 = {}\n".format(hex_cmd1))
-			self.logger.info("Hex cmd2 = {}\n".format(hex_cmd2))
+		opcode, register, shift, value = (np.array(field, dtype=np.int64) for field in zip(*fields)) if fields else [np.zeros(0, dtype=np.int64)] * 4
 
+		# PR delays [µs] to clock cycles, rounded down
+		delay = shift == 40
+		value[delay] = np.floor(value[delay] * (1 / self.cycle)).astype(np.int64)
 
-		# Make a byte array of hex commands
-		# hex_cmd = format(int(hex_cmd,16),'x') # remove the 0x at the beginning
+		limit = np.where(shift == 0, 1 << 58, 1 << np.maximum(shift, 0))
+		if np.any(value >= limit) or np.any(value < 0) or np.any(register >= 1 << (58 - shift)) or np.any(register < 0):
+			n = int(np.flatnonzero((value >= limit) | (value < 0) | (register >= 1 << (58 - shift)) | (register < 0))[0])
+			self.error("Field out of range on line {}: {}".format(n + 1, lines[n].strip()))
 
+		words = (opcode.astype('<u8') << np.uint64(58)) | (register.astype('<u8') << shift.astype('<u8')) | value.astype('<u8')
+		program = words.view('<u4')
 
-		hex_ints = [int(hex_cmd, 16) for hex_cmd in hex_cmds]
-		self.logger.info("Hex ints = {}\n".format(hex_ints))
+		if self.log:
+			for n in range(words.shape[0]): self.logger.info("Hex cmd = {}\n".format(hex(int(words[n]))))
+		return program
 
-		# Convert to byte array
-		b = bytes()
-		hex_bytes = [struct.pack('<I', hex_int) for hex_int in hex_ints]
-		b = b.join(hex_bytes)
-
-		# Logging
-		self.logger.info("Hex bytes = {}\n".format(hex_bytes))
-		self.logger.info("Length of hex bytes = {}\n".format(len(hex_bytes)))
-		self.logger.info("b = {}".format(b))
-		self.logger.info("Length of byte array = {}".format(len(b)))
-
-		# # Binary file
-		# with open('out_bin.txt', "w") as out_file:
-		# 	[out_file.write("{}\n".format(cmd)) for cmd in cmds]
-        #
-		# # Hex file
-		# with open('out_hex.txt', "w") as out_file:
-		# 	[out_file.write("{}\n".format(hex_cmd)) for hex_cmd in hex_cmds]
-		# self.logger.info('Done')
-
-		# Machine code file
-		output_filename = inp_file[0:-4] + '_hex.txt'
-		with open(output_filename, "w") as out_file:
-			idx = 0
-			for hex_cmd in hex_cmds:
-				# # for generating only machine cmd
-				# if idx%2: # odd idx, even row num
-				# 	out_file.write("pulseq_memory[{}] = {};\n\n".format(idx, hex_cmd))
-				# else: # even idx, odd row num
-				# 	out_file.write("pulseq_memory[{}] = {}; \n".format( idx, hex_cmd))
-
-				# for generating readable machine code
-				if idx%2: # odd idx, even row num
-					out_file.write("\tpulseq_memory[{}] = {}\n\n".format(idx, hex_cmd))
-				else: # even idx, odd row num
-					out_file.write("A[{}]\tpulseq_memory[{}] = {} \n".format( hex(int(idx/2)),
-								   idx, hex_cmd))
-				idx += 1
-
-		f.close()
-		return b
+	def assemble(self, inp_file):
+		''' Converts an input txt file to machine code (bytes) '''
+		with open(inp_file) as f:
+			if self.log: self.logger.info("Opening file")
+			lines = f.readlines()
+
+		program = self.encode(lines)
+		if self.log: self.logger.info("Length of byte array = {}".format(program.nbytes))
+
+		# Machine code file, readable
+		if self.hexfile:
+			output_filename = inp_file[0:-4] + '_hex.txt'
+			with open(output_filename, "w") as out_file:
+				for idx, hex_cmd in enumerate(program):
+					if idx%2: # odd idx, even row num
+						out_file.write("\tpulseq_memory[{}] = {}\n\n".format(idx, hex(int(hex_cmd))))
+					else: # even idx, odd row num
+						out_file.write("A[{}]\tpulseq_memory[{}] = {} \n".format(hex(int(idx/2)), idx, hex(int(hex_cmd))))
+
+		return program.tobytes()
+
+	def disassemble(self, program):
+		''' Converts machine code (bytes or uint32 array) back to assembly language lines. Words that are no
+		valid command (variables) are given as variables V<address> = 0x... '''
+		words = np.frombuffer(bytes(program), dtype='<u8') if not isinstance(program, np.ndarray) else program.view('<u8')
+		lines = []
+		for n, word in enumerate(int(word) for word in words):
+			opcode = self.opcodes.get(word >> 58)
+			register = (word >> 32) & ((1 << 26) - 1)
+			address = word & ((1 << 32) - 1)
+			line = None
+			if opcode is None: pass
+			elif len(self.opcode_table[opcode]) < 2:
+				if word & ((1 << 58) - 1) == 0: line = opcode
+			elif opcode == 'LD64' or opcode == 'JNZ':
+				line = '{} {}, {}'.format(opcode, register, hex(address))
+			elif opcode == 'DEC' or opcode == 'INC':
+				if address == 0: line = '{} {}'.format(opcode, register)
+			elif self.opcode_table[opcode][1] == 'A':
+				if register == 0: line = '{} {}'.format(opcode, hex(address))
+			elif opcode == 'PR':
+				# Smallest delay [µs] with these clock cycles
+				cycles = word & ((1 << 40) - 1)
+				delay = int(cycles * self.cycle)
+				while int(np.floor(delay * (1 / self.cycle))) < cycles: delay += 1
+				if int(np.floor(delay * (1 / self.cycle))) == cycles: line = 'PR {}, {}'.format(word >> 40 & ((1 << 18) - 1), delay)
+			elif word >> 40 & ((1 << 18) - 1) == 0:
+				line = '{} {}'.format(opcode, word & ((1 << 40) - 1))
+			lines.append(line if line is not None else 'V{} = {}'.format(n, hex(word)))
+		return lines
 
 assembler = Assembler()
 
-# Sample usage
+# Benchmark
 if __name__ == "__main__":
-	a = Assembler()
-	inp_file = 'sequence/basic/se_default.txt'
-	hex_bytes = a.assemble(inp_file)
-	#print("Hex bytes = {}\n".format(hex_bytes))
+	import glob
+	import math
+	import os
+	import struct
+	import tempfile
+	import time
+
+	def reference(lines):
+		# Former string encoder: binary strings per command, split in half, converted with hex() and int()
+		table = {key: format(value[0], '06b') for key, value in assembler.opcode_table.items()}
+		variables = {}
+		pc = 0
+		hex_cmds = []
+		for line in lines:
+			line = assembler.strip_lines(line)
+			if '=' in line:
+				line = line.replace(' ', '')
+				value = 0
+				for word in line[line.find('=') + 1:].split('|'):
+					if any(str.isdigit(c) for c in word):
+						value = int(word, 16)
+						break
+					value |= int(assembler.bit_table[word], 16)
+				cmd = format(value, 'b').zfill(64)
+				variables[line[:line.find('=')]] = pc
+				pc += 1
+			else:
+				line = line.split(' ')
+				op = assembler.opcode_table[line[0]]
+				if len(op) < 2: cmd = table[line[0]] + '0'.zfill(58)
+				elif op[1] == 'A':
+					if line[0] in ('LD64', 'JNZ'):
+						addr = variables[line[2]] if line[2] in variables else int(line[2], 16)
+						reg, addr = format(int(line[1]), 'b').zfill(5), format(addr, 'b').zfill(32)
+					elif line[0] in ('DEC', 'INC'): reg, addr = format(int(line[1]), 'b').zfill(5), '0'.zfill(32)
+					else: reg, addr = '0'.zfill(5), format(int(line[1], 16), 'b').zfill(32)
+					cmd = table[line[0]] + '0'.zfill(64 - 6 - len(reg) - len(addr)) + reg + addr
+					pc += 1
+				elif line[0] == 'PR':
+					const = format(math.floor(int(line[2]) * (1/(7e-3))), 'b').zfill(40)
+					reg = format(int(line[1]), 'b')
+					cmd = table[line[0]] + '0'.zfill(64 - 40 - 6 - len(reg)) + reg + const
+				else: cmd = table[line[0]] + '0'.zfill(18) + format(int(line[1], 10), 'b').zfill(40)
+			hex_cmds += [hex(int(cmd[32:], 2)), hex(int(cmd[:32], 2))]
+		return b''.join(struct.pack('<I', int(hex_cmd, 16)) for hex_cmd in hex_cmds)
+
+	filenames = [f for f in glob.glob('sequences/**/*.txt', recursive=True) if not f.endswith('_hex.txt')]
+	folder = tempfile.mkdtemp()
+	for filename in filenames:
+		with open(filename) as f:
+			lines = f.readlines()
+		program = Assembler().encode(lines).tobytes()
+		if program != reference(lines): print('Differs:', filename)
+		copy = os.path.join(folder, 'copy.txt')
+		with open(copy, 'w') as f:
+			f.write('\n'.join(Assembler().disassemble(program)))
+		if Assembler().assemble(copy) != program: print('Disassembly differs:', filename)
+
+	for name in ('2D_TSE_Gs', '2D_EPI'):
+		with open('sequences/imaging/%s.txt' % name) as f:
+			lines = f.readlines()
+		# Large program: the commands repeated after the variables
+		first = next(n for n, line in enumerate(lines) if '=' not in assembler.strip_lines(line))
+		for repeat in (1, 100):
+			large = lines[:first] + lines[first:] * repeat
+			t = time.perf_counter()
+			expected = reference(large)
+			t_reference = time.perf_counter() - t
+			t = time.perf_counter()
+			program = Assembler().encode(large)
+			t_encode = time.perf_counter() - t
+			print('%-10s %6d commands: strings %7.4f s   integer %7.4f s (x%.1f, identical: %s)' % \
+				  (name, len(large), t_reference, t_encode, t_reference / t_encode, program.tobytes() == expected))
@@ -0,0 +1,177 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Filtered back-projection of angled projections (projection reconstruction)
+#   The projections (angles x samples, real profiles) are ramp filtered with
+#   rfft (Ram-Lak kernel, Hann window) and back-projected with a sinogram to
+#   image interpolation matrix (linear interpolation), planned once per
+#   geometry (angles, samples, image size, samples per pixel).
+#   order() gives a bit reversed angle order for sweeps, every part of the
+#   sweep covers the half circle evenly.
+#
+#   Incremental mode: start(), add() per projection, image() at any time. The
+#   image is low-pass filtered to the resolution the acquired angles support,
+#   so a coarse image appears after a few angles and sharpens with the sweep.
+#
+#   Benchmark: python3 backprojection_handler.py
+#
+################################################################################
+
+import math
+
+import numpy as np
+
+from scipy import sparse
+
+
+class backprojection:
+    def __init__(self):
+        self.plans = {}
+        self.keep = 4
+        self.filters = {}
+
+        # Incremental back-projection
+        self.sum = None
+        self.count = 0
+        self.samples = 0
+        self.size = 0
+        self.scale = 1
+
+    def ramp(self, samples):
+        # Frequency response of the spatial Ram-Lak kernel (no DC offset) with a Hann window,
+        # zero padded to at least twice the projection length against wrap around
+        if samples not in self.filters:
+            n = 1 << int(math.ceil(math.log2(2 * samples)))
+            k = np.arange(n)
+            k = np.minimum(k, n - k)
+            h = np.zeros(n)
+            h[0] = 0.25
+            h[k % 2 == 1] = -1 / (math.pi * k[k % 2 == 1]) ** 2
+            H = np.real(np.fft.rfft(h))
+            H *= 0.5 + 0.5 * np.cos(math.pi * np.arange(H.shape[0]) / (H.shape[0] - 1))
+            self.filters[samples] = (n, H)
+        return self.filters[samples]
+
+    def filter(self, projections):
+        # projections: (angles x) samples
+        projections = np.asarray(projections, dtype=np.float64)
+        n, H = self.ramp(projections.shape[-1])
+        return np.fft.irfft(np.fft.rfft(projections, n=n, axis=-1) * H, n=n, axis=-1)[..., :projections.shape[-1]]
+
+    def line(self, angles, samples, size, scale):
+        # Projection sample index and weight of every image pixel per angle, pixels x angles (pixel distance
+        # to the centre along the projection direction, in samples). Pixels outside the projection read the
+        # zero padding at index samples.
+        c = (np.arange(size) - size // 2).astype(np.float32)
+        cos = np.cos(np.atleast_1d(angles)).astype(np.float32)
+        sin = np.sin(np.atleast_1d(angles)).astype(np.float32)
+        s = ((c[np.newaxis, :, np.newaxis] * cos + c[:, np.newaxis, np.newaxis] * sin) * scale + samples // 2).reshape(size * size, -1)
+        i = np.floor(s).astype(np.int32)
+        w = s - i
+        outside = (i < 0) | (i >= samples - 1)
+        i[outside] = samples
+        w[outside] = 0
+        return i, w
+
+    def plan(self, angles, samples, size, scale=1):
+        # Sparse interpolation matrix, image pixels x padded sinogram (angles * (samples + 2)),
+        # every pixel row holds the two neighbouring samples of each angle
+        key = (tuple(np.round(angles, 6)), samples, size, scale)
+        if key not in self.plans:
+            if len(self.plans) >= self.keep: self.plans.pop(next(iter(self.plans)))
+            i, w = self.line(angles, samples, size, scale)
+            i += np.arange(len(angles), dtype=np.int32) * (samples + 2)
+            indices = np.stack((i, i + 1), axis=-1).ravel()
+            weights = np.stack((1 - w, w), axis=-1).ravel()
+            pointers = np.arange(0, indices.shape[0] + 1, 2 * len(angles))
+            self.plans[key] = sparse.csr_matrix((weights, indices, pointers), shape=(size * size, len(angles) * (samples + 2)))
+        return self.plans[key]
+
+    def pad(self, filtered):
+        # Two zero samples after every projection for the pixels outside
+        return np.concatenate((filtered, np.zeros(filtered.shape[:-1] + (2,))), axis=-1)
+
+    def reconstruct(self, projections, angles, size, scale=1):
+        # projections: angles x samples, angles [rad] over 180° (or 360°), size x size image
+        projections = np.asarray(projections)
+        P = self.plan(angles, projections.shape[1], size, scale)
+        image = P @ self.pad(self.filter(projections)).ravel().astype(np.float32)
+        return (image * math.pi / len(angles)).reshape(size, size)
+
+    def order(self, count):
+        # Bit reversed acquisition order of count angles, every prefix covers the half circle evenly
+        bits = max(1, int(math.ceil(math.log2(max(count, 2)))))
+        reversed = [int(format(n, '0%db' % bits)[::-1], 2) for n in range(1 << bits)]
+        return np.array([n for n in reversed if n < count])
+
+    def start(self, samples, size, scale=1):
+        self.sum = np.zeros(size * size)
+        self.count = 0
+        self.samples = samples
+        self.size = size
+        self.scale = scale
+
+    def add(self, angle, projection):
+        i, w = self.line(angle, self.samples, self.size, self.scale)
+        p = self.pad(self.filter(projection))
+        self.sum += p[i[:, 0]] + (p[i[:, 0] + 1] - p[i[:, 0]]) * w[:, 0]
+        self.count += 1
+
+    def image(self, lowpass=True):
+        # Current back-projection. Without full angular sampling (pi/2 * size angles over 180°) the streaks
+        # are suppressed by a Hann low-pass at the supported fraction of the resolution.
+        if self.count == 0: return np.zeros((self.size, self.size))
+        image = (self.sum * math.pi / self.count).reshape(self.size, self.size)
+        cutoff = min(1, 2 * self.count / (math.pi * self.size))
+        if not lowpass or cutoff >= 1: return image
+        f = np.fft.fftfreq(self.size) * 2
+        r = np.sqrt(f[:, np.newaxis] ** 2 + f[np.newaxis, :] ** 2) / cutoff
+        window = np.where(r < 1, 0.5 + 0.5 * np.cos(math.pi * np.minimum(r, 1)), 0)
+        return np.real(np.fft.ifft2(np.fft.fft2(image) * window))
+
+
+bp = backprojection()
+
+
+if __name__ == '__main__':
+    import time
+
+    def phantom(angles, samples, size):
+        # Discs (centre row, centre column, radius, intensity) in pixels, analytic projections (chord lengths)
+        discs = [(0, 0, 0.35 * size, 1.0), (0.1 * size, -0.1 * size, 0.1 * size, -0.5), (-0.12 * size, 0.08 * size, 0.06 * size, 0.5)]
+        c = np.arange(size) - size // 2
+        image = np.zeros((size, size))
+        projections = np.zeros((len(angles), samples))
+        s = np.arange(samples) - samples // 2
+        for cy, cx, R, value in discs:
+            image[(c[:, np.newaxis] - cy) ** 2 + (c[np.newaxis, :] - cx) ** 2 < R ** 2] += value
+            d = s[np.newaxis, :] - (cx * np.cos(angles) + cy * np.sin(angles))[:, np.newaxis]
+            projections += value * 2 * np.sqrt(np.maximum(R ** 2 - d ** 2, 0))
+        return projections, image
+
+    def error(image, reference):
+        return np.linalg.norm(image - reference) / np.linalg.norm(reference)
+
+    for size in (64, 128, 256):
+        angles = np.radians(np.arange(0, 180, 180 / int(math.pi / 2 * size)))
+        projections, reference = phantom(angles, size, size)
+
+        bp.plans.clear()
+        t = time.perf_counter()
+        image = bp.reconstruct(projections, angles, size)
+        t_plan = time.perf_counter() - t
+        t = time.perf_counter()
+        image = bp.reconstruct(projections, angles, size)
+        t_batch = time.perf_counter() - t
+
+        t = time.perf_counter()
+        bp.start(size, size)
+        steps = []
+        for k, n in enumerate(bp.order(len(angles))):
+            bp.add(angles[n], projections[n])
+            if k + 1 in (4, 16, len(angles) // 4): steps.append('%d: %.3f' % (k + 1, error(bp.image(), reference)))
+        t_incremental = time.perf_counter() - t
+
+        print('%3d x %3d, %3d angles: batch %6.3f s (plan %6.3f s, error %.3f)   incremental %6.3f s (error after %s)' % \
+              (size, size, len(angles), t_batch, t_plan, error(image, reference), t_incremental, ', '.join(steps)))
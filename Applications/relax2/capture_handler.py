@@ -0,0 +1,218 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Capture files of the server connection (.rcap)
+#   Records everything sent to and received from the server during a scan and
+#   replays it through the unchanged acquisition and processing code.
+#
+#   File layout: 8 byte magic, then records of
+#       kind (1 byte), time since start [s] (float64), length (uint32), payload
+#   kinds: H header (JSON), P parameters.pkl, C command words, U sequence upload,
+#          R bytes received from the server
+#
+#   Record during a real scan:  RELAX2_RECORD=scan.rcap python3 Relax2_main.py
+#   Replay benchmark:           python3 capture_handler.py scan.rcap acquire_image_GRE --process image_process
+#
+################################################################################
+
+import json
+import struct
+import time
+
+from datetime import datetime
+
+import numpy as np
+
+MAGIC = b'RLXCAP\x01\x00'
+RECORD = struct.Struct('<cdI')
+
+
+class capture_writer:
+    def __init__(self, path, header=None, parameters=None):
+        self.path = path
+        self.file = open(path, 'wb', buffering=1 << 20)
+        self.file.write(MAGIC)
+        self.t0 = time.perf_counter()
+
+        header = dict(header or {})
+        header.setdefault('Created', datetime.now().strftime('%m/%d/%Y, %H:%M:%S'))
+        self.record(b'H', json.dumps(header).encode())
+        if parameters is not None: self.record(b'P', parameters)
+
+    def record(self, kind, data):
+        self.file.write(RECORD.pack(kind, time.perf_counter() - self.t0, len(data)))
+        self.file.write(data)
+
+    def sent(self, data):
+        # 10 x uint32 command words, every other write is a sequence upload
+        self.record(b'C' if len(data) == 40 else b'U', data)
+
+    def received(self, data):
+        if len(data) > 0: self.record(b'R', data)
+
+    def close(self):
+        self.file.close()
+        print('Capture saved: ', self.path)
+
+
+class capture_reader:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            blob = file.read()
+        if blob[:len(MAGIC)] != MAGIC:
+            raise ValueError(path + ' is not a relax2 capture file')
+
+        self.header = {}
+        self.parameters = None
+        sent = []
+        received = []
+        # Per record: bytes received and sent up to and including it, and its timestamp
+        events = []
+        sent_count = 0
+        received_count = 0
+
+        pos = len(MAGIC)
+        while pos < len(blob):
+            kind, t, length = RECORD.unpack_from(blob, pos)
+            pos += RECORD.size
+            data = blob[pos:pos + length]
+            pos += length
+            if kind == b'H': self.header = json.loads(data.decode())
+            elif kind == b'P': self.parameters = data
+            elif kind in (b'C', b'U'):
+                sent.append(data)
+                sent_count += length
+                events.append((received_count, sent_count, t))
+            elif kind == b'R':
+                received.append(data)
+                received_count += length
+                events.append((received_count, sent_count, t))
+
+        self.sent = b''.join(sent)
+        self.received = b''.join(received)
+        self.events = events
+
+    def frames(self, samples=50000):
+        # All received data as complex64 frames of one readout each
+        count = len(self.received) // (8 * samples)
+        return np.frombuffer(self.received, np.complex64, count * samples).reshape(count, samples)
+
+
+class capture_replay:
+    def __init__(self, path, realtime=False):
+        self.capture = capture_reader(path)
+        self.realtime = realtime
+        self.sent = 0
+        self.pos = 0
+        self.available = 0
+        self.event = 0
+        self.mismatch = False
+        self.finished = False
+        # Time of the last sent record in the capture and in the replay, for realtime pacing
+        self.t_capture = 0
+        self.t_replay = time.perf_counter()
+
+    def write(self, data):
+        data = bytes(data)
+        expected = self.capture.sent[self.sent:self.sent + len(data)]
+        if expected != data and not self.mismatch:
+            print('Replay: sent data differs from capture at byte', self.sent)
+            self.mismatch = True
+        self.sent += len(data)
+        self.release()
+        return len(data)
+
+    def release(self):
+        # Make received data available once everything sent before it was sent again
+        now = time.perf_counter()
+        while self.event < len(self.capture.events):
+            end, sent, t = self.capture.events[self.event]
+            if sent > self.sent: break
+            if end == self.available:
+                # Sent by the client, received data after it is paced from here
+                self.t_capture = t
+                self.t_replay = now
+            elif self.realtime and t - self.t_capture > now - self.t_replay: break
+            self.available = end
+            self.event += 1
+
+    def next_release(self):
+        # Seconds until the next received data is due, None if the client has to send first
+        if self.event >= len(self.capture.events): return None
+        end, sent, t = self.capture.events[self.event]
+        if sent > self.sent: return None
+        return max(0, (t - self.t_capture) - (time.perf_counter() - self.t_replay))
+
+    def bytesAvailable(self):
+        self.release()
+        return self.available - self.pos
+
+    def read(self, maxlen):
+        self.release()
+        data = self.capture.received[self.pos:min(self.pos + maxlen, self.available)]
+        self.pos += len(data)
+        return data
+
+    def waitForReadyRead(self, msecs):
+        if self.bytesAvailable() > 0: return True
+        delay = self.next_release()
+        if delay is None:
+            if not self.finished:
+                if self.event >= len(self.capture.events): print('Replay: end of capture reached!')
+                else: print('Replay: capture expects data that was not sent!')
+            self.finished = True
+            return False
+        if delay * 1000 > msecs:
+            time.sleep(msecs / 1000)
+            return False
+        time.sleep(delay)
+        return self.bytesAvailable() > 0
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import tempfile
+
+    from PyQt5.QtWidgets import QApplication
+
+    parser = argparse.ArgumentParser(description='Replay a relax2 capture through the acquisition and processing code.')
+    parser.add_argument('capture', help='.rcap file')
+    parser.add_argument('acquire', help='sequence method, e.g. acquire_image_GRE')
+    parser.add_argument('--process', default=None, help='process method, e.g. image_process')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--realtime', action='store_true', help='reproduce the recorded timing instead of wire speed')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    from TCPsocket import socket
+    from parameter_handler import params
+    from sequence_handler import seq
+    from process_handler import proc
+
+    replay = capture_reader(args.capture)
+    outdir = tempfile.mkdtemp()
+    if replay.parameters is not None:
+        with open(os.path.join(outdir, 'parameters.pkl'), 'wb') as file:
+            file.write(replay.parameters)
+        params.loadParam(os.path.join(outdir, 'parameters.pkl'))
+    params.measurement_time_dialog = 0
+    params.datapath = os.path.join(outdir, 'replay')
+
+    times = []
+    for n in range(args.repeat):
+        socket.replay(args.capture, realtime=args.realtime)
+        seq.initVariables()
+        t = time.perf_counter()
+        getattr(seq, args.acquire)()
+        t_acquire = time.perf_counter() - t
+        if args.process is not None: getattr(proc, args.process)()
+        times.append((t_acquire, time.perf_counter() - t))
+        socket.stop_capture()
+
+    times = np.array(times)
+    print('Replay of', os.path.basename(args.capture), ':', len(replay.received) // 8, 'Samples received')
+    print('Acquisition [s]: mean %.4f, min %.4f' % (times[:, 0].mean(), times[:, 0].min()))
+    print('Acquisition + processing [s]: mean %.4f, min %.4f' % (times[:, 1].mean(), times[:, 1].min()))
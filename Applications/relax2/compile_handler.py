@@ -0,0 +1,112 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Cache of the assembled sequence programs
+#   Programs are keyed by a hash of the sequence source (and of the assembler),
+#   kept in an in-memory LRU and on disk in sequences/compiled. Unchanged
+#   sequences are not assembled again.
+#
+#   Benchmark: python3 compile_handler.py
+#
+################################################################################
+
+import hashlib
+import os
+
+from collections import OrderedDict
+
+from assembler import Assembler
+
+
+class program_cache:
+    def __init__(self):
+        self.memory = OrderedDict()
+        self.keep = 32
+        self.folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sequences', 'compiled')
+
+        # A changed assembler invalidates every cached program
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assembler.py'), 'rb') as file:
+            self.version = hashlib.sha1(file.read()).hexdigest()[:16]
+
+        self.assembled = 0
+        self.disk_hits = 0
+        self.memory_hits = 0
+
+    def key(self, source):
+        return hashlib.sha1(self.version.encode() + source).hexdigest()
+
+    def compile(self, filename):
+        # Key and machine code of a sequence file
+        with open(filename, 'rb') as file:
+            key = self.key(file.read())
+
+        program = self.memory.pop(key, None)
+        if program is not None: self.memory_hits += 1
+        else:
+            program = self.read(key)
+            if program is not None: self.disk_hits += 1
+            else:
+                program = Assembler().assemble(filename)
+                self.assembled += 1
+                self.write(key, program)
+
+        self.memory[key] = program
+        while len(self.memory) > self.keep: self.memory.popitem(last=False)
+        return key, program
+
+    def read(self, key):
+        try:
+            with open(os.path.join(self.folder, key + '.bin'), 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def write(self, key, program):
+        # Written next to the target and renamed, a read never sees a partial program
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(os.path.join(self.folder, key + '.bin.tmp'), 'wb') as file:
+                file.write(program)
+            os.replace(os.path.join(self.folder, key + '.bin.tmp'), os.path.join(self.folder, key + '.bin'))
+        except OSError as e:
+            print('Could not cache sequence program:', e)
+
+    def clear(self):
+        self.memory.clear()
+        if os.path.isdir(self.folder):
+            for name in os.listdir(self.folder):
+                if name.endswith('.bin'): os.remove(os.path.join(self.folder, name))
+
+
+programs = program_cache()
+
+
+if __name__ == '__main__':
+    import glob
+    import time
+
+    filenames = sorted(f for f in glob.glob('sequences/**/*.txt', recursive=True) if not f.endswith('_hex.txt'))
+
+    t = time.perf_counter()
+    for filename in filenames: Assembler().assemble(filename)
+    t_assembler = time.perf_counter() - t
+
+    programs.clear()
+    t = time.perf_counter()
+    for filename in filenames: programs.compile(filename)
+    t_first = time.perf_counter() - t
+
+    programs.memory.clear()
+    t = time.perf_counter()
+    for filename in filenames: programs.compile(filename)
+    t_disk = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for filename in filenames: programs.compile(filename)
+    t_memory = time.perf_counter() - t
+
+    print('%d sequences: assembler %.3f s   cache: first %.3f s, disk %.4f s, memory %.4f s' % \
+          (len(filenames), t_assembler, t_first, t_disk, t_memory))
+    for filename in filenames:
+        if programs.compile(filename)[1] != Assembler().assemble(filename): print('Differs:', filename)
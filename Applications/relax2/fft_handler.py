@@ -0,0 +1,113 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Centred FFTs for the reconstruction, fftshift(fft(fftshift(x)))
+#   complex64 data stays complex64, scipy.fft runs multithreaded if available.
+#   For even axis lengths both shifts are done with (-1)^n sign ramps which are
+#   cached per shape, odd lengths fall back to index rolls.
+#
+#   Benchmark: python3 fft_handler.py
+#
+################################################################################
+
+import os
+
+import numpy as np
+
+try:
+    import scipy.fft as backend
+except ImportError:
+    backend = None
+
+
+class fft_handler:
+    def __init__(self):
+        self.workers = os.cpu_count() or 1
+        self.ramps = {}
+
+    def fft(self, x, n=None, norm=None, out=None):
+        # 1D along the last axis, zero padding or cropping to n after the input shift like np.fft.fft
+        x = self.prepare(x)
+        if n is not None and n != x.shape[-1]:
+            x = np.fft.fftshift(x, axes=-1)
+            return self.store(np.fft.fftshift(self.transform(x, (-1,), norm, n), axes=-1), out)
+        return self.centred(x, (x.ndim - 1,), norm, out)
+
+    def fft2(self, x, norm=None, out=None):
+        x = self.prepare(x)
+        return self.centred(x, (x.ndim - 2, x.ndim - 1), norm, out)
+
+    def fftn(self, x, norm=None, out=None):
+        x = self.prepare(x)
+        return self.centred(x, tuple(range(x.ndim)), norm, out)
+
+    def prepare(self, x):
+        # Plain arrays (no np.matrix), real data becomes complex64, complex128 is kept
+        x = np.asarray(x)
+        if x.dtype != np.complex64 and x.dtype != np.complex128: x = x.astype(np.complex64)
+        return x
+
+    def centred(self, x, axes, norm, out=None):
+        if any(x.shape[axis] % 2 for axis in axes):
+            x = np.fft.fftshift(x, axes=axes)
+            return self.store(np.fft.fftshift(self.transform(x, axes, norm), axes=axes), out)
+
+        # fftshift(F(fftshift(x))) = s * c * F(c * x), c = (-1)^index along the axes, s = (-1)^(N/2)
+        # With an out array of the input shape and dtype the transform runs in place in it
+        ramp_in, ramp_out = self.ramp(x.shape, axes, x.real.dtype)
+        if out is not None and out.shape == x.shape and out.dtype == x.dtype and out.flags.c_contiguous:
+            X = self.store(self.transform(np.multiply(x, ramp_in, out=out), axes, norm, overwrite=True), out)
+        else:
+            X = self.store(self.transform(x * ramp_in, axes, norm, overwrite=True), out)
+        X *= ramp_out
+        return X
+
+    def store(self, X, out):
+        if out is None or X is out: return X
+        out[...] = X
+        return out
+
+    def ramp(self, shape, axes, dtype):
+        key = (shape, axes, dtype)
+        if key not in self.ramps:
+            ramp = np.ones([shape[axis] if axis in axes else 1 for axis in range(len(shape))], dtype=dtype)
+            sign = 1
+            for axis in axes:
+                index = [1] * len(shape)
+                index[axis] = shape[axis]
+                ramp = ramp * (1 - 2 * (np.arange(shape[axis]) % 2)).reshape(index).astype(dtype)
+                if (shape[axis] // 2) % 2: sign = -sign
+            self.ramps[key] = (ramp, sign * ramp)
+        return self.ramps[key]
+
+    def transform(self, x, axes, norm, n=None, overwrite=False):
+        if backend is not None:
+            if n is not None: return backend.fft(x, n=n, axis=axes[0], norm=norm, workers=self.workers)
+            return backend.fftn(x, axes=axes, norm=norm, workers=self.workers, overwrite_x=overwrite)
+        if n is not None: return np.fft.fft(x, n=n, axis=axes[0], norm=norm).astype(x.dtype, copy=False)
+        return np.fft.fftn(x, axes=axes, norm=norm).astype(x.dtype, copy=False)
+
+
+ft = fft_handler()
+
+
+if __name__ == '__main__':
+    import time
+
+    def timeit(function, x, repeat=5):
+        function(x)
+        t = time.perf_counter()
+        for n in range(repeat): function(x)
+        return (time.perf_counter() - t) / repeat
+
+    print('scipy.fft:', backend is not None, ' workers:', ft.workers)
+    rng = np.random.default_rng()
+    for shape in [(1500,), (64, 1500), (256, 2500), (16, 64, 1500), (32, 128, 2000), (31, 64, 1500)]:
+        x = (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)).astype(np.complex64)
+        reference = lambda x: np.fft.fftshift(np.fft.fftn(np.fft.fftshift(x)))
+        t_numpy = timeit(reference, x)
+        t_ft = timeit(ft.fftn, x)
+        error = np.max(np.abs(ft.fftn(x) - reference(x))) / np.max(np.abs(reference(x)))
+        print('%-16s numpy %8.2f ms   fft_handler %8.2f ms   x%5.1f   rel. error %.1e' % \
+              (str(shape), t_numpy * 1000, t_ft * 1000, t_numpy / t_ft, error))
@@ -0,0 +1,171 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Gridding reconstruction (NUFFT) of the radial sequences
+#   The raw spokes (angles x readout samples) are interpolated onto a two times
+#   oversampled Cartesian grid with a Kaiser-Bessel kernel, density compensated
+#   (Pipe-Menon), transformed with the centred FFT and deapodised.
+#   Trajectory, interpolation matrix, density compensation and deapodisation are
+#   computed once per (nPE, radialosfactor, radialanglestep, full/half spokes).
+#
+#   Benchmark against the nearest pixel placement: python3 gridding_handler.py
+#
+################################################################################
+
+import math
+
+import numpy as np
+
+from scipy import sparse
+from scipy.special import i0
+
+from fft_handler import ft
+
+
+class gridding:
+    def __init__(self):
+        self.alpha = 2          # Grid oversampling
+        self.width = 4          # Kernel width in oversampled grid points
+        self.table_resolution = 512
+        self.dcf_iterations = 10
+        self.plans = {}
+
+        # Kaiser-Bessel kernel table over |distance| 0 .. width/2 (Beatty et al. 2005)
+        self.beta = math.pi * math.sqrt((self.width / self.alpha) ** 2 * (self.alpha - 0.5) ** 2 - 0.8)
+        u = np.linspace(0, self.width / 2, int(self.table_resolution * self.width / 2) + 1)
+        self.table = i0(self.beta * np.sqrt(np.maximum(1 - (2 * u / self.width) ** 2, 0))) / self.width
+
+    def angles(self, anglestep, half):
+        # Spoke angles [rad] as sent to the sequencer (0.01 rad steps)
+        degrees = np.arange(0, 360 if half else 180, anglestep)
+        return np.array([int((math.radians(angle) % (2 * np.pi)) * 100) / 100 for angle in degrees])
+
+    def size(self, nPE, osfactor, half):
+        # Cartesian matrix of the former nearest pixel placement
+        return int(2 * nPE * osfactor) if half else int(nPE * osfactor)
+
+    def trajectory(self, nPE, osfactor, anglestep, half):
+        # k-space positions (rows, columns) in Cartesian grid points relative to the centre
+        samples = int(nPE * osfactor)
+        r = np.arange(samples, dtype=np.float64)
+        if not half: r -= nPE / 2 * osfactor
+        theta = self.angles(anglestep, half)[:, np.newaxis]
+        return np.sin(theta) * r, np.cos(theta) * r
+
+    def plan(self, nPE, osfactor, anglestep, half):
+        key = (nPE, osfactor, anglestep, bool(half))
+        if key not in self.plans:
+            N = self.size(nPE, osfactor, half)
+            G = self.alpha * N
+            ky, kx = self.trajectory(nPE, osfactor, anglestep, half)
+            gy = self.alpha * ky.ravel() + G // 2
+            gx = self.alpha * kx.ravel() + G // 2
+
+            # Interpolation matrix grid x samples from the kernel table
+            offsets = np.arange(self.width) - self.width // 2 + 1
+            iy = np.floor(gy)[:, np.newaxis] + offsets
+            ix = np.floor(gx)[:, np.newaxis] + offsets
+            wy = self.kernel(gy[:, np.newaxis] - iy)
+            wx = self.kernel(gx[:, np.newaxis] - ix)
+            rows = ((iy.astype(int) % G)[:, :, np.newaxis] * G + (ix.astype(int) % G)[:, np.newaxis, :]).reshape(gy.shape[0], -1)
+            weights = (wy[:, :, np.newaxis] * wx[:, np.newaxis, :]).reshape(gy.shape[0], -1)
+            columns = np.repeat(np.arange(gy.shape[0]), self.width * self.width)
+            C = sparse.csr_matrix((weights.ravel(), (rows.ravel(), columns)), shape=(G * G, gy.shape[0]))
+
+            # Density compensation (Pipe and Menon 1999), scaled to the area of the sampled disc
+            dcf = np.ones(gy.shape[0])
+            CT = C.T.tocsr()
+            for n in range(self.dcf_iterations):
+                dcf /= np.maximum(CT @ (C @ dcf), 1e-12)
+            dcf *= math.pi * (N / 2) ** 2 / np.sum(dcf)
+
+            # Deapodisation from the image of one sample at the k-space centre
+            centre = np.zeros(G * G)
+            oy = np.arange(self.width) - self.width // 2 + 1 + G // 2
+            w = self.kernel(G // 2 - oy)
+            centre.reshape(G, G)[np.ix_(oy, oy)] = np.outer(w, w)
+            apodisation = np.real(ft.fft2(centre.reshape(G, G).astype(np.complex128)))[G // 2 - N // 2:G // 2 - N // 2 + N, G // 2 - N // 2:G // 2 - N // 2 + N]
+
+            self.plans[key] = (N, G, C.astype(np.complex64), dcf.astype(np.float32), (1 / apodisation).astype(np.float32))
+        return self.plans[key]
+
+    def kernel(self, distance):
+        index = np.abs(distance) * self.table_resolution
+        i = np.minimum(index.astype(int), self.table.shape[0] - 2)
+        f = index - i
+        weight = self.table[i] * (1 - f) + self.table[i + 1] * f
+        return np.where(np.abs(distance) < self.width / 2, weight, 0)
+
+    def reconstruct(self, spokes, nPE, osfactor, anglestep, half):
+        # spokes: angles x samples. Returns the image on the Cartesian matrix of the nearest pixel placement.
+        N, G, C, dcf, deapodisation = self.plan(nPE, osfactor, anglestep, half)
+        data = np.asarray(spokes, dtype=np.complex64).ravel() * dcf
+        image = ft.fft2((C @ data).reshape(G, G))
+        return image[G // 2 - N // 2:G // 2 - N // 2 + N, G // 2 - N // 2:G // 2 - N // 2 + N] * deapodisation
+
+    def kspace(self, image):
+        # Cartesian k-space of a reconstructed image, inverse of ft.fft2
+        return np.fft.fftshift(np.fft.ifft2(np.fft.fftshift(image))).astype(np.complex64)
+
+
+grid = gridding()
+
+
+if __name__ == '__main__':
+    import time
+
+    from scipy.special import j1
+
+    def phantom(ky, kx, N):
+        # Discs (centre row, centre column, radius, intensity) in pixels of the N x N image, analytic k-space
+        discs = [(0, 0, 0.35 * N, 1.0), (0.1 * N, -0.1 * N, 0.1 * N, -0.5), (-0.12 * N, 0.08 * N, 0.06 * N, 0.5)]
+        image = np.zeros((N, N))
+        y, x = np.mgrid[-N // 2:N - N // 2, -N // 2:N - N // 2]
+        data = np.zeros(ky.shape, dtype=np.complex128)
+        k = np.sqrt(ky ** 2 + kx ** 2) / N
+        for cy, cx, R, value in discs:
+            image[(y - cy) ** 2 + (x - cx) ** 2 < R ** 2] += value
+            with np.errstate(invalid='ignore', divide='ignore'):
+                disc = np.where(k > 0, R * j1(2 * math.pi * R * k) / np.where(k > 0, k, 1), math.pi * R ** 2)
+            # Sign convention of ft.fft2: image = fftshift(fft2(fftshift(kspace)))
+            data += value * disc * np.exp(2j * math.pi * (ky * cy + kx * cx) / N)
+        return data.astype(np.complex64), image
+
+    def placement(spokes, nPE, osfactor, anglestep, half):
+        # Former sequence_handler loop: nearest pixel per sample, then fft2
+        angles = grid.angles(anglestep, half)
+        N = grid.size(nPE, osfactor, half)
+        kspace = np.matrix(np.zeros((N, N), dtype=np.complex64))
+        for n in range(angles.shape[0]):
+            for m in range(int(nPE * osfactor)):
+                if half: kspace[int(nPE * osfactor + math.sin(angles[n]) * m), int(nPE * osfactor + math.cos(angles[n]) * m)] = spokes[n, m]
+                else: kspace[int(nPE / 2 * osfactor + math.sin(angles[n]) * (m - nPE / 2 * osfactor)), int(nPE / 2 * osfactor + math.cos(angles[n]) * (m - nPE / 2 * osfactor))] = spokes[n, m]
+        return ft.fft2(kspace)
+
+    def error(image, reference, nPE):
+        c = image.shape[0] // 2
+        image = np.abs(image[c - nPE // 2:c + nPE // 2, c - nPE // 2:c + nPE // 2])
+        reference = reference[c - nPE // 2:c + nPE // 2, c - nPE // 2:c + nPE // 2]
+        scale = np.sum(image * reference) / np.sum(image * image)
+        return np.linalg.norm(scale * image - reference) / np.linalg.norm(reference)
+
+    for nPE, osfactor, anglestep, half in [(32, 2, 2, False), (64, 2, 1, False), (64, 2, 1, True), (128, 2, 0.5, False)]:
+        N = grid.size(nPE, osfactor, half)
+        ky, kx = grid.trajectory(nPE, osfactor, anglestep, half)
+        spokes, reference = phantom(ky, kx, N)
+
+        t = time.perf_counter()
+        legacy = placement(spokes, nPE, osfactor, anglestep, half)
+        t_legacy = time.perf_counter() - t
+        grid.plans.clear()
+        t = time.perf_counter()
+        image = grid.reconstruct(spokes, nPE, osfactor, anglestep, half)
+        t_plan = time.perf_counter() - t
+        t = time.perf_counter()
+        image = grid.reconstruct(spokes, nPE, osfactor, anglestep, half)
+        t_nufft = time.perf_counter() - t
+
+        print('nPE %3d os %d step %4.1f %s: placement %7.3f s (error %.3f)   gridding %6.3f s, plan %6.3f s (error %.3f)' % \
+              (nPE, osfactor, anglestep, 'half' if half else 'full', t_legacy, error(legacy, reference, nPE), \
+               t_nufft, t_plan, error(image, reference, nPE)))
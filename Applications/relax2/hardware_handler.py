@@ -0,0 +1,132 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Client side mirror of the programmable server state
+#   RX mode, frequency, attenuation, the four shims and the loaded sequence
+#   program. The upload methods stage a field only if the server does not hold
+#   the value already, flush() sends everything staged in one write (the
+#   program last, the server reads it with a single read). resync() forgets
+#   the server state after a reconnect and stages every known value again.
+#
+#   Benchmark: python3 hardware_handler.py
+#
+################################################################################
+
+import struct
+
+
+class hardware_mirror:
+    def __init__(self):
+        # Field -> (value, command bytes): on the server, staged for the next flush
+        self.state = {}
+        self.pending = {}
+
+        self.writes = 0
+        self.sent = 0
+
+    def command(self, trig, value, axis=0):
+        return struct.pack('<IIIIIIIIII', trig, 0, 0, 0, 0, 0, 0, 0, axis, value)
+
+    def stage(self, field, value, data):
+        # True if staged, False if the server holds the value already
+        if field in self.state and self.state[field][0] == value:
+            self.pending.pop(field, None)
+            return False
+        self.pending[field] = (value, data)
+        return True
+
+    def rxmode(self, mode):
+        return self.stage('rxmode', int(mode), self.command(1, int(mode)))
+
+    def frequency(self, frequency):
+        # [MHz]
+        value = int(1.0e6 * frequency)
+        return self.stage('frequency', value, self.command(2, value))
+
+    def attenuation(self, attenuation):
+        # [dB], the attenuator is set to 31.75 dB first
+        value = int(abs(attenuation) / 0.25)
+        return self.stage('attenuation', value, self.command(3, int(abs(-31.75) / 0.25)) + self.command(3, value))
+
+    def shim(self, axis, value):
+        # [mA], sign in bit 24
+        sign = 1 if value < 0 else 0
+        return self.stage('shim%d' % axis, int(value), self.command(5, sign << 24 | abs(int(value)), axis))
+
+    def program(self, key, program):
+        return self.stage('program', key, self.command(4, 0) + bytes(program))
+
+    def loaded(self):
+        # Key of the program on the server, None if unknown
+        return self.state['program'][0] if 'program' in self.state else None
+
+    def flush(self, socket):
+        # One write for all staged fields, True if anything was sent
+        if not self.pending: return False
+        fields = sorted(self.pending, key=lambda field: field == 'program')
+        data = b''.join(self.pending[field][1] for field in fields)
+        socket.write(data)
+        while(True):
+            if not socket.waitForBytesWritten():
+                break
+        self.state.update(self.pending)
+        self.pending = {}
+        self.writes += 1
+        self.sent += len(data)
+        return True
+
+    def resync(self):
+        # Server state unknown (reconnect): the known values are sent again with the next flush
+        self.pending = {**self.state, **self.pending}
+        self.state = {}
+
+
+hardware = hardware_mirror()
+
+
+if __name__ == '__main__':
+    import time
+
+    class counter:
+        # Socket stand-in counting writes and bytes
+        def __init__(self): self.writes, self.bytes = 0, 0
+        def write(self, data): self.writes += 1; self.bytes += len(data)
+        def waitForBytesWritten(self): return False
+
+    program = bytes(8 * 180)
+    for name, sweep in (('frequency sweep', lambda n: (11.3 + n * 1e-4, 10, [0, 0, 0, 0])),
+                        ('shim sweep', lambda n: (11.3, 10, [n - 50, 0, 0, 0])),
+                        ('repetitions', lambda n: (11.3, 10, [0, 0, 0, 0]))):
+        # Former uploads: RX mode and frequency on change, attenuation twice, all shims and the program every time
+        socket = counter()
+        t = time.perf_counter()
+        frequency_old = 0
+        for n in range(100):
+            frequency, attenuation, shims = sweep(n)
+            if frequency != frequency_old:
+                socket.write(hardware.command(2, int(1.0e6 * frequency)))
+                frequency_old = frequency
+            socket.write(hardware.command(3, 127))
+            socket.write(hardware.command(3, int(abs(attenuation) / 0.25)))
+            for axis in range(4): socket.write(hardware.command(5, (1 << 24 if shims[axis] < 0 else 0) | abs(shims[axis]), axis))
+            socket.write(hardware.command(4, 0))
+            socket.write(program)
+        t_former = time.perf_counter() - t
+        former = (socket.writes, socket.bytes)
+
+        socket = counter()
+        mirror = hardware_mirror()
+        t = time.perf_counter()
+        for n in range(100):
+            frequency, attenuation, shims = sweep(n)
+            mirror.rxmode(1)
+            mirror.frequency(frequency)
+            mirror.attenuation(attenuation)
+            for axis in range(4): mirror.shim(axis, shims[axis])
+            mirror.program('key', program)
+            mirror.flush(socket)
+        t_mirror = time.perf_counter() - t
+
+        print('%-16s 100 acquisitions: former %4d writes %7d bytes (%.4f s)   mirror %4d writes %7d bytes (%.4f s)' % \
+              (name, former[0], former[1], t_former, socket.writes, socket.bytes, t_mirror))
@@ -5,15 +5,159 @@
 #
 ################################################################################
 
+import io
 import pickle
 import json
+import threading
+from contextlib import contextmanager
+
+import numpy as np
 from PyQt5.QtCore import QFile, QTextStream
 from cycler import cycler
 
 import breeze_resources
 
+from rawdata_handler import rawdata
+from settings_handler import store
+
+
+class frozen_list(tuple):
+    # List in a snapshot, a list again in its drafts
+    pass
+
+
+def freeze(value):
+    if isinstance(value, list): return frozen_list(freeze(item) for item in value)
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+    return value
+
+
+def thaw(value):
+    if isinstance(value, frozen_list): return [thaw(item) for item in value]
+    if isinstance(value, np.ndarray): return value.copy()
+    return value
+
+
+def hashable(value):
+    if isinstance(value, np.ndarray): return (value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, tuple): return tuple(hashable(item) for item in value)
+    return value
+
+
+class snapshot:
+    # Frozen settings: read only, hashable (equal settings, equal hash), draft() makes a working copy
+    def __init__(self, values, data):
+        object.__setattr__(self, 'values', values)
+        object.__setattr__(self, 'data', data) # The other attributes, shared with the drafts
+        object.__setattr__(self, 'key', None)
+
+    def __getattr__(self, name):
+        values = object.__getattribute__(self, 'values')
+        if name in values: return values[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Parameter snapshots are read only')
+
+    def __hash__(self):
+        if self.key is None: object.__setattr__(self, 'key', tuple((name, hashable(value)) for name, value in self.values.items()))
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, snapshot) and hash(self) == hash(other) and self.key == other.key
+
+    def draft(self):
+        duplicate = object.__new__(Parameters)
+        values = object.__getattribute__(duplicate, '__dict__')
+        values.update(self.data)
+        for name, value in self.values.items(): values[name] = thaw(value)
+        return duplicate
+
 
 class Parameters:
+    # Parameter copy bound to a thread (draft of a tool, processing of a protocol task next to the acquisition of the next one)
+    bound = threading.local()
+    bindings = 0
+    lock = threading.Lock()
+
+    # Persisted settings (parameters.pkl), new ones are appended: the order of the positional version 0 files
+    settings = ('hosts', 'GUItheme', 'connectionmode', 'GUImode', 'sequence', 'sequencefile', 'datapath', 'frequency',
+                'autorecenter', 'autodataprocess', 'frequencyoffset', 'frequencyoffsetsign', 'phaseoffset',
+                'phaseoffsetradmod100', 'RFpulselength', 'RFpulseamplitude', 'flipangletime', 'flipangleamplitude',
+                'flippulselength', 'flippulseamplitude', 'RFattenuation', 'rx1', 'rx2', 'rxmode', 'RXscaling', 'TS',
+                'ROBWscaler', 'TE', 'TI', 'SIR_TE', 'TR', 'grad', 'Gradientorientation', 'imageorientation',
+                'imageresolution', 'nPE', 'frequencyrange', 'samples', 'sampledelay', 'dataTimestamp', 'timeaxis',
+                'frequencyplotrange', 'FWHM', 'peakvalue', 'noise', 'SNR', 'inhomogeneity', 'centerfrequency',
+                'ACstart', 'ACstop', 'ACstepwidth', 'ACvalues', 'Reffrequency', 'FAstart', 'FAstop', 'FAsteps',
+                'FAvalues', 'RefRFattenuation', 'TIstart', 'TIstop', 'TIsteps', 'T1', 'T1stepsimg', 'TEstart', 'TEstop',
+                'TEsteps', 'T2', 'T2stepsimg', 'projaxis', 'average', 'average_complex', 'averagecount', 'imagplots',
+                'cutcirc', 'cutrec', 'cutcenter', 'cutoutside', 'cutcentervalue', 'cutoutsidevalue', 'usmethode',
+                'ustime', 'usphase', 'ustimeidx', 'usphaseidx', 'Gproj', 'projx', 'projy', 'projz', 'projectionangle',
+                'projectionangleradmod100', 'GROamplitude', 'GPEstep', 'GSamplitude', 'GSPEstep', 'SPEsteps',
+                'Gdiffamplitude', 'crusheramplitude', 'spoileramplitude', 'GROpretime', 'GROpretimescaler',
+                'GSposttime', 'crushertime', 'spoilertime', 'diffusiontime', 'GROfcpretime1', 'GROfcpretime2',
+                'radialanglestep', 'radialosfactor', 'radialanglestepradmod100', 'lnkspacemag', 'autograd', 'FOV',
+                'slicethickness', 'gradsens', 'gradnominal', 'gradmeasured', 'gradsenstool', 'autofreqoffset',
+                'sliceoffset', 'animationstep', 'animationimage', 'ToolShimStart', 'ToolShimStop', 'ToolShimSteps',
+                'ToolShimChannel', 'ToolAutoShimMode', 'STvalues', 'AutoSTvalues', 'STgrad', 'imagefilter',
+                'signalmask', 'SAR_enable', 'SAR_limit', 'SAR_6mlimit', 'SAR_peak_limit', 'SAR_LOG_counter',
+                'SAR_cal_raw', 'SAR_cal_mean', 'SAR_cal_start', 'SAR_cal_end', 'SAR_cal_lookup', 'SAR_power_unit',
+                'SAR_status', 'SAR_max_power', 'headerfileformat', 'motor_enable', 'motor_available', 'motor_port',
+                'motor_axis_limit_negative', 'motor_axis_limit_positive', 'motor_movement_direction',
+                'motor_actual_position', 'motor_goto_position', 'motor_start_position', 'motor_end_position',
+                'motor_total_image_length', 'motor_movement_step', 'motor_image_count', 'motor_current_image_count',
+                'motor_settling_time', 'motor_AC_position', 'motor_AC_position_center', 'motor_AC_inbetween',
+                'motor_AC_inbetween_step', 'single_plot', 'ernstanglecalc_T1', 'ernstanglecalc_TR', 'ernstanglecalc_EA',
+                'imagecolormap', 'imageminimum', 'imagemaximum', 'measurement_time_dialog', 'toolautosequence',
+                'image_grid', 'projection3D', 'preview_mode', 'preview_rate', 'T1fitmethod', 'T2fitmethod')
+
+    def __getattribute__(self, name):
+        if Parameters.bindings:
+            copy = getattr(Parameters.bound, 'params', None)
+            if copy is not None and copy is not self: return getattr(copy, name)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if Parameters.bindings:
+            copy = getattr(Parameters.bound, 'params', None)
+            if copy is not None and copy is not self: return setattr(copy, name, value)
+        object.__setattr__(self, name, value)
+
+    def bind(self, copy):
+        # params refers to the copy in this thread until bind(None)
+        with Parameters.lock:
+            if getattr(Parameters.bound, 'params', None) is not None: Parameters.bindings -= 1
+            if copy is not None: Parameters.bindings += 1
+            Parameters.bound.params = copy
+
+    def snapshot(self):
+        values = object.__getattribute__(self, '__dict__')
+        settings = {name: freeze(values[name]) for name in Parameters.settings if name in values}
+        return snapshot(settings, {name: value for name, value in values.items() if name not in settings})
+
+    def draft(self):
+        # Working copy with its own settings (lists and arrays too), data arrays are shared until replaced
+        return self.snapshot().draft()
+
+    @contextmanager
+    def override(self, *names, **values):
+        # The block runs on a draft bound to this thread with the values set. Afterwards the draft's
+        # changes are taken over, except for the given names and values (they keep their former values)
+        outer = getattr(Parameters.bound, 'params', None)
+        draft = self.draft()
+        object.__getattribute__(draft, '__dict__').update(values)
+        self.bind(draft)
+        try:
+            yield draft
+        finally:
+            self.bind(outer)
+        scratch = set(names) | set(values)
+        for name, value in object.__getattribute__(draft, '__dict__').items():
+            if name not in scratch: object.__setattr__(self, name, value)
+        self.saveFileParameter()
+
     def __init__(self):
         self.GUIthemestr = ['light', 'dark']
         file = QFile(':/' + self.GUIthemestr[0] + '.qss')
@@ -237,187 +381,23 @@ class Parameters:
         self.toolautosequence = 0
         self.image_grid = 0
         self.projection3D = 0
+        self.preview_mode = 0
+        self.preview_rate = 2
+        self.T1fitmethod = 0
+        self.T2fitmethod = 0
 
-    def saveFileParameter(self):  
-        with open('parameters.pkl', 'wb') as file:
-            pickle.dump([self.hosts, \
-                         self.GUItheme, \
-                         self.connectionmode, \
-                         self.GUImode, \
-                         self.sequence, \
-                         self.sequencefile, \
-                         self.datapath, \
-                         self.frequency, \
-                         self.autorecenter, \
-                         self.autodataprocess, \
-                         self.frequencyoffset, \
-                         self.frequencyoffsetsign, \
-                         self.phaseoffset, \
-                         self.phaseoffsetradmod100, \
-                         self.RFpulselength, \
-                         self.RFpulseamplitude, \
-                         self.flipangletime, \
-                         self.flipangleamplitude, \
-                         self.flippulselength, \
-                         self.flippulseamplitude, \
-                         self.RFattenuation, \
-                         self.rx1, \
-                         self.rx2, \
-                         self.rxmode, \
-                         self.RXscaling, \
-                         self.TS, \
-                         self.ROBWscaler, \
-                         self.TE, \
-                         self.TI, \
-                         self.SIR_TE, \
-                         self.TR, \
-                         self.grad, \
-                         self.Gradientorientation, \
-                         self.imageorientation, \
-                         self.imageresolution, \
-                         self.nPE, \
-                         self.frequencyrange, \
-                         self.samples, \
-                         self.sampledelay, \
-                         self.dataTimestamp, \
-                         self.timeaxis, \
-                         self.frequencyplotrange, \
-                         self.FWHM, \
-                         self.peakvalue, \
-                         self.noise, \
-                         self.SNR, \
-                         self.inhomogeneity, \
-                         self.centerfrequency, \
-                         self.ACstart, \
-                         self.ACstop, \
-                         self.ACstepwidth, \
-                         self.ACvalues, \
-                         self.Reffrequency, \
-                         self.FAstart, \
-                         self.FAstop, \
-                         self.FAsteps, \
-                         self.FAvalues, \
-                         self.RefRFattenuation, \
-                         self.TIstart, \
-                         self.TIstop, \
-                         self.TIsteps, \
-                         self.T1, \
-                         self.T1stepsimg, \
-                         self.TEstart, \
-                         self.TEstop, \
-                         self.TEsteps, \
-                         self.T2, \
-                         self.T2stepsimg, \
-                         self.projaxis, \
-                         self.average, \
-                         self.average_complex, \
-                         self.averagecount, \
-                         self.imagplots, \
-                         self.cutcirc, \
-                         self.cutrec, \
-                         self.cutcenter, \
-                         self.cutoutside, \
-                         self.cutcentervalue, \
-                         self.cutoutsidevalue, \
-                         self.usmethode, \
-                         self.ustime, \
-                         self.usphase, \
-                         self.ustimeidx, \
-                         self.usphaseidx, \
-                         self.Gproj, \
-                         self.projx, \
-                         self.projy, \
-                         self.projz, \
-                         self.projectionangle, \
-                         self.projectionangleradmod100, \
-                         self.GROamplitude, \
-                         self.GPEstep, \
-                         self.GSamplitude, \
-                         self.GSPEstep, \
-                         self.SPEsteps, \
-                         self.Gdiffamplitude, \
-                         self.crusheramplitude, \
-                         self.spoileramplitude, \
-                         self.GROpretime, \
-                         self.GROpretimescaler, \
-                         self.GSposttime, \
-                         self.crushertime, \
-                         self.spoilertime, \
-                         self.diffusiontime, \
-                         self.GROfcpretime1, \
-                         self.GROfcpretime2, \
-                         self.radialanglestep, \
-                         self.radialosfactor, \
-                         self.radialanglestepradmod100, \
-                         self.lnkspacemag, \
-                         self.autograd, \
-                         self.FOV, \
-                         self.slicethickness, \
-                         self.gradsens, \
-                         self.gradnominal, \
-                         self.gradmeasured, \
-                         self.gradsenstool, \
-                         self.autofreqoffset, \
-                         self.sliceoffset, \
-                         self.animationstep, \
-                         self.animationimage, \
-                         self.ToolShimStart, \
-                         self.ToolShimStop, \
-                         self.ToolShimSteps, \
-                         self.ToolShimChannel, \
-                         self.ToolAutoShimMode, \
-                         self.STvalues, \
-                         self.AutoSTvalues, \
-                         self.STgrad, \
-                         self.imagefilter, \
-                         self.signalmask, \
-                         self.SAR_enable, \
-                         self.SAR_limit, \
-                         self.SAR_6mlimit, \
-                         self.SAR_peak_limit, \
-                         self.SAR_LOG_counter, \
-                         self.SAR_cal_raw,\
-                         self.SAR_cal_mean,\
-                         self.SAR_cal_start,\
-                         self.SAR_cal_end,\
-                         self.SAR_cal_lookup,\
-                         self.SAR_power_unit,\
-                         self.SAR_status,\
-                         self.SAR_max_power,\
-                         self.headerfileformat, \
-                         self.motor_enable, \
-                         self.motor_available, \
-                         self.motor_port, \
-                         self.motor_axis_limit_negative, \
-                         self.motor_axis_limit_positive, \
-                         self.motor_movement_direction, \
-                         self.motor_actual_position, \
-                         self.motor_goto_position, \
-                         self.motor_start_position, \
-                         self.motor_end_position, \
-                         self.motor_total_image_length, \
-                         self.motor_movement_step, \
-                         self.motor_image_count, \
-                         self.motor_current_image_count, \
-                         self.motor_settling_time, \
-                         self.motor_AC_position, \
-                         self.motor_AC_position_center, \
-                         self.motor_AC_inbetween, \
-                         self.motor_AC_inbetween_step, \
-                         self.single_plot, \
-                         self.ernstanglecalc_T1, \
-                         self.ernstanglecalc_TR, \
-                         self.ernstanglecalc_EA, \
-                         self.imagecolormap, \
-                         self.imageminimum, \
-                         self.imagemaximum, \
-                         self.measurement_time_dialog, \
-                         self.toolautosequence, \
-                         self.image_grid, \
-                         self.projection3D], file)
-       
-        print('Parameters saved!')
+    def saveFileParameter(self, filename='parameters.pkl'):
+        # Drafts bound to a thread (tools, protocol tasks) are not saved. The file is written
+        # shortly after by the settings store, with the values at that time
+        if getattr(Parameters.bound, 'params', None) is not None: return
+        values = object.__getattribute__(self, '__dict__')
+        store.save(filename, lambda: {name: values[name] for name in Parameters.settings})
+
+    def flushParameter(self, filename=None):
+        # Pending parameter files written now (before they are copied or read by others)
+        store.flush(filename)
         
+
     def saveFileData(self):  
         with open('data.pkl', 'wb') as file:
             pickle.dump([self.spectrumdata, \
@@ -474,186 +454,15 @@ class Parameters:
         except:
             print('SAR data could not have been restored.')
 
-    def loadParam(self):
+    def loadParam(self, filename='parameters.pkl'):
         try:
-            with open('parameters.pkl', 'rb') as file:
-                self.hosts, \
-                self.GUItheme, \
-                self.connectionmode, \
-                self.GUImode, \
-                self.sequence, \
-                self.sequencefile, \
-                self.datapath, \
-                self.frequency, \
-                self.autorecenter, \
-                self.autodataprocess, \
-                self.frequencyoffset, \
-                self.frequencyoffsetsign, \
-                self.phaseoffset, \
-                self.phaseoffsetradmod100, \
-                self.RFpulselength, \
-                self.RFpulseamplitude, \
-                self.flipangletime, \
-                self.flipangleamplitude, \
-                self.flippulselength, \
-                self.flippulseamplitude, \
-                self.RFattenuation, \
-                self.rx1, \
-                self.rx2, \
-                self.rxmode, \
-                self.RXscaling, \
-                self.TS, \
-                self.ROBWscaler, \
-                self.TE, \
-                self.TI, \
-                self.SIR_TE, \
-                self.TR, \
-                self.grad, \
-                self.Gradientorientation, \
-                self.imageorientation, \
-                self.imageresolution, \
-                self.nPE, \
-                self.frequencyrange, \
-                self.samples, \
-                self.sampledelay, \
-                self.dataTimestamp, \
-                self.timeaxis, \
-                self.frequencyplotrange, \
-                self.FWHM, \
-                self.peakvalue, \
-                self.noise, \
-                self.SNR, \
-                self.inhomogeneity, \
-                self.centerfrequency, \
-                self.ACstart, \
-                self.ACstop, \
-                self.ACstepwidth, \
-                self.ACvalues, \
-                self.Reffrequency, \
-                self.FAstart, \
-                self.FAstop, \
-                self.FAsteps, \
-                self.FAvalues, \
-                self.RefRFattenuation, \
-                self.TIstart, \
-                self.TIstop, \
-                self.TIsteps, \
-                self.T1, \
-                self.T1stepsimg, \
-                self.TEstart, \
-                self.TEstop, \
-                self.TEsteps, \
-                self.T2, \
-                self.T2stepsimg, \
-                self.projaxis, \
-                self.average, \
-                self.average_complex, \
-                self.averagecount, \
-                self.imagplots, \
-                self.cutcirc, \
-                self.cutrec, \
-                self.cutcenter, \
-                self.cutoutside, \
-                self.cutcentervalue, \
-                self.cutoutsidevalue, \
-                self.usmethode, \
-                self.ustime, \
-                self.usphase, \
-                self.ustimeidx, \
-                self.usphaseidx, \
-                self.Gproj, \
-                self.projx, \
-                self.projy, \
-                self.projz, \
-                self.projectionangle, \
-                self.projectionangleradmod100, \
-                self.GROamplitude, \
-                self.GPEstep, \
-                self.GSamplitude, \
-                self.GSPEstep, \
-                self.SPEsteps, \
-                self.Gdiffamplitude, \
-                self.crusheramplitude, \
-                self.spoileramplitude, \
-                self.GROpretime, \
-                self.GROpretimescaler, \
-                self.GSposttime, \
-                self.crushertime, \
-                self.spoilertime, \
-                self.diffusiontime, \
-                self.GROfcpretime1, \
-                self.GROfcpretime2, \
-                self.radialanglestep, \
-                self.radialosfactor, \
-                self.radialanglestepradmod100, \
-                self.lnkspacemag, \
-                self.autograd, \
-                self.FOV, \
-                self.slicethickness, \
-                self.gradsens, \
-                self.gradnominal, \
-                self.gradmeasured, \
-                self.gradsenstool, \
-                self.autofreqoffset, \
-                self.sliceoffset, \
-                self.animationstep, \
-                self.animationimage, \
-                self.ToolShimStart, \
-                self.ToolShimStop, \
-                self.ToolShimSteps, \
-                self.ToolShimChannel, \
-                self.ToolAutoShimMode, \
-                self.STvalues, \
-                self.AutoSTvalues, \
-                self.STgrad, \
-                self.imagefilter, \
-                self.signalmask, \
-                self.SAR_enable, \
-                self.SAR_limit, \
-                self.SAR_6mlimit, \
-                self.SAR_peak_limit, \
-                self.SAR_LOG_counter, \
-                self.SAR_cal_raw,\
-                self.SAR_cal_mean,\
-                self.SAR_cal_start,\
-                self.SAR_cal_end,\
-                self.SAR_cal_lookup,\
-                self.SAR_power_unit,\
-                self.SAR_status,\
-                self.SAR_max_power,\
-                self.headerfileformat, \
-                self.motor_enable, \
-                self.motor_available, \
-                self.motor_port , \
-                self.motor_axis_limit_negative, \
-                self.motor_axis_limit_positive, \
-                self.motor_movement_direction, \
-                self.motor_actual_position, \
-                self.motor_goto_position, \
-                self.motor_start_position, \
-                self.motor_end_position, \
-                self.motor_total_image_length, \
-                self.motor_movement_step, \
-                self.motor_image_count, \
-                self.motor_current_image_count, \
-                self.motor_settling_time, \
-                self.motor_AC_position, \
-                self.motor_AC_position_center, \
-                self.motor_AC_inbetween, \
-                self.motor_AC_inbetween_step, \
-                self.single_plot, \
-                self.ernstanglecalc_T1, \
-                self.ernstanglecalc_TR, \
-                self.ernstanglecalc_EA, \
-                self.imagecolormap, \
-                self.imageminimum, \
-                self.imagemaximum, \
-                self.measurement_time_dialog, \
-                self.toolautosequence, \
-                self.image_grid, \
-                self.projection3D = pickle.load(file)
+            values = store.load(filename, Parameters.settings)
+            # Settings missing in the file (added since it was written) keep their defaults
+            if any(name not in values for name in Parameters.settings): self.var_init()
+            for name in Parameters.settings:
+                if name in values: setattr(self, name, values[name])
              
-                print('Internal GUI parameter successfully restored from file.')
+            print('Internal GUI parameter successfully restored from file.')
                 
         except:
             print('Parameter could not have been restored, setting default.')
@@ -706,7 +515,7 @@ class Parameters:
             self.var_init()
         
     def save_header_file_txt(self):
-        file = open(params.datapath + '_Header.txt','w')
+        file = io.StringIO()
 
         file.write('Hosts: ' + str(self.hosts) + '\n')
         # file.write(': ' + str(self.GUItheme) + '\n')
@@ -890,7 +699,7 @@ class Parameters:
         # file.write(': ' + str(self.image_grid) + '\n')
         # file.write(': ' + str(self.projection3D) + '\n')
         
-        file.close()
+        rawdata.write_text(params.datapath + '_Header.txt', file.getvalue())
 
     def save_header_file_json(self):
         filename = params.datapath + '_Header.json'
@@ -1007,9 +816,7 @@ class Parameters:
             'Motor Autocenter In-between Image Step': self.motor_AC_inbetween_step
         }
 
-        out_file = open(filename, 'w')
-
-        json.dump(header_dict, out_file, ensure_ascii=False, indent=4)
+        rawdata.write_text(filename, json.dumps(header_dict, ensure_ascii=False, indent=4))
 
     def load_GUItheme(self):
         file = QFile(':/' + self.GUIthemestr[self.GUItheme] + '.qss')
@@ -1019,3 +826,40 @@ class Parameters:
         self.cycler = cycler(color=['#000000', '#0000BB', '#BB0000'])
         
 params = Parameters()
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+
+    os.chdir(tempfile.mkdtemp())
+    params.var_init()
+    params.img_mag = np.zeros((256, 256)) # Data, shared with the drafts
+    runs = 200
+    scratch = ('GUImode', 'sequence', 'TS', 'TE', 'TR', 'slicethickness', 'frequencyoffset', 'nPE', 'FOV', 'datapath')
+
+    # Former tools: settings saved to self.*_temp, parameters.pkl written on every change and on the restore
+    class tool: pass
+    t = time.perf_counter()
+    for n in range(runs):
+        for name in scratch: setattr(tool, name + '_temp', getattr(params, name))
+        params.TE = 4
+        with open('parameters.pkl', 'wb') as file: pickle.dump([getattr(params, name) for name in Parameters.settings], file)
+        for name in scratch: setattr(params, name, getattr(tool, name + '_temp'))
+        with open('parameters.pkl', 'wb') as file: pickle.dump([getattr(params, name) for name in Parameters.settings], file)
+    former = (time.perf_counter() - t) / runs * 1000
+
+    t = time.perf_counter()
+    for n in range(runs):
+        with params.override(*scratch):
+            params.TE = 4
+            params.saveFileParameter()
+    override = (time.perf_counter() - t) / runs * 1000
+
+    t = time.perf_counter()
+    for n in range(runs): hash(params.snapshot())
+    hashed = (time.perf_counter() - t) / runs * 1000
+
+    print('Tool settings: former save/restore %.3f ms, override %.3f ms, snapshot and hash %.3f ms (TE restored: %s)' % \
+          (former, override, hashed, params.TE == 12))
@@ -0,0 +1,178 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Live preview of Cartesian image acquisitions
+#   The acquisition marks every k-space line it has read with line(), at most
+#   params.preview_rate times per second the preview thread reconstructs the
+#   lines acquired so far into preallocated buffers and sends the image with the
+#   updated signal. The readout never waits for the preview: a line only sets
+#   its mask entry and frames are skipped while the last one is still computed
+#   or not yet drawn (the window calls shown() after drawing). The last frame
+#   with all lines waits for the same shown() when a frame is still pending.
+#   Modes (params.preview_mode): 0 off, 1 zero-filled k-space, 2 centre-out
+#   (largest completely acquired symmetric band around the k-space centre),
+#   3 k-space magnitude (log).
+#
+#   Benchmark: python3 preview_handler.py
+#
+################################################################################
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from parameter_handler import params
+from fft_handler import ft
+
+
+class live_preview(QObject):
+    updated = pyqtSignal(object, str)
+
+    def __init__(self):
+        super().__init__()
+        self.thread = ThreadPoolExecutor(1)
+        self.lock = threading.Lock()
+        self.kspace = None
+        self.busy = False
+        self.gate = threading.Lock()
+        self.final = None # Buffer of the finished acquisition, last frame not yet submitted
+
+    def start(self, kspace, order=None):
+        # kspace: acquisition buffer (lines x samples), order: (buffer line, sign) per image line for reordered acquisitions
+        self.mode = params.preview_mode
+        with self.lock:
+            if self.mode == 0 or params.preview_rate <= 0:
+                self.kspace = None
+                return
+            self.kspace = np.asarray(kspace)
+            lines, samples = self.kspace.shape
+            self.order = order
+            self.acquired = np.zeros(lines, dtype=bool)
+            if order is not None: lines = len(order[0])
+            self.lines = 0
+            self.weights = np.zeros((lines, 1), dtype=np.float32)
+            self.work = np.zeros((lines, samples), dtype=np.complex64)
+            if self.mode == 3:
+                self.crop = slice(0, samples)
+            else:
+                center = int(samples / 2)
+                self.crop = slice(max(center - int(lines / 2 * params.ROBWscaler), 0), center + int(lines / 2 * params.ROBWscaler))
+            self.image = np.zeros(self.work[:, self.crop].shape, dtype=np.float32)
+            self.interval = 1 / params.preview_rate
+            self.next = time.monotonic()
+            with self.gate:
+                self.busy = False
+                self.final = None
+
+    def line(self, *lines):
+        # Acquisition thread: buffer lines read, a new frame when due and the preview thread is free
+        if self.kspace is None: return
+        self.acquired[list(lines)] = True
+        self.lines += len(lines)
+        now = time.monotonic()
+        if now < self.next or self.busy: return
+        self.next = now + self.interval
+        self.busy = True
+        self.thread.submit(self.reconstruct, self.lines)
+
+    def finish(self):
+        # Last frame with all lines, then the acquisition buffer is released.
+        # While a frame is computed or not yet drawn, shown() submits it.
+        if self.kspace is None: return
+        with self.gate:
+            if self.busy:
+                self.final = self.kspace
+                return
+            self.busy = True
+        self.submit(self.kspace)
+
+    def shown(self):
+        with self.gate:
+            kspace, self.final = self.final, None
+            if kspace is None: self.busy = False
+        if kspace is not None: self.submit(kspace)
+
+    def submit(self, kspace):
+        self.thread.submit(self.reconstruct, self.lines)
+        self.thread.submit(self.release, kspace)
+
+    def release(self, kspace):
+        with self.lock:
+            if self.kspace is kspace:
+                self.kspace = None
+                self.work = None
+
+    def reconstruct(self, count):
+        with self.lock:
+            if self.kspace is None:
+                self.busy = False
+                return
+            # Acquired lines in image order
+            if self.order is None: np.copyto(self.weights[:, 0], self.acquired)
+            else: np.copyto(self.weights[:, 0], self.acquired[self.order[0]])
+            if self.mode == 2:
+                # Symmetric band around the centre line with all lines acquired
+                mask = self.weights[:, 0]
+                center = int(len(mask) / 2)
+                width = 0
+                while width < center and mask[center - width - 1] and mask[center + width]: width += 1
+                mask[:] = 0
+                mask[center - width:center + width] = 1
+            if self.order is None:
+                np.multiply(self.kspace, self.weights, out=self.work)
+            else:
+                self.weights[:, 0] *= self.order[1]
+                np.take(self.kspace, self.order[0], axis=0, out=self.work)
+                self.work *= self.weights
+
+            if self.mode == 3:
+                np.abs(self.work, out=self.image)
+                np.log1p(self.image, out=self.image)
+            else:
+                ft.fft2(self.work, out=self.work)
+                np.abs(self.work[:, self.crop], out=self.image)
+            self.updated.emit(self.image, 'Live preview: ' + str(count) + '/' + str(len(self.acquired)) + ' lines')
+
+
+preview = live_preview()
+
+
+if __name__ == '__main__':
+    from PyQt5.QtCore import QCoreApplication
+
+    app = QCoreApplication([])
+    params.ROBWscaler = 1
+    nPE = 128
+    samples = 256
+    readout = 0.002 # Line readout [s], fast to show the preview never adds to it
+    kspace = np.zeros((nPE, samples), dtype=np.complex64)
+    rng = np.random.default_rng()
+    frames = []
+    preview.updated.connect(lambda image, text: frames.append(text) or preview.shown())
+
+    for mode in (0, 1, 2, 3):
+        params.preview_mode = mode
+        params.preview_rate = 20
+        frames.clear()
+        t = time.monotonic()
+        preview.start(kspace)
+        worst = 0
+        for n in range(nPE):
+            time.sleep(readout)
+            kspace[n, :] = rng.standard_normal(samples)
+            s = time.perf_counter()
+            preview.line(n)
+            worst = max(worst, time.perf_counter() - s)
+            app.processEvents()
+        preview.finish()
+        elapsed = time.monotonic() - t
+        for n in range(2): # Frame pending at finish(), then the last one
+            preview.thread.submit(lambda: None).result()
+            app.processEvents()
+        print('Mode %d: %d lines in %.3f s (readout %.3f s), %d frames, slowest line() %.3f ms' % (mode, nPE, elapsed, nPE * readout, len(frames), worst * 1000))
@@ -10,11 +10,13 @@ import struct
 import time
 import os
 import shutil
+import threading
+import functools
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from PyQt5.QtCore import QObject, pyqtSignal
-from PyQt5.QtWidgets import QMessageBox
 
 import numpy as np
 import math
@@ -26,6 +28,77 @@ from scipy.stats import linregress
 from TCPsocket import socket, connected, unconnected
 from sequence_handler import seq
 from parameter_handler import params
+from rawdata_handler import rawdata
+from fft_handler import ft
+from relaxometry_handler import fit
+from unwrap_handler import unwrap
+from gridding_handler import grid
+from backprojection_handler import bp
+from stitching_handler import stitch
+from scheduler_handler import scheduler
+
+
+# Tool sequence settings (and the gradients derived from them) the tools change for their measurement
+tool_sequence = ('GUImode', 'sequence', 'TS', 'TE', 'TR', 'slicethickness', 'frequencyoffset', 'nPE', 'FOV', 'GROamplitude', 'Gproj', \
+                 'GROpretime', 'GROfcpretime1', 'GROfcpretime2', 'GPEstep', 'crusheramplitude', 'spoileramplitude', 'GSamplitude', 'GSPEstep')
+
+
+@functools.lru_cache(maxsize=64)
+def gradients(frequencyrange, TS, nPE, imageorientation, gradsens, FOV, GROpretimescaler, slicethickness, crushertime, spoilertime, flippulselength):
+    # Gradient amplitudes and timings, computed once per combination of the settings they depend on
+    Delta_vpp = frequencyrange / (250 * TS)
+    vpp = Delta_vpp * nPE
+    receiverBW = vpp / 2
+
+    if imageorientation == 0: Gxsens, Gysens, Gzsens = gradsens[0], gradsens[1], gradsens[2]
+    elif imageorientation == 1: Gxsens, Gysens, Gzsens = gradsens[1], gradsens[2], gradsens[0]
+    elif imageorientation == 2: Gxsens, Gysens, Gzsens = gradsens[2], gradsens[0], gradsens[1]
+    elif imageorientation == 3: Gxsens, Gysens, Gzsens = gradsens[1], gradsens[0], gradsens[2]
+    elif imageorientation == 4: Gxsens, Gysens, Gzsens = gradsens[2], gradsens[1], gradsens[0]
+    elif imageorientation == 5: Gxsens, Gysens, Gzsens = gradsens[0], gradsens[2], gradsens[1]
+
+    Gx = (4 * np.pi * receiverBW) / (2 * np.pi * 42.57 * FOV)
+    GROamplitude = int(Gx / Gxsens * 1000)
+    Gproj = (int(Gx / gradsens[0] * 1000), int(Gx / gradsens[1] * 1000), int(Gx / gradsens[2] * 1000))
+
+    if GROamplitude == 0:
+        GROpretime = 0
+        GROfcpretime1 = 0
+        GROfcpretime2 = 0
+    else:
+        GROpretime = int((TS * 1000 / 2 * GROamplitude + 200 * GROamplitude / 2 - 200 * 2 * GROamplitude) / (2 * GROamplitude) * GROpretimescaler)
+        GROfcpretime1 = int((((200 * GROamplitude + TS * 1000 * GROamplitude) / 2) - 200 * GROamplitude) / GROamplitude)
+        GROfcpretime2 = int(((200 * GROamplitude + TS * 1000 * GROamplitude) - 200 * 2 * GROamplitude) / (2 * GROamplitude) * GROpretimescaler)
+
+    GPEtime = GROpretime + 200
+    Gystep = (2 * np.pi / FOV) / (2 * np.pi * 42.57 * (GPEtime / 1000000))
+    GPEstep = int(Gystep / Gysens * 1000)
+
+    Achrusher = (4 * np.pi) / (2 * np.pi * 42.57 * slicethickness)
+    Gc = Achrusher / ((crushertime + 200) / 1000000)
+    crusheramplitude = int(Gc / Gzsens * 1000)
+
+    Aspoiler = (4 * np.pi) / (2 * np.pi * 42.57 * slicethickness)
+    Gs = Aspoiler / ((spoilertime + 200) / 1000000)
+    spoileramplitude = int(Gs / Gzsens * 1000)
+
+    Deltaf = 1 / (flippulselength) * 1000000
+
+    Gz = (2 * np.pi * Deltaf) / (2 * np.pi * 42.57 * (slicethickness))
+    GSamplitude = int(Gz / Gzsens * 1000)
+
+    Gz3D = (2 * np.pi / slicethickness) / (2 * np.pi * 42.57 * (GPEtime / 1000000))
+    GSPEstep = int(Gz3D / Gzsens * 1000)
+
+    return GROamplitude, Gproj, GROpretime, GROfcpretime1, GROfcpretime2, GPEstep, crusheramplitude, spoileramplitude, GSamplitude, GSPEstep
+
+
+class process_state(threading.local):
+    # Scratch state of the processing (buffers reused with out=, intermediate results), one per thread:
+    # the processing thread reconstructs a task while the acquisition thread runs spectra of the next one
+    def __init__(self):
+        self.kspace_masks = {}
+        self.fft = None
 
 
 class process:
@@ -34,121 +107,140 @@ class process:
         params.loadParam()
         params.loadData()
 
+        object.__setattr__(self, 'state', process_state())
+
+    def __getattr__(self, name):
+        try: return getattr(object.__getattribute__(self, 'state'), name)
+        except AttributeError: raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        setattr(object.__getattribute__(self, 'state'), name, value)
+
+    def kspace_mask(self, shape, radial=False):
+        # Boolean mask of the k-space samples set to 0 by the undersampling and cut options,
+        # None if no option is active. Cached per k-space shape and option set.
+        key = (shape, radial, params.ustime, params.ustimeidx, params.usphase, params.usphaseidx, params.usmethode, \
+               params.cutcirc, params.cutrec, params.cutcenter, params.cutoutside, params.cutcentervalue, params.cutoutsidevalue)
+        if key in self.kspace_masks: return self.kspace_masks[key]
+
+        rows = np.arange(shape[0])
+        cols = np.arange(shape[1])
+        mask = np.zeros(shape, dtype=bool)
+
+        # Keep every idx-th line (radial and usmethode 1), otherwise blocks of idx lines alternately
+        if params.ustime == 1:
+            if radial or params.usmethode == 1: mask[:, cols % params.ustimeidx != 0] = True
+            else: mask[:, cols % (2 * params.ustimeidx) >= params.ustimeidx] = True
+
+        if params.usphase == 1:
+            if radial or params.usmethode == 1: mask[rows % params.usphaseidx != 0, :] = True
+            else: mask[rows % (2 * params.usphaseidx) >= params.usphaseidx, :] = True
+
+        if params.cutcirc == 1:
+            # Radius in readout samples, phase encoding scaled to the readout length
+            r = np.sqrt((cols[np.newaxis, :] - (shape[1] / 2)) ** 2 + (rows[:, np.newaxis] * shape[1] / shape[0] - (shape[1] / 2)) ** 2)
+            if params.cutcenter == 1: mask |= r <= shape[1] / 2 * params.cutcentervalue / 100
+            if params.cutoutside == 1: mask |= r >= shape[1] / 2 * (1 - params.cutoutsidevalue / 100)
+
+        if params.cutrec == 1:
+            centerx = int(shape[1] / 2)
+            centery = int(shape[0] / 2)
+            cutcx = int(shape[1] / 2 * params.cutcentervalue / 100)
+            cutcy = int(shape[0] / 2 * params.cutcentervalue / 100)
+            cutox = int(shape[1] / 2 * params.cutoutsidevalue / 100)
+            cutoy = int(shape[0] / 2 * params.cutoutsidevalue / 100)
+
+            if params.cutcenter == 1:
+                mask[centery - cutcy:centery + cutcy, centerx - cutcx:centerx + cutcx] = True
+
+            if params.cutoutside == 1:
+                mask[0:cutoy, :] = True
+                mask[shape[0] - cutoy:shape[0], :] = True
+                mask[:, 0:cutox] = True
+                mask[:, shape[1] - cutox:shape[1]] = True
+
+        if not mask.any(): mask = None
+        else: mask.setflags(write=False)
+        self.kspace_masks[key] = mask
+        return mask
+
     def motor_move(self, motor=None):
-        if motor is not None and params.motor_actual_position != params.motor_goto_position:                     
-            print('Moving...')
-            cmd_movement_s = 'G0 ' + str(params.motor_goto_position) + '\r\n'
-            motor.write(cmd_movement_s.encode('utf-8'))
+        self.motor_move_wait(self.motor_move_start(motor=motor))
 
-            time.sleep(0.1)
-            
-            cmd_response_s = 'M118 R0: movement finished\r\n'
-            motor.write(cmd_response_s.encode('utf-8'))
-            
-            response = motor.readline()
-            while 'R0: movement finished' not in response.decode('utf8', errors='ignore'):
-                response = motor.readline()
-            
-            params.motor_actual_position = params.motor_goto_position
-            print('Moved to ' + str(params.motor_actual_position) + 'mm')
-            
-    def recalc_gradients(self):
-        self.Delta_vpp = params.frequencyrange / (250 * params.TS)
-        self.vpp = self.Delta_vpp * params.nPE
-        self.receiverBW = self.vpp / 2
-        
-        if params.imageorientation == 0:
-            self.Gxsens = params.gradsens[0]
-            self.Gysens = params.gradsens[1]
-            self.Gzsens = params.gradsens[2]
-        elif params.imageorientation == 1:
-            self.Gxsens = params.gradsens[1]
-            self.Gysens = params.gradsens[2]
-            self.Gzsens = params.gradsens[0]
-        elif params.imageorientation == 2:
-            self.Gxsens = params.gradsens[2]
-            self.Gysens = params.gradsens[0]
-            self.Gzsens = params.gradsens[1]
-        elif params.imageorientation == 3:
-            self.Gxsens = params.gradsens[1]
-            self.Gysens = params.gradsens[0]
-            self.Gzsens = params.gradsens[2]
-        elif params.imageorientation == 4:
-            self.Gxsens = params.gradsens[2]
-            self.Gysens = params.gradsens[1]
-            self.Gzsens = params.gradsens[0]
-        elif params.imageorientation == 5:
-            self.Gxsens = params.gradsens[0]
-            self.Gysens = params.gradsens[2]
-            self.Gzsens = params.gradsens[1]
-
-        self.Gx = (4 * np.pi * self.receiverBW) / (2 * np.pi * 42.57 * params.FOV)
-        params.GROamplitude = int(self.Gx / self.Gxsens * 1000)
-        
-        params.Gproj[0] = int(self.Gx / params.gradsens[0] * 1000)
-        params.Gproj[1] = int(self.Gx / params.gradsens[1] * 1000)
-        params.Gproj[2] = int(self.Gx / params.gradsens[2] * 1000)
-
-        if params.GROamplitude == 0:
-            params.GROpretime = 0
-            self.GROfcpretime1 = 0
-            self.GROfcpretime2 = 0
-        else:
-            params.GROpretime = int((params.TS * 1000 / 2 * params.GROamplitude + 200 * params.GROamplitude / 2 - 200 * 2 * params.GROamplitude) / (2 * params.GROamplitude) * params.GROpretimescaler)
-            params.GROfcpretime1 = int((((200 * params.GROamplitude + params.TS * 1000 * params.GROamplitude) / 2) - 200 * params.GROamplitude) / params.GROamplitude)
-            params.GROfcpretime2 = int(((200 * params.GROamplitude + params.TS * 1000 * params.GROamplitude) - 200 * 2 * params.GROamplitude) / (2 * params.GROamplitude) * params.GROpretimescaler)
+    def motor_move_start(self, motor=None):
+        # Sends the move and returns an event, set by a reader thread when the motor reports the end
+        # of the movement (None if there is nothing to move)
+        if motor is None or params.motor_actual_position == params.motor_goto_position: return None
+        print('Moving...')
+        cmd_movement_s = 'G0 ' + str(params.motor_goto_position) + '\r\n'
+        motor.write(cmd_movement_s.encode('utf-8'))
+
+        time.sleep(0.1)
 
-        self.GPEtime = params.GROpretime + 200
-        self.Gystep = (2 * np.pi / params.FOV) / (2 * np.pi * 42.57 * (self.GPEtime / 1000000))
-        params.GPEstep = int(self.Gystep / self.Gysens * 1000)
+        cmd_response_s = 'M118 R0: movement finished\r\n'
+        motor.write(cmd_response_s.encode('utf-8'))
 
-        self.Achrusher = (4 * np.pi) / (2 * np.pi * 42.57 * params.slicethickness)
-        self.Gc = self.Achrusher / ((params.crushertime + 200) / 1000000)
-        params.crusheramplitude = int(self.Gc / self.Gzsens * 1000)
+        moving = threading.Event()
+        moving.position = params.motor_goto_position
 
-        self.Aspoiler = (4 * np.pi) / (2 * np.pi * 42.57 * params.slicethickness)
-        self.Gs = self.Aspoiler / ((params.spoilertime + 200) / 1000000)
-        params.spoileramplitude = int(self.Gs / self.Gzsens * 1000)
+        def read():
+            response = motor.readline()
+            while 'R0: movement finished' not in response.decode('utf8', errors='ignore'):
+                response = motor.readline()
+            moving.set()
 
-        self.Deltaf = 1 / (params.flippulselength) * 1000000
+        threading.Thread(target=read, daemon=True).start()
+        return moving
 
-        self.Gz = (2 * np.pi * self.Deltaf) / (2 * np.pi * 42.57 * (params.slicethickness))
-        params.GSamplitude = int(self.Gz / self.Gzsens * 1000)
+    def motor_move_wait(self, moving):
+        if moving is None: return
+        moving.wait()
+        params.motor_actual_position = moving.position
+        print('Moved to ' + str(params.motor_actual_position) + 'mm')
 
-        self.Gz3D = (2 * np.pi / params.slicethickness) / (2 * np.pi * 42.57 * (self.GPEtime / 1000000))
-        params.GSPEstep = int(self.Gz3D / self.Gzsens * 1000)
+    def recalc_gradients(self):
+        derived = gradients(params.frequencyrange, params.TS, params.nPE, params.imageorientation, tuple(params.gradsens), params.FOV, \
+                            params.GROpretimescaler, params.slicethickness, params.crushertime, params.spoilertime, params.flippulselength)
+        params.GROamplitude, Gproj, params.GROpretime, params.GROfcpretime1, params.GROfcpretime2, params.GPEstep, \
+            params.crusheramplitude, params.spoileramplitude, params.GSamplitude, params.GSPEstep = derived
+        params.Gproj[0], params.Gproj[1], params.Gproj[2] = Gproj
         
         params.saveFileParameter()
 
     def spectrum_process(self):
-        self.procdata = np.genfromtxt(params.datapath + '.txt', dtype=np.complex64)
+        self.procdata = rawdata.load(params.datapath, dtype=np.complex64)
         self.procdata = np.transpose(self.procdata)
         params.timeaxis = np.real(self.procdata[0, :])
         params.spectrumdata = self.procdata[1:self.procdata.shape[0], :]
 
         self.data_idx = params.spectrumdata.shape[1]
 
+        # Means over the averages, real and imaginary part from one complex mean
         params.mag = np.mean(np.abs(params.spectrumdata), axis=0)
-        params.real = np.mean(np.real(params.spectrumdata), axis=0)
-        params.imag = np.mean(np.imag(params.spectrumdata), axis=0)
+        self.mean = np.mean(params.spectrumdata, axis=0)
+        params.real = np.real(self.mean)
+        params.imag = np.imag(self.mean)
 
         params.freqencyaxis = np.linspace(-params.frequencyrange / 2, params.frequencyrange / 2, self.data_idx)
 
         print(params.spectrumdata.shape)
-        
-        self.fft = np.matrix(np.zeros((params.spectrumdata.shape[0], params.spectrumdata.shape[1]), dtype=np.complex64))
-        
-        for m in range(params.spectrumdata.shape[0]):
-            self.fft[m, :] = np.fft.fftshift(np.fft.fft(np.fft.fftshift(params.spectrumdata[m, :]), n=self.data_idx, norm='ortho'))
-        
-        if params.average_complex == 1: params.spectrumfft = np.transpose(abs(np.mean(self.fft, axis=0)))
-        else: params.spectrumfft = np.transpose(np.mean(abs(self.fft), axis=0))
+
+        # All averages in one transform, buffers are kept while the data shape is unchanged
+        if self.fft is None or self.fft.shape != params.spectrumdata.shape:
+            self.fft = np.zeros(params.spectrumdata.shape, dtype=np.complex64)
+            self.fft_abs = np.zeros(params.spectrumdata.shape, dtype=np.float32)
+
+        ft.fft(params.spectrumdata, norm='ortho', out=self.fft)
+
+        # Column vector like the former np.matrix result
+        if params.average_complex == 1: params.spectrumfft = np.abs(np.mean(self.fft, axis=0)).reshape(-1, 1)
+        else: params.spectrumfft = np.mean(np.abs(self.fft, out=self.fft_abs), axis=0).reshape(-1, 1)
 
         print('Spectrum data processed!')
 
     def image_process(self):
         # Load kspace from file
-        self.procdata = np.genfromtxt(params.datapath + '.txt', dtype=np.complex64)
+        self.procdata = rawdata.load(params.datapath, dtype=np.complex64)
         params.kspace = np.transpose(self.procdata)
 
         self.kspace_centerx = int(params.kspace.shape[1] / 2)
@@ -156,74 +248,14 @@ class process:
 
         print('k-Space shape: ', params.kspace.shape)
 
-        # Undersampling (Option)
-        if params.ustime == 1:
-            if params.usmethode == 1:
-                for n in range(params.kspace.shape[1]):
-                    if n % params.ustimeidx != 0:
-                        params.kspace[:, n] = 0
-            else:
-                m = 0
-                for n in range(params.kspace.shape[1]):
-                    if m < params.ustimeidx:
-                        m = m + 1
-                    elif m >= params.ustimeidx and m < 2*params.ustimeidx:
-                        params.kspace[:, n] = 0
-                        m = m + 1
-                    else: m = 1
-
-        if params.usphase == 1:
-            if params.usmethode == 1:
-                for n in range(params.kspace.shape[0]):
-                    if n % params.usphaseidx != 0:
-                        params.kspace[n, :] = 0
-            else:
-                m = 0
-                for n in range(params.kspace.shape[0]):
-                    if m < params.usphaseidx:
-                        m = m + 1
-                    elif m >= params.usphaseidx and m < 2*params.usphaseidx:
-                        params.kspace[n, :] = 0
-                        m = m + 1
-                    else: m = 1
-
-        if params.cutcirc == 1:
-            # Set kSpace to 0 (Option)
-            self.cutc = params.kspace.shape[1] / 2 * params.cutcentervalue / 100
-            self.cuto = params.kspace.shape[1] / 2 * (1 - params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) <= self.cutc:
-                            params.kspace[jj, ii] = 0
-
-            if params.cutoutside == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) >= self.cuto:
-                            params.kspace[jj, ii] = 0
-
-        if params.cutrec == 1:
-            # Set kSpace to 0 (Option)
-            self.cutcx = int(params.kspace.shape[1] / 2 * params.cutcentervalue / 100)
-            self.cutcy = int(params.kspace.shape[0] / 2 * params.cutcentervalue / 100)
-            self.cutox = int(params.kspace.shape[1] / 2 * params.cutoutsidevalue / 100)
-            self.cutoy = int(params.kspace.shape[0] / 2 * params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                params.kspace[self.kspace_centery - self.cutcy:self.kspace_centery + self.cutcy, self.kspace_centerx - self.cutcx:self.kspace_centerx + self.cutcx] = 0
-
-            if params.cutoutside == 1:
-                params.kspace[0:self.cutoy, :] = 0
-                params.kspace[params.kspace.shape[0] - self.cutoy:params.kspace.shape[0], :] = 0
-                params.kspace[:, 0:self.cutox] = 0
-                params.kspace[:, params.kspace.shape[1] - self.cutox:params.kspace.shape[1]] = 0
+        # Undersampling and k-space cut (Option)
+        self.zeromask = self.kspace_mask(params.kspace.shape)
+        if self.zeromask is not None: np.putmask(params.kspace, self.zeromask, 0)
 
         # Image calculations
         self.k_amp_full = np.abs(params.kspace)
         self.k_pha_full = np.angle(params.kspace)
-        I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(params.kspace)))
+        I = ft.fft2(params.kspace)
         self.img_mag_full = np.abs(I)
         self.img_pha_full = np.angle(I)
 
@@ -238,7 +270,7 @@ class process:
 
     def image_3D_process(self):
         # Load kspace from file
-        self.procdata = np.genfromtxt(params.datapath + '.txt', dtype=np.complex64)
+        self.procdata = rawdata.load(params.datapath, dtype=np.complex64)
         self.kspace_temp = np.transpose(self.procdata)
 
         params.kspace = np.array(np.zeros((params.SPEsteps, int(self.kspace_temp.shape[0] / params.SPEsteps), int(self.kspace_temp.shape[1])), dtype=np.complex64))
@@ -255,7 +287,7 @@ class process:
         # Image calculations
         self.k_amp_full = np.abs(params.kspace)
         self.k_pha_full = np.angle(params.kspace)
-        I = np.fft.fftshift(np.fft.fftn(np.fft.fftshift(params.kspace)))
+        I = ft.fftn(params.kspace)
         self.img_mag_full = np.abs(I)
         self.img_pha_full = np.angle(I)
 
@@ -270,81 +302,21 @@ class process:
 
     def image_diff_process(self):
         # Load kspace from file
-        self.procdata_temp = np.genfromtxt(params.datapath + '.txt', dtype=np.complex64)
+        self.procdata_temp = rawdata.load(params.datapath, dtype=np.complex64)
         self.procdata = self.procdata_temp[:, 0:int(self.procdata_temp.shape[1] / 2)]
         params.kspace = np.transpose(self.procdata)
 
         self.kspace_centerx = int(params.kspace.shape[1] / 2)
         self.kspace_centery = int(params.kspace.shape[0] / 2)
 
-        # Undersampling (Option)
-        if params.ustime == 1:
-            if params.usmethode == 1:
-                for n in range(params.kspace.shape[1]):
-                    if n % params.ustimeidx != 0:
-                        params.kspace[:, n] = 0
-            else:
-                m = 0
-                for n in range(params.kspace.shape[1]):
-                    if m < params.ustimeidx:
-                        m = m + 1
-                    elif m >= params.ustimeidx and m < 2*params.ustimeidx:
-                        params.kspace[:, n] = 0
-                        m = m + 1
-                    else: m = 1
-
-        if params.usphase == 1:
-            if params.usmethode == 1:
-                for n in range(params.kspace.shape[0]):
-                    if n % params.usphaseidx != 0:
-                        params.kspace[n, :] = 0
-            else:
-                m = 0
-                for n in range(params.kspace.shape[0]):
-                    if m < params.usphaseidx:
-                        m = m + 1
-                    elif m >= params.usphaseidx and m < 2*params.usphaseidx:
-                        params.kspace[n, :] = 0
-                        m = m + 1
-                    else: m = 1
-
-        if params.cutcirc == 1:
-            # Set kSpace to 0 (Option)
-            self.cutc = params.kspace.shape[1] / 2 * params.cutcentervalue / 100
-            self.cuto = params.kspace.shape[1] / 2 * (1 - params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) <= self.cutc:
-                            params.kspace[jj, ii] = 0
-
-            if params.cutoutside == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) >= self.cuto:
-                            params.kspace[jj, ii] = 0
-
-        if params.cutrec == 1:
-            # Set kSpace to 0 (Option)
-            self.cutcx = int(params.kspace.shape[1] / 2 * params.cutcentervalue / 100)
-            self.cutcy = int(params.kspace.shape[0] / 2 * params.cutcentervalue / 100)
-            self.cutox = int(params.kspace.shape[1] / 2 * params.cutoutsidevalue / 100)
-            self.cutoy = int(params.kspace.shape[0] / 2 * params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                params.kspace[self.kspace_centery - self.cutcy:self.kspace_centery + self.cutcy, self.kspace_centerx - self.cutcx:self.kspace_centerx + self.cutcx] = 0
-
-            if params.cutoutside == 1:
-                params.kspace[0:self.cutoy, :] = 0
-                params.kspace[params.kspace.shape[0] - self.cutoy:params.kspace.shape[0], :] = 0
-                params.kspace[:, 0:self.cutox] = 0
-                params.kspace[:, params.kspace.shape[1] - self.cutox:params.kspace.shape[1]] = 0
+        # Undersampling and k-space cut (Option)
+        self.zeromask = self.kspace_mask(params.kspace.shape)
+        if self.zeromask is not None: np.putmask(params.kspace, self.zeromask, 0)
 
         # Image calculations
         self.k_amp_full = np.abs(params.kspace)
         self.k_pha_full = np.angle(params.kspace)
-        I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(params.kspace)))
+        I = ft.fft2(params.kspace)
         self.img_mag_full = np.abs(I)
         self.img_pha_full = np.angle(I)
 
@@ -356,79 +328,19 @@ class process:
         params.img_pha = self.img_pha_full[:, self.kspace_centerx - int(params.kspace.shape[0] / 2 * params.ROBWscaler):self.kspace_centerx + int(params.kspace.shape[0] / 2 * params.ROBWscaler)]
 
         # Load diff kspace from file
-        self.procdata_temp = np.genfromtxt(params.datapath + '.txt', dtype=np.complex64)
+        self.procdata_temp = rawdata.load(params.datapath, dtype=np.complex64)
         self.procdata = self.procdata_temp[:, int(self.procdata_temp.shape[1] / 2):int(self.procdata_temp.shape[1])]
         self.kspacediff = np.transpose(self.procdata)
         print(self.kspacediff.shape)
 
-        # Undersampling (Option)
-        if params.ustime == 1:
-            if params.usmethode == 1:
-                for n in range(params.kspace.shape[1]):
-                    if n % params.ustimeidx != 0:
-                        params.kspace[:, n] = 0
-            else:
-                m = 0
-                for n in range(params.kspace.shape[1]):
-                    if m < params.ustimeidx:
-                        m = m + 1
-                    elif m >= params.ustimeidx and m < 2*params.ustimeidx:
-                        params.kspace[:, n] = 0
-                        m = m + 1
-                    else: m = 1
-
-        if params.usphase == 1:
-            if params.usmethode == 1:
-                for n in range(params.kspace.shape[0]):
-                    if n % params.usphaseidx != 0:
-                        params.kspace[n, :] = 0
-            else:
-                m = 0
-                for n in range(params.kspace.shape[0]):
-                    if m < params.usphaseidx:
-                        m = m + 1
-                    elif m >= params.usphaseidx and m < 2*params.usphaseidx:
-                        params.kspace[n, :] = 0
-                        m = m + 1
-                    else: m = 1
-
-        if params.cutcirc == 1:
-            # Set kSpace to 0 (Option)
-            self.cutc = params.kspace.shape[1] / 2 * params.cutcentervalue / 100
-            self.cuto = params.kspace.shape[1] / 2 * (1 - params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) <= self.cutc:
-                            params.kspace[jj, ii] = 0
-
-            if params.cutoutside == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) >= self.cuto:
-                            params.kspace[jj, ii] = 0
-
-        if params.cutrec == 1:
-            # Set kSpace to 0 (Option)
-            self.cutcx = int(params.kspace.shape[1] / 2 * params.cutcentervalue / 100)
-            self.cutcy = int(params.kspace.shape[0] / 2 * params.cutcentervalue / 100)
-            self.cutox = int(params.kspace.shape[1] / 2 * params.cutoutsidevalue / 100)
-            self.cutoy = int(params.kspace.shape[0] / 2 * params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                params.kspace[self.kspace_centery - self.cutcy:self.kspace_centery + self.cutcy, self.kspace_centerx - self.cutcx:self.kspace_centerx + self.cutcx] = 0
-
-            if params.cutoutside == 1:
-                params.kspace[0:self.cutoy, :] = 0
-                params.kspace[params.kspace.shape[0] - self.cutoy:params.kspace.shape[0], :] = 0
-                params.kspace[:, 0:self.cutox] = 0
-                params.kspace[:, params.kspace.shape[1] - self.cutox:params.kspace.shape[1]] = 0
+        # Undersampling and k-space cut (Option)
+        self.zeromask = self.kspace_mask(params.kspace.shape)
+        if self.zeromask is not None: np.putmask(params.kspace, self.zeromask, 0)
 
         # Image calculations
         self.k_amp_full = np.abs(self.kspacediff)
         self.k_pha_full = np.angle(self.kspacediff)
-        I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(self.kspacediff)))
+        I = ft.fft2(self.kspacediff)
         self.img_mag_full = np.abs(I)
         self.img_pha_full = np.angle(I)
 
@@ -448,62 +360,29 @@ class process:
 
     def radial_process(self):
         # Load kspace from file
-        self.procdata = np.genfromtxt(params.datapath + '.txt', dtype=np.complex64)
+        self.procdata = rawdata.load(params.datapath, dtype=np.complex64)
         params.kspace = np.transpose(self.procdata)
 
+        # Gridding reconstruction of the raw spokes if saved, else the nearest pixel k-space from the file
+        if rawdata.exists(params.datapath + '_Spokes'):
+            head = rawdata.header(params.datapath + '_Spokes')
+            if grid.size(head['nPE'], head['radialosfactor'], head['half']) == params.kspace.shape[0]:
+                self.spokes = rawdata.load(params.datapath + '_Spokes', dtype=np.complex64).reshape(-1, int(head['nPE'] * head['radialosfactor']))
+                params.kspace = grid.kspace(grid.reconstruct(self.spokes, head['nPE'], head['radialosfactor'], head['radialanglestep'], head['half']))
+
         self.kspace_centerx = int(params.kspace.shape[1] / 2)
         self.kspace_centery = int(params.kspace.shape[0] / 2)
 
         print('kspace shape', params.kspace.shape)
 
-        # Undersampling (Option)
-        if params.ustime == 1:
-            for n in range(params.kspace.shape[1]):
-                if n % params.ustimeidx != 0:
-                    params.kspace[:, n] = 0
-
-        if params.usphase == 1:
-            for n in range(params.kspace.shape[0]):
-                if n % params.usphaseidx != 0:
-                    params.kspace[n, :] = 0
-
-        if params.cutcirc == 1:
-            # Set kSpace to 0 (Option)
-            self.cutc = params.kspace.shape[1] / 2 * params.cutcentervalue / 100
-            self.cuto = params.kspace.shape[1] / 2 * (1 - params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) <= self.cutc:
-                            params.kspace[jj, ii] = 0
-
-            if params.cutoutside == 1:
-                for ii in range(params.kspace.shape[1]):
-                    for jj in range(params.kspace.shape[0]):
-                        if np.sqrt((ii - (params.kspace.shape[1] / 2)) ** 2 + (jj * params.kspace.shape[1] / params.kspace.shape[0] - (params.kspace.shape[1] / 2)) ** 2) >= self.cuto:
-                            params.kspace[jj, ii] = 0
-
-        if params.cutrec == 1:
-            # Set kSpace to 0 (Option)
-            self.cutcx = int(params.kspace.shape[1] / 2 * params.cutcentervalue / 100)
-            self.cutcy = int(params.kspace.shape[0] / 2 * params.cutcentervalue / 100)
-            self.cutox = int(params.kspace.shape[1] / 2 * params.cutoutsidevalue / 100)
-            self.cutoy = int(params.kspace.shape[0] / 2 * params.cutoutsidevalue / 100)
-
-            if params.cutcenter == 1:
-                params.kspace[self.kspace_centery - self.cutcy:self.kspace_centery + self.cutcy, self.kspace_centerx - self.cutcx:self.kspace_centerx + self.cutcx] = 0
-
-            if params.cutoutside == 1:
-                params.kspace[0:self.cutoy, :] = 0
-                params.kspace[params.kspace.shape[0] - self.cutoy:params.kspace.shape[0], :] = 0
-                params.kspace[:, 0:self.cutox] = 0
-                params.kspace[:, params.kspace.shape[1] - self.cutox:params.kspace.shape[1]] = 0
+        # Undersampling and k-space cut (Option)
+        self.zeromask = self.kspace_mask(params.kspace.shape, radial=True)
+        if self.zeromask is not None: np.putmask(params.kspace, self.zeromask, 0)
 
         # Image calculations
         self.k_amp_full = np.abs(params.kspace)
         self.k_pha_full = np.angle(params.kspace)
-        I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(params.kspace)))
+        I = ft.fft2(params.kspace)
         self.img_mag_full = np.abs(I)
         self.img_pha_full = np.angle(I)
 
@@ -518,743 +397,246 @@ class process:
 
         print('Image data processed!')
 
-    def image_stitching_2D_GRE(self, motor=None):
-        print('Measuring stitched images 2D GRE...')
-        
-        if os.path.isdir(params.datapath) != True: os.mkdir(params.datapath)
-        else:
-            shutil.rmtree(params.datapath)
-            os.mkdir(params.datapath)
-            
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        params.datapath = params.datapath + '/Image_Stitching'
-        self.motor_goto_position_temp = 0
-        self.motor_goto_position_temp = params.motor_goto_position
-        
-        motor_positions = np.linspace(params.motor_start_position, params.motor_end_position, num=params.motor_image_count)
-        
-        self.estimated_time = params.motor_image_count*params.motor_settling_time*1000 + params.motor_image_count*params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        if params.headerfileformat == 0: params.save_header_file_txt()
-        else: params.save_header_file_json()
-        
-        if params.autorecenter == 1:
-            params.motor_goto_position = params.motor_AC_position
-            self.motor_move(motor=motor)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Settling for Autocenter...')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep(params.motor_settling_time)
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            params.motor_current_image_count = 0
-            
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                params.motor_current_image_count = n
-                                
-                if n > 0 and params.motor_AC_inbetween and (n)%params.motor_AC_inbetween_step == 0:
-                    params.motor_goto_position = params.motor_AC_position
-                    self.motor_move(motor=motor)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Settling for Autocenter...')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep(params.motor_settling_time)
-                    self.frequencyoffset_temp = 0
-                    self.frequencyoffset_temp = params.frequencyoffset
-                    params.frequencyoffset = 0
-                    seq.RXconfig_upload()
-                    seq.Gradients_upload()
-                    seq.Frequency_upload()
-                    seq.RFattenuation_upload()
-                    seq.FID_setup()
-                    seq.Sequence_upload()
-                    seq.acquire_spectrum_FID()
-                    proc.spectrum_process()
-                    proc.spectrum_analytics()
-                    params.frequency = params.centerfrequency
-                    params.frequencyoffset = self.frequencyoffset_temp
-                    params.saveFileParameter()
-                    print('Autorecenter to:', params.frequency)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
+    def projection_reconstruction(self, update=None):
+        # Angled projections (projection sequences 2, 3, 6, 7 or the projection reconstruction sequences 8 - 11)
+        # over 180° in radial angle steps, back-projected while sweeping in bit reversed angle order.
+        # update() is called with params.img_mag after every angle.
+        print('Measuring projection reconstruction...')
 
-                #time.sleep(params.TR / 1000)
+        if params.sequence == 2 or params.sequence == 8: setup, acquire = seq.Image_GRE_setup, seq.acquire_projection_GRE_angle
+        elif params.sequence == 3 or params.sequence == 9: setup, acquire = seq.Image_SE_setup, seq.acquire_projection_SE_angle
+        elif params.sequence == 6 or params.sequence == 10: setup, acquire = seq.Image_GRE_Gs_setup, seq.acquire_projection_GRE_angle_Gs
+        elif params.sequence == 7 or params.sequence == 11: setup, acquire = seq.Image_SE_Gs_setup, seq.acquire_projection_SE_angle_Gs
         else:
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
+            print('Sequence has no projection angle!')
+            return
+
+        self.datapathtemp = params.datapath
+        self.projectionangle_temp = params.projectionangle
+        self.projectionangleradmod100_temp = params.projectionangleradmod100
+
+        # Angles as sent to the sequencer (0.01 rad steps), projection cut to the image readout range
+        self.PRangles = grid.angles(params.radialanglestep, half=False)
+        self.PRwidth = int(params.nPE * params.ROBWscaler)
+        self.sinogram = np.zeros((self.PRangles.shape[0], self.PRwidth))
+        bp.start(self.PRwidth, params.nPE, scale=self.PRwidth / params.nPE)
+
+        seq.RXconfig_upload()
+        seq.Gradients_upload()
+        seq.Frequency_upload()
+        seq.RFattenuation_upload()
+        setup()
+        seq.Sequence_upload()
 
-                seq.sequence_upload()
+        params.datapath = self.datapathtemp + '_Projection'
+        schedule = scheduler.start(params.TR)
+        for k, n in enumerate(bp.order(self.PRangles.shape[0])):
+            print(k + 1, '/', self.PRangles.shape[0])
+            params.projectionangleradmod100 = int(round(self.PRangles[n] * 100))
+            params.projectionangle = math.degrees(self.PRangles[n])
+            acquire()
+            self.spectrum_process()
+            self.sinogram[n, :] = self.projection_profile(self.PRwidth)
+
+            bp.add(self.PRangles[n], self.sinogram[n, :])
+            params.img_mag = bp.image()
+            if update is not None: update()
+            schedule.wait()
+        schedule.finish()
+
+        params.datapath = self.datapathtemp
+        params.projectionangle = self.projectionangle_temp
+        params.projectionangleradmod100 = self.projectionangleradmod100_temp
+
+        rawdata.save(params.datapath + '_Sinogram', self.sinogram, {'angles': self.PRangles.tolist(), 'nPE': params.nPE})
+
+        print('Projection reconstruction acquired!')
+
+    def projection_profile(self, width):
+        # Magnitude projection (mean over the averages) around the centre frequency
+        centre = params.spectrumfft.shape[0] // 2
+        profile = np.zeros(width)
+        lower = max(centre - width // 2, 0)
+        upper = min(centre - width // 2 + width, params.spectrumfft.shape[0])
+        profile[lower - (centre - width // 2):upper - (centre - width // 2)] = np.asarray(params.spectrumfft).ravel()[lower:upper]
+        return profile
+
+    def projection_reconstruction_process(self):
+        # Filtered back-projection of the saved sinogram (angles x samples)
+        head = rawdata.header(params.datapath + '_Sinogram')
+        self.sinogram = rawdata.load(params.datapath + '_Sinogram', dtype=np.float64).reshape(len(head['angles']), -1)
+
+        params.img_mag = bp.reconstruct(self.sinogram, np.array(head['angles']), head['nPE'], scale=self.sinogram.shape[1] / head['nPE'])
+        params.img_pha = np.zeros(params.img_mag.shape)
+        params.img = params.img_mag.astype(np.complex64)
+        params.k_amp = self.sinogram # Sinogram in place of the k-space plots
+        params.k_pha = np.zeros(self.sinogram.shape)
 
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-                
-        os.remove(self.datapath_temp + '/Image_Stitching.txt')
+        print(params.img_mag.shape)
 
-        params.datapath = self.datapath_temp
-        params.motor_goto_position = self.motor_goto_position_temp
-        self.motor_move(motor=motor)
+        print('Projection reconstruction processed!')
 
+    def image_stitching_2D_GRE(self, motor=None):
+        print('Measuring stitched images 2D GRE...')
+        self.image_stitching_scan(motor, seq.FID_setup, seq.acquire_spectrum_FID, \
+                                  params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR))
         print('Stitched images acquired!')
 
     def image_stitching_2D_SE(self, motor=None):
         print('Measuring stitched images 2D SE...')
-        
+        self.image_stitching_scan(motor, seq.SE_setup, seq.acquire_spectrum_SE, \
+                                  params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR))
+        print('Stitched images acquired!')
+
+    def image_stitching_2D_GRE_slice(self, motor=None):
+        print('Measuring stitched images 2D GRE slice...')
+        self.image_stitching_scan(motor, seq.FID_Gs_setup, seq.acquire_spectrum_FID_Gs, \
+                                  params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR))
+        print('Stitched slice images acquired!')
+
+    def image_stitching_2D_SE_slice(self, motor=None):
+        print('Measuring stitched images 2D SE slice...')
+        self.image_stitching_scan(motor, seq.SE_Gs_setup, seq.acquire_spectrum_SE_Gs, \
+                                  params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR))
+        print('Stitched slice images acquired!')
+
+    def image_stitching_scan(self, motor, AC_setup, AC_acquire, position_time, SPEsteps=0, AC_inbetween=True):
+        # Pipelined stitching scan: after each acquisition the motor starts moving to the next position,
+        # the position is reconstructed (stitch.prefetch) and written in the background meanwhile.
+        # The next acquisition starts when the motor reports the end of the move and has settled.
+        # AC_setup / AC_acquire: autorecenter FID, position_time: acquisition time per position [ms]
         if os.path.isdir(params.datapath) != True: os.mkdir(params.datapath)
         else:
             shutil.rmtree(params.datapath)
             os.mkdir(params.datapath)
-            
+
         self.datapath_temp = ''
         self.datapath_temp = params.datapath
         params.datapath = params.datapath + '/Image_Stitching'
         self.motor_goto_position_temp = 0
         self.motor_goto_position_temp = params.motor_goto_position
-        
+
         motor_positions = np.linspace(params.motor_start_position, params.motor_end_position, num=params.motor_image_count)
-        
-        self.estimated_time = params.motor_image_count*params.motor_settling_time*1000 + params.motor_image_count*params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
+
+        self.estimated_time = params.motor_image_count*params.motor_settling_time*1000 + params.motor_image_count*position_time
+
         if params.headerfileformat == 0: params.save_header_file_txt()
         else: params.save_header_file_json()
-                
+
         if params.autorecenter == 1:
             params.motor_goto_position = params.motor_AC_position
             self.motor_move(motor=motor)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Settling for Autocenter...')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep(params.motor_settling_time)
-            
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            params.motor_current_image_count = 0
-                        
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                params.motor_current_image_count = n
-                
-                if n > 0 and params.motor_AC_inbetween and (n)%params.motor_AC_inbetween_step == 0:
-                    params.motor_goto_position = params.motor_AC_position
-                    self.motor_move(motor=motor)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Settling for Autocenter...')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep(params.motor_settling_time)
-                    self.frequencyoffset_temp = 0
-                    self.frequencyoffset_temp = params.frequencyoffset
-                    params.frequencyoffset = 0
-                    seq.RXconfig_upload()
-                    seq.Gradients_upload()
-                    seq.Frequency_upload()
-                    seq.RFattenuation_upload()
-                    seq.SE_setup()
-                    seq.Sequence_upload()
-                    seq.acquire_spectrum_SE()
-                    proc.spectrum_process()
-                    proc.spectrum_analytics()
-                    params.frequency = params.centerfrequency
-                    params.frequencyoffset = self.frequencyoffset_temp
-                    params.saveFileParameter()
-                    print('Autorecenter to:', params.frequency)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
+            self.image_stitching_settle('Settling for Autocenter...')
+            self.image_stitching_autorecenter(AC_setup, AC_acquire)
 
-                seq.sequence_upload()
+        params.motor_current_image_count = 0
+        stitch.tiles.clear()
+        background = ThreadPoolExecutor(1)
 
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-                
-        else:
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                
-                params.motor_goto_position = motor_positions[n]
+        params.motor_goto_position = motor_positions[0]
+        moving = self.motor_move_start(motor=motor)
+
+        for n in range(params.motor_image_count):
+            params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
+            params.motor_current_image_count = n
+
+            if params.autorecenter == 1 and AC_inbetween and n > 0 and params.motor_AC_inbetween and (n)%params.motor_AC_inbetween_step == 0:
+                self.motor_move_wait(moving)
+                params.motor_goto_position = params.motor_AC_position
                 self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
+                self.image_stitching_settle('Settling for Autocenter...')
+                self.image_stitching_autorecenter(AC_setup, AC_acquire)
+                params.motor_goto_position = motor_positions[n]
+                moving = self.motor_move_start(motor=motor)
 
-                seq.sequence_upload()
+            self.motor_move_wait(moving)
+
+            print('Position: ', n + 1, '/', params.motor_image_count)
+
+            self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*position_time) / 1000
+            self.remaining_time_h = math.floor(self.remaining_time / (3600))
+            self.remaining_time_min = math.floor(self.remaining_time / 60)
+            self.remaining_time_s = int(self.remaining_time % 60)
+            self.image_stitching_settle('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
+
+            seq.sequence_upload()
+
+            # Header of this position before the next move changes the goto position
+            if params.headerfileformat == 0: params.save_header_file_txt()
+            else: params.save_header_file_json()
 
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
+            # Next move right after the acquisition (unless an autorecenter comes first), the
+            # reconstruction of this position and the file writes run during the move
+            if n + 1 < params.motor_image_count and not (params.autorecenter == 1 and AC_inbetween and params.motor_AC_inbetween and (n + 1)%params.motor_AC_inbetween_step == 0):
+                params.motor_goto_position = motor_positions[n + 1]
+                moving = self.motor_move_start(motor=motor)
+            else: moving = None
 
-        os.remove(self.datapath_temp + '/Image_Stitching.txt')
-
-        params.datapath = self.datapath_temp
-        params.motor_goto_position = self.motor_goto_position_temp
-        self.motor_move(motor=motor)
-        
-        print('Stitched images acquired!')
-        
-    def image_stitching_2D_GRE_slice(self, motor=None):
-        print('Measuring stitched images 2D GRE slice...')
-        
-        if os.path.isdir(params.datapath) != True: os.mkdir(params.datapath)
-        else:
-            shutil.rmtree(params.datapath)
-            os.mkdir(params.datapath)
-            
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        params.datapath = params.datapath + '/Image_Stitching'
-        self.motor_goto_position_temp = 0
-        self.motor_goto_position_temp = params.motor_goto_position
-
-        motor_positions = np.linspace(params.motor_start_position, params.motor_end_position, num=params.motor_image_count)
-        
-        self.estimated_time = params.motor_image_count*params.motor_settling_time*1000 + params.motor_image_count*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        if params.headerfileformat == 0: params.save_header_file_txt()
-        else: params.save_header_file_json()
-                
-        if params.autorecenter == 1:
-            params.motor_goto_position = params.motor_AC_position
-            self.motor_move(motor=motor)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Settling for Autocenter...')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep(params.motor_settling_time)
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            params.motor_current_image_count = 0
-            
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                params.motor_current_image_count = n
-                
-                if n > 0 and params.motor_AC_inbetween and (n)%params.motor_AC_inbetween_step == 0:
-                    params.motor_goto_position = params.motor_AC_position
-                    self.motor_move(motor=motor)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Settling for Autocenter...')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep(params.motor_settling_time)
-                    self.frequencyoffset_temp = 0
-                    self.frequencyoffset_temp = params.frequencyoffset
-                    params.frequencyoffset = 0
-                    seq.RXconfig_upload()
-                    seq.Gradients_upload()
-                    seq.Frequency_upload()
-                    seq.RFattenuation_upload()
-                    seq.FID_Gs_setup()
-                    seq.Sequence_upload()
-                    seq.acquire_spectrum_FID_Gs()
-                    proc.spectrum_process()
-                    proc.spectrum_analytics()
-                    params.frequency = params.centerfrequency
-                    params.frequencyoffset = self.frequencyoffset_temp
-                    params.saveFileParameter()
-                    print('Autorecenter to:', params.frequency)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-
-                #time.sleep(params.TR / 1000)
-        else:
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-                
-        os.remove(self.datapath_temp + '/Image_Stitching.txt')
-
-        params.datapath = self.datapath_temp
-        params.motor_goto_position = self.motor_goto_position_temp
-        self.motor_move(motor=motor)
-
-        print('Stitched slice images acquired!')
-        
-    def image_stitching_2D_SE_slice(self, motor=None):
-        print('Measuring stitched images 2D SE slice...')
-        
-        if os.path.isdir(params.datapath) != True: os.mkdir(params.datapath)
-        else:
-            shutil.rmtree(params.datapath)
-            os.mkdir(params.datapath)
-            
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        params.datapath = params.datapath + '/Image_Stitching'
-        self.motor_goto_position_temp = 0
-        self.motor_goto_position_temp = params.motor_goto_position
-
-        motor_positions = np.linspace(params.motor_start_position, params.motor_end_position, num=params.motor_image_count)
-
-        self.estimated_time = params.motor_image_count*params.motor_settling_time*1000 + params.motor_image_count*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        if params.headerfileformat == 0: params.save_header_file_txt()
-        else: params.save_header_file_json()
-                
-        if params.autorecenter == 1:
-            params.motor_goto_position = params.motor_AC_position
-            self.motor_move(motor=motor)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Settling for Autocenter...')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep(params.motor_settling_time)
-            
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            params.motor_current_image_count = 0
-            
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                params.motor_current_image_count = n
-                
-                if n > 0 and params.motor_AC_inbetween and (n)%params.motor_AC_inbetween_step == 0:
-                    params.motor_goto_position = params.motor_AC_position
-                    self.motor_move(motor=motor)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Settling for Autocenter...')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep(params.motor_settling_time)
-                    self.frequencyoffset_temp = 0
-                    self.frequencyoffset_temp = params.frequencyoffset
-                    params.frequencyoffset = 0
-                    seq.RXconfig_upload()
-                    seq.Gradients_upload()
-                    seq.Frequency_upload()
-                    seq.RFattenuation_upload()
-                    seq.SE_Gs_setup()
-                    seq.Sequence_upload()
-                    seq.acquire_spectrum_SE_Gs()
-                    proc.spectrum_process()
-                    proc.spectrum_analytics()
-                    params.frequency = params.centerfrequency
-                    params.frequencyoffset = self.frequencyoffset_temp
-                    params.saveFileParameter()
-                    print('Autorecenter to:', params.frequency)
-                    if params.measurement_time_dialog == 1:
-                        msg_box = QMessageBox()
-                        msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                        msg_box.setStandardButtons(QMessageBox.Ok)
-                        msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                        msg_box.button(QMessageBox.Ok).hide()
-                        msg_box.exec()
-                    else: time.sleep((params.TR-100)/1000)
-                    time.sleep(0.1)
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-
-                #time.sleep(params.TR / 1000)
-        else:
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-
-        os.remove(self.datapath_temp + '/Image_Stitching.txt')
+            if SPEsteps > 0: background.submit(stitch.prefetch, params.datapath, SPEsteps, params.ROBWscaler)
+            else: background.submit(stitch.prefetch, params.datapath, 0, params.ROBWscaler, self.kspace_mask(np.transpose(rawdata.load(params.datapath, dtype=np.complex64)).shape))
+
+        background.shutdown(wait=True)
+        rawdata.remove(self.datapath_temp + '/Image_Stitching')
 
         params.datapath = self.datapath_temp
         params.motor_goto_position = self.motor_goto_position_temp
         self.motor_move(motor=motor)
 
-        print('Stitched slice images acquired!')
+    def image_stitching_settle(self, text):
+        scheduler.pause(params.motor_settling_time, text)
+
+    def image_stitching_autorecenter(self, setup, acquire):
+        schedule = scheduler.start(params.TR)
+        self.frequencyoffset_temp = 0
+        self.frequencyoffset_temp = params.frequencyoffset
+        params.frequencyoffset = 0
+        seq.RXconfig_upload()
+        seq.Gradients_upload()
+        seq.Frequency_upload()
+        seq.RFattenuation_upload()
+        setup()
+        seq.Sequence_upload()
+        acquire()
+        proc.spectrum_process()
+        proc.spectrum_analytics()
+        params.frequency = params.centerfrequency
+        params.frequencyoffset = self.frequencyoffset_temp
+        params.saveFileParameter()
+        print('Autorecenter to:', params.frequency)
+        schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+        schedule.finish()
 
     def image_stitching_2D_process(self):
         self.datapath_temp = ''
         self.datapath_temp = params.datapath
 
+        # Positions in stitching order, shift per position in pixels along the stitching axis
+        self.stitching_paths = [self.datapath_temp + '/Image_Stitching_' + str(n + 1) for n in range(params.motor_image_count)]
         if params.imageorientation == 'XY' or params.imageorientation == 'ZY':
             print('Processing XY or ZY')
+            if params.motor_movement_step <= 0: self.stitching_paths.reverse()
+            self.stitching_axis = 0
             self.imagecrop_image_pixel = int((params.nPE * params.motor_movement_step) / params.FOV)
-            self.imagecrop_total_pixel = int(self.imagecrop_image_pixel * params.motor_image_count)
-            self.imageexp_total_pixel = (self.imagecrop_image_pixel * (params.motor_image_count - 1) + params.nPE)
-
-            if params.motor_movement_step <= params.FOV:
-                params.img_st = np.array(np.zeros((self.imagecrop_total_pixel, params.nPE), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((self.imagecrop_total_pixel, params.nPE)))
-                params.img_st_pha = np.array(np.zeros((self.imagecrop_total_pixel, params.nPE)))
-            else:
-                params.img_st = np.array(np.zeros((self.imageexp_total_pixel, params.nPE), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((self.imageexp_total_pixel, params.nPE)))
-                params.img_st_pha = np.array(np.zeros((self.imageexp_total_pixel, params.nPE)))
-
-            for n in range(0, params.motor_image_count):
-                if params.motor_movement_step > 0:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                else:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(params.motor_image_count - n))
-
-                print(n+1,'/',params.motor_image_count)
-
-                proc.image_process()
-
-                if params.motor_movement_step <= params.FOV:
-                    params.img_st[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :] = params.img[int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel), :]
-                    params.img_st_mag[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :] = params.img_mag[int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel), :]
-                    params.img_st_pha[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :] = params.img_pha[int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel), :]
-                else:
-                    params.img_st[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE), :] = params.img[:, :]
-                    params.img_st_mag[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE), :] = params.img_mag[:, :]
-                    params.img_st_pha[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE), :] = params.img_pha[:, :]
-                
-            params.img_st = params.img_st
-            params.img_st_mag = params.img_st_mag
-            params.img_st_pha = params.img_st_pha
-                
         elif params.imageorientation == 'YZ' or params.imageorientation == 'YX':
             print('Processing YZ or YX')
+            if params.motor_movement_step >= 0: self.stitching_paths.reverse()
+            self.stitching_axis = 1
             self.imagecrop_image_pixel = int((params.nPE * params.motor_movement_step) / params.FOV)
-            self.imagecrop_total_pixel = int(self.imagecrop_image_pixel * params.motor_image_count)
-            self.imageexp_total_pixel = (self.imagecrop_image_pixel * (params.motor_image_count - 1) + params.nPE)
-
-            if params.motor_movement_step <= params.FOV:
-                params.img_st = np.array(np.zeros((params.nPE, self.imagecrop_total_pixel), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((params.nPE, self.imagecrop_total_pixel)))
-                params.img_st_pha = np.array(np.zeros((params.nPE, self.imagecrop_total_pixel)))
-            else:
-                params.img_st = np.array(np.zeros((params.nPE, self.imageexp_total_pixel), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((params.nPE, self.imageexp_total_pixel)))
-                params.img_st_pha = np.array(np.zeros((params.nPE, self.imageexp_total_pixel)))
-
-            for n in range(0, params.motor_image_count):
-                if params.motor_movement_step < 0:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                else:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(params.motor_image_count - n))
-                
-                print(n+1,'/',params.motor_image_count)
-                
-                proc.image_process()
-
-                if params.motor_movement_step <= params.FOV:
-                    params.img_st[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel)] = params.img[:,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel)]
-                    params.img_st_mag[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel)] = params.img_mag[:,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel)]
-                    params.img_st_pha[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel)] = params.img_pha[:,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel)]
-                else:
-                    params.img_st[:,int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE)] = params.img[:, :]
-                    params.img_st_mag[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE)] = params.img_mag[:, :]
-                    params.img_st_pha[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE)] = params.img_pha[:, :]
-            
-            params.img_st = params.img_st
-            params.img_st_mag = params.img_st_mag
-            params.img_st_pha = params.img_st_pha
-            
         elif params.imageorientation == 'ZX' or params.imageorientation == 'XZ':
             print('Processing ZX or XZ')
-            params.img_st = np.array(np.zeros((params.nPE, params.motor_image_count * params.nPE), dtype=np.complex64))
-            params.img_st_mag = np.array(np.zeros((params.nPE, params.motor_image_count * params.nPE)))
-            params.img_st_pha = np.array(np.zeros((params.nPE, params.motor_image_count * params.nPE)))
+            self.stitching_axis = 1
+            self.imagecrop_image_pixel = params.nPE
+        else:
+            print('Image orientation not defined!')
+            return
 
-            for n in range(0, params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                
-                print(n+1,'/',params.motor_image_count)
-                
-                proc.image_process()
+        # Undersampling and k-space cut (Option), same k-space shape at every position
+        self.zeromask = self.kspace_mask(np.transpose(rawdata.load(self.stitching_paths[0], dtype=np.complex64)).shape)
 
-                params.img_st[:, n * params.nPE:int(n * params.nPE + params.nPE)] = params.img[:, :]
-                params.img_st_mag[:, n * params.nPE:int(n * params.nPE + params.nPE)] = params.img_mag[:, :]
-                params.img_st_pha[:, n * params.nPE:int(n * params.nPE + params.nPE)] = params.img_pha[:, :]
+        params.img_st = stitch.stitch(self.stitching_paths, self.stitching_axis, self.imagecrop_image_pixel, \
+                                      ROBWscaler=params.ROBWscaler, mask=self.zeromask)
+        params.img_st_mag = np.abs(params.img_st)
+        params.img_st_pha = np.angle(params.img_st)
 
         params.datapath = self.datapath_temp
 
@@ -1262,233 +644,38 @@ class process:
 
     def image_stitching_3D_slab(self, motor=None):
         print('Measuring stitched images 3D SE slab...')
-        
-        if os.path.isdir(params.datapath) != True: os.mkdir(params.datapath)
-        else:
-            shutil.rmtree(params.datapath)
-            os.mkdir(params.datapath)
-            
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        params.datapath = params.datapath + '/Image_Stitching'
-        self.motor_goto_position_temp = 0
-        self.motor_goto_position_temp = params.motor_goto_position
-        
-        motor_positions = np.linspace(params.motor_start_position, params.motor_end_position, num=params.motor_image_count)
-        
-        self.estimated_time = params.motor_image_count*params.motor_settling_time*1000 + params.motor_image_count*params.SPEsteps*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-
-        if params.headerfileformat == 0: params.save_header_file_txt()
-        else: params.save_header_file_json()
-                
-        if params.autorecenter == 1:
-            params.motor_goto_position = params.motor_AC_position
-            self.motor_move(motor=motor)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Settling for Autocenter...')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep(params.motor_settling_time)
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            params.frequencyoffset = self.frequencyoffset_temp
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            params.motor_current_image_count = 0
-            
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                params.motor_current_image_count = n
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n*params.motor_settling_time*1000 - n*params.SPEsteps*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-
-                #time.sleep(params.TR / 1000)
-        else:
-            for n in range(params.motor_image_count):
-                params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                
-                params.motor_goto_position = motor_positions[n]
-                self.motor_move(motor=motor)
-                
-                print('Position: ', n + 1, '/', params.motor_image_count)
-                
-                self.remaining_time = (self.estimated_time - n * params.motor_settling_time - n * params.SPEsteps * params.nPE * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Position: ' + str(n+1) + '/' + str(params.motor_image_count) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's\nSettling...')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.motor_settling_time*1000)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep(params.motor_settling_time)
-
-                seq.sequence_upload()
-
-                if params.headerfileformat == 0: params.save_header_file_txt()
-                else: params.save_header_file_json()
-
-        os.remove(self.datapath_temp + '/Image_Stitching.txt')
-
-        params.datapath = self.datapath_temp
-        params.motor_goto_position = self.motor_goto_position_temp
-        self.motor_move(motor=motor)
-
+        self.image_stitching_scan(motor, seq.SE_Gs_setup, seq.acquire_spectrum_SE_Gs, \
+                                  params.SPEsteps*params.nPE*((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR), \
+                                  SPEsteps=params.SPEsteps, AC_inbetween=False)
         print('Stitched 3D slabs acquired!')
 
     def image_stitching_3D_process(self):
         self.datapath_temp = ''
         self.datapath_temp = params.datapath
 
+        # Positions in stitching order, shift per position in pixels along the stitching axis
+        self.stitching_paths = [self.datapath_temp + '/Image_Stitching_' + str(n + 1) for n in range(params.motor_image_count)]
         if params.imageorientation == 'XY' or params.imageorientation == 'ZY':
+            if params.motor_movement_step >= 0: self.stitching_paths.reverse()
+            self.stitching_axis = 1
             self.imagecrop_image_pixel = int((params.nPE * params.motor_movement_step) / params.FOV)
-            self.imagecrop_total_pixel = int(self.imagecrop_image_pixel * params.motor_image_count)
-            self.imageexp_total_pixel = (self.imagecrop_image_pixel * (params.motor_image_count - 1) + params.nPE)
-
-            if params.motor_movement_step <= params.FOV:
-
-                params.img_st = np.array(np.zeros((params.SPEsteps, self.imagecrop_total_pixel, params.nPE), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((params.SPEsteps, self.imagecrop_total_pixel, params.nPE)))
-                params.img_st_pha = np.array(np.zeros((params.SPEsteps, self.imagecrop_total_pixel, params.nPE)))
-            else:
-                params.img_st = np.array(
-                    np.zeros((params.SPEsteps, self.imageexp_total_pixel, params.nPE), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((params.SPEsteps, self.imageexp_total_pixel, params.nPE)))
-                params.img_st_pha = np.array(np.zeros((params.SPEsteps, self.imageexp_total_pixel, params.nPE)))
-
-            for n in range(params.motor_image_count):
-                if params.motor_movement_step < 0:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                else:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(params.motor_image_count - n))
-                
-                print(n+1,'/',params.motor_image_count)
-                
-                proc.image_3D_process()
-
-                if params.motor_movement_step <= params.FOV:
-                    params.img_st[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :] = params.img[:,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel),:]
-                    params.img_st_mag[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :] = params.img_mag[:,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel),:]
-                    params.img_st_pha[:, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :] = params.img_pha[:,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel),:]
-                else:
-                    params.img_st[:,int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE),:] = params.img[:, :, :]
-                    params.img_st_mag[:,int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE),:] = params.img_mag[:, :, :]
-                    params.img_st_pha[:,int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE),:] = params.img_pha[:, :, :]
-
         elif params.imageorientation == 'YZ' or params.imageorientation == 'YX':
+            if params.motor_movement_step <= 0: self.stitching_paths.reverse()
+            self.stitching_axis = 2
             self.imagecrop_image_pixel = int((params.nPE * params.motor_movement_step) / params.FOV)
-            self.imagecrop_total_pixel = int(self.imagecrop_image_pixel * params.motor_image_count)
-            self.imageexp_total_pixel = (self.imagecrop_image_pixel * (params.motor_image_count - 1) + params.nPE)
-
-            if params.motor_movement_step <= params.FOV:
-
-                params.img_st = np.array(np.zeros((params.SPEsteps, params.nPE, self.imagecrop_total_pixel), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((params.SPEsteps, params.nPE, self.imagecrop_total_pixel)))
-                params.img_st_pha = np.array(np.zeros((params.SPEsteps, params.nPE, self.imagecrop_total_pixel)))
-            else:
-                params.img_st = np.array(
-                    np.zeros((params.SPEsteps, params.nPE, self.imageexp_total_pixel), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((params.SPEsteps, params.nPE, self.imageexp_total_pixel)))
-                params.img_st_pha = np.array(np.zeros((params.SPEsteps, params.nPE, self.imageexp_total_pixel)))
-
-            for n in range(params.motor_image_count):
-                if params.motor_movement_step > 0:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                else:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(params.motor_image_count - n))
-                    
-                print(n+1,'/',params.motor_image_count)
-                
-                proc.image_3D_process()
-
-                if params.motor_movement_step <= params.FOV:
-                    params.img_st[:, :, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel)] = params.img[:, :,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel)]
-                    params.img_st_mag[:, :, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel)] = params.img_mag[:, :,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel)]
-                    params.img_st_pha[:, :, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel)] = params.img_pha[:, :,int(params.nPE / 2 - self.imagecrop_image_pixel / 2):int(params.nPE / 2 - self.imagecrop_image_pixel / 2 + self.imagecrop_image_pixel)]
-                else:
-                    params.img_st[:, :, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE)] = params.img[:, :, :]
-                    params.img_st_mag[:, :, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE)] = params.img_mag[:, :, :]
-                    params.img_st_pha[:, :, int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.nPE)] = params.img_pha[:, :, :]
-
         elif params.imageorientation == 'ZX' or params.imageorientation == 'XZ':
+            if params.motor_movement_step <= 0: self.stitching_paths.reverse()
+            self.stitching_axis = 0
             self.imagecrop_image_pixel = int((params.motor_movement_step * params.SPEsteps) / params.slicethickness)
-            self.imagecrop_total_pixel = int(self.imagecrop_image_pixel * params.motor_image_count)
-            self.imageexp_total_pixel = (self.imagecrop_image_pixel * (params.motor_image_count - 1) + params.SPEsteps)
-
-            if params.motor_movement_step <= params.slicethickness:
-                params.img_st = np.array(np.zeros((self.imagecrop_total_pixel, params.nPE, params.nPE), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((self.imagecrop_total_pixel, params.nPE, params.nPE)))
-                params.img_st_pha = np.array(np.zeros((self.imagecrop_total_pixel, params.nPE, params.nPE)))
-            else:
-                params.img_st = np.array(np.zeros((self.imageexp_total_pixel, params.nPE, params.nPE), dtype=np.complex64))
-                params.img_st_mag = np.array(np.zeros((self.imageexp_total_pixel, params.nPE, params.nPE)))
-                params.img_st_pha = np.array(np.zeros((self.imageexp_total_pixel, params.nPE, params.nPE)))
-
-            for n in range(params.motor_image_count):
-                if params.motor_movement_step > 0:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(n + 1))
-                else:
-                    params.datapath = (self.datapath_temp + '/Image_Stitching_' + str(params.motor_image_count - n))
-                
-                print(n+1,'/',params.motor_image_count)
-                
-                proc.image_3D_process()
+        else:
+            print('Image orientation not defined!')
+            return
 
-                if params.motor_movement_step <= params.slicethickness:
-                    params.img_st[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :, :] = params.img[int(params.SPEsteps / 2 - self.imagecrop_image_pixel / 2):int(params.SPEsteps / 2 - self.imagecrop_image_pixel / 2) + self.imagecrop_image_pixel,:, :]
-                    params.img_st_mag[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :, :] = params.img_mag[int(params.SPEsteps / 2 - self.imagecrop_image_pixel / 2):int(params.SPEsteps / 2 - self.imagecrop_image_pixel / 2) + self.imagecrop_image_pixel,:, :]
-                    params.img_st_pha[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + self.imagecrop_image_pixel), :, :] = params.img_pha[int(params.SPEsteps / 2 - self.imagecrop_image_pixel / 2):int(params.SPEsteps / 2 - self.imagecrop_image_pixel / 2) + self.imagecrop_image_pixel,:, :]
-                else:
-                    params.img_st[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.SPEsteps), :,:] = params.img[:, :, :]
-                    params.img_st_mag[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.SPEsteps), :,:] = params.img_mag[:, :, :]
-                    params.img_st_pha[int(n * self.imagecrop_image_pixel):int(n * self.imagecrop_image_pixel + params.SPEsteps), :,:] = params.img_pha[:, :, :]
+        # Positions in parallel, the complex result memory mapped next to the positions
+        params.img_st = stitch.stitch(self.stitching_paths, self.stitching_axis, self.imagecrop_image_pixel, SPEsteps=params.SPEsteps, \
+                                      ROBWscaler=params.ROBWscaler, out=lambda shape: rawdata.create(self.datapath_temp + '/Image_Stitching_3D', shape, np.complex64))
+        params.img_st_mag = np.abs(params.img_st)
+        params.img_st_pha = np.angle(params.img_st)
 
         params.datapath = self.datapath_temp
 
@@ -1610,1712 +797,1021 @@ class process:
             
     def Autocentertool(self):
         print('Finding signals...')
-        
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.GUImode_temp = 0
-            self.GUImode_temp = params.GUImode
-            self.sequence_temp = 0
-            self.sequence_temp = params.sequence
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            
-            params.GUImode = 0
-            params.sequence = 1
-            params.TS = 10
-            params.TE = 12
-            params.TR = 1000
-            params.slicethickness = 15
-            params.frequencyoffset = 0
-            
-            proc.recalc_gradients()
-            
-        self.freq_temp = 0
-        self.freq_temp = params.frequency
-
-        self.ACidx = round(abs((params.ACstop * 1.0e6 - params.ACstart * 1.0e6)) / (params.ACstepwidth)) + 1
-        self.ACsteps = np.linspace(params.ACstart, params.ACstop, self.ACidx)
-        params.ACvalues = np.matrix(np.zeros((2, self.ACidx)))
-        self.ACpeakvalues = np.zeros(self.ACidx)
-        
-        self.estimated_time = self.ACidx * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
-        for n in range(self.ACidx):
-            print(n + 1, '/', self.ACidx)
-            self.ACsteps[n] = round(self.ACsteps[n], 6)
-            params.frequency = self.ACsteps[n]
-            seq.sequence_upload()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            self.ACsteps[n] = params.centerfrequency
-            self.ACpeakvalues[n] = params.peakvalue
-            
-            self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-            self.remaining_time_h = math.floor(self.remaining_time / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time / 60)
-            self.remaining_time_s = int(self.remaining_time % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.ACidx) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.ACvalues[0, :] = self.ACsteps
-        params.ACvalues[1, :] = self.ACpeakvalues
-        params.Reffrequency = self.ACsteps[np.argmax(self.ACpeakvalues)]
-
-        np.savetxt('tooldata/Autocenter_Tool_Data.txt', np.transpose(params.ACvalues))
-        
-        if params.toolautosequence == 1:
-            params.GUImode = self.GUImode_temp
-            params.sequence = self.sequence_temp
-            params.TS = self.TS_temp
-            params.TE = self.TE_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            
-            proc.recalc_gradients()
-
-        params.frequency = self.freq_temp
-        params.datapath = self.datapath_temp
-
-    def Flipangletool(self):
-        print('Finding flipangles...')
-        
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.GUImode_temp = 0
-            self.GUImode_temp = params.GUImode
-            self.sequence_temp = 0
-            self.sequence_temp = params.sequence
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            
-            params.GUImode = 0
-            params.sequence = 1
-            params.TS = 10
-            params.TE = 12
-            params.TR = 1000
-            params.slicethickness = 15
-            params.frequencyoffset = 0
-            
-            proc.recalc_gradients()
-
-        self.RFattenuation_temp = 0
-        self.RFattenuation_temp = params.RFattenuation
-
-        self.FAsteps = np.linspace(params.FAstart, params.FAstop, params.FAsteps)
-        params.FAvalues = np.matrix(np.zeros((2, params.FAsteps)))
-        self.FApeakvalues = np.zeros(params.FAsteps)
-
-        params.RFattenuation = -31.75
-        seq.sequence_upload()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Reset attenunator')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-        
-        self.estimated_time = params.FAsteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-
-        for n in range(params.FAsteps):
-            print(n + 1, '/', params.FAsteps)
-            self.FAsteps[n] = int(self.FAsteps[n] / 0.25) * 0.25
-            print(self.FAsteps[n])
-            params.RFattenuation = self.FAsteps[n]
-            seq.sequence_upload()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            self.FApeakvalues[n] = params.peakvalue
-            
-            self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-            self.remaining_time_h = math.floor(self.remaining_time / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time / 60)
-            self.remaining_time_s = int(self.remaining_time % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.FAsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.FAvalues[0, :] = self.FAsteps
-        params.FAvalues[1, :] = self.FApeakvalues
-
-        params.RefRFattenuation = self.FAsteps[np.argmax(self.FApeakvalues)]
-
-        np.savetxt('tooldata/Flipangle_Tool_Data.txt', np.transpose(params.FAvalues))
-        
-        if params.toolautosequence == 1:
-            params.GUImode = self.GUImode_temp
-            params.sequence = self.sequence_temp
-            params.TS = self.TS_temp
-            params.TE = self.TE_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            
-            proc.recalc_gradients()
-
-        params.RFattenuation = self.RFattenuation_temp
-        params.datapath = self.datapath_temp
-
-    def Shimtool(self):
-        print('Finding shims...')
-        
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.GUImode_temp = 0
-            self.GUImode_temp = params.GUImode
-            self.sequence_temp = 0
-            self.sequence_temp = params.sequence
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            
-            params.GUImode = 0
-            params.sequence = 10
-            params.slicethickness = 15
-            params.frequencyoffset = 0
-            
-            if params.ToolAutoShimMode == 0:
-                params.TS = 20
-                params.TE = 24
-                params.TR = 500
-            else:
-                params.TS = 30
-                params.TE = 33
-                params.TR = 2000
+        with params.override(*tool_sequence, 'datapath', 'frequency'):
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.GUImode = 0
+                params.sequence = 1
+                params.TS = 10
+                params.TE = 12
+                params.TR = 1000
+                params.slicethickness = 15
+                params.frequencyoffset = 0
                 
-            proc.recalc_gradients()
-
-        self.frequency_temp = 0
-        self.frequency_temp = params.frequency
-        self.shim_temp = [0, 0, 0, 0]
-        self.shim_temp[:] = params.grad[:]
-
-        self.STsteps = np.linspace(params.ToolShimStart, params.ToolShimStop, params.ToolShimSteps)
-        self.STsteps = self.STsteps.astype(int)
-
-        params.STvalues = np.matrix(np.zeros((5, params.ToolShimSteps)))
-        params.STvalues[0, :] = self.STsteps
-
-        seq.sequence_upload()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        params.frequency = params.centerfrequency
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        if params.ToolShimChannel[0] == 1:
-            self.STpeakvaluesX = np.zeros(params.ToolShimSteps)
-            params.grad[0] = self.STsteps[0]
-
-            seq.sequence_upload()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('X Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-
-            for n in range(params.ToolShimSteps):
-                print(n + 1, '/', params.ToolShimSteps)
-                params.grad[0] = self.STsteps[n]
-                params.frequency = params.centerfrequency
-
+                proc.recalc_gradients()
+                
+            self.ACidx = round(abs((params.ACstop * 1.0e6 - params.ACstart * 1.0e6)) / (params.ACstepwidth)) + 1
+            self.ACsteps = np.linspace(params.ACstart, params.ACstop, self.ACidx)
+            params.ACvalues = np.matrix(np.zeros((2, self.ACidx)))
+            self.ACpeakvalues = np.zeros(self.ACidx)
+            
+            self.estimated_time = self.ACidx * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+
+            schedule = scheduler.start(params.TR)
+            for n in range(self.ACidx):
+                print(n + 1, '/', self.ACidx)
+                self.ACsteps[n] = round(self.ACsteps[n], 6)
+                params.frequency = self.ACsteps[n]
                 seq.sequence_upload()
                 proc.spectrum_process()
                 proc.spectrum_analytics()
-                self.STpeakvaluesX[n] = params.peakvalue
+                self.ACsteps[n] = params.centerfrequency
+                self.ACpeakvalues[n] = params.peakvalue
                 
                 self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 self.remaining_time_h = math.floor(self.remaining_time / (3600))
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
-            
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('X Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.ACidx) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
 
-            params.STvalues[1, :] = self.STpeakvaluesX
+            params.ACvalues[0, :] = self.ACsteps
+            params.ACvalues[1, :] = self.ACpeakvalues
+            params.Reffrequency = self.ACsteps[np.argmax(self.ACpeakvalues)]
 
-            params.frequency = self.frequency_temp
-            params.grad[0] = self.shim_temp[0]
+            np.savetxt('tooldata/Autocenter_Tool_Data.txt', np.transpose(params.ACvalues))
 
-        if params.ToolShimChannel[1] == 1:
-            self.STpeakvaluesY = np.zeros(params.ToolShimSteps)
-            params.grad[1] = self.STsteps[0]
+    def Flipangletool(self):
+        print('Finding flipangles...')
 
+        with params.override(*tool_sequence, 'datapath', 'RFattenuation'):
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.GUImode = 0
+                params.sequence = 1
+                params.TS = 10
+                params.TE = 12
+                params.TR = 1000
+                params.slicethickness = 15
+                params.frequencyoffset = 0
+                
+                proc.recalc_gradients()
+
+            self.FAsteps = np.linspace(params.FAstart, params.FAstop, params.FAsteps)
+            params.FAvalues = np.matrix(np.zeros((2, params.FAsteps)))
+            self.FApeakvalues = np.zeros(params.FAsteps)
+
+            params.RFattenuation = -31.75
+            schedule = scheduler.start(params.TR)
             seq.sequence_upload()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Y Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Reset attenunator')
+            schedule.finish()
             
-            self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-
-            for n in range(params.ToolShimSteps):
-                print(n + 1, '/', params.ToolShimSteps)
-                params.grad[1] = self.STsteps[n]
-                params.frequency = params.centerfrequency
+            self.estimated_time = params.FAsteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+            schedule = scheduler.start(params.TR)
+            for n in range(params.FAsteps):
+                print(n + 1, '/', params.FAsteps)
+                self.FAsteps[n] = int(self.FAsteps[n] / 0.25) * 0.25
+                print(self.FAsteps[n])
+                params.RFattenuation = self.FAsteps[n]
                 seq.sequence_upload()
                 proc.spectrum_process()
                 proc.spectrum_analytics()
-                self.STpeakvaluesY[n] = params.peakvalue
+                self.FApeakvalues[n] = params.peakvalue
                 
                 self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 self.remaining_time_h = math.floor(self.remaining_time / (3600))
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
-            
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Y Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.FAsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
 
-            params.STvalues[2, :] = self.STpeakvaluesY
+            params.FAvalues[0, :] = self.FAsteps
+            params.FAvalues[1, :] = self.FApeakvalues
 
-            params.frequency = self.frequency_temp
-            params.grad[1] = self.shim_temp[1]
+            params.RefRFattenuation = self.FAsteps[np.argmax(self.FApeakvalues)]
 
-        if params.ToolShimChannel[2] == 1:
-            self.STpeakvaluesZ = np.zeros(params.ToolShimSteps)
-            params.grad[2] = self.STsteps[0]
+            np.savetxt('tooldata/Flipangle_Tool_Data.txt', np.transpose(params.FAvalues))
 
+    def Shimtool(self):
+        print('Finding shims...')
+
+        with params.override(*tool_sequence, 'datapath', 'frequency', 'grad'):
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.GUImode = 0
+                params.sequence = 10
+                params.slicethickness = 15
+                params.frequencyoffset = 0
+                
+                if params.ToolAutoShimMode == 0:
+                    params.TS = 20
+                    params.TE = 24
+                    params.TR = 500
+                else:
+                    params.TS = 30
+                    params.TE = 33
+                    params.TR = 2000
+                    
+                proc.recalc_gradients()
+
+            self.STsteps = np.linspace(params.ToolShimStart, params.ToolShimStop, params.ToolShimSteps)
+            self.STsteps = self.STsteps.astype(int)
+
+            params.STvalues = np.matrix(np.zeros((5, params.ToolShimSteps)))
+            params.STvalues[0, :] = self.STsteps
+
+            schedule = scheduler.start(params.TR)
             seq.sequence_upload()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Z Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+            params.frequency = params.centerfrequency
+            schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+            schedule.finish()
 
-            for n in range(params.ToolShimSteps):
-                print(n + 1, '/', params.ToolShimSteps)
-                params.frequency = params.centerfrequency
-                params.grad[2] = self.STsteps[n]
+            if params.ToolShimChannel[0] == 1:
+                with params.override('frequency', 'grad'):
+                    self.STpeakvaluesX = np.zeros(params.ToolShimSteps)
+                    params.grad[0] = self.STsteps[0]
 
-                seq.sequence_upload()
-                proc.spectrum_process()
-                proc.spectrum_analytics()
-                self.STpeakvaluesZ[n] = params.peakvalue
-                
-                self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-            
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Z Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                    schedule = scheduler.start(params.TR)
+                    seq.sequence_upload()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    schedule.wait('X Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+                    
+                    self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+
+                    schedule = scheduler.start(params.TR)
+                    for n in range(params.ToolShimSteps):
+                        print(n + 1, '/', params.ToolShimSteps)
+                        params.grad[0] = self.STsteps[n]
+                        params.frequency = params.centerfrequency
+
+                        seq.sequence_upload()
+                        proc.spectrum_process()
+                        proc.spectrum_analytics()
+                        self.STpeakvaluesX[n] = params.peakvalue
+                        
+                        self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
+                        self.remaining_time_h = math.floor(self.remaining_time / (3600))
+                        self.remaining_time_min = math.floor(self.remaining_time / 60)
+                        self.remaining_time_s = int(self.remaining_time % 60)
+                    
+                        schedule.wait('X Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+                    schedule.finish()
 
-            params.STvalues[3, :] = self.STpeakvaluesZ
+                    params.STvalues[1, :] = self.STpeakvaluesX
 
-            params.frequency = self.frequency_temp
-            params.grad[2] = self.shim_temp[2]
+            if params.ToolShimChannel[1] == 1:
+                with params.override('frequency', 'grad'):
+                    self.STpeakvaluesY = np.zeros(params.ToolShimSteps)
+                    params.grad[1] = self.STsteps[0]
 
-        if params.ToolShimChannel[3] == 1:
-            self.STpeakvaluesZ2 = np.zeros(params.ToolShimSteps)
-            params.grad[3] = self.STsteps[0]
+                    schedule = scheduler.start(params.TR)
+                    seq.sequence_upload()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    schedule.wait('Y Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+                    
+                    self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+
+                    schedule = scheduler.start(params.TR)
+                    for n in range(params.ToolShimSteps):
+                        print(n + 1, '/', params.ToolShimSteps)
+                        params.grad[1] = self.STsteps[n]
+                        params.frequency = params.centerfrequency
+
+                        seq.sequence_upload()
+                        proc.spectrum_process()
+                        proc.spectrum_analytics()
+                        self.STpeakvaluesY[n] = params.peakvalue
+                        
+                        self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
+                        self.remaining_time_h = math.floor(self.remaining_time / (3600))
+                        self.remaining_time_min = math.floor(self.remaining_time / 60)
+                        self.remaining_time_s = int(self.remaining_time % 60)
+                    
+                        schedule.wait('Y Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+                    schedule.finish()
 
-            seq.sequence_upload()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Z² Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-            self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                    params.STvalues[2, :] = self.STpeakvaluesY
 
-            for n in range(params.ToolShimSteps):
-                print(n + 1, '/', params.ToolShimSteps)
-                params.frequency = params.centerfrequency
-                params.grad[3] = self.STsteps[n]
+            if params.ToolShimChannel[2] == 1:
+                with params.override('frequency', 'grad'):
+                    self.STpeakvaluesZ = np.zeros(params.ToolShimSteps)
+                    params.grad[2] = self.STsteps[0]
 
-                seq.sequence_upload()
-                proc.spectrum_process()
-                proc.spectrum_analytics()
-                self.STpeakvaluesZ2[n] = params.peakvalue
-                
-                self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
-                self.remaining_time_h = math.floor(self.remaining_time / (3600))
-                self.remaining_time_min = math.floor(self.remaining_time / 60)
-                self.remaining_time_s = int(self.remaining_time % 60)
-            
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Z² Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
-
-            params.STvalues[4, :] = self.STpeakvaluesZ2
-
-            params.frequency = self.frequency_temp
-            params.grad[3] = self.shim_temp[3]
-            
-        if params.toolautosequence == 1:
-            params.GUImode = self.GUImode_temp
-            params.sequence = self.sequence_temp
-            params.TS = self.TS_temp
-            params.TE = self.TE_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            
-            proc.recalc_gradients()
-            
-        params.datapath = self.datapath_temp
+                    schedule = scheduler.start(params.TR)
+                    seq.sequence_upload()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    schedule.wait('Z Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+                    
+                    self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+
+                    schedule = scheduler.start(params.TR)
+                    for n in range(params.ToolShimSteps):
+                        print(n + 1, '/', params.ToolShimSteps)
+                        params.frequency = params.centerfrequency
+                        params.grad[2] = self.STsteps[n]
+
+                        seq.sequence_upload()
+                        proc.spectrum_process()
+                        proc.spectrum_analytics()
+                        self.STpeakvaluesZ[n] = params.peakvalue
+                        
+                        self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
+                        self.remaining_time_h = math.floor(self.remaining_time / (3600))
+                        self.remaining_time_min = math.floor(self.remaining_time / 60)
+                        self.remaining_time_s = int(self.remaining_time % 60)
+                    
+                        schedule.wait('Z Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+                    schedule.finish()
+
+                    params.STvalues[3, :] = self.STpeakvaluesZ
+
+            if params.ToolShimChannel[3] == 1:
+                with params.override('frequency', 'grad'):
+                    self.STpeakvaluesZ2 = np.zeros(params.ToolShimSteps)
+                    params.grad[3] = self.STsteps[0]
+
+                    schedule = scheduler.start(params.TR)
+                    seq.sequence_upload()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    schedule.wait('Z² Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+                    
+                    self.estimated_time = params.ToolShimSteps * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+
+                    schedule = scheduler.start(params.TR)
+                    for n in range(params.ToolShimSteps):
+                        print(n + 1, '/', params.ToolShimSteps)
+                        params.frequency = params.centerfrequency
+                        params.grad[3] = self.STsteps[n]
+
+                        seq.sequence_upload()
+                        proc.spectrum_process()
+                        proc.spectrum_analytics()
+                        self.STpeakvaluesZ2[n] = params.peakvalue
+                        
+                        self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
+                        self.remaining_time_h = math.floor(self.remaining_time / (3600))
+                        self.remaining_time_min = math.floor(self.remaining_time / 60)
+                        self.remaining_time_s = int(self.remaining_time % 60)
+                    
+                        schedule.wait('Z² Measuring... ' + str(n+1) + '/' + str(params.ToolShimSteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+                    schedule.finish()
+
+                    params.STvalues[4, :] = self.STpeakvaluesZ2
 
         np.savetxt('tooldata/Shim_Tool_Data.txt', np.transpose(params.STvalues))
 
     def FieldMapB0(self):
         print('Measuring B0 field...')
 
-        self.GUImode_temp = 0
-        self.GUImode_temp = params.GUImode
-        self.sequence_temp = 0
-        self.sequence_temp = params.sequence
-        self.TE_temp = 0
-        self.TE_temp = params.TE
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.GUImode = 1
-        params.sequence = 4
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            self.nPE_temp = 0
-            self.nPE_temp = params.nPE
-            self.FOV_temp = 0
-            self.FOV_temp = params.FOV
+        with params.override(*tool_sequence, 'datapath'):
+            params.GUImode = 1
+            params.sequence = 4
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.TS = 4
+                params.TE = 4
+                params.TR = 6000
+                params.slicethickness = 15
+                params.frequencyoffset = 0
+                params.nPE = 64
+                if params.imageorientation == 2 or params.imageorientation == 5:
+                    if params.motor_enable == 0: params.FOV = 12
+                    else: params.FOV = 16
+                else:
+                    if params.motor_enable == 0: params.FOV = 16
+                    else: params.FOV = 18
+                        
+                proc.recalc_gradients()
             
-            params.TS = 4
-            params.TE = 4
-            params.TR = 6000
-            params.slicethickness = 15
-            params.frequencyoffset = 0
-            params.nPE = 64
-            if params.imageorientation == 2 or params.imageorientation == 5:
-                if params.motor_enable == 0: params.FOV = 12
-                else: params.FOV = 16
-            else:
-                if params.motor_enable == 0: params.FOV = 16
-                else: params.FOV = 18
-                    
-            proc.recalc_gradients()
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-        
-        params.TE = 2 * params.TE
-        params.datapath = 'rawdata/Tool_Image_rawdata'  
-
-        seq.sequence_upload()
-        proc.image_process()
-
-        self.FieldMapB0_S2_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S2 = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S2_raw[:, :] = params.img_pha[:, :]
-        self.FieldMapB0_S2[:, :] = params.img_pha[:, :]
-
-        for kk in range(20):
-
-            for jj in range(int(self.FieldMapB0_S2.shape[1] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S2.shape[1] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] - 2 * math.pi
-
-            for jj in range(int(self.FieldMapB0_S2.shape[0] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S2.shape[0] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] - 2 * math.pi
-
-        time.sleep(params.TR / 1000)
-        
-        params.TE = self.TE_temp
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
             
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-
-        self.FieldMapB0_S1_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S1 = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S1_raw = params.img_pha
-        self.FieldMapB0_S1 = params.img_pha
-
-        for kk in range(20):
-
-            for jj in range(int(self.FieldMapB0_S1.shape[1] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S1.shape[1] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S1.shape[0] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S1.shape[0] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] - 2 * math.pi
-
-        params.B0DeltaB0map = (self.FieldMapB0_S2 - self.FieldMapB0_S1) / (2 * math.pi * 42.577 * ((2 * params.TE - params.TE)) / 1000)
-        params.B0DeltaB0mapmasked = np.matrix(np.zeros((params.B0DeltaB0map.shape[1], params.B0DeltaB0map.shape[0])))
-        params.B0DeltaB0mapmasked[:, :] = params.B0DeltaB0map[:, :]
-        self.img_max = np.max(np.amax(params.img_mag))
-        params.B0DeltaB0mapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
-
-        self.FieldMapB0_pha_raw = np.concatenate((self.FieldMapB0_S1_raw, self.FieldMapB0_S2_raw), axis=0)
-        np.savetxt('tooldata/FieldMap_B0_Phase_Raw_Data.txt', self.FieldMapB0_pha_raw)
-        self.FieldMapB0_pha = np.concatenate((self.FieldMapB0_S1, self.FieldMapB0_S2), axis=0)
-        np.savetxt('tooldata/FieldMap_B0_Phase_Data.txt', self.FieldMapB0_pha)
-        self.B0DeltaB0maps = np.concatenate((params.img_mag, params.B0DeltaB0map, params.B0DeltaB0mapmasked), axis=0)
-        np.savetxt('tooldata/FieldMap_B0_deltat1ms_Mag_Map_MapMasked_Data.txt', self.B0DeltaB0maps)
-        
-        if params.toolautosequence == 1:
-            params.TS = self.TS_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.nPE = self.nPE_temp
-            params.FOV = self.FOV_temp
+            TE = params.TE
+            params.TE = 2 * params.TE
+            params.datapath = 'rawdata/Tool_Image_rawdata'  
+
+            schedule = scheduler.start(params.TR)
+            seq.sequence_upload()
+            proc.image_process()
+
+            self.FieldMapB0_S2_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
+            self.FieldMapB0_S2_raw[:, :] = params.img_pha[:, :]
+            self.FieldMapB0_S2 = np.matrix(unwrap.unwrap(self.FieldMapB0_S2_raw, params.img_mag))
+
+            schedule.wait()
+            schedule.finish()
+
+            params.TE = TE
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
             
-            proc.recalc_gradients()
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+                
+            params.datapath = 'rawdata/Tool_Image_rawdata'
 
-        params.GUImode = self.GUImode_temp
-        params.sequence = self.sequence_temp
-        params.datapath = self.datapath_temp
+            seq.sequence_upload()
+            proc.image_process()
+
+            self.FieldMapB0_S1_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
+            self.FieldMapB0_S1_raw = params.img_pha
+            self.FieldMapB0_S1 = np.matrix(unwrap.unwrap(self.FieldMapB0_S1_raw, params.img_mag))
+
+            params.B0DeltaB0map = np.matrix(unwrap.difference(self.FieldMapB0_S2_raw, self.FieldMapB0_S1_raw, params.img_mag)) / (2 * math.pi * 42.577 * ((2 * params.TE - params.TE)) / 1000)
+            params.B0DeltaB0mapmasked = np.matrix(np.zeros((params.B0DeltaB0map.shape[1], params.B0DeltaB0map.shape[0])))
+            params.B0DeltaB0mapmasked[:, :] = params.B0DeltaB0map[:, :]
+            self.img_max = np.max(np.amax(params.img_mag))
+            params.B0DeltaB0mapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
+
+            self.FieldMapB0_pha_raw = np.concatenate((self.FieldMapB0_S1_raw, self.FieldMapB0_S2_raw), axis=0)
+            np.savetxt('tooldata/FieldMap_B0_Phase_Raw_Data.txt', self.FieldMapB0_pha_raw)
+            self.FieldMapB0_pha = np.concatenate((self.FieldMapB0_S1, self.FieldMapB0_S2), axis=0)
+            np.savetxt('tooldata/FieldMap_B0_Phase_Data.txt', self.FieldMapB0_pha)
+            self.B0DeltaB0maps = np.concatenate((params.img_mag, params.B0DeltaB0map, params.B0DeltaB0mapmasked), axis=0)
+            np.savetxt('tooldata/FieldMap_B0_deltat1ms_Mag_Map_MapMasked_Data.txt', self.B0DeltaB0maps)
+        
 
     def FieldMapB0Slice(self):
         print('Measuring B0 (Slice) field...')
 
-        self.GUImode_temp = 0
-        self.GUImode_temp = params.GUImode
-        self.sequence_temp = 0
-        self.sequence_temp = params.sequence
-        self.TE_temp = 0
-        self.TE_temp = params.TE
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.GUImode = 1
-        params.sequence = 20
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            self.nPE_temp = 0
-            self.nPE_temp = params.nPE
-            self.FOV_temp = 0
-            self.FOV_temp = params.FOV
+        with params.override(*tool_sequence, 'datapath'):
+            params.GUImode = 1
+            params.sequence = 20
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.TS = 4
+                params.TE = 4
+                params.TR = 6000
+                params.slicethickness = 4
+                params.frequencyoffset = 0
+                params.nPE = 64
+                if params.imageorientation == 2 or params.imageorientation == 5:
+                    if params.motor_enable == 0: params.FOV = 12
+                    else: params.FOV = 16
+                else:
+                    if params.motor_enable == 0: params.FOV = 16
+                    else: params.FOV = 18
+                        
+                proc.recalc_gradients()
             
-            params.TS = 4
-            params.TE = 4
-            params.TR = 6000
-            params.slicethickness = 4
-            params.frequencyoffset = 0
-            params.nPE = 64
-            if params.imageorientation == 2 or params.imageorientation == 5:
-                if params.motor_enable == 0: params.FOV = 12
-                else: params.FOV = 16
-            else:
-                if params.motor_enable == 0: params.FOV = 16
-                else: params.FOV = 18
-                    
-            proc.recalc_gradients()
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-        
-        params.TE = 2 * params.TE
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-
-        self.FieldMapB0_S2_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S2 = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S2_raw[:, :] = params.img_pha[:, :]
-        self.FieldMapB0_S2[:, :] = params.img_pha[:, :]
-
-        for kk in range(20):
-
-            for jj in range(int(self.FieldMapB0_S2.shape[1] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(elf.FieldMapB0_S2.shape[1] / 2) + jj + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S2.shape[1] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj - 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S2.shape[0] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S2.shape[1] / 2) - jj + ii + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S2.shape[0] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii] - 2 * math.pi
-                    if self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] + self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] > math.pi:
-                        self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] = self.FieldMapB0_S2[int(self.FieldMapB0_S2.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S2.shape[1] / 2) + jj - ii + 1] - 2 * math.pi
-
-        time.sleep(params.TR / 1000)
-        
-        params.TE = self.TE_temp
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_Gs_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID_Gs()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
             
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-
-        self.FieldMapB0_S1_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S1 = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
-        self.FieldMapB0_S1_raw = params.img_pha
-        self.FieldMapB0_S1 = params.img_pha
-
-        for kk in range(20):
-
-            for jj in range(int(self.FieldMapB0_S1.shape[1] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj + ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S1.shape[1] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii - 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj - ii + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj - 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S1.shape[0] / 2) - 2):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) + jj + 1, int(self.FieldMapB0_S1.shape[1] / 2) - jj + ii + 1] - 2 * math.pi
-            for jj in range(int(self.FieldMapB0_S1.shape[0] / 2) - 1):
-                for ii in range(1 + jj * 2):
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii - 1] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii] - 2 * math.pi
-                    if self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] + self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] > math.pi:
-                        self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] = self.FieldMapB0_S1[int(self.FieldMapB0_S1.shape[0] / 2) - jj - 1, int(self.FieldMapB0_S1.shape[1] / 2) + jj - ii + 1] - 2 * math.pi
-
-        params.B0DeltaB0map = (self.FieldMapB0_S2 - self.FieldMapB0_S1) / (2 * math.pi * 42.577 * ((2 * params.TE - params.TE)) / 1000)
-        params.B0DeltaB0mapmasked = np.matrix(np.zeros((params.B0DeltaB0map.shape[1], params.B0DeltaB0map.shape[0])))
-        params.B0DeltaB0mapmasked[:, :] = params.B0DeltaB0map[:, :]
-        self.img_max = np.max(np.amax(params.img_mag))
-        params.B0DeltaB0mapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
-
-        self.FieldMapB0_pha_raw = np.concatenate((self.FieldMapB0_S1_raw, self.FieldMapB0_S2_raw), axis=1)
-        np.savetxt('tooldata/FieldMap_B0_Phase_Raw_Data.txt', self.FieldMapB0_pha_raw)
-        self.FieldMapB0_pha = np.concatenate((self.FieldMapB0_S1, self.FieldMapB0_S2), axis=1)
-        np.savetxt('tooldata/FieldMap_B0_Phase_Data.txt', self.FieldMapB0_pha)
-        self.B0DeltaB0maps = np.concatenate((params.img_mag, params.B0DeltaB0map, params.B0DeltaB0mapmasked), axis=1)
-        np.savetxt('tooldata/FieldMap_B0_deltat1ms_Mag_Map_MapMasked_Data.txt', self.B0DeltaB0maps)
-        
-        if params.toolautosequence == 1:
-            params.TS = self.TS_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.nPE = self.nPE_temp
-            params.FOV = self.FOV_temp
+            TE = params.TE
+            params.TE = 2 * params.TE
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+
+            schedule = scheduler.start(params.TR)
+            seq.sequence_upload()
+            proc.image_process()
+
+            self.FieldMapB0_S2_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
+            self.FieldMapB0_S2_raw[:, :] = params.img_pha[:, :]
+            self.FieldMapB0_S2 = np.matrix(unwrap.unwrap(self.FieldMapB0_S2_raw, params.img_mag))
+
+            schedule.wait()
+            schedule.finish()
+
+            params.TE = TE
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
             
-            proc.recalc_gradients()
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_Gs_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID_Gs()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+                
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+
+            seq.sequence_upload()
+            proc.image_process()
 
-        params.GUImode = self.GUImode_temp
-        params.sequence = self.sequence_temp
-        params.datapath = self.datapath_temp
+            self.FieldMapB0_S1_raw = np.matrix(np.zeros((params.img_pha.shape[1], params.img_pha.shape[0])))
+            self.FieldMapB0_S1_raw = params.img_pha
+            self.FieldMapB0_S1 = np.matrix(unwrap.unwrap(self.FieldMapB0_S1_raw, params.img_mag))
+
+            params.B0DeltaB0map = np.matrix(unwrap.difference(self.FieldMapB0_S2_raw, self.FieldMapB0_S1_raw, params.img_mag)) / (2 * math.pi * 42.577 * ((2 * params.TE - params.TE)) / 1000)
+            params.B0DeltaB0mapmasked = np.matrix(np.zeros((params.B0DeltaB0map.shape[1], params.B0DeltaB0map.shape[0])))
+            params.B0DeltaB0mapmasked[:, :] = params.B0DeltaB0map[:, :]
+            self.img_max = np.max(np.amax(params.img_mag))
+            params.B0DeltaB0mapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
+
+            self.FieldMapB0_pha_raw = np.concatenate((self.FieldMapB0_S1_raw, self.FieldMapB0_S2_raw), axis=1)
+            np.savetxt('tooldata/FieldMap_B0_Phase_Raw_Data.txt', self.FieldMapB0_pha_raw)
+            self.FieldMapB0_pha = np.concatenate((self.FieldMapB0_S1, self.FieldMapB0_S2), axis=1)
+            np.savetxt('tooldata/FieldMap_B0_Phase_Data.txt', self.FieldMapB0_pha)
+            self.B0DeltaB0maps = np.concatenate((params.img_mag, params.B0DeltaB0map, params.B0DeltaB0mapmasked), axis=1)
+            np.savetxt('tooldata/FieldMap_B0_deltat1ms_Mag_Map_MapMasked_Data.txt', self.B0DeltaB0maps)
+        
 
     def FieldMapB1(self):
         print('Measuring B1 field...')
-        
-        self.GUImode_temp = 0
-        self.GUImode_temp = params.GUImode
-        self.sequence_temp = 0
-        self.sequence_temp = params.sequence
-        self.datapath_temp = ''    
-        self.datapath_temp = params.datapath
-        self.flipangleamplitude_temp = 0
-        self.flipangleamplitude_temp = params.flipangleamplitude
-        
-        params.GUImode = 1
-        params.sequence = 4
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            self.nPE_temp = 0
-            self.nPE_temp = params.nPE
-            self.FOV_temp = 0
-            self.FOV_temp = params.FOV
+
+        with params.override(*tool_sequence, 'datapath', 'flipangleamplitude'):
+            params.GUImode = 1
+            params.sequence = 4
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.flipangleamplitude = 35
+                params.TS = 4
+                params.TE = 4
+                params.TR = 6000
+                params.slicethickness = 15
+                params.frequencyoffset = 0
+                params.nPE = 64
+                if params.imageorientation == 2 or params.imageorientation == 5:
+                    if params.motor_enable == 0: params.FOV = 12
+                    else: params.FOV = 16
+                else:
+                    if params.motor_enable == 0: params.FOV = 16
+                    else: params.FOV = 18
+                        
+                proc.recalc_gradients()
             
-            params.flipangleamplitude = 35
-            params.TS = 4
-            params.TE = 4
-            params.TR = 6000
-            params.slicethickness = 15
-            params.frequencyoffset = 0
-            params.nPE = 64
-            if params.imageorientation == 2 or params.imageorientation == 5:
-                if params.motor_enable == 0: params.FOV = 12
-                else: params.FOV = 16
-            else:
-                if params.motor_enable == 0: params.FOV = 16
-                else: params.FOV = 18
-                    
-            proc.recalc_gradients()
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-        
-        params.datapath = 'rawdata/Tool_Image_rawdata'
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
             
-        seq.sequence_upload()
-        proc.image_process()
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+                
+            schedule = scheduler.start(params.TR)
+            seq.sequence_upload()
+            proc.image_process()
 
-        self.FieldMapB1_S1 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
-        self.FieldMapB1_S1[:, :] = params.img_mag[:, :]
+            self.FieldMapB1_S1 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
+            self.FieldMapB1_S1[:, :] = params.img_mag[:, :]
 
-        time.sleep(params.TR / 1000)
-        
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-
-        params.flipangleamplitude = params.flipangleamplitude * 2
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-
-        self.FieldMapB1_S2 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
-        self.FieldMapB1_S2[:, :] = params.img_mag[:, :]
-
-        params.flipangleamplitude = self.flipangleamplitude_temp
-
-        params.B1alphamap = np.arccos(self.FieldMapB1_S2 / (2 * self.FieldMapB1_S1)) * params.flipangleamplitude
-        params.B1alphamapmasked = np.matrix(np.zeros((params.B1alphamap.shape[1], params.B1alphamap.shape[0])))
-        params.B1alphamapmasked[:, :] = params.B1alphamap[:, :]
-        self.img_max = np.max(np.amax(params.img_mag))
-        params.B1alphamapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
-
-        self.FieldMapB1_mag = np.concatenate((self.FieldMapB1_S1, self.FieldMapB1_S2), axis=1)
-        np.savetxt('tooldata/FieldMap_B1_Phase_Data.txt', self.FieldMapB1_mag)
-        self.B1alphamaps = np.concatenate((params.img_mag, params.B1alphamap, params.B1alphamapmasked), axis=1)
-        np.savetxt('tooldata/FieldMap_B1_alpha' + str(params.flipangleamplitude) + 'deg_Mag_Map_MapMasked_Data.txt', self.B1alphamaps)
-
-        if params.toolautosequence == 1:
-            params.TS = self.TS_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.nPE = self.nPE_temp
-            params.FOV = self.FOV_temp
+            schedule.wait()
+            schedule.finish()
             
-            proc.recalc_gradients()
-        
-        params.GUImode = self.GUImode_temp
-        params.sequence = self.sequence_temp
-        params.datapath = self.datapath_temp
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+
+            flipangleamplitude = params.flipangleamplitude
+            params.flipangleamplitude = params.flipangleamplitude * 2
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+
+            seq.sequence_upload()
+            proc.image_process()
+
+            self.FieldMapB1_S2 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
+            self.FieldMapB1_S2[:, :] = params.img_mag[:, :]
+            params.flipangleamplitude = flipangleamplitude
+
+            params.B1alphamap = np.arccos(self.FieldMapB1_S2 / (2 * self.FieldMapB1_S1)) * params.flipangleamplitude
+            params.B1alphamapmasked = np.matrix(np.zeros((params.B1alphamap.shape[1], params.B1alphamap.shape[0])))
+            params.B1alphamapmasked[:, :] = params.B1alphamap[:, :]
+            self.img_max = np.max(np.amax(params.img_mag))
+            params.B1alphamapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
+
+            self.FieldMapB1_mag = np.concatenate((self.FieldMapB1_S1, self.FieldMapB1_S2), axis=1)
+            np.savetxt('tooldata/FieldMap_B1_Phase_Data.txt', self.FieldMapB1_mag)
+            self.B1alphamaps = np.concatenate((params.img_mag, params.B1alphamap, params.B1alphamapmasked), axis=1)
+            np.savetxt('tooldata/FieldMap_B1_alpha' + str(params.flipangleamplitude) + 'deg_Mag_Map_MapMasked_Data.txt', self.B1alphamaps)
+
 
     def FieldMapB1Slice(self):
         print('Measuring B1 (Slice) field...')
 
-        self.GUImode_temp = 0
-        self.GUImode_temp = params.GUImode
-        self.sequence_temp = 0
-        self.sequence_temp = params.sequence
-        self.datapath_temp = ''    
-        self.datapath_temp = params.datapath
-        self.flipangleamplitude_temp = 0
-        self.flipangleamplitude_temp = params.flipangleamplitude
-        
-        params.GUImode = 1
-        params.sequence = 20
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            self.nPE_temp = 0
-            self.nPE_temp = params.nPE
-            self.FOV_temp = 0
-            self.FOV_temp = params.FOV
+        with params.override(*tool_sequence, 'datapath', 'flipangleamplitude'):
+            params.GUImode = 1
+            params.sequence = 20
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.flipangleamplitude = 35
+                params.TS = 4
+                params.TE = 4
+                params.TR = 6000
+                params.slicethickness = 4
+                params.frequencyoffset = 0
+                params.nPE = 64
+                if params.imageorientation == 2 or params.imageorientation == 5:
+                    if params.motor_enable == 0: params.FOV = 12
+                    else: params.FOV = 16
+                else:
+                    if params.motor_enable == 0: params.FOV = 16
+                    else: params.FOV = 18
+                        
+                proc.recalc_gradients()
             
-            params.flipangleamplitude = 35
-            params.TS = 4
-            params.TE = 4
-            params.TR = 6000
-            params.slicethickness = 4
-            params.frequencyoffset = 0
-            params.nPE = 64
-            if params.imageorientation == 2 or params.imageorientation == 5:
-                if params.motor_enable == 0: params.FOV = 12
-                else: params.FOV = 16
-            else:
-                if params.motor_enable == 0: params.FOV = 16
-                else: params.FOV = 18
-                    
-            proc.recalc_gradients()
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-
-        self.FieldMapB1_S1 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
-        self.FieldMapB1_S1[:, :] = params.img_mag[:, :]
-
-        time.sleep(params.TR / 1000)
-        
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-
-        params.flipangleamplitude = params.flipangleamplitude * 2
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-        
-        params.flipangleamplitude = self.flipangleamplitude_temp
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_Gs_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID_Gs()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
 
-        self.FieldMapB1_S2 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
-        self.FieldMapB1_S2[:, :] = params.img_mag[:, :]
+            params.datapath = 'rawdata/Tool_Image_rawdata'
 
-        params.B1alphamap = np.arccos(self.FieldMapB1_S2 / (2 * self.FieldMapB1_S1)) * params.flipangleamplitude
-        params.B1alphamapmasked = np.matrix(np.zeros((params.B1alphamap.shape[1], params.B1alphamap.shape[0])))
-        params.B1alphamapmasked[:, :] = params.B1alphamap[:, :]
-        self.img_max = np.max(np.amax(params.img_mag))
-        params.B1alphamapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
-
-        self.FieldMapB1_mag = np.concatenate((self.FieldMapB1_S1, self.FieldMapB1_S2), axis=1)
-        np.savetxt('tooldata/FieldMap_B1_Phase_Data.txt', self.FieldMapB1_mag)
-        self.B1alphamaps = np.concatenate((params.img_mag, params.B1alphamap, params.B1alphamapmasked), axis=1)
-        np.savetxt('tooldata/FieldMap_B1_alpha' + str(params.flipangleamplitude) + 'deg_Mag_Map_MapMasked_Data.txt', self.B1alphamaps)
-
-        if params.toolautosequence == 1:
-            params.TS = self.TS_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.nPE = self.nPE_temp
-            params.FOV = self.FOV_temp
+            schedule = scheduler.start(params.TR)
+            seq.sequence_upload()
+            proc.image_process()
+
+            self.FieldMapB1_S1 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
+            self.FieldMapB1_S1[:, :] = params.img_mag[:, :]
+
+            schedule.wait()
+            schedule.finish()
+            
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
             
-            proc.recalc_gradients()
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.FID_Gs_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_FID_Gs()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+
+            flipangleamplitude = params.flipangleamplitude
+            params.flipangleamplitude = params.flipangleamplitude * 2
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+
+            seq.sequence_upload()
+            proc.image_process()
+
+            self.FieldMapB1_S2 = np.matrix(np.zeros((params.img_mag.shape[1], params.img_mag.shape[0])))
+            self.FieldMapB1_S2[:, :] = params.img_mag[:, :]
+            params.flipangleamplitude = flipangleamplitude
+
+            params.B1alphamap = np.arccos(self.FieldMapB1_S2 / (2 * self.FieldMapB1_S1)) * params.flipangleamplitude
+            params.B1alphamapmasked = np.matrix(np.zeros((params.B1alphamap.shape[1], params.B1alphamap.shape[0])))
+            params.B1alphamapmasked[:, :] = params.B1alphamap[:, :]
+            self.img_max = np.max(np.amax(params.img_mag))
+            params.B1alphamapmasked[params.img_mag < self.img_max * params.signalmask] = np.nan
+
+            self.FieldMapB1_mag = np.concatenate((self.FieldMapB1_S1, self.FieldMapB1_S2), axis=1)
+            np.savetxt('tooldata/FieldMap_B1_Phase_Data.txt', self.FieldMapB1_mag)
+            self.B1alphamaps = np.concatenate((params.img_mag, params.B1alphamap, params.B1alphamapmasked), axis=1)
+            np.savetxt('tooldata/FieldMap_B1_alpha' + str(params.flipangleamplitude) + 'deg_Mag_Map_MapMasked_Data.txt', self.B1alphamaps)
 
-        params.GUImode = self.GUImode_temp
-        params.sequence = self.sequence_temp
-        params.datapath = self.datapath_temp
 
     def FieldMapGradient(self):
         print('Gradient tool started...')
 
-        self.GUImode_temp = 0
-        self.GUImode_temp = params.GUImode
-        self.sequence_temp = 0
-        self.sequence_temp = params.sequence
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.GUImode = 1
-        params.sequence = 5
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            self.nPE_temp = 0
-            self.nPE_temp = params.nPE
-            self.FOV_temp = 0
-            self.FOV_temp = params.FOV
+        with params.override(*tool_sequence, 'datapath'):
+            params.GUImode = 1
+            params.sequence = 5
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
             
-            params.TS = 4
-            params.TE = 12
-            params.TR = 2000
-            params.slicethickness = 15
-            params.frequencyoffset = 0
-            params.nPE = 64
-            if params.imageorientation == 2 or params.imageorientation == 5:
-                if params.motor_enable == 0: params.FOV = 12
-                else: params.FOV = 16
-            else:
-                if params.motor_enable == 0: params.FOV = 16
-                else: params.FOV = 18
-                    
-            proc.recalc_gradients()
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to :', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-        
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-                    
-        seq.sequence_upload()    
-        proc.image_process()
-        
-        if params.toolautosequence == 1:
-            params.TS = self.TS_temp
-            params.TE = self.TE_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.nPE = self.nPE_temp
-            params.FOV = self.FOV_temp
+            if params.toolautosequence == 1:
+                params.TS = 4
+                params.TE = 12
+                params.TR = 2000
+                params.slicethickness = 15
+                params.frequencyoffset = 0
+                params.nPE = 64
+                if params.imageorientation == 2 or params.imageorientation == 5:
+                    if params.motor_enable == 0: params.FOV = 12
+                    else: params.FOV = 16
+                else:
+                    if params.motor_enable == 0: params.FOV = 16
+                    else: params.FOV = 18
+                        
+                proc.recalc_gradients()
             
-            proc.recalc_gradients()
-
-        params.GUImode = self.GUImode_temp
-        params.sequence = self.sequence_temp
-        params.datapath = self.datapath_temp
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.SE_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_SE()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to :', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
+            
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+                        
+            seq.sequence_upload()    
+            proc.image_process()
 
     def FieldMapGradientSlice(self):
         print('Gradient (Slice) tool started...')
 
-        self.GUImode_temp = 0
-        self.GUImode_temp = params.GUImode
-        self.sequence_temp = 0
-        self.sequence_temp = params.sequence
-        self.datapath_temp = ''
-        self.datapath_temp = params.datapath
-        
-        params.GUImode = 1
-        params.sequence = 21
-        params.datapath = 'rawdata/Tool_Spectrum_rawdata'
-        
-        if params.toolautosequence == 1:
-            self.TS_temp = 0
-            self.TS_temp = params.TS
-            self.TE_temp = 0
-            self.TE_temp = params.TE
-            self.TR_temp = 0
-            self.TR_temp = params.TR
-            self.slicethickness_temp = 0
-            self.slicethickness_temp = params.slicethickness
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            self.nPE_temp = 0
-            self.nPE_temp = params.nPE
-            self.FOV_temp = 0
-            self.FOV_temp = params.FOV
-            
-            params.TS = 4
-            params.TE = 12
-            params.TR = 4000
-            params.slicethickness = 4
-            params.frequencyoffset = 0
-            params.nPE = 64
-            if params.imageorientation == 2 or params.imageorientation == 5:
-                if params.motor_enable == 0: params.FOV = 12
-                else: params.FOV = 16
-            else:
-                if params.motor_enable == 0: params.FOV = 16
-                else: params.FOV = 18
-                    
-            proc.recalc_gradients()
-        
-        if params.autorecenter == 1:
-            self.frequencyoffset_temp = 0
-            self.frequencyoffset_temp = params.frequencyoffset
-            params.frequencyoffset = 0
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            params.frequencyoffset = self.frequencyoffset_temp
-
-        params.datapath = 'rawdata/Tool_Image_rawdata'
-
-        seq.sequence_upload()
-        proc.image_process()
-        
-        if params.toolautosequence == 1:
-            params.TS = self.TS_temp
-            params.TE = self.TE_temp
-            params.TR = self.TR_temp
-            params.slicethickness = self.slicethickness_temp
-            params.frequencyoffset = self.frequencyoffset_temp
-            params.nPE = self.nPE_temp
-            params.FOV = self.FOV_temp
+        with params.override(*tool_sequence, 'datapath'):
+            params.GUImode = 1
+            params.sequence = 21
+            params.datapath = 'rawdata/Tool_Spectrum_rawdata'
+            
+            if params.toolautosequence == 1:
+                params.TS = 4
+                params.TE = 12
+                params.TR = 4000
+                params.slicethickness = 4
+                params.frequencyoffset = 0
+                params.nPE = 64
+                if params.imageorientation == 2 or params.imageorientation == 5:
+                    if params.motor_enable == 0: params.FOV = 12
+                    else: params.FOV = 16
+                else:
+                    if params.motor_enable == 0: params.FOV = 16
+                    else: params.FOV = 18
+                        
+                proc.recalc_gradients()
             
-            proc.recalc_gradients()
+            if params.autorecenter == 1:
+                with params.override(frequencyoffset=0):
+                    schedule = scheduler.start(params.TR)
+                    seq.RXconfig_upload()
+                    seq.Gradients_upload()
+                    seq.Frequency_upload()
+                    seq.RFattenuation_upload()
+                    seq.SE_Gs_setup()
+                    seq.Sequence_upload()
+                    seq.acquire_spectrum_SE_Gs()
+                    proc.spectrum_process()
+                    proc.spectrum_analytics()
+                    params.frequency = params.centerfrequency
+                    params.saveFileParameter()
+                    print('Autorecenter to:', params.frequency)
+                    schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+                    schedule.finish()
 
-        params.GUImode = self.GUImode_temp
-        params.sequence = self.sequence_temp
-        params.datapath = self.datapath_temp
+            params.datapath = 'rawdata/Tool_Image_rawdata'
+
+            seq.sequence_upload()
+            proc.image_process()
 
     def T1measurement_IR_FID(self):
         print('Measuring T1 (FID)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
-        self.T1peakvalues = np.zeros(params.TIsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TIsteps):
-            self.estimated_time = self.estimated_time + ((100 + params.flippulselength + self.T1steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
+            self.T1peakvalues = np.zeros(params.TIsteps)
             
-        self.T1steps[0] = round(self.T1steps[0], 1)
-        params.TI = self.T1steps[0]
-        seq.IR_FID_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_FID()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TIsteps):
-            print(n + 1, '/', params.TIsteps)
-            self.T1steps[n] = round(self.T1steps[n], 1)
-            params.TI = self.T1steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+            self.estimated_time = 0
+            for n in range(params.TIsteps):
+                self.estimated_time = self.estimated_time + ((100 + params.flippulselength + self.T1steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                
+            self.T1steps[0] = round(self.T1steps[0], 1)
+            params.TI = self.T1steps[0]
+            schedule = scheduler.start(params.TR)
             seq.IR_FID_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_FID()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T1peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T1values[0, :] = self.T1steps
-        params.T1values[1, :] = self.T1peakvalues
-
-        params.TI = self.TI_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                print(n + 1, '/', params.TIsteps)
+                self.T1steps[n] = round(self.T1steps[n], 1)
+                params.TI = self.T1steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.IR_FID_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_FID()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T1peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T1values[0, :] = self.T1steps
+            params.T1values[1, :] = self.T1peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TIsteps, 2)))
         self.datatxt1 = np.transpose(params.T1values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T1 (FID) Data aquired!')
 
     def T1measurement_IR_SE(self):
         print('Measuring T1 (SE)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
-        self.T1peakvalues = np.zeros(params.TIsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TIsteps):
-            self.estimated_time = self.estimated_time + ((100 + params.flippulselength + self.T1steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
+            self.T1peakvalues = np.zeros(params.TIsteps)
             
-        self.T1steps[0] = round(self.T1steps[0], 1)
-        params.TI = self.T1steps[0]
-        seq.IR_SE_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_SE()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TIsteps):
-            print(n + 1, '/', params.TIsteps)
-            self.T1steps[n] = round(self.T1steps[n], 1)
-            params.TI = self.T1steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+            self.estimated_time = 0
+            for n in range(params.TIsteps):
+                self.estimated_time = self.estimated_time + ((100 + params.flippulselength + self.T1steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                
+            self.T1steps[0] = round(self.T1steps[0], 1)
+            params.TI = self.T1steps[0]
+            schedule = scheduler.start(params.TR)
             seq.IR_SE_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_SE()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T1peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T1values[0, :] = self.T1steps
-        params.T1values[1, :] = self.T1peakvalues
-
-        params.TI = self.TI_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                print(n + 1, '/', params.TIsteps)
+                self.T1steps[n] = round(self.T1steps[n], 1)
+                params.TI = self.T1steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.IR_SE_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T1peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T1values[0, :] = self.T1steps
+            params.T1values[1, :] = self.T1peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TIsteps, 2)))
         self.datatxt1 = np.transpose(params.T1values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T1 (SE) Data aquired!')
 
     def T1measurement_IR_FID_Gs(self):
         print('Measuring T1 (Slice, FID)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
-        self.T1peakvalues = np.zeros(params.TIsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TIsteps):
-            self.estimated_time = self.estimated_time + ((100 + 4*params.flippulselength + self.T1steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
+            self.T1peakvalues = np.zeros(params.TIsteps)
             
-        self.T1steps[0] = round(self.T1steps[0], 1)
-        params.TI = self.T1steps[0]
-        seq.IR_FID_Gs_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_FID_Gs()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TIsteps):
-            print(n + 1, '/', params.TIsteps)
-            self.T1steps[n] = round(self.T1steps[n], 1)
-            params.TI = self.T1steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+            self.estimated_time = 0
+            for n in range(params.TIsteps):
+                self.estimated_time = self.estimated_time + ((100 + 4*params.flippulselength + self.T1steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                
+            self.T1steps[0] = round(self.T1steps[0], 1)
+            params.TI = self.T1steps[0]
+            schedule = scheduler.start(params.TR)
             seq.IR_FID_Gs_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_FID_Gs()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T1peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + 4*params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T1values[0, :] = self.T1steps
-        params.T1values[1, :] = self.T1peakvalues
-
-        params.TI = self.TI_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                print(n + 1, '/', params.TIsteps)
+                self.T1steps[n] = round(self.T1steps[n], 1)
+                params.TI = self.T1steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.IR_FID_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_FID_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T1peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + 4*params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T1values[0, :] = self.T1steps
+            params.T1values[1, :] = self.T1peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TIsteps, 2)))
         self.datatxt1 = np.transpose(params.T1values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T1 (Slice, FID) Data aquired!')
 
     def T1measurement_IR_SE_Gs(self):
         print('Measuring T1 (Slice, SE)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
-        self.T1peakvalues = np.zeros(params.TIsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TIsteps):
-            self.estimated_time = self.estimated_time + ((100 + 4*params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1values = np.matrix(np.zeros((2, params.TIsteps)))
+            self.T1peakvalues = np.zeros(params.TIsteps)
             
-        self.T1steps[0] = round(self.T1steps[0], 1)
-        params.TI = self.T1steps[0]
-        seq.IR_SE_Gs_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_SE_Gs()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TIsteps):
-            print(n + 1, '/', params.TIsteps)
-            self.T1steps[n] = round(self.T1steps[n], 1)
-            params.TI = self.T1steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+            self.estimated_time = 0
+            for n in range(params.TIsteps):
+                self.estimated_time = self.estimated_time + ((100 + 4*params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                
+            self.T1steps[0] = round(self.T1steps[0], 1)
+            params.TI = self.T1steps[0]
+            schedule = scheduler.start(params.TR)
             seq.IR_SE_Gs_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_SE_Gs()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T1peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + 4*params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T1values[0, :] = self.T1steps
-        params.T1values[1, :] = self.T1peakvalues
-
-        params.TI = self.TI_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                print(n + 1, '/', params.TIsteps)
+                self.T1steps[n] = round(self.T1steps[n], 1)
+                params.TI = self.T1steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.IR_SE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T1peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + 4*params.flippulselength + self.T1steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                    self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TIsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T1values[0, :] = self.T1steps
+            params.T1values[1, :] = self.T1peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TIsteps, 2)))
         self.datatxt1 = np.transpose(params.T1values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T1 (Slice, SE) Data aquired!')
 
-    def T1process(self):
+    def T1process(self, method='loglinear'):
+        # method 'loglinear' or 'IR' (three parameter fit started from the log-linear solution)
         print('Calculating T1...')
-        self.procdata = np.genfromtxt(params.datapath + '.txt')
+        self.procdata = rawdata.load(params.datapath)
         params.T1values = np.transpose(self.procdata)
 
         params.T1xvalues = np.zeros(params.T1values.shape[1])
@@ -3338,585 +1834,521 @@ class process:
         params.T1 = round(-(1 / params.T1linregres.slope), 2)
         params.T1regyvalues1 = abs(self.T1ymax - np.exp(params.T1regyvalues2))
 
+        if method == 'IR':
+            self.T1fit = fit.T1_IR(params.T1xvalues, params.T1yvalues1, params.T1linregres.slope)
+            A, B = self.T1fit['amplitudes']
+            params.T1 = round(float(self.T1fit['T1']), 2)
+            params.T1regyvalues1 = abs(A - B * np.exp(-params.T1xvalues / params.T1))
+            print('Fit R²: ', round(float(self.T1fit['r2']), 4), ', iterations: ', int(self.T1fit['iterations']))
+
         print('T1 calculated!')
 
     def T1measurement_Image_IR_GRE(self):
         print('Measuring T1 (2D GRE)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1stepsimg = np.zeros((params.TIsteps))
-        params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
-
-        for n in range(params.TIsteps):
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-            print(n + 1, '/', params.TIsteps)
-            params.T1stepsimg[n] = round(self.T1steps[n], 1)
-            params.TI = params.T1stepsimg[n]
-            seq.Image_IR_GRE_setup()
-            seq.Sequence_upload()
-            seq.acquire_image_GRE()
-            proc.image_process()
-            params.T1img_mag[n, :, :] = params.img_mag[:, :]
-            time.sleep(params.TR / 1000)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1stepsimg = np.zeros((params.TIsteps))
+            params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                seq.RXconfig_upload()
+                seq.Gradients_upload()
+                seq.Frequency_upload()
+                seq.RFattenuation_upload()
+                seq.FID_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_FID()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                params.frequency = params.centerfrequency
+                params.saveFileParameter()
+                print('Autorecenter to:', params.frequency)
+                schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+
+                print(n + 1, '/', params.TIsteps)
+                params.T1stepsimg[n] = round(self.T1steps[n], 1)
+                params.TI = params.T1stepsimg[n]
+                seq.Image_IR_GRE_setup()
+                seq.Sequence_upload()
+                seq.acquire_image_GRE()
+                proc.image_process()
+                params.T1img_mag[n, :, :] = params.img_mag[:, :]
+                schedule.wait()
+            schedule.finish()
 
-        params.TI = self.TI_temp
         params.saveFileData()
 
         self.datatxt1 = np.zeros((params.T1stepsimg.shape[0]))
         self.datatxt1 = np.transpose(params.T1stepsimg)
-        np.savetxt(params.datapath + '_Image_TI_steps.txt', self.datatxt1)
+        rawdata.save(params.datapath + '_Image_TI_steps', self.datatxt1)
 
         self.datatxt2 = np.matrix(np.zeros((params.T1img_mag.shape[1], params.T1img_mag.shape[0] * params.T1img_mag.shape[2])))
         for m in range(params.T1img_mag.shape[0]):
             self.datatxt2[:, m * params.T1img_mag.shape[2]:m * params.T1img_mag.shape[2] + params.T1img_mag.shape[2]] = params.T1img_mag[m, :, :]
-        np.savetxt(params.datapath + '_Image_Magnitude.txt', self.datatxt2)
+        rawdata.save(params.datapath + '_Image_Magnitude', self.datatxt2)
 
         print('T1 (2D GRE) Data aquired!')
 
     def T1measurement_Image_IR_SE(self):
         print('Measuring T1 (2D SE)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1stepsimg = np.zeros((params.TIsteps))
-        params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
-
-        for n in range(params.TIsteps):
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-            print(n + 1, '/', params.TIsteps)
-            params.T1stepsimg[n] = round(self.T1steps[n], 1)
-            params.TI = params.T1stepsimg[n]
-            seq.Image_IR_SE_setup()
-            seq.Sequence_upload()
-            seq.acquire_image_SE()
-            proc.image_process()
-            params.T1img_mag[n, :, :] = params.img_mag[:, :]
-            time.sleep(params.TR / 1000)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1stepsimg = np.zeros((params.TIsteps))
+            params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                seq.RXconfig_upload()
+                seq.Gradients_upload()
+                seq.Frequency_upload()
+                seq.RFattenuation_upload()
+                seq.SE_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                params.frequency = params.centerfrequency
+                params.saveFileParameter()
+                print('Autorecenter to:', params.frequency)
+                schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+
+                print(n + 1, '/', params.TIsteps)
+                params.T1stepsimg[n] = round(self.T1steps[n], 1)
+                params.TI = params.T1stepsimg[n]
+                seq.Image_IR_SE_setup()
+                seq.Sequence_upload()
+                seq.acquire_image_SE()
+                proc.image_process()
+                params.T1img_mag[n, :, :] = params.img_mag[:, :]
+                schedule.wait()
+            schedule.finish()
 
-        params.TI = self.TI_temp
         params.saveFileData()
 
         self.datatxt1 = np.zeros((params.T1stepsimg.shape[0]))
         self.datatxt1 = np.transpose(params.T1stepsimg)
-        np.savetxt(params.datapath + '_Image_TI_steps.txt', self.datatxt1)
+        rawdata.save(params.datapath + '_Image_TI_steps', self.datatxt1)
 
         self.datatxt2 = np.matrix(np.zeros((params.T1img_mag.shape[1], params.T1img_mag.shape[0] * params.T1img_mag.shape[2])))
         for m in range(params.T1img_mag.shape[0]):
             self.datatxt2[:, m * params.T1img_mag.shape[2]:m * params.T1img_mag.shape[2] + params.T1img_mag.shape[2]] = params.T1img_mag[m, :, :]
-        np.savetxt(params.datapath + '_Image_Magnitude.txt', self.datatxt2)
+        rawdata.save(params.datapath + '_Image_Magnitude', self.datatxt2)
 
         print('T1 (2D SE) Data aquired!')
 
     def T1measurement_Image_IR_GRE_Gs(self):
         print('Measuring T1 (Slice, 2D GRE)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1stepsimg = np.zeros((params.TIsteps))
-        params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
-
-        for n in range(params.TIsteps):
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.FID_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_FID_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-            print(n + 1, '/', params.TIsteps)
-            params.T1stepsimg[n] = round(self.T1steps[n], 1)
-            params.TI = params.T1stepsimg[n]
-            seq.Image_IR_GRE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_image_GRE_Gs()
-            proc.image_process()
-            params.T1img_mag[n, :, :] = params.img_mag[:, :]
-            time.sleep(params.TR / 1000)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1stepsimg = np.zeros((params.TIsteps))
+            params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                seq.RXconfig_upload()
+                seq.Gradients_upload()
+                seq.Frequency_upload()
+                seq.RFattenuation_upload()
+                seq.FID_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_FID_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                params.frequency = params.centerfrequency
+                params.saveFileParameter()
+                print('Autorecenter to:', params.frequency)
+                schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+
+                print(n + 1, '/', params.TIsteps)
+                params.T1stepsimg[n] = round(self.T1steps[n], 1)
+                params.TI = params.T1stepsimg[n]
+                seq.Image_IR_GRE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_image_GRE_Gs()
+                proc.image_process()
+                params.T1img_mag[n, :, :] = params.img_mag[:, :]
+                schedule.wait()
+            schedule.finish()
 
-        params.TI = self.TI_temp
         params.saveFileData()
 
         self.datatxt1 = np.zeros((params.T1stepsimg.shape[0]))
         self.datatxt1 = np.transpose(params.T1stepsimg)
-        np.savetxt(params.datapath + '_Image_TI_steps.txt', self.datatxt1)
+        rawdata.save(params.datapath + '_Image_TI_steps', self.datatxt1)
 
         self.datatxt2 = np.matrix(
             np.zeros((params.T1img_mag.shape[1], params.T1img_mag.shape[0] * params.T1img_mag.shape[2])))
         for m in range(params.T1img_mag.shape[0]):
             self.datatxt2[:, m * params.T1img_mag.shape[2]:m * params.T1img_mag.shape[2] + params.T1img_mag.shape[2]] = params.T1img_mag[m, :, :]
-        np.savetxt(params.datapath + '_Image_Magnitude.txt', self.datatxt2)
+        rawdata.save(params.datapath + '_Image_Magnitude', self.datatxt2)
 
         print('T1 (Slice, 2D GRE) Data aquired!')
 
     def T1measurement_Image_IR_SE_Gs(self):
         print('Measuring T1 (Slice, 2D SE)...')
 
-        self.TI_temp = 0
-        self.TI_temp = params.TI
-
-        self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
-        params.T1stepsimg = np.zeros((params.TIsteps))
-        params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
-
-        for n in range(params.TIsteps):
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-            print(n + 1, '/', params.TIsteps)
-            params.T1stepsimg[n] = round(self.T1steps[n], 1)
-            params.TI = params.T1stepsimg[n]
-            seq.Image_IR_SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_image_SE_Gs()
-            proc.image_process()
-            params.T1img_mag[n, :, :] = params.img_mag[:, :]
-            time.sleep(params.TR / 1000)
+        with params.override('TI'):
+            self.T1steps = np.linspace(params.TIstart, params.TIstop, params.TIsteps)
+            params.T1stepsimg = np.zeros((params.TIsteps))
+            params.T1img_mag = np.array(np.zeros((params.TIsteps, params.nPE, params.nPE)))
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TIsteps):
+                seq.RXconfig_upload()
+                seq.Gradients_upload()
+                seq.Frequency_upload()
+                seq.RFattenuation_upload()
+                seq.SE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                params.frequency = params.centerfrequency
+                params.saveFileParameter()
+                print('Autorecenter to:', params.frequency)
+                schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+
+                print(n + 1, '/', params.TIsteps)
+                params.T1stepsimg[n] = round(self.T1steps[n], 1)
+                params.TI = params.T1stepsimg[n]
+                seq.Image_IR_SE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_image_SE_Gs()
+                proc.image_process()
+                params.T1img_mag[n, :, :] = params.img_mag[:, :]
+                schedule.wait()
+            schedule.finish()
 
-        params.TI = self.TI_temp
         params.saveFileData()
 
         self.datatxt1 = np.zeros((params.T1stepsimg.shape[0]))
         self.datatxt1 = np.transpose(params.T1stepsimg)
-        np.savetxt(params.datapath + '_Image_TI_steps.txt', self.datatxt1)
+        rawdata.save(params.datapath + '_Image_TI_steps', self.datatxt1)
 
         self.datatxt2 = np.matrix(np.zeros((params.T1img_mag.shape[1], params.T1img_mag.shape[0] * params.T1img_mag.shape[2])))
         for m in range(params.T1img_mag.shape[0]):
             self.datatxt2[:, m * params.T1img_mag.shape[2]:m * params.T1img_mag.shape[2] + params.T1img_mag.shape[2]] = params.T1img_mag[m, :, :]
-        np.savetxt(params.datapath + '_Image_Magnitude.txt', self.datatxt2)
+        rawdata.save(params.datapath + '_Image_Magnitude', self.datatxt2)
 
         print('T1 (Slice, 2D SE) Data aquired!')
 
-    def T1imageprocess(self):
+    def T1imageprocess(self, method='loglinear'):
+        # method 'loglinear' or 'IR' (three parameter fit started from the log-linear solution)
         print('Calculating T1 map...')
 
-        self.procdata = np.genfromtxt(params.datapath + '_Image_TI_steps.txt')
+        self.procdata = rawdata.load(params.datapath + '_Image_TI_steps')
         params.T1stepsimg = np.transpose(self.procdata)
 
-        self.procdata = np.genfromtxt(params.datapath + '_Image_Magnitude.txt')
-        params.T1img_mag = np.array(np.zeros((int(self.procdata.shape[1] / self.procdata.shape[0]), self.procdata.shape[0], self.procdata.shape[0])))
-
-        for n in range(int(self.procdata.shape[1] / self.procdata.shape[0])):
-            params.T1img_mag[n, :, :] = self.procdata[:, n * self.procdata.shape[0]:n * self.procdata.shape[0] + self.procdata.shape[0]]
-        params.T1imgvalues = np.matrix(np.zeros((params.T1img_mag.shape[1], params.T1img_mag.shape[2])))
-
-        for n in range(params.T1img_mag.shape[1]):
-            for m in range(params.T1img_mag.shape[2]):
-
-                params.T1xvalues = np.zeros(params.T1stepsimg.shape[0])
-                params.T1yvalues1 = np.zeros(params.T1stepsimg.shape[0])
-                params.T1yvalues2 = np.zeros(params.T1stepsimg.shape[0])
-                params.T1xvalues[:] = params.T1stepsimg[:]
-                params.T1yvalues1[:] = params.T1img_mag[:, n, m]
-                params.T1yvalues2[:] = params.T1img_mag[:, n, m]
-
-                self.minindex = np.argmin(params.T1yvalues1)
-                if self.minindex >= 1:
-                    params.T1yvalues2[0:self.minindex - 1] = -params.T1yvalues1[0:self.minindex - 1]
-                self.T1ymax = np.max(params.T1yvalues2)
-
-                params.T1yvalues2[:] = np.log(self.T1ymax - params.T1yvalues2)
-                params.T1yvalues2[np.isinf(params.T1yvalues2)] = np.nan
-
-                params.T1linregres = linregress(params.T1xvalues[np.isnan(params.T1yvalues2) == False], params.T1yvalues2[np.isnan(params.T1yvalues2) == False])
-                params.T1imgvalues[n, m] = round(-(1 / params.T1linregres.slope), 2)
+        # Magnitude images side by side (N x steps*N) to steps x N x N
+        self.procdata = rawdata.load(params.datapath + '_Image_Magnitude')
+        N = self.procdata.shape[0]
+        params.T1img_mag = np.array(np.reshape(self.procdata, (N, int(self.procdata.shape[1] / N), N)).transpose(1, 0, 2), dtype=np.float64)
 
+        # Fit only the pixels above the signal mask
         self.img_max = np.max(np.amax(params.T1img_mag[params.T1img_mag.shape[0] - 1, :, :]))
-        params.T1imgvalues[params.T1img_mag[params.T1img_mag.shape[0] - 1, :, :] < self.img_max * params.signalmask] = np.nan
+        self.T1mask = params.T1img_mag[params.T1img_mag.shape[0] - 1, :, :] >= self.img_max * params.signalmask
+
+        # Polarity restoration: values more than one step before the minimum are inverted
+        Y = params.T1img_mag[:, self.T1mask]
+        minindex = np.argmin(Y, axis=0)
+        Y = np.where(np.arange(Y.shape[0])[:, np.newaxis] < minindex - 1, -Y, Y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Y = np.log(np.max(Y, axis=0) - Y)
+        Y[np.isinf(Y)] = np.nan
+
+        slope, intercept, rvalue = self.loglinear_fit(np.asarray(params.T1stepsimg, dtype=np.float64), Y)
+
+        params.T1imgvalues = np.matrix(np.full(self.T1mask.shape, np.nan))
+        self.T1imgslope = np.full(self.T1mask.shape, np.nan)
+        self.T1imgintercept = np.full(self.T1mask.shape, np.nan)
+        self.T1imgr2 = np.full(self.T1mask.shape, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            params.T1imgvalues[self.T1mask] = np.round(-(1 / slope), 2)
+        self.T1imgslope[self.T1mask] = slope
+        self.T1imgintercept[self.T1mask] = intercept
+        self.T1imgr2[self.T1mask] = rvalue ** 2
+
+        if method == 'IR':
+            self.T1imgfit = fit.T1_IR(params.T1stepsimg, params.T1img_mag[:, self.T1mask], slope)
+            self.T1imgiterations = np.zeros(self.T1mask.shape, dtype=np.int32)
+            params.T1imgvalues[self.T1mask] = np.round(self.T1imgfit['T1'], 2)
+            self.T1imgr2[self.T1mask] = self.T1imgfit['r2']
+            self.T1imgiterations[self.T1mask] = self.T1imgfit['iterations']
+            print('Fit iterations (mean): ', round(float(np.mean(self.T1imgfit['iterations'])), 1), \
+                  ', not converged: ', int(np.sum(~self.T1imgfit['converged'])))
 
         print('T1 map calculated!')
 
+    def loglinear_fit(self, x, Y):
+        # Least squares line through the non-NaN values of every column of Y over x,
+        # same arithmetic as scipy.stats.linregress per column. Returns slope, intercept and r.
+        valid = ~np.isnan(Y)
+        n = np.sum(valid, axis=0)
+        X = np.where(valid, x[:, np.newaxis], 0)
+        Y = np.where(valid, Y, 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xmean = np.sum(X, axis=0) / n
+            ymean = np.sum(Y, axis=0) / n
+            xc = np.where(valid, X - xmean, 0)
+            yc = np.where(valid, Y - ymean, 0)
+            ssxm = np.sum(xc * xc, axis=0) * (1 / n)
+            ssxym = np.sum(xc * yc, axis=0) * (1 / n)
+            ssym = np.sum(yc * yc, axis=0) * (1 / n)
+
+            slope = ssxym / ssxm
+            intercept = ymean - slope * xmean
+            rvalue = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+        zero = (ssxm == 0) | (ssym == 0)
+        rvalue[zero] = np.where(ssxym[zero] == 0, np.nan, 0.0)
+
+        return slope, intercept, rvalue
+
     def T2measurement_SE(self):
         print('Measuring T2 (SE)...')
 
-        self.TE_temp = 0
-        self.TE_temp = params.TE
-
-        self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
-        params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
-        self.T2peakvalues = np.zeros(params.TEsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TEsteps):
-            self.estimated_time = self.estimated_time + ((100 + params.flippulselength/2 + self.T2steps[n]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        self.T2steps[0] = round(self.T2steps[0], 1)
-        params.TE = self.T2steps[0]
-        seq.SE_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_SE()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TEsteps):
-            print(n + 1, '/', params.TEsteps)
-            self.T2steps[n] = round(self.T2steps[n], 1)
-            params.TE = self.T2steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+        with params.override('TE'):
+            self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
+            params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
+            self.T2peakvalues = np.zeros(params.TEsteps)
+            
+            self.estimated_time = 0
+            for n in range(params.TEsteps):
+                self.estimated_time = self.estimated_time + ((100 + params.flippulselength/2 + self.T2steps[n]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+            
+            self.T2steps[0] = round(self.T2steps[0], 1)
+            params.TE = self.T2steps[0]
+            schedule = scheduler.start(params.TR)
             seq.SE_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_SE()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T2peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength/2 + self.T2steps[m]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-            
-
-        params.T2values[0, :] = self.T2steps
-        params.T2values[1, :] = self.T2peakvalues
-
-        params.TE = self.TE_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TEsteps):
+                print(n + 1, '/', params.TEsteps)
+                self.T2steps[n] = round(self.T2steps[n], 1)
+                params.TE = self.T2steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.SE_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T2peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength/2 + self.T2steps[m]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+                
+            params.T2values[0, :] = self.T2steps
+            params.T2values[1, :] = self.T2peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TEsteps, 2)))
         self.datatxt1 = np.transpose(params.T2values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T2 (SE) Data aquired!')
 
     def T2measurement_SIR_FID(self):
         print('Measuring T2 (SIR-FID)...')
 
-        self.SIR_TE_temp = 0
-        self.SIR_TE_temp = params.SIR_TE
-
-        self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
-        params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
-        self.T2peakvalues = np.zeros(params.TEsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TEsteps):
-            self.estimated_time = self.estimated_time + ((100 + params.flippulselength/2 + self.T2steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        self.T2steps[0] = round(self.T2steps[0], 1)
-        params.SIR_TE = self.T2steps[0]
-        seq.SIR_FID_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_SE()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TEsteps):
-            print(n + 1, '/', params.TEsteps)
-            self.T2steps[n] = round(self.T2steps[n], 1)
-            params.SIR_TE = self.T2steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+        with params.override('SIR_TE'):
+            self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
+            params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
+            self.T2peakvalues = np.zeros(params.TEsteps)
+            
+            self.estimated_time = 0
+            for n in range(params.TEsteps):
+                self.estimated_time = self.estimated_time + ((100 + params.flippulselength/2 + self.T2steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+            
+            self.T2steps[0] = round(self.T2steps[0], 1)
+            params.SIR_TE = self.T2steps[0]
+            schedule = scheduler.start(params.TR)
             seq.SIR_FID_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_SE()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T2peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength/2 + self.T2steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T2values[0, :] = self.T2steps
-        params.T2values[1, :] = self.T2peakvalues
-
-        params.SIR_TE = self.SIR_TE_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TEsteps):
+                print(n + 1, '/', params.TEsteps)
+                self.T2steps[n] = round(self.T2steps[n], 1)
+                params.SIR_TE = self.T2steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.SIR_FID_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T2peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + params.flippulselength/2 + self.T2steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T2values[0, :] = self.T2steps
+            params.T2values[1, :] = self.T2peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TEsteps, 2)))
         self.datatxt1 = np.transpose(params.T2values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T2 (SIR-FID) Data aquired!')
 
     def T2measurement_SE_Gs(self):
         print('Measuring T2 (Slice, SE)...')
 
-        self.TE_temp = 0
-        self.TE_temp = params.TE
-
-        self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
-        params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
-        self.T2peakvalues = np.zeros(params.TEsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TEsteps):
-            self.estimated_time = self.estimated_time + ((100 + 2*params.flippulselength + self.T2steps[n]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        self.T2steps[0] = round(self.T2steps[0], 1)
-        params.TE = self.T2steps[0]
-        seq.SE_Gs_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_SE_Gs()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TEsteps):
-            print(n + 1, '/', params.TEsteps)
-            self.T2steps[n] = round(self.T2steps[n], 1)
-            params.TE = self.T2steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+        with params.override('TE'):
+            self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
+            params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
+            self.T2peakvalues = np.zeros(params.TEsteps)
+            
+            self.estimated_time = 0
+            for n in range(params.TEsteps):
+                self.estimated_time = self.estimated_time + ((100 + 2*params.flippulselength + self.T2steps[n]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+            
+            self.T2steps[0] = round(self.T2steps[0], 1)
+            params.TE = self.T2steps[0]
+            schedule = scheduler.start(params.TR)
             seq.SE_Gs_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_SE_Gs()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T2peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + 2*params.flippulselength + self.T2steps[m]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T2values[0, :] = self.T2steps
-        params.T2values[1, :] = self.T2peakvalues
-
-        params.TE = self.TE_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TEsteps):
+                print(n + 1, '/', params.TEsteps)
+                self.T2steps[n] = round(self.T2steps[n], 1)
+                params.TE = self.T2steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.SE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T2peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + 2*params.flippulselength + self.T2steps[m]*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T2values[0, :] = self.T2steps
+            params.T2values[1, :] = self.T2peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TEsteps, 2)))
         self.datatxt1 = np.transpose(params.T2values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T2 (Slice, SE) Data aquired!')
 
     def T2measurement_SIR_FID_Gs(self):
         print('Measuring T2 (Slice, SIR-FID)...')
 
-        self.SIR_TE_temp = 0
-        self.SIR_TE_temp = params.SIR_TE
-
-        self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
-        params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
-        self.T2peakvalues = np.zeros(params.TEsteps)
-        
-        self.estimated_time = 0
-        for n in range(params.TEsteps):
-            self.estimated_time = self.estimated_time + ((100 + 2*params.flippulselength + self.T2steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-        
-        self.T2steps[0] = round(self.T2steps[0], 1)
-        params.SIR_TE = self.T2steps[0]
-        seq.SIR_FID_Gs_setup()
-        seq.Sequence_upload()
-        seq.acquire_spectrum_SE_Gs()
-        proc.spectrum_process()
-        proc.spectrum_analytics()
-        if params.measurement_time_dialog == 1:
-            msg_box = QMessageBox()
-            msg_box.setText('Pre-measuring...')
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-            msg_box.button(QMessageBox.Ok).hide()
-            msg_box.exec()
-        else: time.sleep((params.TR-100)/1000)
-        time.sleep(0.1)
-
-        for n in range(params.TEsteps):
-            print(n + 1, '/', params.TEsteps)
-            self.T2steps[n] = round(self.T2steps[n], 1)
-            params.SIR_TE = self.T2steps[n]
-            # if params.SNR >= 100:
-                # params.frequency = params.centerfrequency
-                # print('Recenter to: ', params.frequency)
-                # params.saveFileParameter()
+        with params.override('SIR_TE'):
+            self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
+            params.T2values = np.matrix(np.zeros((2, params.TEsteps)))
+            self.T2peakvalues = np.zeros(params.TEsteps)
+            
+            self.estimated_time = 0
+            for n in range(params.TEsteps):
+                self.estimated_time = self.estimated_time + ((100 + 2*params.flippulselength + self.T2steps[n]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+            
+            self.T2steps[0] = round(self.T2steps[0], 1)
+            params.SIR_TE = self.T2steps[0]
+            schedule = scheduler.start(params.TR)
             seq.SIR_FID_Gs_setup()
             seq.Sequence_upload()
             seq.acquire_spectrum_SE_Gs()
             proc.spectrum_process()
             proc.spectrum_analytics()
-            self.T2peakvalues[n] = params.peakvalue
-            
-            self.remaining_time_1 = 0
-            for m in range(n):
-                self.remaining_time_1 = self.remaining_time_1 + ((100 + 2*params.flippulselength + self.T2steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
-            self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
-            self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
-            self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
-            self.remaining_time_s = int(self.remaining_time_2 % 60)
-            
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-        params.T2values[0, :] = self.T2steps
-        params.T2values[1, :] = self.T2peakvalues
-
-        params.SIR_TE = self.SIR_TE_temp
-        params.saveFileParameter()
+            schedule.wait('Pre-measuring...')
+            schedule.finish()
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TEsteps):
+                print(n + 1, '/', params.TEsteps)
+                self.T2steps[n] = round(self.T2steps[n], 1)
+                params.SIR_TE = self.T2steps[n]
+                # if params.SNR >= 100:
+                    # params.frequency = params.centerfrequency
+                    # print('Recenter to: ', params.frequency)
+                    # params.saveFileParameter()
+                seq.SIR_FID_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                self.T2peakvalues[n] = params.peakvalue
+                
+                self.remaining_time_1 = 0
+                for m in range(n):
+                    self.remaining_time_1 = self.remaining_time_1 + ((100 + 2*params.flippulselength + self.T2steps[m]*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
+                self.remaining_time_2 = (self.estimated_time - self.remaining_time_1)/1000
+                self.remaining_time_h = math.floor(self.remaining_time_2 / (3600))
+                self.remaining_time_min = math.floor(self.remaining_time_2 / 60)
+                self.remaining_time_s = int(self.remaining_time_2 % 60)
+                
+                schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.TEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+            schedule.finish()
+
+            params.T2values[0, :] = self.T2steps
+            params.T2values[1, :] = self.T2peakvalues
 
         self.datatxt1 = np.matrix(np.zeros((params.TEsteps, 2)))
         self.datatxt1 = np.transpose(params.T2values)
-        np.savetxt(params.datapath + '.txt', self.datatxt1)
+        rawdata.save(params.datapath, self.datatxt1)
 
         print('T2 (Slice, SIR-FID) Data aquired!')
 
-    def T2process(self):
+    def T2process(self, method='loglinear'):
+        # method 'loglinear', 'mono' or 'bi' (exponential fits started from the log-linear solution)
         print('Calculating T2...')
-        self.procdata = np.genfromtxt(params.datapath + '.txt')
+        self.procdata = rawdata.load(params.datapath)
         params.T2values = np.transpose(self.procdata)
 
         params.T2xvalues = np.zeros(params.T2values.shape[1])
@@ -3928,63 +2360,62 @@ class process:
         params.T2regyvalues = params.T2linregres.slope * params.T2xvalues + params.T2linregres.intercept
         params.T2 = round(-(1 / params.T2linregres.slope), 2)
 
+        if method in ('mono', 'bi'):
+            if method == 'mono': self.T2fit = fit.T2_mono(params.T2xvalues, params.T2values[1, :], params.T2linregres.slope)
+            else: self.T2fit = fit.T2_bi(params.T2xvalues, params.T2values[1, :], params.T2linregres.slope)
+            params.T2 = round(float(self.T2fit['T2']), 2)
+            params.T2regyvalues = np.log(np.sum(self.T2fit['amplitudes'][:, np.newaxis] * np.exp(-self.T2fit['rates'][:, np.newaxis] * params.T2xvalues), axis=0))
+            print('Fit R²: ', round(float(self.T2fit['r2']), 4), ', iterations: ', int(self.T2fit['iterations']))
+
         print('T2 calculated!')
 
     def T2measurement_Image_SE(self):
         print('Measuring T2 (2D SE)...')
 
-        self.TE_temp = 0
-        self.TE_temp = params.TE
-
-        self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
-        params.T2stepsimg = np.zeros((params.TEsteps))
-        params.T2img_mag = np.array(np.zeros((params.TEsteps, params.nPE, params.nPE)))
-
-        for n in range(params.TEsteps):
-            params.TE = self.TE_temp
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-            print(n + 1, '/', params.TEsteps)
-            params.T2stepsimg[n] = round(self.T2steps[n], 1)
-            params.TE = params.T2stepsimg[n]
-            seq.Image_SE_setup()
-            seq.Sequence_upload()
-            seq.acquire_image_SE()
-            proc.image_process()
-            params.T2img_mag[n, :, :] = params.img_mag[:, :]
-            time.sleep(params.TR / 1000)
+        with params.override('TE'):
+            TE = params.TE
+            self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
+            params.T2stepsimg = np.zeros((params.TEsteps))
+            params.T2img_mag = np.array(np.zeros((params.TEsteps, params.nPE, params.nPE)))
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TEsteps):
+                params.TE = TE
+                seq.RXconfig_upload()
+                seq.Gradients_upload()
+                seq.Frequency_upload()
+                seq.RFattenuation_upload()
+                seq.SE_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                params.frequency = params.centerfrequency
+                params.saveFileParameter()
+                print('Autorecenter to:', params.frequency)
+                schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+
+                print(n + 1, '/', params.TEsteps)
+                params.T2stepsimg[n] = round(self.T2steps[n], 1)
+                params.TE = params.T2stepsimg[n]
+                seq.Image_SE_setup()
+                seq.Sequence_upload()
+                seq.acquire_image_SE()
+                proc.image_process()
+                params.T2img_mag[n, :, :] = params.img_mag[:, :]
+                schedule.wait()
+            schedule.finish()
 
-        params.TE = self.TE_temp
         params.saveFileData()
 
         self.datatxt1 = np.zeros((params.T2stepsimg.shape[0]))
         self.datatxt1 = np.transpose(params.T2stepsimg)
-        np.savetxt(params.datapath + '_Image_TE_steps.txt', self.datatxt1)
+        rawdata.save(params.datapath + '_Image_TE_steps', self.datatxt1)
 
         self.datatxt2 = np.matrix(np.zeros((params.T2img_mag.shape[1], params.T2img_mag.shape[0] * params.T2img_mag.shape[2])))
         for m in range(params.T2img_mag.shape[0]):
             self.datatxt2[:, m * params.T2img_mag.shape[2]:m * params.T2img_mag.shape[2] + params.T2img_mag.shape[2]] = params.T2img_mag[m, :, :]
-        np.savetxt(params.datapath + '_Image_Magnitude.txt', self.datatxt2)
+        rawdata.save(params.datapath + '_Image_Magnitude', self.datatxt2)
 
         print('T2 (2D SE) Data aquired!')
 
@@ -3994,277 +2425,233 @@ class process:
     def T2measurement_Image_SE_Gs(self):
         print('Measuring T2 (Slice, 2D SE)...')
 
-        self.SIR_TE_temp = 0
-        self.SIR_TE_temp = params.SIR_TE
-
-        self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
-        params.T2stepsimg = np.zeros((params.TEsteps))
-        params.T2img_mag = np.array(np.zeros((params.TEsteps, params.nPE, params.nPE)))
-
-        for n in range(params.TEsteps):
-            params.SIR_TE = self.TE_temp
-            seq.RXconfig_upload()
-            seq.Gradients_upload()
-            seq.Frequency_upload()
-            seq.RFattenuation_upload()
-            seq.SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_spectrum_SE_Gs()
-            proc.spectrum_process()
-            proc.spectrum_analytics()
-            params.frequency = params.centerfrequency
-            params.saveFileParameter()
-            print('Autorecenter to:', params.frequency)
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Autorecenter to: ' + str(params.frequency) + 'MHz')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
-
-            print(n + 1, '/', params.TEsteps)
-            params.T2stepsimg[n] = round(self.T2steps[n], 1)
-            params.SIR_TE = params.T2stepsimg[n]
-            seq.Image_SE_Gs_setup()
-            seq.Sequence_upload()
-            seq.acquire_image_SE_Gs()
-            proc.image_process()
-            params.T2img_mag[n, :, :] = params.img_mag[:, :]
-            time.sleep(params.TR / 1000)
+        with params.override('SIR_TE'):
+            SIR_TE = params.SIR_TE
+            self.T2steps = np.linspace(params.TEstart, params.TEstop, params.TEsteps)
+            params.T2stepsimg = np.zeros((params.TEsteps))
+            params.T2img_mag = np.array(np.zeros((params.TEsteps, params.nPE, params.nPE)))
+
+            schedule = scheduler.start(params.TR)
+            for n in range(params.TEsteps):
+                params.SIR_TE = SIR_TE
+                seq.RXconfig_upload()
+                seq.Gradients_upload()
+                seq.Frequency_upload()
+                seq.RFattenuation_upload()
+                seq.SE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_spectrum_SE_Gs()
+                proc.spectrum_process()
+                proc.spectrum_analytics()
+                params.frequency = params.centerfrequency
+                params.saveFileParameter()
+                print('Autorecenter to:', params.frequency)
+                schedule.wait('Autorecenter to: ' + str(params.frequency) + 'MHz')
+
+                print(n + 1, '/', params.TEsteps)
+                params.T2stepsimg[n] = round(self.T2steps[n], 1)
+                params.SIR_TE = params.T2stepsimg[n]
+                seq.Image_SE_Gs_setup()
+                seq.Sequence_upload()
+                seq.acquire_image_SE_Gs()
+                proc.image_process()
+                params.T2img_mag[n, :, :] = params.img_mag[:, :]
+                schedule.wait()
+            schedule.finish()
 
-        params.SIR_TE = self.SIR_TE_temp
         params.saveFileData()
 
         self.datatxt1 = np.zeros((params.T2stepsimg.shape[0]))
         self.datatxt1 = np.transpose(params.T2stepsimg)
-        np.savetxt(params.datapath + '_Image_TE_steps.txt', self.datatxt1)
+        rawdata.save(params.datapath + '_Image_TE_steps', self.datatxt1)
 
         self.datatxt2 = np.matrix(np.zeros((params.T2img_mag.shape[1], params.T2img_mag.shape[0] * params.T2img_mag.shape[2])))
         for m in range(params.T2img_mag.shape[0]):
             self.datatxt2[:, m * params.T2img_mag.shape[2]:m * params.T2img_mag.shape[2] + params.T2img_mag.shape[2]] = params.T2img_mag[m, :, :]
-        np.savetxt(params.datapath + '_Image_Magnitude.txt', self.datatxt2)
+        rawdata.save(params.datapath + '_Image_Magnitude', self.datatxt2)
 
         print('T2 (Slice, 2D SE) Data aquired!')
 
     def T2measurement_Image_SIR_GRE_Gs(self):
         print('\033[1m' + 'WIP, 2D SIR-GRE (slice) sequence not implemented' + '\033[0m')
 
-    def T2imageprocess(self):
+    def T2imageprocess(self, method='loglinear'):
+        # method 'loglinear', 'mono' or 'bi' (exponential fits started from the log-linear solution)
         print('Calculating T2 map...')
 
-        self.procdata = np.genfromtxt(params.datapath + '_Image_TE_steps.txt')
+        self.procdata = rawdata.load(params.datapath + '_Image_TE_steps')
         params.T2stepsimg = np.transpose(self.procdata)
 
-        self.procdata = np.genfromtxt(params.datapath + '_Image_Magnitude.txt')
-        params.T2img_mag = np.array(np.zeros((int(self.procdata.shape[1] / self.procdata.shape[0]), self.procdata.shape[0], self.procdata.shape[0])))
-
-        for n in range(int(self.procdata.shape[1] / self.procdata.shape[0])):
-            params.T2img_mag[n, :, :] = self.procdata[:, n * self.procdata.shape[0]:n * self.procdata.shape[0] + self.procdata.shape[0]]
-        params.T2imgvalues = np.matrix(np.zeros((params.T2img_mag.shape[1], params.T2img_mag.shape[2])))
-
-        for n in range(params.T2img_mag.shape[1]):
-            for m in range(params.T2img_mag.shape[2]):
-                params.T2xvalues = np.zeros(params.T2stepsimg.shape[0])
-                params.T2yvalues = np.zeros(params.T2stepsimg.shape[0])
-                params.T2xvalues[:] = params.T2stepsimg[:]
-                params.T2yvalues[:] = np.log(params.T2img_mag[:, n, m])
-
-                params.T2linregres = linregress(params.T2xvalues, params.T2yvalues)
-                params.T2imgvalues[n, m] = round(-(1 / params.T2linregres.slope), 2)
+        # Magnitude images side by side (N x steps*N) to steps x N x N
+        self.procdata = rawdata.load(params.datapath + '_Image_Magnitude')
+        N = self.procdata.shape[0]
+        params.T2img_mag = np.array(np.reshape(self.procdata, (N, int(self.procdata.shape[1] / N), N)).transpose(1, 0, 2), dtype=np.float64)
 
+        # Fit only the pixels above the signal mask of the first echo
         self.img_max = np.max(np.amax(params.T2img_mag[0, :, :]))
-        params.T2imgvalues[params.T2img_mag[0, :, :] < self.img_max * params.signalmask] = np.nan
+        self.T2mask = params.T2img_mag[0, :, :] >= self.img_max * params.signalmask
+
+        S = params.T2img_mag[:, self.T2mask]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Y = np.log(S)
+
+        slope, intercept, rvalue = self.loglinear_fit(np.asarray(params.T2stepsimg, dtype=np.float64), Y)
+
+        params.T2imgvalues = np.matrix(np.full(self.T2mask.shape, np.nan))
+        self.T2imgr2 = np.full(self.T2mask.shape, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            params.T2imgvalues[self.T2mask] = np.round(-(1 / slope), 2)
+        self.T2imgr2[self.T2mask] = rvalue ** 2
+
+        if method in ('mono', 'bi'):
+            if method == 'mono': self.T2imgfit = fit.T2_mono(params.T2stepsimg, S, slope)
+            else: self.T2imgfit = fit.T2_bi(params.T2stepsimg, S, slope)
+            self.T2imgiterations = np.zeros(self.T2mask.shape, dtype=np.int32)
+            params.T2imgvalues[self.T2mask] = np.round(self.T2imgfit['T2'], 2)
+            self.T2imgr2[self.T2mask] = self.T2imgfit['r2']
+            self.T2imgiterations[self.T2mask] = self.T2imgfit['iterations']
+            print('Fit iterations (mean): ', round(float(np.mean(self.T2imgfit['iterations'])), 1), \
+                  ', not converged: ', int(np.sum(~self.T2imgfit['converged'])))
 
         print('T2 map calculated!')
 
     def animation_image_cartesian_process(self):
-
-        self.kspaceanimate = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[1]), dtype=np.complex64))
-        self.kspaceanimate_temp = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0])))
-        self.animationimage_temp = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0])))
-        params.animationimage = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0], params.kspace.shape[0] * 2)))
-
-        self.kspace_centerx = int(params.kspace.shape[1] / 2)
-        self.kspace_centery = int(params.kspace.shape[0] / 2)
-
-        for n in range(params.kspace.shape[0]):
-            self.kspaceanimate[n, :] = params.kspace[n, :]
-            self.kspaceanimate_temp = np.abs(self.kspaceanimate[:,int(self.kspace_centerx - params.kspace.shape[0] / 2 * int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))):int(self.kspace_centerx + params.kspace.shape[0] / 2 * int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))):int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))]) / np.amax(params.k_amp)
-
-            # Image calculations
-            I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(self.kspaceanimate)))
-            self.animationimage_temp[:, :] = np.abs(I[:, self.kspace_centerx - int(params.kspace.shape[0] / 2 * params.ROBWscaler):self.kspace_centerx + int(params.kspace.shape[0] / 2 * params.ROBWscaler)]) / np.amax(params.img_mag)
-            
-            # Store animation array
-            params.animationimage[n, :, :] = np.concatenate((self.animationimage_temp[:, :], self.kspaceanimate_temp[:, :]), axis=1)
+        params.animationimage = np.array(list(self.animation_cartesian_frames(range(params.kspace.shape[0]))))
 
     def animation_image_cartesian_IO_process(self):
+        params.animationimage = np.array(list(self.animation_cartesian_frames(self.animation_IO_rows())))
 
-        self.kspaceanimate = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[1]), dtype=np.complex64))
-        self.kspaceanimate_temp = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0])))
-        self.animationimage_temp = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0])))
-        params.animationimage = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0], params.kspace.shape[0] * 2)))
-
-        self.kspace_centerx = int(params.kspace.shape[1] / 2)
-        self.kspace_centery = int(params.kspace.shape[0] / 2)
-
-        for n in range(int(params.kspace.shape[0]/2)):
-            self.kspaceanimate[self.kspace_centery-n, :] = params.kspace[self.kspace_centery-n, :]
-            self.kspaceanimate_temp = np.abs(self.kspaceanimate[:,int(self.kspace_centerx - params.kspace.shape[0] / 2 * int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))):int(self.kspace_centerx + params.kspace.shape[0] / 2 * int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))):int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))]) / np.amax(params.k_amp)
-            
-            # Image calculations
-            I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(self.kspaceanimate)))
-            self.animationimage_temp[:, :] = np.abs(I[:, self.kspace_centerx - int(params.kspace.shape[0] / 2 * params.ROBWscaler):self.kspace_centerx + int(params.kspace.shape[0] / 2 * params.ROBWscaler)]) / np.amax(params.img_mag)
-            
-            # Store animation array
-            params.animationimage[n*2, :, :] = np.concatenate((self.animationimage_temp[:, :], self.kspaceanimate_temp[:, :]), axis=1)
-            
-            self.kspaceanimate[self.kspace_centery+n, :] = params.kspace[self.kspace_centery+n, :]
-            self.kspaceanimate_temp = np.abs(self.kspaceanimate[:,int(self.kspace_centerx - params.kspace.shape[0] / 2 * int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))):int(self.kspace_centerx + params.kspace.shape[0] / 2 * int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))):int(math.floor(params.kspace.shape[1] / params.kspace.shape[0]))]) / np.amax(params.k_amp)
-
-            # Image calculations
-            I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(self.kspaceanimate)))
-            self.animationimage_temp[:, :] = np.abs(I[:, self.kspace_centerx - int(params.kspace.shape[0] / 2 * params.ROBWscaler):self.kspace_centerx + int(params.kspace.shape[0] / 2 * params.ROBWscaler)]) / np.amax(params.img_mag)
-            
-            # Store animation array
-            params.animationimage[n*2+1, :, :] = np.concatenate((self.animationimage_temp[:, :], self.kspaceanimate_temp[:, :]), axis=1)
+    def animation_image_radial_full_process(self):
+        params.animationimage = np.array(list(self.animation_radial_frames(half=False)))
 
-    def animation_image_radial_full_process(self):   
-        self.kspace_center = int(params.kspace.shape[0] / 2)
-        
-        self.radialangles = np.arange(0, 180, params.radialanglestep)
-        self.radialanglecount = self.radialangles.shape[0]
-        
-        self.kspaceanimate1 = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0]), dtype=np.complex64))
-        self.kspaceanimate2 = np.array(np.zeros((int(params.kspace.shape[0]/params.radialosfactor), int(params.kspace.shape[0]/params.radialosfactor)), dtype=np.complex64))
-        self.kspaceanimate_temp = np.array(np.zeros((int(params.kspace.shape[0]/params.radialosfactor), int(params.kspace.shape[0]/params.radialosfactor))))
-        self.animationimage_temp = np.array(np.zeros((int(params.kspace.shape[0]/params.radialosfactor), int(params.kspace.shape[0]/params.radialosfactor))))
-        params.animationimage = np.array(np.zeros((self.radialanglecount, int(params.kspace.shape[0]/params.radialosfactor), int(params.kspace.shape[0]/params.radialosfactor) * 2)))
-        
-        for o in range(self.radialanglecount):
-            for n in range(o+1):
-                self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
-                for m in range(params.kspace.shape[0]):
-                    self.kspaceanimate1[int(self.kspace_center + math.sin(self.radialangleradmod100/100)*(m-self.kspace_center)), int(self.kspace_center + math.cos(self.radialangleradmod100/100)*(m-self.kspace_center))] = params.kspace[int(self.kspace_center + math.sin(self.radialangleradmod100/100)*(m-self.kspace_center)), int(self.kspace_center + math.cos(self.radialangleradmod100/100)*(m-self.kspace_center))]
-                for m in range(int(params.kspace.shape[0]/params.radialosfactor)):
-                    self.kspaceanimate2[int(self.kspace_center/params.radialosfactor + math.sin(self.radialangleradmod100/100)*(m-self.kspace_center/params.radialosfactor)), int(self.kspace_center/params.radialosfactor + math.cos(self.radialangleradmod100/100)*(m-self.kspace_center/params.radialosfactor))] = params.kspace[int(self.kspace_center + math.sin(self.radialangleradmod100/100)*(m*params.radialosfactor-self.kspace_center)), int(self.kspace_center + math.cos(self.radialangleradmod100/100)*(m*params.radialosfactor-self.kspace_center))]
-            self.kspaceanimate_temp = np.abs(self.kspaceanimate2) / np.amax(params.k_amp)
-            # Image calculations
-            I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(self.kspaceanimate1)))
-            self.animationimage_temp = np.abs(I[int(self.kspace_center-self.kspace_center/params.radialosfactor):int(self.kspace_center+self.kspace_center/params.radialosfactor), int(self.kspace_center-self.kspace_center/params.radialosfactor):int(self.kspace_center+self.kspace_center/params.radialosfactor)]) / np.amax(params.img_mag)
-            # Store animation array
-            params.animationimage[o, :, :] = np.concatenate((self.animationimage_temp[:, :], self.kspaceanimate_temp[:, :]), axis=1)
-        
     def animation_image_radial_half_process(self):
+        params.animationimage = np.array(list(self.animation_radial_frames(half=True)))
+
+    def animation_IO_rows(self):
+        # Centre out, alternating below and above the centre line
+        self.kspace_centery = int(params.kspace.shape[0] / 2)
+        rows = []
+        for n in range(int(params.kspace.shape[0] / 2)): rows += [self.kspace_centery - n, self.kspace_centery + n]
+        return rows
+
+    def animation_basis(self, N):
+        # Row n: centred 1D transform of a unit sample at n, the image of one k-space point is
+        # the outer product of the row and column basis vectors (fft2 is separable and linear)
+        if getattr(self, 'animationbasis', None) is None or self.animationbasis.shape[0] != N:
+            self.animationbasis = ft.fft(np.eye(N, dtype=np.complex64))
+        return self.animationbasis
+
+    def animation_cartesian_frames(self, rows):
+        # Frames (image | k-space) while the k-space lines are added in the given order.
+        # Every new line updates the image by one 1D transform and an outer product.
+        self.kspace_centerx = int(params.kspace.shape[1] / 2)
+        N = params.kspace.shape[0]
+        step = int(math.floor(params.kspace.shape[1] / N))
+        kcrop = slice(int(self.kspace_centerx - N / 2 * step), int(self.kspace_centerx + N / 2 * step), step)
+        crop = slice(self.kspace_centerx - int(N / 2 * params.ROBWscaler), self.kspace_centerx + int(N / 2 * params.ROBWscaler))
+
+        basis = self.animation_basis(N)
+        image = np.zeros((N, crop.stop - crop.start), dtype=np.complex128)
+        panel = np.zeros((N, len(range(params.kspace.shape[1])[kcrop])))
+        filled = np.zeros(N, dtype=bool)
+        img_max = np.amax(params.img_mag)
+        k_max = np.amax(params.k_amp)
+
+        for n in rows:
+            if not filled[n]:
+                image += np.outer(basis[n], ft.fft(params.kspace[n, :])[crop])
+                panel[n, :] = np.abs(params.kspace[n, kcrop]) / k_max
+                filled[n] = True
+            yield np.concatenate((np.abs(image) / img_max, panel), axis=1)
+
+    def animation_spoke(self, angle, half):
+        # Grid points of one spoke in the k-space (rows, columns) and in the displayed k-space
+        # (rows, columns, source rows, source columns), like the former sample by sample insertion
+        c = self.kspace_center
+        os_factor = params.radialosfactor * (2 if half else 1)
+        angle = int((math.radians(angle) % (2 * np.pi)) * 100) / 100
+        s = math.sin(angle)
+        co = math.cos(angle)
+
+        if half:
+            m = np.arange(c, dtype=np.float64)
+            rows = (c + s * m).astype(int)
+            cols = (c + co * m).astype(int)
+            m = np.arange(int(c / os_factor), dtype=np.float64)
+            panel = ((c / os_factor + s * m).astype(int), (c / os_factor + co * m).astype(int), \
+                     (c + s * (m * os_factor)).astype(int), (c + co * (m * os_factor)).astype(int))
+        else:
+            m = np.arange(params.kspace.shape[0], dtype=np.float64)
+            rows = (c + s * (m - c)).astype(int)
+            cols = (c + co * (m - c)).astype(int)
+            m = np.arange(int(params.kspace.shape[0] / os_factor), dtype=np.float64)
+            panel = ((c / os_factor + s * (m - c / os_factor)).astype(int), (c / os_factor + co * (m - c / os_factor)).astype(int), \
+                     (c + s * (m * os_factor - c)).astype(int), (c + co * (m * os_factor - c)).astype(int))
+        return rows, cols, panel
+
+    def animation_radial_frames(self, half=False):
+        # Frames (image | k-space) while the spokes are added. Only the grid points of the new
+        # spoke are transformed: image += B[rows].T @ diag(values) @ B[columns] on the crop.
         self.kspace_center = int(params.kspace.shape[0] / 2)
-        
-        self.radialangles = np.arange(0, 360, params.radialanglestep)
+        self.radialangles = np.arange(0, 360 if half else 180, params.radialanglestep)
         self.radialanglecount = self.radialangles.shape[0]
-        
-        self.kspaceanimate1 = np.array(np.zeros((params.kspace.shape[0], params.kspace.shape[0]), dtype=np.complex64))
-        self.kspaceanimate2 = np.array(np.zeros((int(params.kspace.shape[0]/(2*params.radialosfactor)), int(params.kspace.shape[0]/(2*params.radialosfactor))), dtype=np.complex64))
-        self.kspaceanimate_temp = np.array(np.zeros((int(params.kspace.shape[0]/(2*params.radialosfactor)), int(params.kspace.shape[0]/(2*params.radialosfactor)))))
-        self.animationimage_temp = np.array(np.zeros((int(params.kspace.shape[0]/(2*params.radialosfactor)), int(params.kspace.shape[0]/(2*params.radialosfactor)))))
-        params.animationimage = np.array(np.zeros((self.radialanglecount, int(params.kspace.shape[0]/(2*params.radialosfactor)), int(params.kspace.shape[0]/(2*params.radialosfactor)) * 2)))
-        
-        for o in range(self.radialanglecount):
-            for n in range(o+1):
-                self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
-                for m in range(self.kspace_center):
-                    self.kspaceanimate1[int(self.kspace_center + math.sin(self.radialangleradmod100/100)*(m)), int(self.kspace_center + math.cos(self.radialangleradmod100/100)*(m))] = params.kspace[int(self.kspace_center + math.sin(self.radialangleradmod100/100)*(m)), int(self.kspace_center + math.cos(self.radialangleradmod100/100)*(m))]
-                for m in range(int(self.kspace_center/(2*params.radialosfactor))):
-                    self.kspaceanimate2[int(self.kspace_center/(2*params.radialosfactor) + math.sin(self.radialangleradmod100/100)*(m)), int(self.kspace_center/(2*params.radialosfactor) + math.cos(self.radialangleradmod100/100)*(m))] = params.kspace[int(self.kspace_center + math.sin(self.radialangleradmod100/100)*(m*2*params.radialosfactor)), int(self.kspace_center + math.cos(self.radialangleradmod100/100)*(m*2*params.radialosfactor))]
-            
-            self.kspaceanimate_temp = np.abs(self.kspaceanimate2) / np.amax(params.k_amp)
-            # Image calculations
-            I = np.fft.fftshift(np.fft.fft2(np.fft.fftshift(self.kspaceanimate1)))
-            self.animationimage_temp = np.abs(I[int(self.kspace_center-self.kspace_center/(2*params.radialosfactor)):int(self.kspace_center+self.kspace_center/(2*params.radialosfactor)), int(self.kspace_center-self.kspace_center/(2*params.radialosfactor)):int(self.kspace_center+self.kspace_center/(2*params.radialosfactor))]) / np.amax(params.img_mag)
-            # Store animation array
-            params.animationimage[o, :, :] = np.concatenate((self.animationimage_temp[:, :], self.kspaceanimate_temp[:, :]), axis=1)
-
-    def animate_cartesian(self):
-        proc.animation_image_cartesian_process()
 
+        N = params.kspace.shape[0]
+        c = self.kspace_center
+        os_factor = params.radialosfactor * (2 if half else 1)
+        crop = slice(int(c - c / os_factor), int(c + c / os_factor))
+
+        basis = self.animation_basis(N)[:, crop]
+        image = np.zeros((crop.stop - crop.start, crop.stop - crop.start), dtype=np.complex128)
+        panel = np.zeros((int(N / os_factor), int(N / os_factor)))
+        filled = np.zeros((N, N), dtype=bool)
+        img_max = np.amax(params.img_mag)
+        k_max = np.amax(params.k_amp)
+
+        for angle in self.radialangles:
+            rows, cols, (prows, pcols, srows, scols) = self.animation_spoke(angle, half)
+            new = np.unique(np.ravel_multi_index((rows, cols), (N, N)))
+            new = new[~filled.ravel()[new]]
+            if new.size > 0:
+                rows, cols = np.unravel_index(new, (N, N))
+                filled[rows, cols] = True
+                image += basis[rows].T @ (params.kspace[rows, cols][:, np.newaxis] * basis[cols])
+            panel[prows, pcols] = np.abs(params.kspace[srows, scols]) / k_max
+            yield np.concatenate((np.abs(image) / img_max, panel), axis=1)
+
+    def animate(self, frames, count):
+        # Frames are computed while the animation runs, nothing is kept in memory
         import matplotlib.animation as animation
 
         fig = plt.figure()
 
-        im = plt.imshow(params.animationimage[params.kspace.shape[0]-1, :, :], cmap=params.imagecolormap, animated=True)
-        
+        im = plt.imshow(next(frames()), cmap=params.imagecolormap, vmin=0, vmax=1, animated=True)
+
         plt.axis('off')
 
-        def updatefig(i):
-            im.set_array(params.animationimage[i, :, :])
+        def updatefig(frame):
+            im.set_array(frame)
             return im,
 
-        ani = animation.FuncAnimation(fig, updatefig, frames=params.kspace.shape[0], interval=params.animationstep, blit=True)
+        self.ani = animation.FuncAnimation(fig, updatefig, frames=frames, interval=params.animationstep, blit=True, \
+                                           save_count=count, cache_frame_data=False)
 
         plt.show()
-        
-    def animate_cartesian_IO(self):
-        proc.animation_image_cartesian_IO_process()
-
-        import matplotlib.animation as animation
-
-        fig = plt.figure()
-
-        im = plt.imshow(params.animationimage[params.kspace.shape[0]-1, :, :], cmap=params.imagecolormap, animated=True)
-        
-        plt.axis('off')
 
-        def updatefig(i):
-            im.set_array(params.animationimage[i, :, :])
-            return im,
+    def animate_cartesian(self):
+        self.animate(lambda: self.animation_cartesian_frames(range(params.kspace.shape[0])), params.kspace.shape[0])
 
-        ani = animation.FuncAnimation(fig, updatefig, frames=params.kspace.shape[0], interval=params.animationstep, blit=True)
+    def animate_cartesian_IO(self):
+        self.animate(lambda: self.animation_cartesian_frames(self.animation_IO_rows()), params.kspace.shape[0])
 
-        plt.show()
-        
     def animate_radial_full(self):
         self.radialangles = np.arange(0, 180, params.radialanglestep)
         self.radialanglecount = self.radialangles.shape[0]
-        
-        proc.animation_image_radial_full_process()
-
-        import matplotlib.animation as animation
-
-        fig = plt.figure()
-
-        im = plt.imshow(params.animationimage[self.radialanglecount-1, :, :], cmap=params.imagecolormap, animated=True)
-        
-        plt.axis('off')
-
-        def updatefig(i):
-            im.set_array(params.animationimage[i, :, :])
-            return im,
+        self.animate(lambda: self.animation_radial_frames(half=False), self.radialanglecount)
 
-        ani = animation.FuncAnimation(fig, updatefig, frames=self.radialanglecount, interval=params.animationstep, blit=True)
-
-        plt.show()
-                
     def animate_radial_half(self):
         self.radialangles = np.arange(0, 360, params.radialanglestep)
         self.radialanglecount = self.radialangles.shape[0]
-        
-        proc.animation_image_radial_half_process()
-
-        import matplotlib.animation as animation
-
-        fig = plt.figure()
+        self.animate(lambda: self.animation_radial_frames(half=True), self.radialanglecount)
 
-        im = plt.imshow(params.animationimage[self.radialanglecount-1, :, :], cmap=params.imagecolormap, animated=True)
-        
-        plt.axis('off')
-
-        def updatefig(i):
-            im.set_array(params.animationimage[i, :, :])
-            return im,
-
-        ani = animation.FuncAnimation(fig, updatefig, frames=self.radialanglecount, interval=params.animationstep, blit=True)
-
-        plt.show()
-        
 proc = process()
@@ -0,0 +1,207 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Binary raw data files (.rdat)
+#   8 byte magic, uint32 header length, JSON header (dtype, shape, ...) padded
+#   to 64 bytes, then the array in C order. The data can be memory mapped.
+#
+#   Saved arrays are handed to the processing in memory, the files are written
+#   by a background thread (flushed on exit).
+#
+#   Legacy .txt files written with np.savetxt are still read, convert them with
+#   python3 rawdata_handler.py rawdata [--delete]
+#
+################################################################################
+
+import atexit
+import json
+import os
+import queue
+import struct
+import threading
+
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+MAGIC = b'RLXRAW\x01\x00'
+ALIGN = 64
+
+
+class rawdata_io:
+    def __init__(self):
+        self.extension = '.rdat'
+
+        # Arrays of the latest saves, processing takes them from here instead of the disk
+        self.memory = OrderedDict()
+        self.keep = 4
+
+        # Files are written by a background thread, save() only blocks if the queue is full
+        self.queue = queue.Queue(maxsize=16)
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        atexit.register(self.flush)
+
+    def save(self, path, data, header=None):
+        # path without extension, like params.datapath
+        data = np.array(data, copy=True, order='C')
+        data.setflags(write=False)
+        head = dict(header or {})
+        head.setdefault('Created', datetime.now().strftime('%m/%d/%Y, %H:%M:%S'))
+
+        with self.lock:
+            self.memory.pop(path, None)
+            self.memory[path] = data
+            while len(self.memory) > self.keep: self.memory.popitem(last=False)
+
+        self.submit(path + self.extension, self.write, path, data, head)
+
+    def write(self, path, data, head):
+        # Written next to the target and renamed, arrays still mapped from an older file stay valid
+        with open(path + self.extension + '.tmp', 'wb') as file:
+            self.write_header(file, head, data.dtype, data.shape)
+            file.write(data.tobytes())
+        os.replace(path + self.extension + '.tmp', path + self.extension)
+
+    def write_header(self, file, head, dtype, shape):
+        head['dtype'] = np.dtype(dtype).str
+        head['shape'] = list(shape)
+
+        text = json.dumps(head).encode()
+        offset = len(MAGIC) + 4 + len(text)
+        text += b' ' * (-offset % ALIGN)
+
+        file.write(MAGIC)
+        file.write(struct.pack('<I', len(text)))
+        file.write(text)
+        return len(MAGIC) + 4 + len(text)
+
+    def create(self, path, shape, dtype, header=None):
+        # Zero filled file mapped for writing, for results larger than the memory
+        with self.lock: self.memory.pop(path, None)
+        if self.is_pending(path + self.extension): self.flush()
+        head = dict(header or {})
+        head.setdefault('Created', datetime.now().strftime('%m/%d/%Y, %H:%M:%S'))
+        with open(path + self.extension + '.tmp', 'wb') as file:
+            offset = self.write_header(file, head, dtype, shape)
+            file.truncate(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        os.replace(path + self.extension + '.tmp', path + self.extension)
+        return np.memmap(path + self.extension, dtype=np.dtype(dtype), mode='r+', offset=offset, shape=tuple(shape))
+
+    def write_text(self, filename, text):
+        # Header files and other small text files, written in order with the raw data
+        self.submit(filename, self.write_file, filename, text)
+
+    def write_file(self, filename, text):
+        with open(filename, 'w') as file:
+            file.write(text)
+
+    def submit(self, filename, function, *args):
+        with self.lock:
+            self.pending[filename] = self.pending.get(filename, 0) + 1
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.writer, daemon=True)
+                self.thread.start()
+        self.queue.put((filename, function, args))
+
+    def writer(self):
+        while True:
+            filename, function, args = self.queue.get()
+            try: function(*args)
+            except Exception as e: print('Could not write', filename, ':', e)
+            with self.lock:
+                self.pending[filename] -= 1
+                if self.pending[filename] == 0: del self.pending[filename]
+            self.queue.task_done()
+
+    def flush(self):
+        # Blocks until every queued file is written
+        if self.thread is not None: self.queue.join()
+
+    def is_pending(self, filename):
+        with self.lock:
+            return filename in self.pending
+
+    def header(self, path):
+        if self.is_pending(path + self.extension): self.flush()
+        with open(path + self.extension, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(path + self.extension + ' is not a relax2 raw data file')
+            length = struct.unpack('<I', file.read(4))[0]
+            head = json.loads(file.read(length).decode())
+        head['offset'] = len(MAGIC) + 4 + length
+        return head
+
+    def load(self, path, dtype=None, mmap=True):
+        # Array of a recent save if still in memory, else the binary file if present,
+        # otherwise the legacy np.savetxt file
+        with self.lock: data = self.memory.get(path)
+        if data is not None:
+            data = data.astype(dtype or data.dtype)
+            if data.ndim == 2 and 1 in data.shape: data = data.reshape(-1)
+            return data
+        if self.is_pending(path + self.extension): self.flush()
+        if os.path.isfile(path + self.extension):
+            head = self.header(path)
+            if mmap:
+                data = np.memmap(path + self.extension, dtype=np.dtype(head['dtype']), mode='c', \
+                                 offset=head['offset'], shape=tuple(head['shape']))
+            else:
+                data = np.fromfile(path + self.extension, dtype=np.dtype(head['dtype']), \
+                                   offset=head['offset']).reshape(head['shape'])
+            if dtype is not None and data.dtype != dtype: data = data.astype(dtype)
+            # Single row or column like np.genfromtxt returns it
+            if data.ndim == 2 and 1 in data.shape: data = data.reshape(-1)
+            return data
+        if dtype is None: return np.genfromtxt(path + '.txt')
+        return np.genfromtxt(path + '.txt', dtype=dtype)
+
+    def exists(self, path):
+        with self.lock:
+            if path in self.memory or path + self.extension in self.pending: return True
+        return os.path.isfile(path + self.extension) or os.path.isfile(path + '.txt')
+
+    def remove(self, path):
+        with self.lock: self.memory.pop(path, None)
+        if self.is_pending(path + self.extension): self.flush()
+        for filename in (path + self.extension, path + '.txt'):
+            if os.path.isfile(filename): os.remove(filename)
+
+    def convert(self, filename, delete=False):
+        # Legacy .txt data file to .rdat, complex if the text holds complex numbers
+        path = filename[:-len('.txt')]
+        with open(filename, 'r') as file:
+            iscomplex = 'j' in file.read(4096)
+        data = np.genfromtxt(filename, dtype=np.complex64 if iscomplex else np.float64)
+        self.write(path, data, {'Converted from': os.path.basename(filename), \
+                                'Created': datetime.now().strftime('%m/%d/%Y, %H:%M:%S')})
+        if delete: os.remove(filename)
+        return data.shape
+
+
+rawdata = rawdata_io()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert legacy .txt raw data to .rdat files.')
+    parser.add_argument('folder', nargs='?', default='rawdata')
+    parser.add_argument('--delete', action='store_true', help='remove the .txt files after conversion')
+    args = parser.parse_args()
+
+    count = 0
+    for root, dirs, files in os.walk(args.folder):
+        for name in sorted(files):
+            if not name.endswith('.txt') or name.endswith('_Header.txt'): continue
+            if os.path.isfile(os.path.join(root, name[:-len('.txt')] + rawdata.extension)): continue
+            try:
+                shape = rawdata.convert(os.path.join(root, name), args.delete)
+                print('Converted:', os.path.join(root, name), shape)
+                count += 1
+            except (ValueError, OSError) as e:
+                print('Skipped:', os.path.join(root, name), e)
+    print(count, 'files converted.')
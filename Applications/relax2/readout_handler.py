@@ -0,0 +1,83 @@
+################################################################################
+#
+# Date: 2025
+#
+################################################################################
+
+import numpy as np
+
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+
+from TCPsocket import socket, connected
+from parameter_handler import params
+
+
+class readout(QObject):
+    # Emitted with the running frame count whenever a readout frame is complete
+    frame_ready = pyqtSignal(int)
+
+    def __init__(self):
+        super().__init__()
+
+        self.framesize = 0
+        self.fill = 0
+        self.armed = False
+        self.complete = False
+        self.frame_count = 0
+        self.timeout = 30000
+
+        # Direct: the frame is filled in the thread the socket belongs to (GUI or acquisition thread)
+        socket.readyRead.connect(self.on_ready_read, Qt.DirectConnection)
+
+    def allocate(self, samples):
+        # One preallocated frame buffer, viewed as complex64 without copying
+        if self.framesize != 8 * samples:
+            self.framesize = 8 * samples
+            self.buffer = bytearray(self.framesize)
+            self.view = memoryview(self.buffer)
+            self.data = np.frombuffer(self.buffer, np.complex64)
+        self.fill = 0
+        self.complete = False
+
+    def on_ready_read(self):
+        # Drain whatever the socket holds into the frame, partial chunks included.
+        # Bytes of the next frame stay in the socket buffer until the next read_frame().
+        if not self.armed:
+            return
+        while not self.complete:
+            datasize = socket.bytesAvailable()
+            if datasize <= 0:
+                break
+            chunk = socket.read(min(datasize, self.framesize - self.fill))
+            self.view[self.fill:self.fill + len(chunk)] = chunk
+            self.fill += len(chunk)
+            if self.fill == self.framesize:
+                self.complete = True
+                self.frame_count += 1
+                self.frame_ready.emit(self.frame_count)
+
+    def read_frame(self, out=None, start=0, stop=None, scale=1):
+        self.allocate(params.samples)
+        self.armed = True
+        self.on_ready_read()
+
+        while not self.complete:
+            # Blocks in select() until the socket has data, readyRead then fills the frame
+            if not socket.waitForReadyRead(self.timeout):
+                if socket.state() != connected:
+                    print('Readout aborted, connection to server lost!')
+                    break
+            self.on_ready_read()
+
+        self.armed = False
+        # A partial frame is not returned, the buffer beyond the fill is left from the previous frame
+        if not self.complete: raise ConnectionError('Readout incomplete: ' + str(int(self.fill/8)) + ' of ' + str(int(self.framesize/8)) + ' samples')
+        print('Readout finished : ', int(self.framesize/8), 'Samples')
+
+        if out is None:
+            return self.data
+        np.multiply(self.data[start:stop], scale, out=out)
+        return out
+
+
+rx = readout()
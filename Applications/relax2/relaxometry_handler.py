@@ -0,0 +1,243 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Non-linear relaxometry fits for whole maps and single curves
+#       IR:   S(TI) = A - B * exp(-TI / T1)       (polarity restored magnitude)
+#       mono: S(TE) = A * exp(-TE / T2)
+#       bi:   S(TE) = A1 * exp(-TE / T2a) + A2 * exp(-TE / T2b)
+#
+#   Variable projection: the amplitudes are solved linearly, the rates are
+#   fitted with Levenberg-Marquardt on all voxels at once (log rates, so they
+#   stay positive). Each fit starts from the log-linear solution. Large maps
+#   can be split into chunks over a process pool.
+#
+#   Benchmark: python3 relaxometry_handler.py
+#
+################################################################################
+
+import os
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+def basis_IR(x, theta):
+    # Basis functions: functions x points x voxels
+    Phi = np.empty((2, x.shape[0], theta.shape[1]))
+    Phi[0] = 1
+    Phi[1] = -np.exp(-x[:, np.newaxis] * np.exp(theta[0]))
+    return Phi
+
+
+def basis_mono(x, theta):
+    return np.exp(-x[:, np.newaxis] * np.exp(theta[0]))[np.newaxis]
+
+
+def basis_bi(x, theta):
+    return np.exp(-x[np.newaxis, :, np.newaxis] * np.exp(theta)[:, np.newaxis, :])
+
+
+MODELS = {'IR': basis_IR, 'mono': basis_mono, 'bi': basis_bi}
+
+
+def solve(A, b):
+    # Small symmetric systems per voxel, A: n x n x voxels, b: n x voxels
+    if A.shape[0] == 1: return b / A[0]
+    if A.shape[0] == 2:
+        det = A[0, 0] * A[1, 1] - A[0, 1] * A[1, 0]
+        return np.stack((A[1, 1] * b[0] - A[0, 1] * b[1], A[0, 0] * b[1] - A[1, 0] * b[0])) / det
+    return np.linalg.solve(np.moveaxis(A, 2, 0), b.T[:, :, np.newaxis])[:, :, 0].T
+
+
+def residual(model, x, y, theta):
+    # Amplitudes from the normal equations, with a tiny ridge against singular bases
+    Phi = MODELS[model](x, theta)
+    L = Phi.shape[0]
+    A = np.empty((L, L, Phi.shape[2]))
+    for l in range(L):
+        for m in range(l, L): A[l, m] = A[m, l] = np.einsum('sp,sp->p', Phi[l], Phi[m])
+    b = np.einsum('lsp,sp->lp', Phi, y)
+    ridge = 1e-12 * np.trace(A) + 1e-300
+    for l in range(L): A[l, l] += ridge
+    c = solve(A, b)
+    return y - np.einsum('lsp,lp->sp', Phi, c), c
+
+
+def varpro_lm(model, x, y, theta, max_iter=50, tol=1e-6):
+    # y: points x voxels, theta: log rates x voxels
+    # Returns theta, amplitudes, iterations and the voxels that did not converge
+    theta = np.array(theta, dtype=np.float64)
+    r, c = residual(model, x, y, theta)
+    cost = np.einsum('sp,sp->p', r, r)
+    lam = np.full(theta.shape[1], 1e-3)
+    iterations = np.zeros(theta.shape[1], dtype=np.int32)
+    valid = np.isfinite(cost) & np.all(np.isfinite(theta), axis=0)
+    active = valid.copy()
+    K = theta.shape[0]
+
+    for it in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0: break
+        th = theta[:, idx]
+        y0 = y[:, idx]
+        r0 = r[:, idx]
+
+        # Jacobian of the projected residual by forward differences
+        J = np.empty((K,) + r0.shape)
+        for k in range(K):
+            h = 1e-6 * np.maximum(np.abs(th[k]), 1)
+            step = th.copy()
+            step[k] += h
+            J[k] = (residual(model, x, y0, step)[0] - r0) / h
+
+        JTJ = np.empty((K, K, idx.size))
+        for k in range(K):
+            for l in range(k, K): JTJ[k, l] = JTJ[l, k] = np.einsum('sp,sp->p', J[k], J[l])
+        g = np.einsum('ksp,sp->kp', J, r0)
+        for k in range(K): JTJ[k, k] += lam[idx] * JTJ[k, k] + 1e-12
+        delta = -solve(JTJ, g)
+
+        th_new = th + delta
+        r_new, c_new = residual(model, x, y0, th_new)
+        cost_new = np.einsum('sp,sp->p', r_new, r_new)
+        better = np.isfinite(cost_new) & (cost_new < cost[idx])
+
+        ok = idx[better]
+        theta[:, ok] = th_new[:, better]
+        r[:, ok] = r_new[:, better]
+        c[:, ok] = c_new[:, better]
+        change = (cost[ok] - cost_new[better]) / np.maximum(cost[ok], 1e-300)
+        cost[ok] = cost_new[better]
+        lam[ok] /= 10
+        worse = idx[~better]
+        lam[worse] *= 10
+        iterations[idx] += 1
+
+        small = np.all(np.abs(delta[:, better]) < tol * (1 + np.abs(th_new[:, better])), axis=0) | (change < tol)
+        active[ok[small]] = False
+        active[worse[lam[worse] > 1e10]] = False
+
+    # Voxels without a finite start are not fitted and count as not converged
+    return theta, c, iterations, active | ~valid
+
+
+def fit_chunk(args):
+    model, x, y, theta, max_iter, tol = args
+    with np.errstate(over='ignore', under='ignore', divide='ignore', invalid='ignore'):
+        return varpro_lm(model, x, y, theta, max_iter, tol)
+
+
+class relaxometry:
+    def __init__(self):
+        self.chunk = 65536
+        self.max_iter = 50
+        self.tol = 1e-6
+
+    def fit(self, model, x, Y, rates, workers=None):
+        # x: points, Y: points x map (any number of dimensions), rates: start rates (map or K x map)
+        # in 1/unit of x. Returns the results in the map shape.
+        x = np.asarray(x, dtype=np.float64)
+        shape = np.shape(Y)[1:]
+        y = np.asarray(Y, dtype=np.float64).reshape(x.shape[0], -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            theta = np.log(np.asarray(rates, dtype=np.float64).reshape(-1, y.shape[1]))
+
+        if workers is None: workers = (os.cpu_count() or 1) if y.shape[1] >= 2 * self.chunk else 1
+        chunks = [(model, x, y[:, n:n + self.chunk], theta[:, n:n + self.chunk], self.max_iter, self.tol) \
+                  for n in range(0, y.shape[1], self.chunk)]
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(workers) as pool: results = list(pool.map(fit_chunk, chunks))
+        else: results = [fit_chunk(chunk) for chunk in chunks]
+
+        theta = np.concatenate([result[0] for result in results], axis=1)
+        c = np.concatenate([result[1] for result in results], axis=1)
+        iterations = np.concatenate([result[2] for result in results])
+        unconverged = np.concatenate([result[3] for result in results])
+
+        # Fit quality per voxel
+        with np.errstate(over='ignore', under='ignore', divide='ignore', invalid='ignore'):
+            fitted = np.einsum('lsp,lp->sp', MODELS[model](x, theta), c)
+            ssres = np.sum((y - fitted) ** 2, axis=0)
+            sstot = np.sum((y - np.mean(y, axis=0)) ** 2, axis=0)
+            r2 = 1 - ssres / sstot
+            rates = np.exp(theta)
+
+        return {'rates': rates.reshape((-1,) + shape), 'amplitudes': c.reshape((-1,) + shape), \
+                'r2': r2.reshape(shape), 'rmse': np.sqrt(ssres / x.shape[0]).reshape(shape), \
+                'iterations': iterations.reshape(shape), 'converged': ~unconverged.reshape(shape)}
+
+    def start_rate(self, slope, x):
+        # Log-linear slope as start rate, 1/mean(x) where it is unusable
+        rate = -np.array(slope, dtype=np.float64, ndmin=1)
+        rate[~np.isfinite(rate) | (rate <= 0)] = 1 / np.mean(np.abs(x))
+        return rate
+
+    def T1_IR(self, TI, M, slope, workers=None):
+        # M: magnitude signal, TI steps x map. Returns T1 in units of TI.
+        # The polarity is restored twice, inverted before and up to the minimum, the better fit is kept.
+        M = np.asarray(M, dtype=np.float64)
+        steps = np.arange(M.shape[0]).reshape((-1,) + (1,) * (M.ndim - 1))
+        minindex = np.argmin(M, axis=0)
+        result = self.fit('IR', TI, np.where(steps < minindex, -M, M), self.start_rate(slope, TI), workers)
+        other = self.fit('IR', TI, np.where(steps <= minindex, -M, M), self.start_rate(slope, TI), workers)
+        better = other['rmse'] < result['rmse']
+        for key in result: result[key] = np.where(better, other[key], result[key])
+        result['T1'] = 1 / result['rates'][0]
+        return result
+
+    def T2_mono(self, TE, Y, slope, workers=None):
+        result = self.fit('mono', TE, Y, self.start_rate(slope, TE), workers)
+        result['T2'] = 1 / result['rates'][0]
+        return result
+
+    def T2_bi(self, TE, Y, slope, workers=None):
+        # Components start at twice and half the mono-exponential rate, T2a is the short one
+        rate = self.start_rate(slope, TE)
+        result = self.fit('bi', TE, Y, np.stack((2 * rate, rate / 2)), workers)
+        order = np.argsort(-result['rates'], axis=0)
+        result['rates'] = np.take_along_axis(result['rates'], order, axis=0)
+        result['amplitudes'] = np.take_along_axis(result['amplitudes'], order, axis=0)
+        with np.errstate(divide='ignore', over='ignore'):
+            result['T2a'] = 1 / result['rates'][0]
+            result['T2b'] = 1 / result['rates'][1]
+        # Dominant component as the map value
+        result['T2'] = np.where(result['amplitudes'][0] >= result['amplitudes'][1], result['T2a'], result['T2b'])
+        return result
+
+
+fit = relaxometry()
+
+
+if __name__ == '__main__':
+    import time
+
+    rng = np.random.default_rng()
+    for N in (128, 256):
+        TI = np.linspace(50, 3000, 10)
+        T1 = rng.uniform(200, 2000, N * N)
+        Y = np.abs(1 - 1.9 * np.exp(-TI[:, np.newaxis] / T1) + rng.normal(0, 0.01, (TI.shape[0], N * N)))
+        t = time.perf_counter()
+        result = fit.T1_IR(TI, Y, -1 / (T1 * rng.uniform(0.7, 1.3, N * N)))
+        t = time.perf_counter() - t
+        error = np.median(np.abs(result['T1'] - T1) / T1)
+        print('T1 IR   %dx%d: %.3f s, median rel. error %.3f, mean iterations %.1f, converged %.1f %%' % \
+              (N, N, t, error, np.mean(result['iterations']), 100 * np.mean(result['converged'])))
+
+        TE = np.linspace(10, 200, 12)
+        T2 = rng.uniform(20, 150, N * N)
+        Y = np.exp(-TE[:, np.newaxis] / T2) + rng.normal(0, 0.005, (TE.shape[0], N * N))
+        t = time.perf_counter()
+        result = fit.T2_mono(TE, Y, -1 / (T2 * rng.uniform(0.7, 1.3, N * N)))
+        t = time.perf_counter() - t
+        error = np.median(np.abs(result['T2'] - T2) / T2)
+        print('T2 mono %dx%d: %.3f s, median rel. error %.3f, mean iterations %.1f' % \
+              (N, N, t, error, np.mean(result['iterations'])))
+
+        Y = 0.6 * np.exp(-TE[:, np.newaxis] / 15) + 0.4 * np.exp(-TE[:, np.newaxis] / T2) + rng.normal(0, 0.002, (TE.shape[0], N * N))
+        t = time.perf_counter()
+        result = fit.T2_bi(TE, Y, -1 / T2)
+        t = time.perf_counter() - t
+        print('T2 bi   %dx%d: %.3f s, median T2a %.1f, mean iterations %.1f' % \
+              (N, N, t, np.median(result['T2a']), np.mean(result['iterations'])))
@@ -0,0 +1,105 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Repetition time scheduler
+#   start() begins a run of shots, wait() ends a shot and waits for the
+#   deadline of the next one (monotonic clock, TR after the start of the shot),
+#   so the time spent in readout and processing is part of the TR instead of
+#   adding to it. A shot running over its TR starts the next TR right away.
+#   The progress text is sent with the progress signal (the main window shows
+#   it in the title) instead of a modal countdown dialog, finish() logs the
+#   achieved against the requested TR. pause() waits a fixed time the same way.
+#
+#   Benchmark: python3 scheduler_handler.py
+#
+################################################################################
+
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal, QCoreApplication, QEventLoop, QThread
+
+from parameter_handler import params
+
+
+class tr_run:
+    def __init__(self, scheduler, TR):
+        self.scheduler = scheduler
+        self.TR = TR / 1000
+        self.start = time.monotonic()
+        self.deadline = self.start + self.TR
+        self.last = self.start
+        self.shots = 0
+
+    def wait(self, text=''):
+        # End of a shot: report the progress and wait until the next shot is due
+        self.shots += 1
+        if text: self.scheduler.progress.emit(text)
+        arrival = time.monotonic()
+        self.scheduler.sleep(self.deadline)
+        self.last = time.monotonic()
+        self.deadline = max(self.deadline, arrival) + self.TR
+
+    def finish(self):
+        if self.shots == 0: return
+        achieved = (self.last - self.start) / self.shots * 1000
+        print('TR: requested %.0f ms, achieved %.1f ms (%d shots)' % (self.TR * 1000, achieved, self.shots))
+        self.scheduler.progress.emit('')
+
+
+class tr_scheduler(QObject):
+    progress = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+
+    def start(self, TR):
+        # TR [ms]
+        return tr_run(self, TR)
+
+    def pause(self, duration, text=''):
+        # Fixed pause [s] (motor settling, protocol pause), shown like a TR wait
+        if text: self.progress.emit(text)
+        self.sleep(time.monotonic() + duration)
+        if text: self.progress.emit('')
+
+    def sleep(self, deadline):
+        # With the measurement time display the window keeps painting (no user input, like the former modal dialog)
+        app = QCoreApplication.instance()
+        if params.measurement_time_dialog == 1 and app is not None and QThread.currentThread() == app.thread():
+            while True:
+                QCoreApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: break
+                time.sleep(min(remaining, 0.02))
+        else:
+            remaining = deadline - time.monotonic()
+            if remaining > 0: time.sleep(remaining)
+
+
+scheduler = tr_scheduler()
+
+
+if __name__ == '__main__':
+    import numpy as np
+
+    params.measurement_time_dialog = 0
+    TR = 200
+    shots = 20
+    rng = np.random.default_rng()
+    work = rng.uniform(0.005, 0.02, shots) # Readout and processing per shot [s]
+
+    # Former loop: readout and processing, then TR - 100 ms and 100 ms
+    t = time.monotonic()
+    for n in range(shots):
+        time.sleep(work[n])
+        time.sleep((TR - 100) / 1000)
+        time.sleep(0.1)
+    former = (time.monotonic() - t) / shots * 1000
+
+    schedule = scheduler.start(TR)
+    for n in range(shots):
+        time.sleep(work[n])
+        schedule.wait()
+    schedule.finish()
+    print('%d shots, TR %d ms, %.1f ms readout and processing on average: former period %.1f ms' % (shots, TR, work.mean() * 1000, former))
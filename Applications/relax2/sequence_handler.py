@@ -13,13 +13,18 @@ import math
 from datetime import datetime
 
 from PyQt5.QtCore import QObject, pyqtSignal
-from PyQt5.QtWidgets import QMessageBox
 
 import numpy as np
 
 from TCPsocket import socket, connected, unconnected
 from parameter_handler import params
-from assembler import Assembler
+from compile_handler import programs
+from template_handler import templates
+from hardware_handler import hardware
+from scheduler_handler import scheduler
+from preview_handler import preview
+from readout_handler import rx
+from rawdata_handler import rawdata
 
 class sequence:
     def __init__(self):
@@ -460,6 +465,7 @@ class sequence:
     def conn_client(self):
         socket.connectToHost(params.ip, 1001)
         socket.waitForConnected(1000)
+        hardware.resync()
 
         if socket.state() == connected :
             print('Connection to server esteblished.')
@@ -472,6 +478,7 @@ class sequence:
             return socket.state()
 
     def disconn_client(self):
+        hardware.resync()
         try:
             socket.disconnectFromHost()
         except: pass
@@ -481,54 +488,26 @@ class sequence:
 
 
     def initVariables(self):
-        self.buffer = bytearray(8 * params.samples)
-        self.data = np.frombuffer(self.buffer, np.complex64)
+        rx.allocate(params.samples)
+        self.data = rx.data
 
-        self.freq_old = 0
-        self.att_old = 0
-        self.rxmode_old = 1
+        hardware.resync()
 
     def RXconfig_upload(self):
-        if params.rxmode != self.rxmode_old:
-            socket.write(struct.pack('<IIIIIIIIII', 1, 0, 0, 0, 0, 0, 0, 0, 0, int(params.rxmode)))
-            print('Set RX port!')
-            self.rxmode_old = params.rxmode
+        if hardware.rxmode(params.rxmode): print('Set RX port!')
 
     def Frequency_upload(self):
-        if params.frequency != self.freq_old:
-            socket.write(struct.pack('<IIIIIIIIII', 2, 0, 0, 0, 0, 0, 0, 0, 0, int(1.0e6 * params.frequency)))
-            print('Set frequency!')
-            self.freq_old = params.frequency
+        if hardware.frequency(params.frequency): print('Set frequency!')
         
     def RFattenuation_upload(self):
-        #if params.RFattenuation != self.att_old:
-        socket.write(struct.pack('<IIIIIIIIII', 3, 0, 0, 0, 0, 0, 0, 0, 0, int(abs(-31.75)/0.25)))
-        socket.write(struct.pack('<IIIIIIIIII', 3, 0, 0, 0, 0, 0, 0, 0, 0, int(abs(params.RFattenuation)/0.25)))
-        print('Set attenuation!')
-        #self.att_old = params.RFattenuation
+        if hardware.attenuation(params.RFattenuation): print('Set attenuation!')
         
     def Gradients_upload(self):
-        if params.grad[0] != None:
-            if np.sign(params.grad[0]) < 0: sign = 1
-            else: sign = 0
-            socket.write(struct.pack('<IIIIIIIIII', 5, 0, 0, 0, 0, 0, 0, 0, 0, sign << 24 | abs(params.grad[0])))
-        if params.grad[1] != None:
-            if np.sign(params.grad[1]) < 0: sign = 1
-            else: sign = 0
-            socket.write(struct.pack('<IIIIIIIIII', 5, 0, 0, 0, 0, 0, 0, 0, 1, sign << 24 | abs(params.grad[1])))
-        if params.grad[2] != None:
-            if np.sign(params.grad[2]) < 0: sign = 1
-            else: sign = 0
-            socket.write(struct.pack('<IIIIIIIIII', 5, 0, 0, 0, 0, 0, 0, 0, 2, sign << 24 | abs(params.grad[2])))
-        if params.grad[3] != None:
-            if np.sign(params.grad[3]) < 0: sign = 1
-            else: sign = 0
-            socket.write(struct.pack('<IIIIIIIIII', 5, 0, 0, 0, 0, 0, 0, 0, 3, sign << 24 | abs(params.grad[3])))
-
-        while(True):
-            if not socket.waitForBytesWritten():
-                break
-        print('Set shims!')
+        # Staged like the other settings, sent with the sequence in Sequence_upload
+        changed = False
+        for axis in range(4):
+            if params.grad[axis] != None: changed |= hardware.shim(axis, params.grad[axis])
+        if changed: print('Set shims!')
         
     # Free Induction Decay sequence    
     def FID_setup(self):
@@ -536,16 +515,11 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength/2 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_fid, 'r+')
-        lines = f.readlines()
-        lines[-13] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength/2 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_fid, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_fid)
+        sequence.set(-13, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-11, 3, int(params.TE * 1000 - params.flippulselength/2 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_fid
         
@@ -557,20 +531,15 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 20 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_se, 'r+')
-        lines = f.readlines()
-        lines[-28] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-26] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-23] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_se)
+        sequence.set(-28, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-26, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-23, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_se
         
@@ -585,18 +554,13 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength/2 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_ir_fid, 'r+')
-        lines = f.readlines()
-        lines[-18] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-16] = 'PR 3, ' + str(int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) + '\t// Pause\n'
-        lines[-13] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength/2 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_ir_fid, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_ir_fid)
+        sequence.set(-18, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-16, 3, int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) # Pause
+        sequence.set(-13, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-11, 3, int(params.TE * 1000 - params.flippulselength/2 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_ir_fid
         
@@ -611,22 +575,17 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 20 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_ir_se, 'r+')
-        lines = f.readlines()
-        lines[-33] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) + '\t// Pause\n'
-        lines[-28] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-26] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-23] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_ir_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_ir_se)
+        sequence.set(-33, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) # Pause
+        sequence.set(-28, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-26, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-23, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_ir_se
         
@@ -647,22 +606,17 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength/2 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')    
             
-        f = open(self.seq_sir_fid, 'r+')
-        lines = f.readlines()
-        lines[-33] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-28] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-23] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-16] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - 100 - params.flippulselength/2)) + '\t// Pause\n'
-        lines[-13] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength/2 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_sir_fid, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_sir_fid)
+        sequence.set(-33, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-31, 3, int(params.SIR_TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-28, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-23, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-19, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-16, 3, int(params.SIR_TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - 100 - params.flippulselength/2)) # Pause
+        sequence.set(-13, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-11, 3, int(params.TE * 1000 - params.flippulselength/2 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_sir_fid
         
@@ -683,26 +637,21 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 20 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_sir_se, 'r+')
-        lines = f.readlines()
-        lines[-48] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-46] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-43] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-38] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-34] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-31] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - 100 - params.flippulselength/2)) + '\t// Pause\n'
-        lines[-28] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-26] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-23] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_sir_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_sir_se)
+        sequence.set(-48, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-46, 3, int(params.SIR_TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-43, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-38, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-34, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-31, 3, int(params.SIR_TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - 100 - params.flippulselength/2)) # Pause
+        sequence.set(-28, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-26, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-23, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_sir_se
         
@@ -713,20 +662,15 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 50 + 200 + params.GROpretime + 400 + params.TS * 1000 + 400 + params.TS * 1000 + 200) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_epi, 'r+')
-        lines = f.readlines()
-        lines[-30] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) + '\t// Pause\n'
-        lines[-25] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-19] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-16] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_epi, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_epi)
+        sequence.set(-30, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-28, 3, int(params.TE * 1000 - params.flippulselength / 2 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) # Pause
+        sequence.set(-25, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-22, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-19, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-16, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_epi
         
@@ -737,24 +681,19 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 60 + 200 + params.GROpretime + 400 + params.TS * 1000 + 400 + params.TS * 1000 + 200) / 1000 *2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_epi_se, 'r+')
-        lines = f.readlines()
-        lines[-45] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-43] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-40] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-35] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) + '\t// Pause\n'
-        lines[-25] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-19] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-16] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_epi_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_epi_se)
+        sequence.set(-45, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-43, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-40, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-35, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-28, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) # Pause
+        sequence.set(-25, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-22, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-19, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-16, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_epi_se
         
@@ -766,38 +705,33 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 20 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_tse, 'r+')
-        lines = f.readlines()
-        lines[-76] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-74] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-71] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-66] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-62] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-59] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-58] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-57] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-54] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-50] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-46] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-43] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-42] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-41] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-38] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-34] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-30] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-27] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-26] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-25] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-22] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_tse, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_tse)
+        sequence.set(-76, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-74, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-71, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-66, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-62, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-59, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-58, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-57, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-54, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-50, 6, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-46, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-43, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-42, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-41, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-38, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-34, 6, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-30, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-27, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-26, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-25, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-22, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 6, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_tse
         
@@ -808,17 +742,12 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 20 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_fid_gs, 'r+')
-        lines = f.readlines()
-        lines[-18] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_fid_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_fid_gs)
+        sequence.set(-18, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-14, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-11, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_fid_gs
         
@@ -833,21 +762,16 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 40 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-33] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-29] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-26] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-23] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_se_gs)
+        sequence.set(-33, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-29, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-26, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-23, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_se_gs
         
@@ -861,19 +785,14 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 20 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_ir_fid_gs, 'r+')
-        lines = f.readlines()
-        lines[-25] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-23] = 'PR 3, ' + str(int(params.TI * 1000 - 4*params.RFpulselength - 20 - 200 - 4*params.flippulselength/2)) + '\t// Pause\n'
-        lines[-18] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_ir_fid_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_ir_fid_gs)
+        sequence.set(-25, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-23, 3, int(params.TI * 1000 - 4*params.RFpulselength - 20 - 200 - 4*params.flippulselength/2)) # Pause
+        sequence.set(-18, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-14, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-11, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_ir_fid_gs
         
@@ -890,23 +809,18 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 40 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_ir_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-40] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-38] = 'PR 3, ' + str(int(params.TI * 1000 - 4*params.RFpulselength - 20 - 200 - 4*params.flippulselength/2)) + '\t// Pause\n'
-        lines[-33] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-29] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-26] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-23] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_ir_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_ir_se_gs)
+        sequence.set(-40, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-38, 3, int(params.TI * 1000 - 4*params.RFpulselength - 20 - 200 - 4*params.flippulselength/2)) # Pause
+        sequence.set(-33, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-29, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-26, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-23, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_ir_se_gs
         
@@ -926,23 +840,18 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 20 + params.TS * 1000 / 2) / 1000))/10
             print('TE set to:', params.TE, 'ms') 
         
-        f = open(self.seq_sir_fid_gs, 'r+')
-        lines = f.readlines()
-        lines[-40] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-38] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - 4*params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-35] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-30] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-26] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-23] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - 200 - 4*params.flippulselength/2)) + '\t// Pause\n'
-        lines[-18] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 20 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_sir_fid_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_sir_fid_gs)
+        sequence.set(-40, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-38, 3, int(params.SIR_TE / 2 * 1000 - 4*params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-35, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-30, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-26, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-23, 3, int(params.SIR_TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - 200 - 4*params.flippulselength/2)) # Pause
+        sequence.set(-18, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-14, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-11, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 20 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_sir_fid_gs
         
@@ -965,27 +874,22 @@ class sequence:
             params.TE = math.ceil(10*((2*4*params.RFpulselength/2 + 200 + params.crushertime + 200 + 30 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_sir_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-55] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-53] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - 4*params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-50] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-45] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-41] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-38] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - 200 - 4*params.flippulselength/2)) + '\t// Pause\n'
-        lines[-33] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-29] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-26] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-23] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_sir_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_sir_se_gs)
+        sequence.set(-55, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-53, 3, int(params.SIR_TE / 2 * 1000 - 4*params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-50, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-45, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-41, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-38, 3, int(params.SIR_TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - 200 - 4*params.flippulselength/2)) # Pause
+        sequence.set(-33, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-29, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-26, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-23, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_sir_se_gs
         
@@ -996,21 +900,16 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 60 + 200 + params.GROpretime + 400 + params.TS * 1000 + 400 + params.TS * 1000 + 200) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_epi_gs, 'r+')
-        lines = f.readlines()
-        lines[-35] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) + '\t// Pause\n'
-        lines[-25] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-19] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-16] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_epi_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_epi_gs)
+        sequence.set(-35, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-31, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-28, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) # Pause
+        sequence.set(-25, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-22, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-19, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-16, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_epi_gs
         
@@ -1025,25 +924,20 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 40 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_epi_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-50] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-46] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-43] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-40] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-35] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.RFpulselength - 200 - params.crushertime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) + '\t// Pause\n'
-        lines[-25] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-19] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-16] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_epi_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_epi_se_gs)
+        sequence.set(-50, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-46, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-43, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-40, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-35, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-28, 3, int(params.TE / 2 * 1000 - 4*params.RFpulselength - 200 - params.crushertime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) # Pause
+        sequence.set(-25, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-22, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-19, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-16, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_epi_se_gs
         
@@ -1057,91 +951,66 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 40 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_tse_gs, 'r+')
-        lines = f.readlines()
-        lines[-81] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-77] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-74] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-71] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-66] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-62] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-59] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-58] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-57] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 10 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-54] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-50] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-46] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-43] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-42] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-41] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 10 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-38] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-34] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-30] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-27] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-26] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-25] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 10 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-22] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-18] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-14] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-11] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-10] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_tse_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_tse_gs)
+        sequence.set(-81, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-77, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-74, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-71, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-66, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-62, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-59, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-58, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-57, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 10 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-54, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-50, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-46, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-43, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-42, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-41, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 10 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-38, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-34, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-30, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-27, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-26, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-25, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 10 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-22, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-18, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-14, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-11, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 30 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-10, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_tse_gs
         
         print('TSE (slice) setup complete!')
 
     def rf_loopback_test_rect_flip_setup(self):
-        f = open(self.seq_rf_loopback_test_rect_flip, 'r+')
-        lines = f.readlines()
-        lines[-5] = 'PR 6, ' + str(int(params.flippulselength)) + '\t// Flip RF Pulse\n'
-        f.close()
-        with open(self.seq_rf_loopback_test_rect_flip, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_rf_loopback_test_rect_flip)
+        sequence.set(-5, 6, int(params.flippulselength)) # Flip RF Pulse
                 
         params.sequencefile = self.seq_rf_loopback_test_rect_flip
         
         print('RF loopback test sequence setup complete!')
         
     def rf_loopback_test_rect_180_setup(self):
-        f = open(self.seq_rf_loopback_test_rect_180, 'r+')
-        lines = f.readlines()
-        lines[-5] = 'PR 6, ' + str(int(2*params.RFpulselength)) + '\t// 180deg RF Pulse\n'
-        f.close()
-        with open(self.seq_rf_loopback_test_rect_180, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_rf_loopback_test_rect_180)
+        sequence.set(-5, 6, int(2*params.RFpulselength)) # 180deg RF Pulse
                 
         params.sequencefile = self.seq_rf_loopback_test_rect_180
         
         print('RF loopback test sequence setup complete!')
 
     def rf_loopback_test_sinc_flip_setup(self):
-        f = open(self.seq_rf_loopback_test_sinc_flip, 'r+')
-        lines = f.readlines()
-        lines[-5] = 'PR 6, ' + str(int(4*params.flippulselength)) + '\t// Flip RF Pulse\n'
-        f.close()
-        with open(self.seq_rf_loopback_test_sinc_flip, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_rf_loopback_test_sinc_flip)
+        sequence.set(-5, 6, int(4*params.flippulselength)) # Flip RF Pulse
                 
         params.sequencefile = self.seq_rf_loopback_test_sinc_flip
         
         print('RF loopback test sequence setup complete!')
         
     def rf_loopback_test_sinc_180_setup(self):
-        f = open(self.seq_rf_loopback_test_sinc_180, 'r+')
-        lines = f.readlines()
-        lines[-5] = 'PR 6, ' + str(int(2*4*params.RFpulselength)) + '\t// 180deg RF Pulse\n'
-        f.close()
-        with open(self.seq_rf_loopback_test_sinc_180, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_rf_loopback_test_sinc_180)
+        sequence.set(-5, 6, int(2*4*params.RFpulselength)) # 180deg RF Pulse
                 
         params.sequencefile = self.seq_rf_loopback_test_sinc_180
         
@@ -1149,20 +1018,15 @@ class sequence:
         
     #2D Gradient Echo Sequence   
     def grad_test_setup(self):
-        f = open(self.seq_grad_test, 'r+')
-        lines = f.readlines()
-        lines[-7] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-10] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-13] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-16] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-22] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-25] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TR)) + '\t// Grad pulse length\n'
-        f.close()
-        with open(self.seq_grad_test, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_grad_test)
+        sequence.set(-7, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-10, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-13, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-16, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-19, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-22, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-25, 3, int(params.TR)) # Grad pulse length
+        sequence.set(-28, 3, int(params.TR)) # Grad pulse length
                 
         params.sequencefile = self.seq_grad_test
         
@@ -1170,8 +1034,6 @@ class sequence:
         
     def rf_sar_cal_test_setup(self):
         print('\033[1m' + 'WIP' + '\033[0m')
-        f = open(self.seq_rf_sar_cal_test, 'r+')
-        lines = f.readlines()
 #         lines[-61] = 'TXOFFSET ' + str(19*params.RFpulselength) + '\n'
 #         lines[-60] = 'PR 5, ' + str(params.RFpulselength) + '\n'
 #         lines[-59] = 'PR 11, ' + str(int(params.TI)) + '\n'
@@ -1233,10 +1095,6 @@ class sequence:
 #         lines[-8] = 'PR 11, ' + str(int(params.TI)) + '\n'
 #         lines[-7] = 'TXOFFSET ' + str(19*params.RFpulselength) + '\n'
 #         lines[-6] = 'PR 5, ' + str(params.RFpulselength) + '\n'
-        f.close()
-        with open(self.seq_rf_sar_cal_test, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
                 
         params.sequencefile = self.seq_rf_sar_cal_test
         
@@ -1248,17 +1106,12 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_rad_f_gre, 'r+')
-        lines = f.readlines()
-        lines[-21] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_f_gre, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_f_gre)
+        sequence.set(-21, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-19, 3, int(params.TE * 1000 - params.flippulselength / 2 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_f_gre
         
@@ -1270,21 +1123,16 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_rad_f_se, 'r+')
-        lines = f.readlines()
-        lines[-36] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_f_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_f_se)
+        sequence.set(-36, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_f_se
         
@@ -1296,16 +1144,11 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_rad_h_gre, 'r+')
-        lines = f.readlines()
-        lines[-19] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-17] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 40 - 200 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_h_gre, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_h_gre)
+        sequence.set(-19, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-17, 3, int(params.TE * 1000 - params.flippulselength / 2 - 40 - 200 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_h_gre
         
@@ -1321,20 +1164,15 @@ class sequence:
             print('TE to short!! TE set to:', params.TE, 'ms')
             
             
-        f = open(self.seq_2D_rad_h_se, 'r+')
-        lines = f.readlines()
-        lines[-34] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-32] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-29] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-24] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-20] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-17] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_h_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_h_se)
+        sequence.set(-34, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-32, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-29, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-24, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-20, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-17, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_h_se
         
@@ -1346,18 +1184,13 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 45 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
                
-        f = open(self.seq_2D_rad_f_gre_gs, 'r+')
-        lines = f.readlines()
-        lines[-26] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_f_gre_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_f_gre_gs)
+        sequence.set(-26, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-22, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-19, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_f_gre_gs
         
@@ -1372,22 +1205,17 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 45 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_rad_f_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-41] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-37] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_f_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_f_se_gs)
+        sequence.set(-41, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-37, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_f_se_gs
         
@@ -1399,17 +1227,12 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 25 + 200 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_rad_h_gre_gs, 'r+')
-        lines = f.readlines()
-        lines[-23] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-16] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 25 - 200 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_h_gre_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_h_gre_gs)
+        sequence.set(-23, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-19, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-16, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 25 - 200 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_h_gre_gs
         
@@ -1425,29 +1248,24 @@ class sequence:
             print('TE to short!! TE set to:', params.TE, 'ms')
             
             
-        f = open(self.seq_2D_rad_h_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-38] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-34] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-31] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-28] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-23] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-16] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 25 - 200 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-#         lines[-34] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-#         lines[-32] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-#         lines[-29] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-#         lines[-24] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-#         lines[-20] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-#         lines[-17] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.TS * 1000 / 2)) + '\t// Pause\n'
-#         lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-#         lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_rad_h_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_rad_h_se_gs)
+        sequence.set(-38, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-34, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-31, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-28, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-23, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-19, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-16, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 25 - 200 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
+#         sequence.set(-34, 5, params.flippulselength) # Flip RF Pulse
+#         sequence.set(-32, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+#         sequence.set(-29, 3, int(params.crushertime)) # Crusher length
+#         sequence.set(-24, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+#         sequence.set(-20, 3, int(params.crushertime)) # Crusher length
+#         sequence.set(-17, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.TS * 1000 / 2)) # Pause
+#         sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+#         sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_rad_h_se_gs
         
@@ -1459,17 +1277,12 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_gre, 'r+')
-        lines = f.readlines()
-        lines[-21] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_gre, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_gre)
+        sequence.set(-21, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-19, 3, int(params.TE * 1000 - params.flippulselength / 2 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_gre
         
@@ -1481,21 +1294,16 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_se, 'r+')
-        lines = f.readlines()
-        lines[-36] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_se)
+        sequence.set(-36, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_se
         
@@ -1511,19 +1319,14 @@ class sequence:
             print('TE to short!! TE set to:', params.TE, 'ms')
         
             
-        f = open(self.seq_2D_ir_gre, 'r+')
-        lines = f.readlines()
-        lines[-26] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-24] = 'PR 3, ' + str(int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) + '\t// Pause\n'
-        lines[-21] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 10 - 30 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_ir_gre, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_ir_gre)
+        sequence.set(-26, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-24, 3, int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) # Pause
+        sequence.set(-21, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-19, 3, int(params.TE * 1000 - params.flippulselength / 2 - 10 - 30 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_ir_gre
         
@@ -1538,23 +1341,18 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_ir_se, 'r+')
-        lines = f.readlines()
-        lines[-41] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-39] = 'PR 3, ' + str(int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) + '\t// Pause\n'
-        lines[-36] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_ir_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_ir_se)
+        sequence.set(-41, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-39, 3, int(params.TI * 1000 - params.RFpulselength - 10 - 100 - params.flippulselength / 2)) # Pause
+        sequence.set(-36, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_ir_se
         
@@ -1575,23 +1373,18 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 10 + 30 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('SIR TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_sir_gre, 'r+')
-        lines = f.readlines()
-        lines[-41] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-39] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-36] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-31] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-27] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-24] = 'PR 3, ' + str(int(params.SIR_TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - 100 - params.flippulselength/2)) + '\t// Pause\n'
-        lines[-21] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 10 - 30 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_sir_gre, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_sir_gre)
+        sequence.set(-41, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-39, 3, int(params.SIR_TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-36, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-31, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-27, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-24, 3, int(params.SIR_TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 20 - 100 - params.flippulselength/2)) # Pause
+        sequence.set(-21, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-19, 3, int(params.TE * 1000 - params.flippulselength / 2 - 10 - 30 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_sir_gre
         
@@ -1603,18 +1396,13 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 45 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_gre_gs, 'r+')
-        lines = f.readlines()
-        lines[-26] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_gre_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_gre_gs)
+        sequence.set(-26, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-22, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-19, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_gre_gs
         
@@ -1629,22 +1417,17 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 45 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-41] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-37] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_se_gs)
+        sequence.set(-41, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-37, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_se_gs
         
@@ -1658,20 +1441,15 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 40 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_ir_gre_gs, 'r+')
-        lines = f.readlines()
-        lines[-33] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.TI * 1000 - 2*4*params.RFpulselength/2 - 20 - 100 - 100 - 4*params.flippulselength/2)) + '\t// Pause\n'
-        lines[-26] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_ir_gre_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_ir_gre_gs)
+        sequence.set(-33, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.TI * 1000 - 2*4*params.RFpulselength/2 - 20 - 100 - 100 - 4*params.flippulselength/2)) # Pause
+        sequence.set(-26, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-22, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-19, 3, int(params.TE * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_ir_gre_gs
         
@@ -1688,24 +1466,19 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 40 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_ir_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-48] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-46] = 'PR 3, ' + str(int(params.TI * 1000 - 2*4*params.RFpulselength/2 - 20 - 100 - 100 - 4*params.flippulselength/2)) + '\t// Pause\n'
-        lines[-41] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-37] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_ir_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_ir_se_gs)
+        sequence.set(-48, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-46, 3, int(params.TI * 1000 - 2*4*params.RFpulselength/2 - 20 - 100 - 100 - 4*params.flippulselength/2)) # Pause
+        sequence.set(-41, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-37, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_ir_se_gs
         
@@ -1719,22 +1492,17 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 40 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_3D_se_gs, 'r+')
-        lines = f.readlines()
-        lines[-41] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-37] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-34] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-26] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-22] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_3D_se_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_3D_se_gs)
+        sequence.set(-41, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-37, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-34, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 40 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-26, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-22, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_3D_se_gs
         
@@ -1748,46 +1516,41 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 45 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_3D_tse_gs, 'r+')
-        lines = f.readlines()
-        lines[-140] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-136] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-133] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-130] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-125] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-121] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-118] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-115] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-112] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-106] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-103] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 55 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-100] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-95] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-91] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-88] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-85] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-79] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-73] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-70] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-67] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-62] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-58] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-55] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-52] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-46] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-40] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-37] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-34] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-29] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-25] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-19] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_3D_tse_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_3D_tse_gs)
+        sequence.set(-140, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-136, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-133, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-130, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-125, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-121, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-118, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-115, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-112, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-106, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-103, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 55 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-100, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-95, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-91, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-88, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-85, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-79, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-73, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-70, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-67, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-62, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-58, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-55, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-52, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-46, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-40, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-37, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-34, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-29, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-25, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-22, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-19, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_3D_tse_gs
         
@@ -1799,45 +1562,40 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 55 + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_tse, 'r+')
-        lines = f.readlines()
-        lines[-132] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-130] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-127] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-122] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-118] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-115] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-112] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-109] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-103] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-100] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-97] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-93] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-89] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length l89\n'
-        lines[-86] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-83] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-77] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-71] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-68] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 55 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-65] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-61] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse l61\n'
-        lines[-57] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-54] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-51] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-45] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-39] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-36] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-33] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-29] = 'PR 6, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-25] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-19] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_tse, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_tse)
+        sequence.set(-132, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-130, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-127, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-122, 6, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-118, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-115, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-112, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-109, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-103, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-100, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) # Pause
+        sequence.set(-97, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-93, 6, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-89, 4, int(params.crushertime)) # Crusher length l89
+        sequence.set(-86, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 45 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-83, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-77, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-71, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-68, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 55 - params.RFpulselength)) # Pause
+        sequence.set(-65, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-61, 6, 2 * params.RFpulselength) # 180deg RF Pulse l61
+        sequence.set(-57, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-54, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-51, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-45, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-39, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-36, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) # Pause
+        sequence.set(-33, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-29, 6, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-25, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-22, 4, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-19, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_tse
         
@@ -1852,46 +1610,41 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 45 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_tse_gs, 'r+')
-        lines = f.readlines()
-        lines[-140] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-136] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-133] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-130] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-125] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-121] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-118] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-115] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-112] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-106] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-103] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 55 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-100] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-95] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-91] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-88] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-85] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-79] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-73] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-70] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-67] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-62] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-58] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-55] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-52] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-46] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-40] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-37] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-34] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-29] = 'PR 6, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-25] = 'PR 4, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-19] = 'PR 4, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_tse_gs, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_tse_gs)
+        sequence.set(-140, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-136, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-133, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 45 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-130, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-125, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-121, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-118, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-115, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-112, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-106, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-103, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 55 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-100, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-95, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-91, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-88, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-85, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-79, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-73, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-70, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-67, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-62, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-58, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-55, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 50 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-52, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-46, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-40, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-37, 4, int(params.TE / 2 * 1000 - params.TS * 1000 / 2 - 400 - params.GROpretime - 200 - 200 - params.crushertime - 200 - 50 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-34, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-29, 6, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-25, 4, int(params.crushertime)) # Crusher length
+        sequence.set(-22, 4, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 55 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-19, 4, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_tse_gs
         
@@ -1902,21 +1655,16 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 200 + 600 + 200 + 70 + 200 + params.GROpretime + 400 + params.TS * 1000 + 400 + params.TS * 1000 + 200) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_epi, 'r+')
-        lines = f.readlines()
-        lines[-35] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(600) + '\t// Phase length\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 200 - 600 - 200 - 70 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) + '\t// Pause\n'
-        lines[-25] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-19] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-16] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_epi, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_epi)
+        sequence.set(-35, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-31, 3, 600) # Phase length
+        sequence.set(-28, 3, int(params.TE * 1000 - params.flippulselength / 2 - 200 - 600 - 200 - 70 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) # Pause
+        sequence.set(-25, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-22, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-19, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-16, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_epi
         
@@ -1927,25 +1675,20 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 60 + 200 + params.GROpretime + 400 + params.TS * 1000 + 400 + params.TS * 1000 + 200) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_epi_se, 'r+')
-        lines = f.readlines()
-        lines[-51] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-49] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - 600 - 200 - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-46] = 'PR 3, ' + str(600) + '\t// Phase length\n'
-        lines[-40] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-35] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-28] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) + '\t// Pause\n'
-        lines[-25] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-22] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-19] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-16] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_epi_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_epi_se)
+        sequence.set(-51, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-49, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - 600 - 200 - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) # Pause
+        sequence.set(-46, 3, 600) # Phase length
+        sequence.set(-40, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-35, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-28, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 60 - 200 - params.GROpretime - 400 - params.TS * 1000 - 400 - params.TS * 1000 - 200)) # Pause
+        sequence.set(-25, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-22, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-19, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-16, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_epi_se
         
@@ -1956,25 +1699,20 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 80 + 800 + 2 * params.diffusiontime + 200 + params.GROpretime + 400 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_se_diff, 'r+')
-        lines = f.readlines()
-        lines[-54] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-52] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 10 - 800 - 2 * params.diffusiontime - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-49] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-46] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-40] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-35] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-25] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-22] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 80 - 800 - 2 * params.diffusiontime - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_se_diff, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_se_diff)
+        sequence.set(-54, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-52, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 10 - 800 - 2 * params.diffusiontime - 200 - params.crushertime - 200 - 50 - params.RFpulselength)) # Pause
+        sequence.set(-49, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-46, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-40, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-35, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-25, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-22, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 80 - 800 - 2 * params.diffusiontime - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_se_diff
         
@@ -1988,26 +1726,21 @@ class sequence:
             params.TE = math.ceil(10*((4*params.flippulselength/2 + 400 + params.GSposttime + 200 + 200 + params.crushertime + 200 + 800 + 2 * params.diffusiontime + 45 + 2*4*params.RFpulselength/2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_se_gs_diff, 'r+')
-        lines = f.readlines()
-        lines[-59] = 'PR 5, ' + str(4*params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-55] = 'PR 3, ' + str(int(params.GSposttime)) + '\t// Slice rephaser length\n'
-        lines[-52] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 800 - 2 * params.diffusiontime - 45 - 2*4*params.RFpulselength/2)) + '\t// Pause\n'
-        lines[-49] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-46] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-40] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-35] = 'PR 5, ' + str(2*4*params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-31] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-25] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-22] = 'PR 3, ' + str(int(params.diffusiontime)) + '\t// Diff length\n'
-        lines[-19] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 800 - 2 * params.diffusiontime - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROpretime)) + '\t// Readout prephaser length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_se_gs_diff, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_se_gs_diff)
+        sequence.set(-59, 5, 4*params.flippulselength) # Flip RF Pulse
+        sequence.set(-55, 3, int(params.GSposttime)) # Slice rephaser length
+        sequence.set(-52, 3, int(params.TE / 2 * 1000 - 4*params.flippulselength/2 - 400 - params.GSposttime - 200 - 200 - params.crushertime - 200 - 800 - 2 * params.diffusiontime - 45 - 2*4*params.RFpulselength/2)) # Pause
+        sequence.set(-49, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-46, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-40, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-35, 5, 2*4*params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-31, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-25, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-22, 3, int(params.diffusiontime)) # Diff length
+        sequence.set(-19, 3, int(params.TE / 2 * 1000 - 2*4*params.RFpulselength/2 - 200 - params.crushertime - 200 - 800 - 2 * params.diffusiontime - 40 - 200 - params.GROpretime - 400 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-16, 3, int(params.GROpretime)) # Readout prephaser length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_se_gs_diff
         
@@ -2019,18 +1752,13 @@ class sequence:
             params.TE = math.ceil(10*((params.flippulselength / 2 + 10 + 200 + params.GROfcpretime1 + 400 + params.GROfcpretime2 + 400 + 35 + params.TS * 1000 / 2) / 1000))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
         
-        f = open(self.seq_2D_fc_gre, 'r+')
-        lines = f.readlines()
-        lines[-27] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-25] = 'PR 3, ' + str(int(params.TE * 1000 - params.flippulselength / 2 - 10 - 200 - params.GROfcpretime1 - 400 - params.GROfcpretime2 - 400 - 35 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-22] = 'PR 3, ' + str(int(params.GROfcpretime1)) + '\t// Readout FC prephaser 1 length\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROfcpretime2)) + '\t// Readout FC prephaser 2 length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_fc_gre, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_fc_gre)
+        sequence.set(-27, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-25, 3, int(params.TE * 1000 - params.flippulselength / 2 - 10 - 200 - params.GROfcpretime1 - 400 - params.GROfcpretime2 - 400 - 35 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-22, 3, int(params.GROfcpretime1)) # Readout FC prephaser 1 length
+        sequence.set(-16, 3, int(params.GROfcpretime2)) # Readout FC prephaser 2 length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_fc_gre
         
@@ -2042,43 +1770,34 @@ class sequence:
             params.TE = math.ceil(10*((params.RFpulselength + 200 + params.crushertime + 200 + 200 + params.GROfcpretime1 + 400 + params.GROfcpretime2 + 400 + 55 + params.TS * 1000 / 2) / 1000 * 2))/10
             print('TE to short!! TE set to:', params.TE, 'ms')
             
-        f = open(self.seq_2D_fc_se, 'r+')
-        lines = f.readlines()
-        lines[-42] = 'PR 5, ' + str(params.flippulselength) + '\t// Flip RF Pulse\n'
-        lines[-40] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) + '\t// Pause\n'
-        lines[-37] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-32] = 'PR 5, ' + str(2 * params.RFpulselength) + '\t// 180deg RF Pulse\n'
-        lines[-28] = 'PR 3, ' + str(int(params.crushertime)) + '\t// Crusher length\n'
-        lines[-25] = 'PR 3, ' + str(int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 200 - params.GROfcpretime1 - 400 - params.GROfcpretime2 - 400 - 55 - params.TS * 1000 / 2)) + '\t// Pause\n'
-        lines[-22] = 'PR 3, ' + str(int(params.GROfcpretime1)) + '\t// Readout FC prephaser 1 length\n'
-        lines[-16] = 'PR 3, ' + str(int(params.GROfcpretime2)) + '\t// Readout FC prephaser 2 length\n'
-        lines[-13] = 'PR 4, ' + str(int(params.TS*1000)) + '\t// Sampling window\n'
-        lines[-7] = 'PR 4, ' + str(int(params.spoilertime)) + '\t// Spoiler length\n'
-        f.close()
-        with open(self.seq_2D_fc_se, 'w') as out_file:
-            for line in lines:
-                out_file.write(line)
+        sequence = templates.load(self.seq_2D_fc_se)
+        sequence.set(-42, 5, params.flippulselength) # Flip RF Pulse
+        sequence.set(-40, 3, int(params.TE / 2 * 1000 - params.flippulselength/2 - 200 - params.crushertime - 200 - 30 - params.RFpulselength)) # Pause
+        sequence.set(-37, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-32, 5, 2 * params.RFpulselength) # 180deg RF Pulse
+        sequence.set(-28, 3, int(params.crushertime)) # Crusher length
+        sequence.set(-25, 3, int(params.TE / 2 * 1000 - params.RFpulselength - 200 - params.crushertime - 200 - 200 - params.GROfcpretime1 - 400 - params.GROfcpretime2 - 400 - 55 - params.TS * 1000 / 2)) # Pause
+        sequence.set(-22, 3, int(params.GROfcpretime1)) # Readout FC prephaser 1 length
+        sequence.set(-16, 3, int(params.GROfcpretime2)) # Readout FC prephaser 2 length
+        sequence.set(-13, 4, int(params.TS*1000)) # Sampling window
+        sequence.set(-7, 4, int(params.spoilertime)) # Spoiler length
                 
         params.sequencefile = self.seq_2D_fc_se
         
         print('2D FC SE setup complete!')
         
     def Sequence_upload(self):
-        self.assembler = Assembler()
-        byte_array = self.assembler.assemble(params.sequencefile)
-        
-        time.sleep(0.1)
-        
-        socket.write(struct.pack('<IIIIIIIIII', 4, 0, 0, 0, 0, 0, 0, 0, 0, 0))
-        socket.write(byte_array)
+        # Program of the sequence template (patched by the setup), staged only if the server holds another one.
+        # One write for the program and all changed settings.
+        byte_array = templates.load(params.sequencefile).program()
 
-        while(True):
-            if not socket.waitForBytesWritten():
-                break
+        if hardware.program(programs.key(byte_array), byte_array):
+            time.sleep(0.1)
+            print('Sequence uploaded!')
+        else: print('Sequence already loaded.')
+        hardware.flush(socket)
 
         socket.setReadBufferSize(8*params.samples)
-        
-        print('Sequence uploaded!')
 
     def acquire_spectrum_FID(self):
         print('Acquire spectrum...')
@@ -2093,6 +1812,7 @@ class sequence:
 
         if params.sequence == 0: self.estimated_time = self.avecount * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2102,31 +1822,14 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             if params.average == 1:
                 if params.sequence == 0: self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 self.remaining_time_h = math.floor(self.remaining_time / (3600))
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -2135,7 +1838,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2157,6 +1860,7 @@ class sequence:
         if params.sequence == 2 or params.sequence == 3: self.estimated_time = self.avecount * ((100 + params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         if params.sequence == 4 or params.sequence == 5: self.estimated_time = self.avecount * ((100 + params.flippulselength/2 + params.SIR_TE*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2166,17 +1870,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             if params.average == 1:
                 
                 if params.sequence == 1: self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -2186,15 +1880,8 @@ class sequence:
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -2203,7 +1890,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2222,6 +1909,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,4*self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2231,15 +1919,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
         
             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.spectrumdata[n,self.data_idx:2*self.data_idx] = self.data[self.data_idx+self.sampledelay+self.EPIdelay:self.sampledelay+self.EPIdelay:-1]*params.RXscaling
@@ -2247,7 +1927,8 @@ class sequence:
             self.spectrumdata[n,3*self.data_idx:4*self.data_idx] = self.data[self.data_idx+self.sampledelay+3*self.EPIdelay:self.sampledelay+3*self.EPIdelay:-1]*params.RXscaling
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.TS, 4*self.data_idx)
         
@@ -2256,7 +1937,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((4*self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2275,6 +1956,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,4*self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2284,15 +1966,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
         
             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.spectrumdata[n,self.data_idx:2*self.data_idx] = self.data[self.data_idx+self.sampledelay+self.EPIdelay:self.sampledelay+self.EPIdelay:-1]*params.RXscaling
@@ -2300,7 +1974,8 @@ class sequence:
             self.spectrumdata[n,3*self.data_idx:4*self.data_idx] = self.data[self.data_idx+self.sampledelay+3*self.EPIdelay:self.sampledelay+3*self.EPIdelay:-1]*params.RXscaling
            
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.TS, 4*self.data_idx)
         
@@ -2309,7 +1984,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((4*self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2330,6 +2005,7 @@ class sequence:
         
         self.estimated_time = self.avecount * ((100 + params.flippulselength/2 + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2339,15 +2015,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
         
             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.spectrumdata[n,self.data_idx:2*self.data_idx] = -self.data[self.sampledelay+self.TEdelay:self.data_idx+self.sampledelay+self.TEdelay]*params.RXscaling
@@ -2360,15 +2028,8 @@ class sequence:
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.TS, 4*self.data_idx)
         
@@ -2377,7 +2038,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((4*self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2397,6 +2058,7 @@ class sequence:
         
         if params.sequence == 9: self.estimated_time = self.avecount * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2406,32 +2068,15 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             if params.average == 1:
                 if params.sequence == 9: self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 self.remaining_time_h = math.floor(self.remaining_time / (3600))
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -2440,7 +2085,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2461,6 +2106,7 @@ class sequence:
         if params.sequence == 10: self.estimated_time = self.avecount * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         if params.sequence == 11 or params.sequence == 12: self.estimated_time = self.avecount * ((100 + 4*params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2470,17 +2116,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             if params.average == 1:
                 if params.sequence == 10: self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 if params.sequence == 11 or params.sequence == 12: self.remaining_time = (self.estimated_time - n * ((100 + 4*params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -2488,15 +2124,8 @@ class sequence:
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -2505,7 +2134,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2525,6 +2154,7 @@ class sequence:
         
         self.estimated_time = self.avecount * ((100 + 2*params.flippulselength + params.SIR_TE*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2534,32 +2164,15 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             if params.average == 1:
                 self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.SIR_TE*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 self.remaining_time_h = math.floor(self.remaining_time / (3600))
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -2568,7 +2181,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2587,6 +2200,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,4*self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2596,15 +2210,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
         
             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.spectrumdata[n,self.data_idx:2*self.data_idx] = self.data[self.data_idx+self.sampledelay+self.EPIdelay:self.sampledelay+self.EPIdelay:-1]*params.RXscaling
@@ -2612,7 +2218,8 @@ class sequence:
             self.spectrumdata[n,3*self.data_idx:4*self.data_idx] = self.data[self.data_idx+self.sampledelay+3*self.EPIdelay:self.sampledelay+3*self.EPIdelay:-1]*params.RXscaling
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.TS, 4*self.data_idx)
         
@@ -2621,7 +2228,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((4*self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2640,6 +2247,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,4*self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2649,15 +2257,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
         
             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.spectrumdata[n,self.data_idx:2*self.data_idx] = self.data[self.data_idx+self.sampledelay+self.EPIdelay:self.sampledelay+self.EPIdelay:-1]*params.RXscaling
@@ -2665,7 +2265,8 @@ class sequence:
             self.spectrumdata[n,3*self.data_idx:4*self.data_idx] = self.data[self.data_idx+self.sampledelay+3*self.EPIdelay:self.sampledelay+3*self.EPIdelay:-1]*params.RXscaling
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.TS, 4*self.data_idx)
         
@@ -2674,7 +2275,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((4*self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2695,6 +2296,7 @@ class sequence:
         
         self.estimated_time = self.avecount * ((100 + 2*params.flippulselength + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2704,15 +2306,7 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
         
             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.spectrumdata[n,self.data_idx:2*self.data_idx] = -self.data[self.sampledelay+self.TEdelay:self.data_idx+self.sampledelay+self.TEdelay]*params.RXscaling
@@ -2725,15 +2319,8 @@ class sequence:
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
-                time.sleep(0.1)
+                schedule.wait('Averaging... ' + str(n+1) + '/' + str(self.avecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.TS, 4*self.data_idx)
         
@@ -2742,7 +2329,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((4*self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2760,6 +2347,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2769,20 +2357,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.flippulselength, self.data_idx)
 
@@ -2791,7 +2370,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2809,6 +2388,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2818,20 +2398,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 2*params.RFpulselength, self.data_idx)
 
@@ -2840,7 +2411,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2858,6 +2429,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2867,20 +2439,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 4*params.flippulselength, self.data_idx)
 
@@ -2889,7 +2452,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2907,6 +2470,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2916,20 +2480,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, 2*4*params.RFpulselength, self.data_idx)
 
@@ -2938,7 +2493,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -2956,6 +2511,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -2965,20 +2521,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -2987,7 +2534,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3006,6 +2553,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -3015,20 +2563,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3037,7 +2576,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3051,6 +2590,7 @@ class sequence:
         self.sampledelay = int(params.sampledelay * 250) #Filterdelay 350µs
         self.ax = 3
         
+        schedule = scheduler.start(params.TR)
         for m in range(params.projaxis.shape[0]):
             if params.projaxis[m] == 1:
                 self.ax = m
@@ -3072,6 +2612,7 @@ class sequence:
         
                 self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+                average_schedule = scheduler.start(params.TR)
                 for n in range(self.avecount):
                     print('Average: ',n+1,'/',self.avecount)
         
@@ -3081,20 +2622,11 @@ class sequence:
                         if not socket.waitForBytesWritten(): break
                         time.sleep(0.0001)
             
-                    while True:
-                        socket.waitForReadyRead()
-                        datasize = socket.bytesAvailable()
-                        time.sleep(0.0001)
-                        if datasize == 8*params.samples:
-                            print('Readout finished : ', int(datasize/8), 'Samples')
-                            self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                            break
-                        else: continue
-        
-                    self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+                    rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
                     
                     if params.average == 1:
-                        time.sleep(params.TR/1000)
+                        average_schedule.wait()
+                average_schedule.finish()
             
                 params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3103,9 +2635,10 @@ class sequence:
                 self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
                 self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
                 self.datatxt2 = np.transpose(self.datatxt1)
-                np.savetxt(params.datapath + '_' + str(m) + '.txt', self.datatxt2)
+                rawdata.save(params.datapath + '_' + str(m), self.datatxt2)
             
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3119,6 +2652,7 @@ class sequence:
         self.sampledelay = int(params.sampledelay * 250) #Filterdelay 350µs
         self.ax = 3
         
+        schedule = scheduler.start(params.TR)
         for m in range(params.projaxis.shape[0]):
             if params.projaxis[m] == 1:
                 self.ax = m
@@ -3140,6 +2674,7 @@ class sequence:
         
                 self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+                average_schedule = scheduler.start(params.TR)
                 for n in range(self.avecount):
                     print('Average: ',n+1,'/',self.avecount)
         
@@ -3149,20 +2684,11 @@ class sequence:
                         if not socket.waitForBytesWritten(): break
                         time.sleep(0.0001)
             
-                    while True:
-                        socket.waitForReadyRead()
-                        datasize = socket.bytesAvailable()
-                        time.sleep(0.0001)
-                        if datasize == 8*params.samples:
-                            print('Readout finished : ', int(datasize/8), 'Samples')
-                            self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                            break
-                        else: continue
-        
-                    self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+                    rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
                     
                     if params.average == 1:
-                        time.sleep(params.TR/1000)
+                        average_schedule.wait()
+                average_schedule.finish()
             
                 params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3171,9 +2697,10 @@ class sequence:
                 self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
                 self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
                 self.datatxt2 = np.transpose(self.datatxt1)
-                np.savetxt(params.datapath + '_' + str(m) + '.txt', self.datatxt2)
+                rawdata.save(params.datapath + '_' + str(m), self.datatxt2)
             
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3217,6 +2744,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -3226,20 +2754,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3248,7 +2767,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3292,6 +2811,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -3301,20 +2821,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3323,7 +2834,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3337,6 +2848,7 @@ class sequence:
         self.sampledelay = int(params.sampledelay * 250) #Filterdelay 350µs
         self.ax = 3
         
+        schedule = scheduler.start(params.TR)
         for m in range(params.projaxis.shape[0]):
             if params.projaxis[m] == 1:
                 self.ax = m
@@ -3358,6 +2870,7 @@ class sequence:
         
                 self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+                average_schedule = scheduler.start(params.TR)
                 for n in range(self.avecount):
                     print('Average: ',n+1,'/',self.avecount)
         
@@ -3367,20 +2880,11 @@ class sequence:
                         if not socket.waitForBytesWritten(): break
                         time.sleep(0.0001)
             
-                    while True:
-                        socket.waitForReadyRead()
-                        datasize = socket.bytesAvailable()
-                        time.sleep(0.0001)
-                        if datasize == 8*params.samples:
-                            print('Readout finished : ', int(datasize/8), 'Samples')
-                            self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                            break
-                        else: continue
-        
-                    self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+                    rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
                     
                     if params.average == 1:
-                        time.sleep(params.TR/1000)
+                        average_schedule.wait()
+                average_schedule.finish()
             
                 params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3389,9 +2893,10 @@ class sequence:
                 self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
                 self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
                 self.datatxt2 = np.transpose(self.datatxt1)
-                np.savetxt(params.datapath + '_' + str(m) + '.txt', self.datatxt2)
+                rawdata.save(params.datapath + '_' + str(m), self.datatxt2)
             
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3405,6 +2910,7 @@ class sequence:
         self.sampledelay = int(params.sampledelay * 250) #Filterdelay 350µs
         self.ax = 3
         
+        schedule = scheduler.start(params.TR)
         for m in range(params.projaxis.shape[0]):
             if params.projaxis[m] == 1:
                 self.ax = m
@@ -3426,6 +2932,7 @@ class sequence:
         
                 self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+                average_schedule = scheduler.start(params.TR)
                 for n in range(self.avecount):
                     print('Average: ',n+1,'/',self.avecount)
         
@@ -3435,20 +2942,11 @@ class sequence:
                         if not socket.waitForBytesWritten(): break
                         time.sleep(0.0001)
             
-                    while True:
-                        socket.waitForReadyRead()
-                        datasize = socket.bytesAvailable()
-                        time.sleep(0.0001)
-                        if datasize == 8*params.samples:
-                            print('Readout finished : ', int(datasize/8), 'Samples')
-                            self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                            break
-                        else: continue
-        
-                    self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+                    rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
                     
                     if params.average == 1:
-                        time.sleep(params.TR/1000)
+                        average_schedule.wait()
+                average_schedule.finish()
             
                 params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3457,9 +2955,10 @@ class sequence:
                 self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
                 self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
                 self.datatxt2 = np.transpose(self.datatxt1)
-                np.savetxt(params.datapath + '_' + str(m) + '.txt', self.datatxt2)
+                rawdata.save(params.datapath + '_' + str(m), self.datatxt2)
             
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3503,6 +3002,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -3512,20 +3012,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3534,7 +3025,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3578,6 +3069,7 @@ class sequence:
         
         self.spectrumdata = np.matrix(np.zeros((self.avecount,self.data_idx), dtype = np.complex64))
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.avecount):
             print('Average: ',n+1,'/',self.avecount)
         
@@ -3587,20 +3079,11 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-        
-            self.spectrumdata[n,:] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.spectrumdata[n,:], start=self.sampledelay, stop=self.data_idx+self.sampledelay, scale=params.RXscaling)
             
             if params.average == 1:
-                time.sleep(params.TR/1000)
+                schedule.wait()
+        schedule.finish()
             
         params.timeaxis = np.linspace(0, params.TS, self.data_idx)
         
@@ -3609,7 +3092,7 @@ class sequence:
         self.datatxt1[1:self.avecount+1,:] = self.spectrumdata[:,:]
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,self.avecount+1), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
         timestamp = datetime.now() 
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3634,18 +3117,12 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspace)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspace[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspace[n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
+            preview.line(n)
             
             if params.GUImode == 1 and (params.sequence == 4 or params.sequence == 15): self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             if params.GUImode == 1 and params.sequence == 7: self.remaining_time = (self.estimated_time - n * ((100 + params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -3656,15 +3133,12 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            text = ''
+            if params.GUImode == 1: text = 'Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            schedule.wait(text)
+        schedule.finish()
+        preview.finish()
             
         params.kspace = self.kspace
         
@@ -3672,7 +3146,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3697,18 +3171,12 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspace)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspace[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspace[n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
+            preview.line(n)
             
             if params.GUImode == 1 and (params.sequence == 5 or params.sequence == 16): self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             if params.GUImode == 1 and params.sequence == 8: self.remaining_time = (self.estimated_time - n * ((100 + params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -3720,15 +3188,12 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            text = ''
+            if params.GUImode == 1: text = 'Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            schedule.wait(text)
+        schedule.finish()
+        preview.finish()
             
         params.kspace = self.kspace
         
@@ -3736,7 +3201,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3759,32 +3224,18 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspacetemp[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspacetemp[n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
             
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         for n in range(int(params.nPE/2)):
             self.kspace[n,:] = self.kspacetemp[2*n,:]
@@ -3798,7 +3249,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3822,18 +3273,12 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspace)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspace[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspace[n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
+            preview.line(n)
             
             if params.GUImode == 1 and params.sequence == 21: self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             if params.GUImode == 1 and params.sequence == 24: self.remaining_time = (self.estimated_time - n * ((100 + 4*params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -3843,15 +3288,12 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            text = ''
+            if params.GUImode == 1: text = 'Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            schedule.wait(text)
+        schedule.finish()
+        preview.finish()
             
         params.kspace = self.kspace
         
@@ -3859,7 +3301,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3883,18 +3325,12 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspace)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspace[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspace[n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
+            preview.line(n)
             
             if params.GUImode == 1 and (params.sequence == 22 or params.sequence == 23): self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             if params.GUImode == 1 and params.sequence == 25: self.remaining_time = (self.estimated_time - n * ((100 + 4*params.RFpulselength + params.TI*1000 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -3904,15 +3340,12 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            text = ''
+            if params.GUImode == 1: text = 'Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE + n+1) + '/' + str(params.motor_image_count*params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            schedule.wait(text)
+        schedule.finish()
+        preview.finish()
             
         params.kspace = self.kspace
         
@@ -3920,7 +3353,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -3943,32 +3376,18 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspacetemp[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspacetemp[n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
             
             self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.nPE) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         for n in range(int(params.nPE/2)):
             self.kspace[n,:] = self.kspacetemp[2*n,:]
@@ -3982,7 +3401,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -4006,18 +3425,10 @@ class sequence:
             time.sleep(0.0001)
                 
         for m in range(params.SPEsteps):    
+            schedule = scheduler.start(params.TR)
             for n in range(params.nPE):
                 print(n+1+m*params.nPE,'/',params.nPE*params.SPEsteps)
-                while True:
-                    socket.waitForReadyRead()
-                    datasize = socket.bytesAvailable()
-                    time.sleep(0.0001)
-                    if datasize == 8*params.samples:
-                        print('Readout finished : ',int(datasize/8), 'Samples')
-                        self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                        break
-                    else: continue
-                self.kspace[m,n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+                rx.read_frame(out=self.kspace[m,n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
             
                 if params.GUImode == 1 and params.sequence == 35: self.remaining_time = (self.estimated_time - (n+m*params.nPE) * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
                 if params.GUImode == 5 and params.sequence == 10: self.remaining_time = (self.estimated_time - params.motor_current_image_count*params.motor_settling_time*1000 - params.motor_current_image_count * params.nPE * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR) - (n+m*params.nPE) * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -4025,15 +3436,11 @@ class sequence:
                 self.remaining_time_min = math.floor(self.remaining_time / 60)
                 self.remaining_time_s = int(self.remaining_time % 60)
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1+m*params.nPE) + '/' + str(params.nPE*params.SPEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE*params.SPEsteps + n+1+m*params.nPE) + '/' + str(params.motor_image_count*params.nPE*params.SPEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
+                text = ''
+                if params.GUImode == 1: text = 'Measuring... ' + str(n+1+m*params.nPE) + '/' + str(params.nPE*params.SPEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+                if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*params.nPE*params.SPEsteps + n+1+m*params.nPE) + '/' + str(params.motor_image_count*params.nPE*params.SPEsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+                schedule.wait(text)
+            schedule.finish()
                 
         params.kspace = self.kspace
         
@@ -4042,7 +3449,7 @@ class sequence:
         self.datatxt2 = np.matrix(np.zeros((self.data_idx, params.nPE * params.SPEsteps), dtype = np.complex64))
         for m in range(params.SPEsteps):
             self.datatxt2[:,m*params.nPE:m*params.nPE+params.nPE] = np.transpose(self.datatxt1[m,:,:])
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         
         timestamp = datetime.now()
@@ -4070,30 +3477,17 @@ class sequence:
             time.sleep(0.0001)
                 
         for m in range(params.SPEsteps):    
+            schedule = scheduler.start(params.TR)
             for n in range(self.nsteps):
                 print(n+1+m*self.nsteps,'/',self.nsteps*params.SPEsteps)
-                while True:
-                    socket.waitForReadyRead()
-                    datasize = socket.bytesAvailable()
-                    time.sleep(0.0001)
-                    if datasize == 8*params.samples:
-                        print('Readout finished : ',int(datasize/8), 'Samples')
-                        self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                        break
-                    else: continue
+                self.data = rx.read_frame()
                 self.kspacetemp[n, :] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
                 self.kspacetemp[n+self.nsteps, :] = -self.data[self.sampledelay+self.TEdelay:self.data_idx+self.sampledelay+self.TEdelay]*params.RXscaling
                 self.kspacetemp[n+2*self.nsteps, :] = self.data[self.sampledelay+2*self.TEdelay:self.data_idx+self.sampledelay+2*self.TEdelay]*params.RXscaling
                 self.kspacetemp[n+3*self.nsteps, :] = -self.data[self.sampledelay+3*self.TEdelay:self.data_idx+self.sampledelay+3*self.TEdelay]*params.RXscaling
                 
-                if params.measurement_time_dialog == 1:
-                    msg_box = QMessageBox()
-                    msg_box.setText('Measuring... ' + str(n+1+m*self.nsteps) + '/' + str(self.nsteps*params.SPEsteps))
-                    msg_box.setStandardButtons(QMessageBox.Ok)
-                    msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                    msg_box.button(QMessageBox.Ok).hide()
-                    msg_box.exec()
-                else: time.sleep((params.TR-100)/1000)
+                schedule.wait('Measuring... ' + str(n+1+m*self.nsteps) + '/' + str(self.nsteps*params.SPEsteps))
+            schedule.finish()
             
             self.kspace[m,0:int(self.nsteps/2), :] = self.kspacetemp[int(3*self.nsteps):int(3*self.nsteps+self.nsteps/2), :]
             self.kspace[m,int(self.nsteps/2):int(self.nsteps), :] = self.kspacetemp[int(2*self.nsteps):int(2*self.nsteps+self.nsteps/2), :]
@@ -4110,13 +3504,26 @@ class sequence:
         self.datatxt2 = np.matrix(np.zeros((self.data_idx, params.nPE * params.SPEsteps), dtype = np.complex64))
         for m in range(params.SPEsteps):
             self.datatxt2[:,m*params.nPE:m*params.nPE+params.nPE] = np.transpose(self.datatxt1[m,:,:])
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
         
         print('Image acquired!')
         
+    def TSE_order(self):
+        # Echo train lines (kspacetemp) of each k-space line and their sign
+        half = int(self.nsteps/2)
+        index = np.concatenate((np.arange(3*self.nsteps, 3*self.nsteps+half), np.arange(2*self.nsteps, 2*self.nsteps+half), \
+                                np.arange(self.nsteps, self.nsteps+half), np.arange(0, self.nsteps), np.arange(self.nsteps+half, 2*self.nsteps), \
+                                np.arange(2*self.nsteps+half, 3*self.nsteps), np.arange(3*self.nsteps+half, 4*self.nsteps)))
+        sign = np.ones(len(index), dtype=np.float32)
+        sign[0:half] = -1
+        sign[self.nsteps:self.nsteps+half] = -1
+        sign[2*self.nsteps+half:3*self.nsteps] = -1
+        sign[3*self.nsteps+half:4*self.nsteps] = -1
+        return index, sign
+
     def acquire_image_TSE(self):
         print('Acquire image...')
 
@@ -4139,21 +3546,16 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspacetemp, self.TSE_order())
+        schedule = scheduler.start(params.TR)
         for n in range(self.nsteps):
             print(n+1,'/',self.nsteps)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
             self.kspacetemp[n, :] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.kspacetemp[n+self.nsteps, :] = self.data[self.sampledelay+self.TEdelay:self.data_idx+self.sampledelay+self.TEdelay]*params.RXscaling
             self.kspacetemp[n+2*self.nsteps, :] = self.data[self.sampledelay+2*self.TEdelay:self.data_idx+self.sampledelay+2*self.TEdelay]*params.RXscaling
             self.kspacetemp[n+3*self.nsteps, :] = self.data[self.sampledelay+3*self.TEdelay:self.data_idx+self.sampledelay+3*self.TEdelay]*params.RXscaling
+            preview.line(n, n+self.nsteps, n+2*self.nsteps, n+3*self.nsteps)
             
             if params.GUImode == 1 and params.sequence == 11: self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             if params.GUImode == 5 and params.sequence == 4: self.remaining_time = (self.estimated_time - params.motor_current_image_count*params.motor_settling_time*1000 - params.motor_current_image_count * params.nPE * ((100 + params.flippulselength/2 + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR) - n * ((100 + params.flippulselength/2 + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -4161,23 +3563,15 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*self.nsteps + n+1) + '/' + str(arams.motor_image_count*self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            
-        self.kspace[0:int(self.nsteps/2), :] = -self.kspacetemp[int(3*self.nsteps):int(3*self.nsteps+self.nsteps/2), :]
-        self.kspace[int(self.nsteps/2):int(self.nsteps), :] = self.kspacetemp[int(2*self.nsteps):int(2*self.nsteps+self.nsteps/2), :]
-        self.kspace[int(self.nsteps):int(self.nsteps+self.nsteps/2), :] = -self.kspacetemp[int(self.nsteps):int(self.nsteps+self.nsteps/2), :]
-        self.kspace[int(self.nsteps+self.nsteps/2):int(2*self.nsteps+self.nsteps/2), :] = self.kspacetemp[0:self.nsteps, :]
-        self.kspace[int(2*self.nsteps+self.nsteps/2):int(3*self.nsteps), :] = -self.kspacetemp[int(self.nsteps+self.nsteps/2):int(2*self.nsteps), :]
-        self.kspace[int(3*self.nsteps):int(3*self.nsteps+self.nsteps/2), :] = self.kspacetemp[int(2*self.nsteps+self.nsteps/2):int(3*self.nsteps), :]
-        self.kspace[int(3*self.nsteps+self.nsteps/2):int(4*self.nsteps), :] = -self.kspacetemp[int(3*self.nsteps+self.nsteps/2):int(4*self.nsteps), :]
+            text = ''
+            if params.GUImode == 1: text = 'Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*self.nsteps + n+1) + '/' + str(arams.motor_image_count*self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            schedule.wait(text)
+        schedule.finish()
+        preview.finish()
+            
+        index, sign = self.TSE_order()
+        self.kspace[0:len(index), :] = np.multiply(self.kspacetemp[index], sign.reshape(-1, 1))
      
         params.kspace = self.kspace
         
@@ -4185,7 +3579,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
 #         self.datatxt1 = np.matrix(np.zeros((params.nPE,10000), dtype = np.complex64))
 #         self.datatxt1 = self.kspace2
@@ -4217,21 +3611,16 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspacetemp, self.TSE_order())
+        schedule = scheduler.start(params.TR)
         for n in range(self.nsteps):
             print(n+1,'/',self.nsteps)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
             self.kspacetemp[n, :] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.kspacetemp[n+self.nsteps, :] = self.data[self.sampledelay+self.TEdelay:self.data_idx+self.sampledelay+self.TEdelay]*params.RXscaling
             self.kspacetemp[n+2*self.nsteps, :] = self.data[self.sampledelay+2*self.TEdelay:self.data_idx+self.sampledelay+2*self.TEdelay]*params.RXscaling
             self.kspacetemp[n+3*self.nsteps, :] = self.data[self.sampledelay+3*self.TEdelay:self.data_idx+self.sampledelay+3*self.TEdelay]*params.RXscaling
+            preview.line(n, n+self.nsteps, n+2*self.nsteps, n+3*self.nsteps)
             
             if params.GUImode == 1 and params.sequence == 28: self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             if params.GUImode == 5 and params.sequence == 9: self.remaining_time = (self.estimated_time - params.motor_current_image_count*params.motor_settling_time*1000 - params.motor_current_image_count * params.nPE * ((100 + 2*params.flippulselength + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR) - n * ((100 + 2*params.flippulselength + 4*params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -4239,23 +3628,15 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                if params.GUImode == 1: msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                if params.GUImode == 5: msg_box.setText('Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*self.nsteps + n+1) + '/' + str(params.motor_image_count*self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-
-        self.kspace[0:int(self.nsteps/2), :] = -self.kspacetemp[int(3*self.nsteps):int(3*self.nsteps+self.nsteps/2), :]
-        self.kspace[int(self.nsteps/2):int(self.nsteps), :] = self.kspacetemp[int(2*self.nsteps):int(2*self.nsteps+self.nsteps/2), :]
-        self.kspace[int(self.nsteps):int(self.nsteps+self.nsteps/2), :] = -self.kspacetemp[int(self.nsteps):int(self.nsteps+self.nsteps/2), :]
-        self.kspace[int(self.nsteps+self.nsteps/2):int(2*self.nsteps+self.nsteps/2), :] = self.kspacetemp[0:self.nsteps, :]
-        self.kspace[int(2*self.nsteps+self.nsteps/2):int(3*self.nsteps), :] = -self.kspacetemp[int(self.nsteps+self.nsteps/2):int(2*self.nsteps), :]
-        self.kspace[int(3*self.nsteps):int(3*self.nsteps+self.nsteps/2), :] = self.kspacetemp[int(2*self.nsteps+self.nsteps/2):int(3*self.nsteps), :]
-        self.kspace[int(3*self.nsteps+self.nsteps/2):int(4*self.nsteps), :] = -self.kspacetemp[int(3*self.nsteps+self.nsteps/2):int(4*self.nsteps), :]
+            text = ''
+            if params.GUImode == 1: text = 'Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            if params.GUImode == 5: text = 'Position: ' + str(params.motor_current_image_count+1) + '/' + str(params.motor_image_count) + '\nMeasuring... ' + str(params.motor_current_image_count*self.nsteps + n+1) + '/' + str(params.motor_image_count*self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's'
+            schedule.wait(text)
+        schedule.finish()
+        preview.finish()
+
+        index, sign = self.TSE_order()
+        self.kspace[0:len(index), :] = np.multiply(self.kspacetemp[index], sign.reshape(-1, 1))
             
         params.kspace = self.kspace
         
@@ -4263,7 +3644,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
 #         self.datatxt1 = np.matrix(np.zeros((params.nPE,10000), dtype = np.complex64))
 #         self.datatxt1 = self.kspace2
@@ -4301,21 +3682,16 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        preview.start(self.kspace)
+        schedule = scheduler.start(params.TR)
         for n in range(self.nsteps):
             print(n+1,'/',self.nsteps)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
             self.kspace[n*4, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
             self.kspace[n*4+1, :] = -self.data[self.data_idx + self.sampledelay2 : self.sampledelay2 : -1]*params.RXscaling
             self.kspace[n*4+2, :] = self.data[self.sampledelay3 : self.data_idx + self.sampledelay3]*params.RXscaling
             self.kspace[n*4+3, :] = -self.data[self.data_idx + self.sampledelay4 : self.sampledelay4 : -1]*params.RXscaling
+            preview.line(n*4, n*4+1, n*4+2, n*4+3)
                 
             self.kspace2[n, :] = self.data[0:10000]
             
@@ -4325,14 +3701,9 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
+        preview.finish()
 
         params.kspace = self.kspace
         
@@ -4340,7 +3711,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
 #         self.datatxt1 = np.matrix(np.zeros((params.nPE,10000), dtype = np.complex64))
 #         self.datatxt1 = self.kspace2
@@ -4374,17 +3745,10 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(self.nsteps):
             print(n+1,'/',self.nsteps)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
             self.kspace[n*4, :] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
             self.kspace[n*4+1, :] = -self.data[self.data_idx+self.sampledelay+self.EPIdelay:self.sampledelay+self.EPIdelay:-1]*params.RXscaling
             self.kspace[n*4+2, :] = self.data[self.sampledelay+2*self.EPIdelay:self.data_idx+self.sampledelay+2*self.EPIdelay]*params.RXscaling
@@ -4396,14 +3760,8 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.nsteps) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
 #             self.spectrumdata[n,0:self.data_idx] = self.data[self.sampledelay:self.data_idx+self.sampledelay]*params.RXscaling
 #             self.spectrumdata[n,self.data_idx:2*self.data_idx] = self.data[self.data_idx+self.sampledelay+self.EPIdelay:self.sampledelay+self.EPIdelay:-1]*params.RXscaling
@@ -4418,7 +3776,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
             
 #         self.datatxt1 = np.matrix(np.zeros((params.nPE,10000), dtype = np.complex64))
 #         self.datatxt1 = self.kspace2
@@ -4445,17 +3803,10 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE*2)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
             self.kspace[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]
             
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -4463,46 +3814,26 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
                 
         socket.write(struct.pack('<IIIIIIIIII', params.imageorientation << 16 | 13, params.flippulseamplitude, params.flippulselength << 16 | params.RFpulselength, params.frequencyoffset, params.frequencyoffsetsign << 16 | params.phaseoffsetradmod100, params.spoileramplitude << 16 | params.crusheramplitude, params.Gdiffamplitude, params.GPEstep, params.GROamplitude << 16 | params.nPE, params.TR))
 
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1+params.nPE,'/',params.nPE*2)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspace[params.nPE+n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspace[params.nPE+n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
             
             self.remaining_time = (self.estimated_time - (n + params.nPE) * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1+params.nPE) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1+params.nPE) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.kspace = self.kspace
         
@@ -4510,7 +3841,7 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -4531,17 +3862,10 @@ class sequence:
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1,'/',params.nPE*2)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
             self.kspace[n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]
             
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
@@ -4549,46 +3873,26 @@ class sequence:
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
                 
         socket.write(struct.pack('<IIIIIIIIII', params.imageorientation << 16 | 41, params.flippulseamplitude, params.flippulselength << 16 | params.RFpulselength, params.frequencyoffset, params.frequencyoffsetsign << 16 | params.phaseoffsetradmod100, params.Gdiffamplitude, params.spoileramplitude << 16 | params.crusheramplitude, params.GSamplitude << 16 | params.GPEstep, params.GROamplitude << 16 | params.nPE, params.TR))
 
         while(True):
             if not socket.waitForBytesWritten(): break
             time.sleep(0.0001)
+        schedule = scheduler.start(params.TR)
         for n in range(params.nPE):
             print(n+1+params.nPE,'/',params.nPE*2)
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ',int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
-            self.kspace[params.nPE+n, :] = self.data[self.sampledelay : self.data_idx + self.sampledelay]*params.RXscaling
+            rx.read_frame(out=self.kspace[params.nPE+n, :], start=self.sampledelay, stop=self.data_idx + self.sampledelay, scale=params.RXscaling)
             
             self.remaining_time = (self.estimated_time - (n + params.nPE) * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1+params.nPE) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
+            schedule.wait('Measuring... ' + str(n+1+params.nPE) + '/' + str(params.nPE*2) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
             
         params.kspace = self.kspace
         
@@ -4596,13 +3900,27 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((self.data_idx,params.nPE), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
         
         print('Image acquired!')
         
+    def radial_store(self, n, half):
+        # Samples of the last readout as raw spoke n, and placed at the nearest pixels of the Cartesian k-space
+        samples = int(params.nPE*params.radialosfactor)
+        self.spokes[n, :] = self.data[(self.sampledelay + np.arange(samples)*self.kspacestep).astype(int)]*params.RXscaling
+        angle = self.radialangleradmod100/100
+        m = np.arange(samples, dtype = np.float64)
+        if half:
+            center = params.nPE*params.radialosfactor
+            r = m
+        else:
+            center = params.nPE/2*params.radialosfactor
+            r = m - center
+        self.kspace[(center + math.sin(angle)*r).astype(int), (center + math.cos(angle)*r).astype(int)] = self.spokes[n, :]
+
     def acquire_image_radial_f_GRE(self):
         print('Acquire image...')
 
@@ -4632,9 +3950,11 @@ class sequence:
             self.GRO2 = params.Gproj[2]
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -4645,33 +3965,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE/2*params.radialosfactor + math.sin(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor)), int(params.nPE/2*params.radialosfactor + math.cos(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor))] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=False)
             
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
         
         params.kspace = self.kspace
         
@@ -4679,7 +3983,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((params.nPE*params.radialosfactor, params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': False})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -4715,9 +4021,11 @@ class sequence:
             self.GRO2 = params.Gproj[2]
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -4728,33 +4036,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE/2*params.radialosfactor + math.sin(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor)), int(params.nPE/2*params.radialosfactor + math.cos(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor))] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=False)
                         
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
         
         params.kspace = self.kspace
         
@@ -4762,7 +4054,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((params.nPE*params.radialosfactor, params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': False})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -4798,9 +4092,11 @@ class sequence:
             self.GRO2 = int(params.Gproj[2]/2)
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -4811,33 +4107,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE*params.radialosfactor + math.sin(self.radialangleradmod100/100)*m), int(params.nPE*params.radialosfactor + math.cos(self.radialangleradmod100/100)*m)] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=True)
             
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
         
         params.kspace = self.kspace
         
@@ -4845,7 +4125,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((2*params.nPE*params.radialosfactor, 2*params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': True})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -4881,9 +4163,11 @@ class sequence:
             self.GRO2 = int(params.Gproj[2]/2)
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -4894,33 +4178,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE*params.radialosfactor + math.sin(self.radialangleradmod100/100)*m), int(params.nPE*params.radialosfactor + math.cos(self.radialangleradmod100/100)*m)] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=True)
             
             self.remaining_time = (self.estimated_time - n * ((100 + params.flippulselength/2 + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
 
         params.kspace = self.kspace
         
@@ -4928,7 +4196,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((2*params.nPE*params.radialosfactor, 2*params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': True})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -4964,9 +4234,11 @@ class sequence:
             self.GRO2 = params.Gproj[2]
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
 
         self.estimated_time = self.radialanglecount * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -4977,33 +4249,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE/2*params.radialosfactor + math.sin(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor)), int(params.nPE/2*params.radialosfactor + math.cos(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor))] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=False)
             
             self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
         
         params.kspace = self.kspace
         
@@ -5011,7 +4267,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((params.nPE*params.radialosfactor, params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': False})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -5047,9 +4305,11 @@ class sequence:
             self.GRO2 = params.Gproj[2]
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -5060,33 +4320,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE/2*params.radialosfactor + math.sin(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor)), int(params.nPE/2*params.radialosfactor + math.cos(self.radialangleradmod100/100)*(m-params.nPE/2*params.radialosfactor))] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=False)
             
             self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
         
         params.kspace = self.kspace
         
@@ -5094,7 +4338,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((params.nPE*params.radialosfactor, params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': False})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -5130,9 +4376,11 @@ class sequence:
             self.GRO2 = int(params.Gproj[2]/2)        
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
 
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -5143,33 +4391,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE*params.radialosfactor + math.sin(self.radialangleradmod100/100)*m), int(params.nPE*params.radialosfactor + math.cos(self.radialangleradmod100/100)*m)] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=True)
             
             self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
         
         params.kspace = self.kspace
         
@@ -5177,7 +4409,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((2*params.nPE*params.radialosfactor, 2*params.nPE*params.radialosfactor), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': True})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
@@ -5213,9 +4447,11 @@ class sequence:
             self.GRO2 = int(params.Gproj[2]/2)
         
         self.radialanglecount = self.radialangles.shape[0]
+        self.spokes = np.zeros((self.radialanglecount, int(params.nPE*params.radialosfactor)), dtype = np.complex64)
         
         self.estimated_time = self.radialanglecount * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)
         
+        schedule = scheduler.start(params.TR)
         for n in range(self.radialanglecount):
             print(n+1,'/',self.radialanglecount)
             self.radialangleradmod100 = int((math.radians(self.radialangles[n]) % (2*np.pi))*100)
@@ -5226,33 +4462,17 @@ class sequence:
                 if not socket.waitForBytesWritten(): break
                 time.sleep(0.0001)
             
-            while True:
-                socket.waitForReadyRead()
-                datasize = socket.bytesAvailable()
-                time.sleep(0.0001)
-                if datasize == 8*params.samples:
-                    print('Readout finished : ', int(datasize/8), 'Samples')
-                    self.buffer[0:8*params.samples] = socket.read(8*params.samples)
-                    break
-                else: continue
+            self.data = rx.read_frame()
                 
-            for m in range(params.nPE*params.radialosfactor):
-                self.kspace[int(params.nPE*params.radialosfactor + math.sin(self.radialangleradmod100/100)*m), int(params.nPE*params.radialosfactor + math.cos(self.radialangleradmod100/100)*m)] = self.data[int(self.sampledelay + m*self.kspacestep)]*params.RXscaling
+            self.radial_store(n, half=True)
             
             self.remaining_time = (self.estimated_time - n * ((100 + 2*params.flippulselength + params.TE*1000 + (params.TS*1000)/2 + 400 + params.spoilertime) / 1000 + params.TR)) / 1000
             self.remaining_time_h = math.floor(self.remaining_time / (3600))
             self.remaining_time_min = math.floor(self.remaining_time / 60)
             self.remaining_time_s = int(self.remaining_time % 60)
             
-            if params.measurement_time_dialog == 1:
-                msg_box = QMessageBox()
-                msg_box.setText('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
-                msg_box.setStandardButtons(QMessageBox.Ok)
-                msg_box.button(QMessageBox.Ok).animateClick(params.TR-100)
-                msg_box.button(QMessageBox.Ok).hide()
-                msg_box.exec()
-            else: time.sleep((params.TR-100)/1000)
-            time.sleep(0.1)
+            schedule.wait('Measuring... ' + str(n+1) + '/' + str(self.radialanglecount) + '\nRemaining time: ' + str(self.remaining_time_h) + 'h' + str(self.remaining_time_min) + 'min' + str(self.remaining_time_s) + 's')
+        schedule.finish()
 
         params.kspace = self.kspace
         
@@ -5260,7 +4480,9 @@ class sequence:
         self.datatxt1 = params.kspace
         self.datatxt2 = np.matrix(np.zeros((2*self.data_idx,2*self.data_idx), dtype = np.complex64))
         self.datatxt2 = np.transpose(self.datatxt1)
-        np.savetxt(params.datapath + '.txt', self.datatxt2)
+        rawdata.save(params.datapath, self.datatxt2)
+        rawdata.save(params.datapath + '_Spokes', self.spokes, {'nPE': params.nPE, 'radialosfactor': params.radialosfactor, \
+                                                              'radialanglestep': params.radialanglestep, 'half': True})
         
         timestamp = datetime.now()
         params.dataTimestamp = timestamp.strftime('%m/%d/%Y, %H:%M:%S')
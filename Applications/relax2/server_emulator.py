@@ -0,0 +1,342 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Stand-in for server/relax_server_dev.c
+#   Speaks the relax2 command protocol (10 x uint32 command words) on port 1001
+#   and answers every readout with 50000 complex64 samples, sent in 10 chunks of
+#   5000*8 bytes like the Red Pitaya server. The signal is simulated from a
+#   phantom with M0/T1/T2/B0 maps.
+#
+#   Usage: python3 server_emulator.py [--mode fast|accurate] [--port 1001]
+#
+#   Timing that is not part of the command words (TE, TI, TS, sample delay,
+#   spectroscopy TR) is taken from the emulator settings.
+#
+################################################################################
+
+import argparse
+import socket as pysocket
+import struct
+import threading
+import time
+
+import numpy as np
+
+
+# Opcodes with one frame per phase encoding step, npe in word 8 and TR in word 9
+IMAGE_2D = (8, 9, 10, 11, 13, 21, 22, 23, 24, 34, 35, 41)
+# 3D slab opcodes and the command word holding the slice phase steps (<< 16)
+IMAGE_3D = {12: 6, 32: 5}
+# Gradient echo imaging opcodes, the other imaging opcodes are spin echo based
+GRADIENT_ECHO = (8, 10, 24)
+# Single frame opcodes sampling a spin echo, everything else samples a FID
+ECHO = (15, 17, 19, 26, 27, 29, 30, 37, 39)
+# Axis projections (axis in word 0 << 16) and angled projections (angle word)
+PROJECTION = (16, 17, 36, 37)
+PROJECTION_ANGLE = {30: 7, 31: 8, 38: 8, 39: 7}
+
+
+class phantom:
+    def __init__(self, M0, T1, T2, B0):
+        self.M0 = np.asarray(M0, dtype=np.float64)
+        self.T1 = np.asarray(T1, dtype=np.float64)
+        self.T2 = np.asarray(T2, dtype=np.float64)
+        self.B0 = np.asarray(B0, dtype=np.float64)
+
+        self.shape = self.M0.shape
+        y, x = np.indices(self.shape)
+        self.x = (x - self.shape[1] / 2) / (self.shape[1] / 2)
+        self.y = (y - self.shape[0] / 2) / (self.shape[0] / 2)
+
+    @classmethod
+    def default(cls, size=64):
+        # Two compartments in a cylinder with a linear B0 offset along x
+        y, x = np.indices((size, size))
+        r = np.sqrt((x - size / 2) ** 2 + (y - size / 2) ** 2) / (size / 2)
+        r2 = np.sqrt((x - size * 0.62) ** 2 + (y - size * 0.45) ** 2) / (size / 2)
+
+        M0 = np.where(r < 0.8, 1.0, 0.0)
+        T1 = np.where(r < 0.8, 300.0, 1.0)
+        T2 = np.where(r < 0.8, 80.0, 1.0)
+        M0[r2 < 0.25] = 0.7
+        T1[r2 < 0.25] = 1500.0
+        T2[r2 < 0.25] = 400.0
+        B0 = np.where(r < 0.8, 20.0 * (x - size / 2) / (size / 2), 0.0)
+
+        return cls(M0, T1, T2, B0)
+
+    @classmethod
+    def load(cls, path):
+        # .npz file with M0, T1 [ms], T2 [ms] and B0 [Hz] arrays of equal shape
+        maps = np.load(path)
+        return cls(maps['M0'], maps['T1'], maps['T2'], maps['B0'])
+
+
+class server_emulator:
+    def __init__(self, model=None, host='127.0.0.1', port=1001, mode='fast', \
+                 TS=6, sampledelay=0.344, TE=12, TI=None, TR=500, noise=1e-5, amplitude=1e-3, \
+                 larmor=None, reference_attenuation=-15.0, shimsens=0.05):
+        self.phantom = model if model is not None else phantom.default()
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.TS = TS
+        self.sampledelay = sampledelay
+        self.TE = TE
+        self.TI = TI
+        self.TR = TR
+        self.noise = noise
+        self.amplitude = amplitude
+        self.larmor = larmor
+        self.reference_attenuation = reference_attenuation
+        self.shimsens = shimsens
+
+        self.samples = 50000
+        self.chunk = 5000
+        self.samplerate = 250000
+
+        self.rxmode = 1
+        self.frequency = 0
+        self.attenuation = abs(reference_attenuation)
+        self.shims = [0, 0, 0, 0]
+        self.program = b''
+
+        self.rng = np.random.default_rng()
+        self.cache = {}
+        self.server = None
+        self.running = False
+
+    def start(self):
+        # Serve in a background thread, e.g. for benchmarks in the same process
+        self.server = pysocket.socket(pysocket.AF_INET, pysocket.SOCK_STREAM)
+        self.server.setsockopt(pysocket.SOL_SOCKET, pysocket.SO_REUSEADDR, 1)
+        self.server.bind((self.host, self.port))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.running = True
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        self.running = False
+        try: self.server.close()
+        except: pass
+
+    def serve_forever(self):
+        if self.server is None:
+            self.server = pysocket.socket(pysocket.AF_INET, pysocket.SOCK_STREAM)
+            self.server.setsockopt(pysocket.SOL_SOCKET, pysocket.SO_REUSEADDR, 1)
+            self.server.bind((self.host, self.port))
+            self.server.listen(1)
+            self.running = True
+        print('Listening on ' + self.host + ':' + str(self.port) + ' (' + self.mode + ' mode)...')
+        while self.running:
+            try: conn, addr = self.server.accept()
+            except OSError: break
+            print('Accepted client!')
+            conn.setsockopt(pysocket.IPPROTO_TCP, pysocket.TCP_NODELAY, 1)
+            try: self.handle(conn)
+            except (ConnectionError, OSError) as e: print('Connection closed:', e)
+            conn.close()
+
+    def recv_command(self, conn):
+        buf = bytearray(40)
+        view = memoryview(buf)
+        n = 0
+        while n < 40:
+            r = conn.recv_into(view[n:], 40 - n)
+            if r == 0: return None
+            n += r
+        return struct.unpack('<IIIIIIIIII', buf)
+
+    def handle(self, conn):
+        while True:
+            words = self.recv_command(conn)
+            if words is None: break
+            self.command(conn, words)
+
+    def command(self, conn, words):
+        trig = words[0] & 0xffff
+
+        if trig == 1:
+            self.rxmode = words[9] & 0x3
+            print('Set RX mode:', self.rxmode)
+        elif trig == 2:
+            self.frequency = words[9]
+            print('Setting frequency to %.4f MHz' % (self.frequency / 1e6))
+        elif trig == 3:
+            self.attenuation = min(words[9], 127) * 0.25
+            print('Setting attenuation to %.2f dB' % self.attenuation)
+        elif trig == 4:
+            self.program = self.recv_program(conn)
+            self.cache = {}
+            print('Num bytes received = ', len(self.program))
+        elif trig == 5:
+            axis = words[8]
+            value = words[9] & 0xffffff
+            if words[9] >> 24 == 1: value = -value
+            if axis < 4: self.shims[axis] = value
+            self.cache = {}
+            print('Gradient offsets updated with values: X %d, Y %d, Z %d Z2 %d [mA]' % tuple(self.shims))
+        else:
+            self.acquire(conn, trig, words)
+
+    def recv_program(self, conn):
+        # Like the C server a single read, the frontend sends the program right after command 4
+        return conn.recv(65536)
+
+    def acquire(self, conn, trig, words):
+        if trig in IMAGE_2D:
+            npe = words[8] & 0xffff
+            if trig in (34, 35): order = [n for m in range(npe // 2) for n in (npe // 2 + m, npe // 2 - 1 - m)]
+            else: order = range(npe)
+            kspace = self.kspace_2D(npe, words[9], trig not in GRADIENT_ECHO)
+            lines = [kspace[n] for n in order]
+            TR = words[9]
+        elif trig in IMAGE_3D:
+            npe = words[8] & 0xffff
+            snpe = words[IMAGE_3D[trig]] >> 16
+            kspace = self.kspace_2D(npe, words[9], True)
+            kz = self.slab_profile(snpe)
+            lines = [kz[m] * kspace[n] for m in range(snpe) for n in range(npe)]
+            TR = words[9]
+        elif trig in PROJECTION:
+            angle = 0.0 if words[0] >> 16 == 0 else np.pi / 2
+            lines = [self.projection(angle, trig in ECHO)]
+            TR = 0
+        elif trig in PROJECTION_ANGLE:
+            angle = (words[PROJECTION_ANGLE[trig]] & 0xffff) / 100
+            lines = [self.projection(angle, trig in ECHO)]
+            TR = 0
+        else:
+            lines = [self.spectrum(trig in ECHO)]
+            TR = 0
+
+        print('Acquire opcode', trig, ':', len(lines), 'frame(s)')
+        for line in lines:
+            self.send_frame(conn, line)
+            if self.mode == 'accurate' and TR: time.sleep(TR / 1000)
+
+    def send_frame(self, conn, line):
+        frame = np.empty(self.samples, dtype=np.complex64)
+        frame.real = self.rng.normal(0, self.noise, self.samples)
+        frame.imag = self.rng.normal(0, self.noise, self.samples)
+        start = int(self.sampledelay * 250)
+        frame[start:start + line.shape[0]] += line
+
+        view = memoryview(frame.view(np.uint8))
+        t0 = time.monotonic()
+        for i in range(self.samples // self.chunk):
+            if self.mode == 'accurate':
+                # RX FIFO is read out in chunks at 250 kSamples/s
+                delay = t0 + (i + 1) * self.chunk / self.samplerate - time.monotonic()
+                if delay > 0: time.sleep(delay)
+            conn.sendall(view[i * self.chunk * 8:(i + 1) * self.chunk * 8])
+
+    # --- Signal model ---------------------------------------------------------
+
+    def flipangle(self):
+        # 90° at the reference attenuation, amplitude scales with the attenuator setting
+        return np.pi / 2 * 10 ** ((self.attenuation - abs(self.reference_attenuation)) / -20)
+
+    def offresonance(self):
+        df = self.phantom.B0 + self.shimsens * (self.shims[0] * self.phantom.x + self.shims[1] * self.phantom.y)
+        if self.larmor is not None: df = df + (self.larmor * 1e6 - self.frequency)
+        return df
+
+    def weights(self, TR, echo):
+        # Longitudinal recovery (optionally after inversion) and T2 decay at TE
+        p = self.phantom
+        E1 = np.exp(-TR / p.T1)
+        if self.TI is not None: Mz = 1 - 2 * np.exp(-self.TI / p.T1) + E1
+        else: Mz = 1 - E1
+        w = p.M0 * Mz * np.sin(self.flipangle())
+        if echo: w = w * np.exp(-self.TE / p.T2)
+        return w * self.amplitude / p.M0.size
+
+    def readout_samples(self):
+        return int(self.TS * 250)
+
+    def kspace_2D(self, npe, TR, echo):
+        key = ('2D', npe, TR, echo)
+        if key not in self.cache:
+            p = self.phantom
+            w = self.weights(TR, echo)
+            if not echo: w = w * np.exp(2j * np.pi * self.offresonance() * self.TE / 1000)
+            else: w = w.astype(np.complex128)
+
+            # Resample the phantom to npe x npe and center it in the oversampled readout
+            idx = (np.arange(npe) * p.shape[0] / npe).astype(int)
+            jdx = (np.arange(npe) * p.shape[1] / npe).astype(int)
+            n_ro = self.readout_samples()
+            img = np.zeros((npe, max(n_ro, npe)), dtype=np.complex128)
+            c = img.shape[1] // 2 - npe // 2
+            img[:, c:c + npe] = w[np.ix_(idx, jdx)] * p.M0.size / npe ** 2
+            k = np.fft.ifftshift(np.fft.ifft2(np.fft.ifftshift(img), norm='forward'))
+            self.cache[key] = k[:, :n_ro].astype(np.complex64)
+        return self.cache[key]
+
+    def slab_profile(self, snpe):
+        profile = np.zeros(snpe)
+        profile[snpe // 4:snpe - snpe // 4] = 1
+        return np.fft.ifftshift(np.fft.ifft(np.fft.ifftshift(profile), norm='forward')) / snpe
+
+    def projection(self, angle, echo):
+        key = ('proj', round(angle, 2), echo)
+        if key not in self.cache:
+            p = self.phantom
+            w = self.weights(self.TR, echo)
+            if not echo: w = w * np.exp(2j * np.pi * self.offresonance() * self.TE / 1000)
+            mask = w != 0
+            n_ro = self.readout_samples()
+            # k in cycles per phantom pixel, phantom centered in the oversampled readout
+            k = (np.arange(n_ro) - n_ro / 2) / n_ro
+            r = (p.x[mask] * np.cos(angle) + p.y[mask] * np.sin(angle)) * p.shape[1] / 2
+            line = np.exp(2j * np.pi * np.outer(k, r)) @ w[mask]
+            self.cache[key] = line.astype(np.complex64)
+        return self.cache[key]
+
+    def spectrum(self, echo):
+        key = ('spec', echo)
+        if key not in self.cache:
+            p = self.phantom
+            w = self.weights(self.TR, echo)
+            df = self.offresonance()
+            mask = w != 0
+            # Voxels with equal off-resonance and T2 share one exponential
+            groups, inverse = np.unique(np.stack((np.round(df[mask], 1), p.T2[mask])), axis=1, return_inverse=True)
+            wsum = np.bincount(inverse.ravel(), weights=w[mask])
+            n_ro = self.readout_samples()
+            if echo:
+                t = (np.arange(n_ro) - n_ro / 2) / self.samplerate
+                decay = np.exp(-np.outer(np.abs(t), 1000 / groups[1]))
+            else:
+                t = self.TE / 1000 - self.TS / 2000 + np.arange(n_ro) / self.samplerate
+                decay = np.exp(-np.outer(t, 1000 / groups[1]))
+            line = (np.exp(2j * np.pi * np.outer(t, groups[0])) * decay) @ wsum
+            self.cache[key] = line.astype(np.complex64)
+        return self.cache[key]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stand-in for the relax2 Red Pitaya server.')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=1001)
+    parser.add_argument('--mode', choices=['fast', 'accurate'], default='fast', help='fast: as fast as possible, accurate: honour readout time and TR')
+    parser.add_argument('--phantom', default=None, help='.npz file with M0, T1, T2 and B0 maps')
+    parser.add_argument('--TS', type=float, default=6, help='Sampling window [ms]')
+    parser.add_argument('--sampledelay', type=float, default=0.344, help='Filter delay [ms]')
+    parser.add_argument('--TE', type=float, default=12, help='Echo time [ms]')
+    parser.add_argument('--TI', type=float, default=None, help='Inversion time [ms]')
+    parser.add_argument('--TR', type=float, default=500, help='Repetition time of single shot acquisitions [ms]')
+    parser.add_argument('--noise', type=float, default=1e-5)
+    parser.add_argument('--larmor', type=float, default=None, help='Phantom Larmor frequency [MHz]')
+    args = parser.parse_args()
+
+    emulator = server_emulator(phantom.load(args.phantom) if args.phantom else None, host=args.host, port=args.port, \
+                               mode=args.mode, TS=args.TS, sampledelay=args.sampledelay, TE=args.TE, TI=args.TI, \
+                               TR=args.TR, noise=args.noise, larmor=args.larmor)
+    try: emulator.serve_forever()
+    except KeyboardInterrupt: emulator.stop()
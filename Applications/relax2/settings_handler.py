@@ -0,0 +1,138 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Parameter file (parameters.pkl)
+#   Pickled dict {'version': n, 'settings': {name: value}}, read by name: a
+#   setting missing in the file keeps its default, a removed one is ignored.
+#   Older files are migrated when read (version 0: positional list in the
+#   order of Parameters.settings, settings added since are missing).
+#
+#   save() only marks the file, a timer thread writes it at most once per
+#   interval with the values at that time (written next to the file and
+#   renamed), so saves in the tool loops never wait for the disk. flush()
+#   writes the pending files right away, load() of a pending file flushes it
+#   first, files written or read before are loaded from memory while they are
+#   unchanged on the disk. Pending files are written on exit.
+#
+#   Benchmark: python3 settings_handler.py
+#
+################################################################################
+
+import atexit
+import os
+import pickle
+import threading
+import time
+
+
+class settings_store:
+    version = 1
+
+    def __init__(self):
+        self.interval = 0.5 # At most one write per interval [s]
+        self.pending = {} # filename: values(), called when the file is written
+        self.lock = threading.Lock()
+        self.timer = None
+        self.last = 0
+        self.cache = {} # filename: (file signature, pickled content)
+        atexit.register(self.flush)
+
+    def save(self, filename, values):
+        with self.lock:
+            self.pending[filename] = values
+            if self.timer is None:
+                self.timer = threading.Timer(max(self.last + self.interval - time.monotonic(), 0), self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self, filename=None):
+        # Writes the pending files (all or the given one) now
+        with self.lock:
+            if filename is None: files, self.pending = self.pending, {}
+            else: files = {filename: self.pending.pop(filename)} if filename in self.pending else {}
+            if not self.pending and self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if files: self.last = time.monotonic()
+        for name, values in files.items(): self.write(name, values())
+
+    def is_pending(self, filename):
+        with self.lock:
+            return filename in self.pending
+
+    def write(self, filename, settings):
+        content = pickle.dumps({'version': settings_store.version, 'settings': settings})
+        with open(filename + '.tmp', 'wb') as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(filename + '.tmp', filename)
+        self.cache[filename] = (self.signature(filename), content)
+        print('Parameters saved!')
+
+    def signature(self, filename):
+        stat = os.stat(filename)
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def load(self, filename, order):
+        # Settings of the file by name, order: names of the positional (version 0) files
+        if self.is_pending(filename): self.flush(filename)
+        signature = self.signature(filename)
+        cached = self.cache.get(filename)
+        if cached is not None and cached[0] == signature: content = cached[1]
+        else:
+            with open(filename, 'rb') as file: content = file.read()
+            self.cache[filename] = (signature, content)
+        return self.migrate(pickle.loads(content), order)
+
+    def migrate(self, data, order):
+        if isinstance(data, list):
+            # Version 0: settings were only appended, a shorter list is an older layout
+            if len(data) > len(order): raise ValueError('Parameter file has more settings than known')
+            data = {'version': 1, 'settings': dict(zip(order, data))}
+        if not isinstance(data, dict) or 'settings' not in data: raise ValueError('Not a parameter file')
+        if data.get('version', 0) > settings_store.version: print('Parameter file of a newer version, reading the known settings.')
+        return data['settings']
+
+
+store = settings_store()
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    import numpy as np
+
+    os.chdir(tempfile.mkdtemp())
+    order = tuple('setting' + str(n) for n in range(177))
+    values = {name: n * 0.5 for n, name in enumerate(order)}
+    values['setting10'] = np.matrix(np.zeros((5, 64))) # Tool results
+    values['setting20'] = [0, 0, 0, 0]
+    saves = 500 # A tool sweep saving after every step
+
+    # Former saveFileParameter: positional list written on every call
+    t = time.perf_counter()
+    for n in range(saves):
+        values['setting20'][0] = n
+        with open('former.pkl', 'wb') as file:
+            pickle.dump([values[name] for name in order], file)
+    former = (time.perf_counter() - t) / saves * 1000
+
+    t = time.perf_counter()
+    for n in range(saves):
+        values['setting20'][0] = n
+        store.save('parameters.pkl', lambda: dict(values))
+    coalesced = (time.perf_counter() - t) / saves * 1000
+    store.flush()
+
+    t = time.perf_counter()
+    with open('former.pkl', 'rb') as file: pickle.load(file)
+    load_former = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    loaded = store.load('parameters.pkl', order)
+    load = (time.perf_counter() - t) * 1000
+    migrated = store.load('former.pkl', order)
+
+    print('%d saves: former %.3f ms per save, coalesced %.4f ms per save. Load: former %.3f ms, cached %.3f ms (last value %d, migrated %s)' % \
+          (saves, former, coalesced, load_former, load, loaded['setting20'][0], migrated['setting20'] == values['setting20']))
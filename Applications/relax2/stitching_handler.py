@@ -0,0 +1,227 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Image stitching reconstruction
+#   The positions are loaded and reconstructed in a process pool (complex
+#   image, cropped to the readout range like image_process / image_3D_process)
+#   and added into one preallocated complex output as they arrive, 3D outputs
+#   can be a memory mapped .rdat file. Overlapping positions are blended with
+#   linear feathered weights, without feathering the centre of each position is
+#   cropped like before. The overlaps are feathered in magnitude (the phase of
+#   the positions can differ and would cancel the signal), the phase is the one
+#   of the blended complex image (the magnitude sum is a temporary memory
+#   mapped file next to a memory mapped output). Magnitude and phase are
+#   derived once from the result.
+#   Positions reconstructed with prefetch() during the acquisition are reused.
+#
+#   Benchmark: python3 stitching_handler.py
+#
+################################################################################
+
+import itertools
+import os
+import tempfile
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from rawdata_handler import rawdata
+from fft_handler import ft
+
+
+def single_thread():
+    # Pool workers: one FFT thread each, the pool runs the positions in parallel
+    ft.workers = 1
+
+
+def reconstruct(args):
+    # Complex image of one position, SPEsteps > 0: 3D slab (slices stacked in the file)
+    path, SPEsteps, ROBWscaler, mask = args
+    kspace = np.transpose(rawdata.load(path, dtype=np.complex64, mmap=False))
+    if SPEsteps > 0:
+        rows = int(kspace.shape[0] / SPEsteps)
+        kspace = np.ascontiguousarray(kspace[:SPEsteps * rows]).reshape(SPEsteps, rows, kspace.shape[1])
+        I = ft.fftn(kspace)
+        width = int(kspace.shape[1] / 2 * ROBWscaler)
+    else:
+        kspace = np.array(kspace)
+        if mask is not None: np.putmask(kspace, mask, 0)
+        I = ft.fft2(kspace)
+        width = int(kspace.shape[0] / 2 * ROBWscaler)
+    centre = int(kspace.shape[-1] / 2)
+    return I[..., centre - width:centre + width]
+
+
+class stitching:
+    def __init__(self):
+        self.workers = os.cpu_count() or 1
+        self.feather = True
+
+        # Positions reconstructed during the acquisition (prefetch), taken by stitch()
+        self.tiles = {}
+
+    def key(self, job):
+        path, SPEsteps, ROBWscaler, mask = job
+        return (path, SPEsteps, ROBWscaler, None if mask is None else mask.tobytes())
+
+    def prefetch(self, path, SPEsteps=0, ROBWscaler=1, mask=None):
+        # Reconstructs one position ahead of stitch(), e.g. while the motor moves to the next position
+        job = (path, SPEsteps, ROBWscaler, mask)
+        self.tiles[self.key(job)] = reconstruct(job)
+
+    def weights(self, length, step):
+        # Weight of the tile along the stitching axis: linear ramps over the overlap to the neighbours
+        # (their sum is one inside the overlaps), without feathering the centre step pixels
+        overlap = length - step
+        if overlap <= 0: return np.ones(length)
+        x = np.arange(length) + 0.5
+        if not self.feather:
+            crop = int(length / 2 - step / 2)
+            return ((x > crop) & (x < crop + step)).astype(np.float64)
+        return np.minimum(1, np.minimum(x, length - x) / overlap)
+
+    def stitch(self, paths, axis, step, SPEsteps=0, ROBWscaler=1, mask=None, out=None):
+        # paths in stitching order, step: tile shift in pixels along axis. With overlapping tiles the result
+        # covers count * step pixels (the former cropped extent), else (count - 1) * step + tile length.
+        # out: None for a new array, or a function shape -> writable complex64 array (zero filled).
+        jobs = [(path, SPEsteps, ROBWscaler, mask) for path in paths]
+        ready = [(n, self.tiles.pop(self.key(job))) for n, job in enumerate(jobs) if self.key(job) in self.tiles]
+        missing = [n for n, job in enumerate(jobs) if n not in dict(ready)]
+        if missing: rawdata.flush()
+        # 2D positions take milliseconds, the pool pays off for the 3D slabs
+        workers = min(self.workers, len(missing)) if SPEsteps > 0 else 1
+        step = abs(step)
+
+        result = None
+        weightsum = None
+        magnitude = None
+        scratch = None
+        pool = ProcessPoolExecutor(workers, initializer=single_thread) if workers > 1 else None
+        try:
+            if pool is None: done = ((n, reconstruct(jobs[n])) for n in missing)
+            else: done = self.completed(pool, [(n, jobs[n]) for n in missing], 2 * workers)
+            for n, tile in itertools.chain(ready, done):
+                length = tile.shape[axis]
+                if result is None:
+                    if step <= length:
+                        total = step * len(jobs)
+                        crop = int(length / 2 - step / 2)
+                    else:
+                        total = step * (len(jobs) - 1) + length
+                        crop = 0
+                    shape = list(tile.shape)
+                    shape[axis] = total
+                    result = np.zeros(shape, dtype=np.complex64) if out is None else out(tuple(shape))
+                    weightsum = np.zeros(total)
+                    w = self.weights(length, step)
+                    if self.feather and step < length:
+                        if isinstance(result, np.memmap):
+                            scratch = tempfile.TemporaryFile(dir=os.path.dirname(result.filename))
+                            magnitude = np.memmap(scratch, dtype=np.float32, mode='w+', shape=tuple(shape))
+                        else: magnitude = np.zeros(shape, dtype=np.float32)
+
+                # Tile range clipped to the output
+                start = n * step - crop
+                lower = max(start, 0)
+                upper = min(start + length, total)
+                if upper <= lower: continue
+                index = [slice(None)] * tile.ndim
+                index[axis] = slice(lower, upper)
+                local = [slice(None)] * tile.ndim
+                local[axis] = slice(lower - start, upper - start)
+                shape = [1] * tile.ndim
+                shape[axis] = upper - lower
+                weight = w[lower - start:upper - start].reshape(shape).astype(np.float32)
+                result[tuple(index)] += tile[tuple(local)] * weight
+                if magnitude is not None: magnitude[tuple(index)] += np.abs(tile[tuple(local)]) * weight
+                weightsum[lower:upper] += w[lower - start:upper - start]
+
+            shape = [1] * result.ndim
+            shape[axis] = result.shape[axis]
+            weightsum = np.where(weightsum > 0, weightsum, 1).reshape(shape).astype(np.float32)
+            if magnitude is None: result /= weightsum
+            else:
+                # Feathered magnitude with the phase of the blended image, slice by slice (memory mapped outputs)
+                magnitude /= weightsum
+                for n in range(result.shape[0]): result[n] = magnitude[n] * np.exp(1j * np.angle(result[n]))
+        finally:
+            if pool is not None: pool.shutdown()
+            if scratch is not None:
+                del magnitude
+                scratch.close()
+        return result
+
+    def completed(self, pool, jobs, depth):
+        # Results (index, tile) as they finish, at most depth positions in flight (bounded memory)
+        running = {}
+        queue = list(jobs)
+        while queue or running:
+            while queue and len(running) < depth:
+                n, job = queue.pop(0)
+                running[pool.submit(reconstruct, job)] = n
+            finished, pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield running.pop(future), future.result()
+
+
+stitch = stitching()
+
+
+if __name__ == '__main__':
+    import shutil
+    import tempfile
+    import time
+
+    def serial(paths, axis, step, SPEsteps):
+        # Former loop: reconstruct every position, crop the centre step pixels into three outputs
+        tiles = [reconstruct((path, SPEsteps, 1, None)) for path in paths]
+        length = tiles[0].shape[axis]
+        crop = int(length / 2 - step / 2)
+        shape = list(tiles[0].shape)
+        shape[axis] = step * len(paths)
+        img, mag, pha = np.zeros(shape, dtype=np.complex64), np.zeros(shape), np.zeros(shape)
+        for n, tile in enumerate(tiles):
+            index = [slice(None)] * tile.ndim
+            index[axis] = slice(n * step, n * step + step)
+            local = [slice(None)] * tile.ndim
+            local[axis] = slice(crop, crop + step)
+            img[tuple(index)] = tile[tuple(local)]
+            mag[tuple(index)] = np.abs(tile)[tuple(local)]
+            pha[tuple(index)] = np.angle(tile)[tuple(local)]
+        return img, mag, pha
+
+    rng = np.random.default_rng()
+    folder = tempfile.mkdtemp()
+    try:
+        for count, SPEsteps, nPE, samples in [(20, 0, 128, 256), (20, 32, 64, 128), (20, 64, 128, 256)]:
+            rows = nPE * SPEsteps if SPEsteps else nPE
+            paths = []
+            for n in range(count):
+                paths.append(os.path.join(folder, 'Image_Stitching_%d_%d' % (SPEsteps, n + 1)))
+                data = (rng.standard_normal((samples, rows)) + 1j * rng.standard_normal((samples, rows))).astype(np.complex64)
+                rawdata.write(paths[-1], data, {})
+            axis = 1
+            step = nPE // 2
+
+            t = time.perf_counter()
+            img, mag, pha = serial(paths, axis, step, SPEsteps)
+            t_serial = time.perf_counter() - t
+
+            stitch.feather = False
+            t = time.perf_counter()
+            result = stitch.stitch(paths, axis, step, SPEsteps)
+            mag2, pha2 = np.abs(result), np.angle(result)
+            t_pool = time.perf_counter() - t
+            error = np.max(np.abs(result - img)) / np.max(np.abs(img))
+
+            stitch.feather = True
+            t = time.perf_counter()
+            result = stitch.stitch(paths, axis, step, SPEsteps)
+            t_feather = time.perf_counter() - t
+
+            print('%2d positions %-14s serial %6.3f s   pool (%d workers) %6.3f s (cropped, max. deviation %.1e)   feathered %6.3f s' % \
+                  (count, str(img.shape), t_serial, min(stitch.workers, count) if SPEsteps else 1, t_pool, error, t_feather))
+    finally:
+        shutil.rmtree(folder)
@@ -0,0 +1,123 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Parametric sequence templates
+#   A sequence file is parsed once (assembled by the program cache) into its
+#   machine code words. The PR delays of the file are timing slots, named by
+#   their comment (e.g. Flip RF Pulse, Pause, Sampling window) and addressed by
+#   line like before (lines[-13] -> set(-13, ...)). Setting a slot re-encodes
+#   only that word, program() packs the words in memory. The sequence files are
+#   not written anymore, the template is parsed again if the file changed.
+#
+#   Benchmark: python3 template_handler.py
+#
+################################################################################
+
+import math
+import os
+import struct
+
+from compile_handler import programs
+
+
+class template:
+    PR = 0b011101
+    cycle = 7e-3 # Clock cycle [µs]
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.stamp = self.changed(filename)
+
+        with open(filename, 'r') as file:
+            lines = file.readlines()
+        program = programs.compile(filename)[1]
+        self.words = list(struct.unpack('<%dQ' % (len(program) // 8), program))
+        if len(self.words) != len(lines): raise ValueError('Sequence file {} does not assemble one word per line'.format(filename))
+
+        # Timing slots: line -> [name, register, delay [µs]]
+        self.slots = {}
+        for n, line in enumerate(lines):
+            code, _, comment = line.partition('//')
+            code = code.replace(',', ' ').split()
+            if code and code[0] == 'PR': self.slots[n] = [comment.strip(), int(code[1]), int(code[2])]
+
+    def changed(self, filename):
+        stat = os.stat(filename)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def index(self, line):
+        n = line + len(self.words) if line < 0 else line
+        if n not in self.slots: raise ValueError('Line {} of {} is no PR timing slot'.format(line, self.filename))
+        return n
+
+    def set(self, line, register, delay):
+        # PR register, delay [µs] (whole µs, rounded down to clock cycles like the assembler)
+        n = self.index(line)
+        delay = int(delay)
+        cycles = math.floor(delay * (1 / self.cycle))
+        if delay < 0 or cycles >= 1 << 40: raise ValueError('{} delay out of range: {} µs'.format(self.slots[n][0], delay))
+        self.words[n] = (self.PR << 58) | (int(register) << 40) | cycles
+        self.slots[n][1:] = [int(register), delay]
+
+    def get(self, line):
+        # Name, register and delay [µs] of a slot
+        return tuple(self.slots[self.index(line)])
+
+    def program(self):
+        return struct.pack('<%dQ' % len(self.words), *self.words)
+
+
+class template_cache:
+    def __init__(self):
+        self.templates = {}
+
+    def load(self, filename):
+        # Template of a sequence file, parsed once (and again if the file changed)
+        sequence = self.templates.get(filename)
+        if sequence is None or sequence.changed(filename) != sequence.stamp:
+            sequence = self.templates[filename] = template(filename)
+        return sequence
+
+
+templates = template_cache()
+
+
+if __name__ == '__main__':
+    import glob
+    import shutil
+    import tempfile
+    import time
+
+    from assembler import Assembler
+
+    filenames = sorted(f for f in glob.glob('sequences/**/*.txt', recursive=True) if not f.endswith('_hex.txt'))
+    folder = tempfile.mkdtemp()
+    try:
+        t_file = 0
+        t_template = 0
+        for filename in filenames:
+            sequence = templates.load(filename)
+            slots = sorted(sequence.slots)
+            copy = os.path.join(folder, os.path.basename(filename))
+            shutil.copy(filename, copy)
+
+            # Former setup: rewrite the PR lines of the file and assemble it
+            t = time.perf_counter()
+            with open(copy, 'r') as file:
+                lines = file.readlines()
+            for n in slots: lines[n] = 'PR %d, %d\t// %s\n' % (sequence.slots[n][1], sequence.slots[n][2] + 10, sequence.slots[n][0])
+            with open(copy, 'w') as file:
+                for line in lines: file.write(line)
+            reference = Assembler().assemble(copy)
+            t_file += time.perf_counter() - t
+
+            t = time.perf_counter()
+            for n in slots: sequence.set(n, sequence.slots[n][1], sequence.slots[n][2] + 10)
+            program = sequence.program()
+            t_template += time.perf_counter() - t
+
+            if program != reference: print('Differs:', filename)
+        print('%d sequences: rewrite and assemble %.3f s   template %.4f s' % (len(filenames), t_file, t_template))
+    finally:
+        shutil.rmtree(folder)
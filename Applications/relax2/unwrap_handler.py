@@ -0,0 +1,188 @@
+################################################################################
+#
+# Date: 2025
+#
+#   Phase unwrapping of 2D and 3D phase images (B0 field maps)
+#       vectorised: line by line from the centre along each axis, the lines are
+#                   aligned by the unwrapped centre line/plane, then a residual
+#                   correction against the locally smoothed result
+#       quality:    quality guided flood fill, pixels are unwrapped in order of
+#                   the quality (phase derivative variance, weighted with the
+#                   magnitude) with a heap, O(N log N)
+#   The unwrapped phase keeps the value of the start pixel (centre / best quality).
+#   Field maps unwrap the wrapped phase difference of the echoes once.
+#
+#   Benchmark against the spiral walk: python3 unwrap_handler.py
+#
+################################################################################
+
+import heapq
+import math
+
+import numpy as np
+
+from scipy import ndimage
+
+
+def wrap(x):
+    return x - 2 * math.pi * np.round(x / (2 * math.pi))
+
+
+class unwrap_handler:
+    def __init__(self):
+        self.method = 'quality'
+
+    def unwrap(self, phase, magnitude=None, mask=None):
+        # Method used by the field maps
+        if self.method == 'vectorised': return self.vectorised(phase, mask)
+        return self.quality(phase, magnitude, mask)
+
+    def difference(self, phase2, phase1, magnitude=None, mask=None):
+        # Unwrapped phase2 - phase1 (two echoes), one unwrap of the wrapped difference: unwrapping the
+        # echoes on their own can leave them 2 pi k apart, a constant offset of the whole map
+        return self.unwrap(wrap(np.asarray(phase2, dtype=np.float64) - np.asarray(phase1, dtype=np.float64)), magnitude, mask)
+
+    def vectorised(self, phase, mask=None):
+        phase = np.asarray(phase, dtype=np.float64)
+        U = self.path(phase, tuple(range(phase.ndim)))
+
+        # Residual correction: path errors show up as 2pi steps against the neighbourhood,
+        # every pixel takes the multiple of 2pi closest to the local median
+        reference = ndimage.median_filter(U, size=3, mode='nearest')
+        U = phase + 2 * math.pi * np.round((reference - phase) / (2 * math.pi))
+        centre = tuple(n // 2 for n in phase.shape)
+        U -= 2 * math.pi * np.round((U[centre] - phase[centre]) / (2 * math.pi))
+
+        if mask is not None: U[~np.asarray(mask, dtype=bool)] = phase[~np.asarray(mask, dtype=bool)]
+        return U
+
+    def path(self, phase, axes):
+        # Unwrap along the last axis, then align the lines by the unwrapped centre slice
+        if len(axes) == 0: return phase
+        axis = axes[-1]
+        U = self.line(phase, axis)
+        centre = np.take(U, [U.shape[axis] // 2], axis=axis)
+        return U + (self.path(centre, axes[:-1]) - centre)
+
+    def line(self, phase, axis):
+        # np.unwrap starting at the centre element in both directions
+        c = phase.shape[axis] // 2
+        right = np.unwrap(np.take(phase, range(c, phase.shape[axis]), axis=axis), axis=axis)
+        left = np.flip(np.unwrap(np.flip(np.take(phase, range(c + 1), axis=axis), axis=axis), axis=axis), axis=axis)
+        return np.concatenate((np.take(left, range(c), axis=axis), right), axis=axis)
+
+    def quality_map(self, phase, magnitude=None):
+        # Smoothness of the phase: inverse phase derivative variance (3 x 3 neighbourhood),
+        # weighted with the normalised magnitude if available
+        variance = np.zeros(phase.shape)
+        for axis in range(phase.ndim):
+            d = wrap(np.diff(phase, axis=axis, append=np.take(phase, [-1], axis=axis)))
+            mean = ndimage.uniform_filter(d, size=3, mode='nearest')
+            variance += np.sqrt(np.maximum(ndimage.uniform_filter(d * d, size=3, mode='nearest') - mean * mean, 0))
+        q = 1 / (1 + variance)
+        if magnitude is not None: q *= np.abs(magnitude) / max(np.max(np.abs(magnitude)), 1e-30)
+        return q
+
+    def quality(self, phase, magnitude=None, mask=None):
+        phase = np.asarray(phase, dtype=np.float64)
+        shape = phase.shape
+        quality = self.quality_map(phase, magnitude).ravel().tolist()
+        wrapped = phase.ravel().tolist()
+        unwrapped = list(wrapped)
+        done = np.zeros(phase.size, dtype=bool) if mask is None else ~np.asarray(mask, dtype=bool).ravel()
+        done = done.tolist()
+
+        # Flat index steps to the neighbours and the coordinate that limits each step
+        strides = [int(np.prod(shape[axis + 1:])) for axis in range(len(shape))]
+        coords = [c.ravel().tolist() for c in np.indices(shape)]
+        steps = []
+        for axis in range(len(shape)):
+            steps.append((-strides[axis], axis, 0))
+            steps.append((strides[axis], axis, shape[axis] - 1))
+
+        twopi = 2 * math.pi
+        order = np.argsort(-np.asarray(quality), kind='stable').tolist()
+        for seed in order:
+            # Every connected region starts at its best pixel
+            if done[seed]: continue
+            done[seed] = True
+            heap = []
+            n = seed
+            while True:
+                for step, axis, limit in steps:
+                    if coords[axis][n] == limit: continue
+                    m = n + step
+                    if not done[m]: heapq.heappush(heap, (-quality[m], m, n))
+                while heap:
+                    q, n, parent = heapq.heappop(heap)
+                    if not done[n]: break
+                else: break
+                done[n] = True
+                d = wrapped[n] - unwrapped[parent]
+                unwrapped[n] = wrapped[n] - twopi * round(d / twopi)
+
+        return np.array(unwrapped).reshape(shape)
+
+
+unwrap = unwrap_handler()
+
+
+if __name__ == '__main__':
+    import time
+
+    def spiral_walk(phase):
+        # Former FieldMapB0 routine: 20 passes of a four quadrant spiral around the centre
+        S = np.array(phase, dtype=np.float64)
+        cx = int(S.shape[0] / 2)
+        cy = int(S.shape[1] / 2)
+        def check(x, y):
+            if S[x, y] + S[x, y] > math.pi: S[x, y] = S[x, y] - 2 * math.pi
+        for kk in range(20):
+            for jj in range(cy - 2):
+                for ii in range(1 + jj * 2):
+                    for d in (-1, 0, 1): check(cx - jj + ii + d, cy + jj + 1)
+            for jj in range(cy - 1):
+                for ii in range(1 + jj * 2):
+                    for d in (-1, 0, 1): check(cx + jj - ii + d, cy - jj - 1)
+            for jj in range(cx - 2):
+                for ii in range(1 + jj * 2):
+                    for d in (-1, 0, 1): check(cx + jj + 1, cy - jj + ii + d)
+            for jj in range(cx - 1):
+                for ii in range(1 + jj * 2):
+                    for d in (-1, 0, 1): check(cx - jj - 1, cy + jj - ii + d)
+        return S
+
+    def phantom(shape, rng):
+        # Smooth field (quadratic + bumps) of about +-15 rad in a sphere/disc, noisy background
+        grid = np.meshgrid(*[np.linspace(-1, 1, n) for n in shape], indexing='ij')
+        r2 = sum(g * g for g in grid)
+        true = 12 * grid[0] * grid[-1] + 8 * r2
+        for k in range(3):
+            centre = rng.uniform(-0.5, 0.5, len(shape))
+            true += rng.uniform(-6, 6) * np.exp(-sum((g - c) ** 2 for g, c in zip(grid, centre)) / 0.05)
+        magnitude = np.where(r2 < 0.8, 1.0, 0.05) + rng.normal(0, 0.02, shape)
+        noise = rng.normal(0, 0.05, shape) / np.abs(magnitude)
+        return np.angle(np.exp(1j * (true + noise))), true, np.abs(magnitude), r2 < 0.8
+
+    def errors(U, true, mask):
+        # Pixels in the object off by a multiple of 2pi against the true phase (after one global offset)
+        k = np.round((U - true) / (2 * math.pi))
+        return np.mean(k[mask] != np.median(k[mask]))
+
+    def timeit(function):
+        t = time.perf_counter()
+        result = function()
+        return result, time.perf_counter() - t
+
+    rng = np.random.default_rng()
+    for shape in [(64, 64), (128, 128), (256, 256), (32, 64, 64)]:
+        wrapped, true, magnitude, mask = phantom(shape, rng)
+        line = '%-14s' % str(shape)
+        if len(shape) == 2:
+            U, t = timeit(lambda: spiral_walk(wrapped))
+            line += 'spiral walk %8.3f s (%5.1f %% wrong)   ' % (t, 100 * errors(U, true, mask))
+        U, t = timeit(lambda: unwrap.vectorised(wrapped))
+        line += 'vectorised %7.3f s (%5.1f %% wrong)   ' % (t, 100 * errors(U, true, mask))
+        U, t = timeit(lambda: unwrap.quality(wrapped, magnitude))
+        line += 'quality %7.3f s (%5.1f %% wrong)' % (t, 100 * errors(U, true, mask))
+        print(line)